@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+# benchmarks/fixture_server.py - V9 基准测试本地固定页面服务器
+"""
+本地固定页面服务器 (aiohttp)
+
+为离线基准测试提供固定内容的页面，不访问任何真实网站:
+- /article/{n}                     静态文章
+- /spa/{n}?delay_ms=500            延迟渲染的单页应用 (需要浏览器)
+- /google.com/search?q=...         类 Google 搜索结果页 (触发深度爬取)
+- /arxiv.org/search/?query=...     类 arXiv 搜索列表页
+- /pubmed.ncbi.nlm.nih.gov/?term=  类 PubMed 搜索列表页
+- /huge                            约 5MB 的超大页面
+- /robots.txt                      允许所有爬虫
+
+路径中包含搜索引擎域名，使 server_v9 的搜索页识别逻辑与真实站点一致。
+可以单独运行: python benchmarks/fixture_server.py --port 8765
+"""
+
+import argparse
+import asyncio
+import html
+import random
+from typing import Optional, Tuple
+
+from aiohttp import web
+
+WORDS = (
+    "crawler browser latency throughput markdown render network cache page scheduler "
+    "research paper model transformer dataset evaluation benchmark result method analysis "
+    "system design memory concurrency request response server client protocol content"
+).split()
+
+# 略小于HTTP快速通道的默认上限 (5MB)，覆盖大页面的转换与格式化路径
+HUGE_PAGE_BYTES = 5 * 1024 * 1024 - 64 * 1024
+SERP_RESULTS = 10
+
+
+def make_paragraphs(seed: int, paragraphs: int = 8, words_per_paragraph: int = 100) -> str:
+    """生成确定性的段落文本"""
+    rng = random.Random(seed)
+    return "\n".join(
+        "<p>" + " ".join(rng.choice(WORDS) for _ in range(words_per_paragraph)) + ".</p>"
+        for _ in range(paragraphs)
+    )
+
+
+def page(title: str, body: str, head: str = "") -> str:
+    return (
+        "<!DOCTYPE html><html><head><meta charset=\"utf-8\">"
+        f"<title>{html.escape(title)}</title>{head}</head>"
+        f"<body>{body}</body></html>"
+    )
+
+
+async def handle_robots(request: web.Request) -> web.Response:
+    return web.Response(text="User-agent: *\nAllow: /\n", content_type="text/plain")
+
+
+async def handle_article(request: web.Request) -> web.Response:
+    article_id = int(request.match_info["article_id"])
+    body = (
+        f"<article><h1>Fixture Article {article_id}</h1>"
+        f"<p class=\"byline\">Benchmark Author {article_id % 7}</p>"
+        f"{make_paragraphs(article_id)}</article>"
+    )
+    return web.Response(text=page(f"Fixture Article {article_id}", body), content_type="text/html")
+
+
+async def handle_spa(request: web.Request) -> web.Response:
+    spa_id = int(request.match_info["spa_id"])
+    delay_ms = int(request.query.get("delay_ms", "500"))
+    content = make_paragraphs(spa_id + 10_000).replace("\n", "")
+    script = (
+        "<script>setTimeout(function () {"
+        f"document.getElementById('root').innerHTML = '<h1>Rendered SPA {spa_id}</h1>' + {content!r};"
+        f"}}, {delay_ms});</script>"
+    )
+    body = f"<noscript>Please enable JavaScript to view this page.</noscript><div id=\"root\"></div>{script}"
+    return web.Response(text=page(f"SPA {spa_id}", body), content_type="text/html")
+
+
+async def handle_google_serp(request: web.Request) -> web.Response:
+    query = request.query.get("q", "")
+    base = f"{request.scheme}://{request.host}"
+    results = "".join(
+        f"<div class=\"g\"><div class=\"yuRUbf\"><a href=\"{base}/article/{index}\">"
+        f"<h3>{html.escape(query)} result {index}</h3></a></div>"
+        f"<div class=\"VwiC3b\">Snippet {index} for {html.escape(query)}: "
+        f"{' '.join(WORDS[index:index + 20])}</div></div>"
+        for index in range(1, SERP_RESULTS + 1)
+    )
+    body = f"<div id=\"search\"><div id=\"rso\">{results}</div></div>"
+    return web.Response(text=page(f"{query} - Google Search", body), content_type="text/html")
+
+
+async def handle_arxiv_listing(request: web.Request) -> web.Response:
+    query = request.query.get("query", "")
+    base = f"{request.scheme}://{request.host}"
+    results = "".join(
+        "<li class=\"arxiv-result\">"
+        f"<p class=\"list-title\"><a href=\"{base}/article/{100 + index}\">arXiv:2401.{index:05d}</a></p>"
+        f"<p class=\"title is-5 mathjax\">{html.escape(query)} study {index}</p>"
+        f"<p class=\"authors\">Authors: <a href=\"#\">Author {index}</a>, <a href=\"#\">Author {index + 1}</a></p>"
+        f"<span class=\"abstract-full\">{' '.join(WORDS[:40])}</span>"
+        f"<p class=\"is-size-7\">Submitted 1 January, 2024</p>"
+        "</li>"
+        for index in range(1, SERP_RESULTS + 1)
+    )
+    body = f"<ol class=\"breathe-horizontal\">{results}</ol>"
+    return web.Response(text=page(f"Search | arXiv: {query}", body), content_type="text/html")
+
+
+async def handle_pubmed_listing(request: web.Request) -> web.Response:
+    term = request.query.get("term", "")
+    base = f"{request.scheme}://{request.host}"
+    results = "".join(
+        "<article class=\"full-docsum\">"
+        f"<a class=\"docsum-title\" href=\"{base}/article/{200 + index}\">{html.escape(term)} trial {index}</a>"
+        f"<span class=\"docsum-authors full-authors\">Author {index}, Author {index + 1}.</span>"
+        f"<span class=\"docsum-journal-citation full-journal-citation\">J Fixture. 2024;{index}:1-10.</span>"
+        f"<span class=\"docsum-pmid\">{38000000 + index}</span>"
+        f"<div class=\"full-view-snippet\">{' '.join(WORDS[10:40])}</div>"
+        "</article>"
+        for index in range(1, SERP_RESULTS + 1)
+    )
+    body = f"<div class=\"search-results-chunks\">{results}</div>"
+    return web.Response(text=page(f"{term} - Search Results - PubMed", body), content_type="text/html")
+
+
+def build_huge_page() -> str:
+    paragraph = make_paragraphs(42, paragraphs=1, words_per_paragraph=200)
+    repeats = HUGE_PAGE_BYTES // len(paragraph.encode("utf-8"))
+    return page("Huge Fixture Page", "<article><h1>Huge Fixture Page</h1>" + paragraph * repeats + "</article>")
+
+
+def create_fixture_app(response_delay_ms: int = 0) -> web.Application:
+    """创建固定页面应用，可选地为每个响应增加固定延迟"""
+
+    @web.middleware
+    async def delay_middleware(request, handler):
+        if response_delay_ms and request.path != "/robots.txt":
+            await asyncio.sleep(response_delay_ms / 1000)
+        return await handler(request)
+
+    app = web.Application(middlewares=[delay_middleware])
+    huge_page = build_huge_page()
+
+    async def handle_huge(request: web.Request) -> web.Response:
+        return web.Response(text=huge_page, content_type="text/html")
+
+    app.router.add_get("/robots.txt", handle_robots)
+    app.router.add_get("/article/{article_id:\\d+}", handle_article)
+    app.router.add_get("/spa/{spa_id:\\d+}", handle_spa)
+    app.router.add_get("/google.com/search", handle_google_serp)
+    app.router.add_get("/arxiv.org/search/", handle_arxiv_listing)
+    app.router.add_get("/pubmed.ncbi.nlm.nih.gov/", handle_pubmed_listing)
+    app.router.add_get("/huge", handle_huge)
+    return app
+
+
+async def start_fixture_server(
+    host: str = "127.0.0.1",
+    port: int = 0,
+    response_delay_ms: int = 0
+) -> Tuple[web.AppRunner, str]:
+    """
+    启动固定页面服务器
+
+    Returns:
+        (AppRunner, base_url)，port=0 时自动选择空闲端口
+    """
+    runner = web.AppRunner(create_fixture_app(response_delay_ms), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = runner.addresses[0][1]
+    return runner, f"http://{host}:{bound_port}"
+
+
+async def _serve_forever(host: str, port: int, response_delay_ms: int):
+    runner, base_url = await start_fixture_server(host, port, response_delay_ms)
+    print(f"🧪 固定页面服务器已启动: {base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description="V9 基准测试本地固定页面服务器")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay-ms", type=int, default=0, help="每个响应的额外延迟")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_serve_forever(args.host, args.port, args.delay_ms))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
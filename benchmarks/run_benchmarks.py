@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# benchmarks/run_benchmarks.py - V9 离线基准测试
+"""
+V9 离线基准测试
+
+启动本地固定页面服务器，直接调用 server_v9 的工具函数，
+按工具场景和并发级别报告吞吐量、p50/p95/p99 延迟和峰值 RSS (含浏览器子进程)。
+不访问任何真实网站，可以在上线前发现性能回退。
+
+用法:
+    python benchmarks/run_benchmarks.py
+    python benchmarks/run_benchmarks.py --scenarios static_article,serp_deep --concurrency 1,8 --requests 40
+    python benchmarks/run_benchmarks.py --save baseline.json
+    python benchmarks/run_benchmarks.py --baseline baseline.json --max-regression 0.2
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent.absolute()
+sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(Path(__file__).parent.absolute()))
+
+from fixture_server import start_fixture_server
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# 工具输出第一行包含这些标记时视为失败
+ERROR_MARKERS = ("失败", "Error", "error", "failed", "Failed", "异常")
+
+
+@dataclass
+class Scenario:
+    """一个基准测试场景: 某个工具在某类页面上的调用"""
+    name: str
+    tool: str
+    description: str
+    make_call: Callable[[Any, str, int], Awaitable[str]]
+
+
+@dataclass
+class ScenarioResult:
+    """一个场景在一个并发级别下的测量结果"""
+    scenario: str
+    tool: str
+    concurrency: int
+    requests: int
+    errors: int
+    elapsed_seconds: float
+    throughput_rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    mean_ms: float
+    peak_rss_mb: float
+    output_bytes: int
+    error_samples: List[str] = field(default_factory=list)
+
+
+def build_scenarios() -> Dict[str, Scenario]:
+    """定义所有基准测试场景"""
+    scenarios = [
+        Scenario(
+            "static_article", "crawl", "静态文章 (HTTP快速通道)",
+            lambda server, base, i: server.crawl(f"{base}/article/{i % 50}")
+        ),
+        Scenario(
+            "spa_render", "crawl", "延迟500ms渲染的SPA (升级到浏览器)",
+            lambda server, base, i: server.crawl(f"{base}/spa/{i % 20}?delay_ms=500")
+        ),
+        Scenario(
+            "huge_page", "crawl", "约5MB的超大页面",
+            lambda server, base, i: server.crawl(f"{base}/huge")
+        ),
+        Scenario(
+            "intelligent_article", "crawl_with_intelligence", "智能爬取静态文章",
+            lambda server, base, i: server.crawl_with_intelligence(f"{base}/article/{i % 50}", "smart")
+        ),
+        Scenario(
+            "serp_deep", "crawl_with_intelligence", "类Google搜索结果页 + 深度爬取5个结果",
+            lambda server, base, i: server.crawl_with_intelligence(
+                f"{base}/google.com/search?q=benchmark+{i}", "deep", 5
+            )
+        ),
+        Scenario(
+            "arxiv_listing", "crawl_with_intelligence", "类arXiv列表页 + 深度爬取3个结果",
+            lambda server, base, i: server.crawl_with_intelligence(
+                f"{base}/arxiv.org/search/?query=transformer+{i}&searchtype=all", "deep", 3
+            )
+        ),
+        Scenario(
+            "pubmed_listing", "crawl_with_intelligence", "类PubMed列表页 + 深度爬取3个结果",
+            lambda server, base, i: server.crawl_with_intelligence(
+                f"{base}/pubmed.ncbi.nlm.nih.gov/?term=covid+{i}", "deep", 3
+            )
+        ),
+        Scenario(
+            "batch_20", "crawl_batch", "批量爬取20篇静态文章",
+            lambda server, base, i: server.crawl_batch([f"{base}/article/{i * 20 + n}" for n in range(20)])
+        ),
+    ]
+    return {scenario.name: scenario for scenario in scenarios}
+
+
+class RssSampler:
+    """后台采样当前进程及其子进程 (浏览器) 的 RSS 峰值"""
+
+    def __init__(self, interval_seconds: float = 0.05):
+        self.interval_seconds = interval_seconds
+        self.peak_bytes = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def _current_rss(self) -> int:
+        if psutil is None:
+            # 无 psutil 时退化为进程生命周期内的峰值 (Linux 单位为KB)
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+        process = psutil.Process(os.getpid())
+        total = process.memory_info().rss
+        for child in process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+
+    async def _run(self):
+        while True:
+            self.peak_bytes = max(self.peak_bytes, self._current_rss())
+            await asyncio.sleep(self.interval_seconds)
+
+    def __enter__(self):
+        self.peak_bytes = self._current_rss()
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+        self.peak_bytes = max(self.peak_bytes, self._current_rss())
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """最近秩法分位数"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values) + 0.5)) - 1))
+    return sorted_values[index]
+
+
+def is_error_output(output: str) -> bool:
+    first_line = output.strip().splitlines()[0] if output and output.strip() else ""
+    return not first_line or any(marker in first_line for marker in ERROR_MARKERS)
+
+
+async def run_scenario(server, base_url: str, scenario: Scenario, concurrency: int, total_requests: int) -> ScenarioResult:
+    """以固定并发执行一个场景"""
+    latencies: List[float] = []
+    errors = 0
+    error_samples: List[str] = []
+    output_bytes = 0
+    next_index = 0
+
+    async def worker():
+        nonlocal errors, output_bytes, next_index
+        while next_index < total_requests:
+            index = next_index
+            next_index += 1
+            start = time.perf_counter()
+            try:
+                output = await scenario.make_call(server, base_url, index)
+            except Exception as e:
+                output = f"Error: {type(e).__name__}: {e}"
+            latencies.append(time.perf_counter() - start)
+            output_bytes += len(output.encode("utf-8"))
+            if is_error_output(output):
+                errors += 1
+                if len(error_samples) < 3:
+                    error_samples.append(output.strip()[:200])
+
+    with RssSampler() as sampler:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return ScenarioResult(
+        scenario=scenario.name,
+        tool=scenario.tool,
+        concurrency=concurrency,
+        requests=total_requests,
+        errors=errors,
+        elapsed_seconds=round(elapsed, 3),
+        throughput_rps=round(total_requests / elapsed, 2) if elapsed else 0.0,
+        p50_ms=round(percentile(latencies, 0.50) * 1000, 1),
+        p95_ms=round(percentile(latencies, 0.95) * 1000, 1),
+        p99_ms=round(percentile(latencies, 0.99) * 1000, 1),
+        mean_ms=round(statistics.fmean(latencies) * 1000, 1) if latencies else 0.0,
+        peak_rss_mb=round(sampler.peak_bytes / (1024 * 1024), 1),
+        output_bytes=output_bytes,
+        error_samples=error_samples
+    )
+
+
+def configure_server(server, args, scratch_dir: Path) -> Callable[[], None]:
+    """
+    基准测试期间的服务器设置: 默认关闭缓存和限速，避免测量到缓存命中或人为等待
+
+    结果缓存和语料库换成临时目录中的实例，固定页面不会写入用户的缓存、
+    语料库和全文索引。返回恢复原设置的函数。
+    """
+    from v9_core.corpus_store import CorpusStore
+    from v9_core.result_cache import ResultCache
+    from v9_core.search_index import BM25Index
+
+    original_result_cache = server.result_cache
+    original_corpus_store = server.corpus_store
+    original_polite = server.host_scheduler.enabled
+
+    server.result_cache = ResultCache(cache_dir=str(scratch_dir / "cache"), enabled=args.with_cache)
+    server.corpus_store = CorpusStore(corpus_dir=str(scratch_dir / "corpus"), index=BM25Index())
+    server.host_scheduler.enabled = args.polite
+    server.metrics.reset()
+
+    def restore():
+        server.result_cache = original_result_cache
+        server.corpus_store = original_corpus_store
+        server.host_scheduler.enabled = original_polite
+
+    return restore
+
+
+def print_results(results: List[ScenarioResult]):
+    header = f"{'scenario':<22}{'tool':<26}{'conc':>5}{'reqs':>6}{'err':>5}{'rps':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'RSS MB':>9}"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        print(
+            f"{result.scenario:<22}{result.tool:<26}{result.concurrency:>5}{result.requests:>6}{result.errors:>5}"
+            f"{result.throughput_rps:>9.2f}{result.p50_ms:>10.1f}{result.p95_ms:>10.1f}{result.p99_ms:>10.1f}"
+            f"{result.peak_rss_mb:>9.1f}"
+        )
+    for result in results:
+        for sample in result.error_samples:
+            print(f"⚠️ {result.scenario} (c={result.concurrency}): {sample.splitlines()[0]}")
+
+
+def compare_with_baseline(results: List[ScenarioResult], baseline_path: Path, max_regression: float) -> List[str]:
+    """与基线对比，返回超过阈值的回退项"""
+    baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+    baseline_index = {(item["scenario"], item["concurrency"]): item for item in baseline["results"]}
+    regressions = []
+    for result in results:
+        previous = baseline_index.get((result.scenario, result.concurrency))
+        if not previous:
+            continue
+        if previous["p95_ms"] and result.p95_ms > previous["p95_ms"] * (1 + max_regression):
+            regressions.append(
+                f"{result.scenario} c={result.concurrency}: p95 {previous['p95_ms']}ms -> {result.p95_ms}ms"
+            )
+        if previous["throughput_rps"] and result.throughput_rps < previous["throughput_rps"] * (1 - max_regression):
+            regressions.append(
+                f"{result.scenario} c={result.concurrency}: throughput {previous['throughput_rps']} -> {result.throughput_rps} rps"
+            )
+        if result.errors > previous["errors"]:
+            regressions.append(
+                f"{result.scenario} c={result.concurrency}: errors {previous['errors']} -> {result.errors}"
+            )
+    return regressions
+
+
+async def run(args) -> int:
+    scenarios = build_scenarios()
+    selected = args.scenarios.split(",") if args.scenarios else list(scenarios)
+    unknown = [name for name in selected if name not in scenarios]
+    if unknown:
+        print(f"❌ 未知场景: {', '.join(unknown)} (可用: {', '.join(scenarios)})")
+        return 2
+    concurrency_levels = [int(level) for level in args.concurrency.split(",")]
+
+    runner, base_url = await start_fixture_server(response_delay_ms=args.server_delay_ms)
+    print(f"🧪 固定页面服务器: {base_url}")
+
+    import server_v9 as server
+    scratch = tempfile.TemporaryDirectory(prefix="v9_benchmark_")
+    restore_server = configure_server(server, args, Path(scratch.name))
+
+    results: List[ScenarioResult] = []
+    try:
+        async with server.server_lifespan(server.mcp):
+            for name in selected:
+                scenario = scenarios[name]
+                # 预热一次，不计入结果
+                await scenario.make_call(server, base_url, 0)
+                for concurrency in concurrency_levels:
+                    print(f"⏱️ {name} ({scenario.description}) 并发={concurrency} 请求数={args.requests}")
+                    results.append(await run_scenario(server, base_url, scenario, concurrency, args.requests))
+            phase_stats = await server.performance_stats("text")
+    finally:
+        await runner.cleanup()
+        restore_server()
+        scratch.cleanup()
+
+    print()
+    print_results(results)
+    if args.show_phases:
+        print()
+        print(phase_stats)
+
+    if args.save:
+        payload = {
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "settings": {
+                "requests": args.requests,
+                "server_delay_ms": args.server_delay_ms,
+                "with_cache": args.with_cache,
+                "polite": args.polite
+            },
+            "results": [asdict(result) for result in results]
+        }
+        Path(args.save).write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+        print(f"💾 结果已保存: {args.save}")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, Path(args.baseline), args.max_regression)
+        if regressions:
+            print(f"\n❌ 发现 {len(regressions)} 项性能回退 (阈值 {args.max_regression:.0%}):")
+            for regression in regressions:
+                print(f"   - {regression}")
+            return 1
+        print(f"\n✅ 与基线相比无性能回退 (阈值 {args.max_regression:.0%})")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="V9 离线基准测试")
+    parser.add_argument("--scenarios", default="", help="逗号分隔的场景名 (默认全部)")
+    parser.add_argument("--concurrency", default="1,4,8", help="逗号分隔的并发级别")
+    parser.add_argument("--requests", type=int, default=20, help="每个场景和并发级别的请求数")
+    parser.add_argument("--server-delay-ms", type=int, default=0, help="固定页面服务器的响应延迟")
+    parser.add_argument("--with-cache", action="store_true", help="启用结果缓存")
+    parser.add_argument("--polite", action="store_true", help="启用按主机限速")
+    parser.add_argument("--show-phases", action="store_true", help="输出各阶段延迟统计")
+    parser.add_argument("--save", help="把结果保存为JSON (可作为基线)")
+    parser.add_argument("--baseline", help="与基线JSON对比")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="允许的最大回退比例")
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,10 +2,47 @@
 import random
 import time
 import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass
 from typing import Optional, List, Dict, Any
 from crawl4ai import *
 from crawl4ai.user_agent_generator import ValidUAGenerator, UserAgentGenerator
 
+@dataclass(frozen=True)
+class StealthFingerprint:
+    """一组相互一致的浏览器指纹 (UA、Client Hints、平台、视窗、请求头)"""
+    user_agent: str
+    client_hints: str
+    platform: str
+    viewport: tuple
+    headers: Dict[str, str]
+
+# 隐身浏览器的启动参数 (与指纹无关)
+STEALTH_LAUNCH_ARGS = [
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-gpu",
+    "--disable-web-security",
+    "--disable-features=VizDisplayCompositor",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-field-trial-config",
+    "--disable-back-forward-cache",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-sync",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-infobars",
+    "--disable-blink-features=AutomationControlled",
+    "--disable-automation",
+    "--exclude-switches=enable-automation",
+    "--disable-client-side-phishing-detection"
+]
+
 class EnhancedAntiDetection:
     """增强反爬虫检测功能"""
     
@@ -36,12 +73,23 @@ class EnhancedAntiDetection:
             
         return user_agent, client_hints
     
-    def get_stealth_headers(self, client_hints: str) -> Dict[str, str]:
+    @staticmethod
+    def get_platform_hint(user_agent: str) -> str:
+        """根据 User Agent 推断 sec-ch-ua-platform，保证请求头与 UA 一致"""
+        if "Windows" in user_agent:
+            return '"Windows"'
+        if "Macintosh" in user_agent or "Mac OS X" in user_agent:
+            return '"macOS"'
+        if "CrOS" in user_agent:
+            return '"Chrome OS"'
+        return '"Linux"'
+    
+    def get_stealth_headers(self, client_hints: str, platform: str = '"Linux"') -> Dict[str, str]:
         """生成隐身请求头"""
         return {
             "sec-ch-ua": client_hints,
             "sec-ch-ua-mobile": "?0",
-            "sec-ch-ua-platform": '"Linux"',
+            "sec-ch-ua-platform": platform,
             "sec-fetch-dest": "document",
             "sec-fetch-mode": "navigate",
             "sec-fetch-site": "none",
@@ -63,49 +111,149 @@ class EnhancedAntiDetection:
         ]
         return random.choice(common_resolutions)
     
-    def get_stealth_browser_config(self, randomize_viewport: bool = True) -> BrowserConfig:
-        """获取隐身浏览器配置"""
+    def generate_fingerprint(self, randomize_viewport: bool = True) -> StealthFingerprint:
+        """生成一组一致的指纹"""
         user_agent, client_hints = self.get_random_user_agent_with_hints()
-        headers = self.get_stealth_headers(client_hints)
+        platform = self.get_platform_hint(user_agent)
         
         if randomize_viewport:
-            viewport_width, viewport_height = self.get_random_viewport()
+            viewport = self.get_random_viewport()
         else:
-            viewport_width, viewport_height = 1920, 1080
-            
+            viewport = (1920, 1080)
+        
+        return StealthFingerprint(
+            user_agent=user_agent,
+            client_hints=client_hints,
+            platform=platform,
+            viewport=viewport,
+            headers=self.get_stealth_headers(client_hints, platform)
+        )
+    
+    def get_stealth_browser_config(self, randomize_viewport: bool = True) -> BrowserConfig:
+        """获取隐身浏览器配置"""
+        return self.build_browser_config(self.generate_fingerprint(randomize_viewport))
+    
+    @staticmethod
+    def build_browser_config(fingerprint: StealthFingerprint) -> BrowserConfig:
+        """根据指纹构建隐身浏览器配置"""
+        viewport_width, viewport_height = fingerprint.viewport
+        
         return BrowserConfig(
             headless=True,
-            user_agent=user_agent,
-            headers=headers,
+            user_agent=fingerprint.user_agent,
+            headers=dict(fingerprint.headers),
             viewport_width=viewport_width,
             viewport_height=viewport_height,
             java_script_enabled=True,
             ignore_https_errors=True,
-            extra_args=[
-                "--no-sandbox",
-                "--disable-dev-shm-usage",
-                "--disable-gpu",
-                "--disable-web-security",
-                "--disable-features=VizDisplayCompositor",
-                "--disable-background-timer-throttling",
-                "--disable-backgrounding-occluded-windows",
-                "--disable-renderer-backgrounding",
-                "--disable-field-trial-config",
-                "--disable-back-forward-cache",
-                "--disable-background-networking",
-                "--disable-default-apps",
-                "--disable-extensions",
-                "--disable-sync",
-                "--no-first-run",
-                "--no-default-browser-check",
-                "--disable-infobars",
-                "--disable-blink-features=AutomationControlled",
-                f"--window-size={viewport_width},{viewport_height}",
-                "--disable-automation",
-                "--exclude-switches=enable-automation",
-                "--disable-client-side-phishing-detection"
-            ]
+            extra_args=STEALTH_LAUNCH_ARGS + [f"--window-size={viewport_width},{viewport_height}"]
         )
+    
+    @staticmethod
+    def build_launch_config() -> BrowserConfig:
+        """
+        构建隐身浏览器的启动配置
+        
+        不含 UA、请求头与视窗: 常驻浏览器池中所有隐身请求共用这一启动形状，
+        指纹在每个页面上单独应用。
+        """
+        return BrowserConfig(
+            headless=True,
+            java_script_enabled=True,
+            ignore_https_errors=True,
+            extra_args=list(STEALTH_LAUNCH_ARGS)
+        )
+
+class FingerprintPool:
+    """
+    进程级指纹池
+    
+    在后台线程中预先生成指纹，请求时按顺序取出、每组只发放一次，
+    池内 UA 互不重复；剩余数量低于阈值时在后台补充，
+    UA 生成的开销不再落在 crawl_stealth / crawl_with_retry 的请求路径上。
+    
+    池中只保存指纹而不是 BrowserConfig: 所有隐身请求共用 launch_config 这一个
+    启动配置 (常驻浏览器按它分组)，指纹在每个页面上单独应用。
+    """
+    
+    def __init__(self, pool_size: int = 200, refill_threshold: int = 50, randomize_viewport: bool = True):
+        self.pool_size = max(1, pool_size)
+        self.refill_threshold = min(max(0, refill_threshold), self.pool_size - 1)
+        self.randomize_viewport = randomize_viewport
+        # 单个生成器贯穿进程生命周期，used_agents 去重记录才能跨请求生效
+        self.detector = EnhancedAntiDetection()
+        self.launch_config = get_stealth_launch_config()
+        self._ready = deque()
+        self._lock = threading.Lock()
+        self._fill_lock = threading.Lock()
+        self._refill_thread: Optional[threading.Thread] = None
+        self._stats = {"issued": 0, "misses": 0, "refills": 0, "generated": 0}
+    
+    def _generate(self) -> StealthFingerprint:
+        return self.detector.generate_fingerprint(self.randomize_viewport)
+    
+    def fill(self) -> int:
+        """同步补满指纹池，返回新生成的数量"""
+        with self._fill_lock:
+            return self._fill_locked()
+    
+    def _fill_locked(self) -> int:
+        with self._lock:
+            pooled_agents = {fingerprint.user_agent for fingerprint in self._ready}
+            missing = self.pool_size - len(self._ready)
+        
+        generated = []
+        attempts = 0
+        # UA 空间有限，去重失败时不无限重试
+        while len(generated) < missing and attempts < missing * 3:
+            attempts += 1
+            fingerprint = self._generate()
+            if fingerprint.user_agent in pooled_agents:
+                continue
+            pooled_agents.add(fingerprint.user_agent)
+            generated.append(fingerprint)
+        
+        with self._lock:
+            self._ready.extend(generated)
+            self._stats["generated"] += len(generated)
+            self._stats["refills"] += 1
+        return len(generated)
+    
+    async def warm_up(self) -> int:
+        """在线程中预热指纹池，不阻塞事件循环"""
+        return await asyncio.to_thread(self.fill)
+    
+    def _schedule_refill(self):
+        """剩余数量低于阈值时启动后台补充线程 (同一时间最多一个)"""
+        if self._refill_thread is not None and self._refill_thread.is_alive():
+            return
+        self._refill_thread = threading.Thread(target=self.fill, name="fingerprint-pool-refill", daemon=True)
+        self._refill_thread.start()
+    
+    def acquire(self) -> StealthFingerprint:
+        """取出下一组指纹"""
+        with self._lock:
+            entry = self._ready.popleft() if self._ready else None
+            remaining = len(self._ready)
+            self._stats["issued"] += 1
+            if entry is None:
+                self._stats["misses"] += 1
+        
+        if remaining <= self.refill_threshold:
+            self._schedule_refill()
+        if entry is None:
+            # 冷启动或补充尚未完成: 当场生成一组
+            entry = self._generate()
+        return entry
+    
+    def acquire_config(self) -> BrowserConfig:
+        """取出下一组指纹并构建独立的隐身浏览器配置 (供不使用浏览器池的调用方)"""
+        return self.detector.build_browser_config(self.acquire())
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取指纹池统计"""
+        with self._lock:
+            return {"ready": len(self._ready), "pool_size": self.pool_size, **self._stats}
 
 class GeolocationSpoofer:
     """地理位置伪装"""
@@ -157,10 +305,11 @@ class RetryManager:
                     delay = self.base_delay * (2 ** attempt) + random.uniform(0, 1)
                     await asyncio.sleep(delay)
         
-        # 返回失败结果
-        from crawl4ai.models import AsyncCrawlResponse
-        return AsyncCrawlResponse(
+        # 返回失败结果 (与 crawler.arun 的返回类型一致)
+        from crawl4ai.models import CrawlResult
+        return CrawlResult(
             url=url,
+            html="",
             success=False,
             error_message=f"Failed after {self.max_retries + 1} attempts. Last error: {last_error}"
         )
@@ -177,18 +326,44 @@ class ConcurrencyManager:
         async with self.semaphore:
             return await coro
 
+# 全局指纹池实例
+_fingerprint_pool = None
+# 所有隐身请求共用的启动配置
+_stealth_launch_config = None
+
+def get_stealth_launch_config() -> BrowserConfig:
+    """获取共享的隐身浏览器启动配置 (不含指纹，指纹按页面应用)"""
+    global _stealth_launch_config
+    if _stealth_launch_config is None:
+        _stealth_launch_config = EnhancedAntiDetection.build_launch_config()
+    return _stealth_launch_config
+
+def get_fingerprint_pool(pool_size: int = 200, refill_threshold: int = 50) -> FingerprintPool:
+    """获取全局指纹池 (参数只在首次创建时生效)"""
+    global _fingerprint_pool
+    if _fingerprint_pool is None:
+        _fingerprint_pool = FingerprintPool(pool_size=pool_size, refill_threshold=refill_threshold)
+    return _fingerprint_pool
+
 # 工厂函数
-def create_stealth_config() -> BrowserConfig:
+def create_stealth_config(use_pool: bool = True) -> BrowserConfig:
     """创建隐身配置"""
+    if use_pool:
+        return get_fingerprint_pool().acquire_config()
     detector = EnhancedAntiDetection()
     return detector.get_stealth_browser_config()
 
-def create_geo_spoofed_config(location: Optional[str] = None) -> tuple[BrowserConfig, GeolocationConfig]:
+def create_stealth_fingerprint(use_pool: bool = True) -> StealthFingerprint:
+    """创建隐身指纹 (配合 get_stealth_launch_config 在共享浏览器中按页面应用)"""
+    if use_pool:
+        return get_fingerprint_pool().acquire()
+    return EnhancedAntiDetection().generate_fingerprint()
+
+def create_geo_spoofed_config(location: Optional[str] = None, use_pool: bool = True) -> tuple[BrowserConfig, GeolocationConfig]:
     """创建地理位置伪装配置"""
-    detector = EnhancedAntiDetection()
     spoofer = GeolocationSpoofer()
     
-    browser_config = detector.get_stealth_browser_config()
+    browser_config = create_stealth_config(use_pool)
     geo_config = spoofer.get_random_location()
     
     return browser_config, geo_config
@@ -9,16 +9,25 @@ from pathlib import Path
 # ===== 工作目录修正 =====
 # 确保无论从哪个目录启动，都能正确找到项目资源文件
 SCRIPT_DIR = Path(__file__).parent.absolute()
-print(f"🔧 脚本目录: {SCRIPT_DIR}")
-print(f"🔧 当前工作目录: {Path.cwd()}")
+if str(SCRIPT_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPT_DIR))
+
+# 启动计时模块只依赖标准库，可以在虚拟环境激活之前导入
+from v9_core.startup import (
+    FAST_START, startup_log, startup_profiler,
+    LazyModule, LazyObject, preload_modules, warm_up_modules
+)
+
+startup_log(f"🔧 脚本目录: {SCRIPT_DIR}")
+startup_log(f"🔧 当前工作目录: {Path.cwd()}")
 
 # 如果当前工作目录不是脚本所在目录，则切换到脚本目录
 if Path.cwd() != SCRIPT_DIR:
-    print(f"🔄 切换工作目录: {Path.cwd()} -> {SCRIPT_DIR}")
+    startup_log(f"🔄 切换工作目录: {Path.cwd()} -> {SCRIPT_DIR}")
     os.chdir(SCRIPT_DIR)
-    print(f"✅ 工作目录已切换到: {Path.cwd()}")
+    startup_log(f"✅ 工作目录已切换到: {Path.cwd()}")
 else:
-    print(f"✅ 工作目录正确: {Path.cwd()}")
+    startup_log(f"✅ 工作目录正确: {Path.cwd()}")
 # ===== 工作目录修正结束 =====
 
 # ===== 自动激活虚拟环境功能 =====
@@ -32,10 +41,15 @@ def activate_virtual_environment():
     current_dir = Path(__file__).parent.absolute()
     venv_path = current_dir / ".venv"
     
-    print(f"🔍 检查虚拟环境: {venv_path}")
+    # 快速启动模式: 已经由虚拟环境的解释器启动时无需扫描 lib 目录
+    if FAST_START and Path(sys.prefix).resolve() == venv_path.resolve():
+        os.environ['VIRTUAL_ENV'] = str(venv_path)
+        return
+    
+    startup_log(f"🔍 检查虚拟环境: {venv_path}")
     
     if venv_path.exists():
-        print(f"✅ 找到虚拟环境目录: {venv_path}")
+        startup_log(f"✅ 找到虚拟环境目录: {venv_path}")
         
         # 动态检测所有可用的Python版本
         lib_path = venv_path / "lib"
@@ -43,7 +57,7 @@ def activate_virtual_environment():
         detected_version = None
         
         if lib_path.exists():
-            print(f"🔍 扫描lib目录: {lib_path}")
+            startup_log(f"🔍 扫描lib目录: {lib_path}")
             
             # 获取所有python*目录，自动支持未来版本
             python_dirs = []
@@ -53,16 +67,16 @@ def activate_virtual_environment():
             
             # 按版本号排序，优先使用最新版本
             python_dirs.sort(reverse=True)
-            print(f"🔍 发现Python版本: {python_dirs}")
+            startup_log(f"🔍 发现Python版本: {python_dirs}")
             
             # 查找第一个包含site-packages的版本
             for py_version in python_dirs:
                 potential_path = lib_path / py_version / "site-packages"
-                print(f"🔍 检查路径: {potential_path}")
+                startup_log(f"🔍 检查路径: {potential_path}")
                 if potential_path.exists():
                     site_packages_path = potential_path
                     detected_version = py_version
-                    print(f"✅ 找到可用的Python版本: {py_version}")
+                    startup_log(f"✅ 找到可用的Python版本: {py_version}")
                     break
         
         if site_packages_path:
@@ -70,12 +84,12 @@ def activate_virtual_environment():
             site_packages_str = str(site_packages_path)
             if site_packages_str not in sys.path:
                 sys.path.insert(0, site_packages_str)
-                print(f"✅ 虚拟环境已自动激活!")
-                print(f"📦 Python版本: {detected_version}")
-                print(f"📦 Site-packages路径: {site_packages_str}")
+                startup_log(f"✅ 虚拟环境已自动激活!")
+                startup_log(f"📦 Python版本: {detected_version}")
+                startup_log(f"📦 Site-packages路径: {site_packages_str}")
             else:
-                print(f"ℹ️  虚拟环境已在sys.path中")
-                print(f"📦 当前Python版本: {detected_version}")
+                startup_log(f"ℹ️  虚拟环境已在sys.path中")
+                startup_log(f"📦 当前Python版本: {detected_version}")
             
             # 设置虚拟环境相关的环境变量
             os.environ['VIRTUAL_ENV'] = str(venv_path)
@@ -86,51 +100,217 @@ def activate_virtual_environment():
                 current_path = os.environ.get('PATH', '')
                 if str(venv_bin) not in current_path:
                     os.environ['PATH'] = f"{venv_bin}:{current_path}"
-                    print(f"🔧 PATH已更新，优先使用虚拟环境的可执行文件")
+                    startup_log(f"🔧 PATH已更新，优先使用虚拟环境的可执行文件")
                 else:
-                    print(f"ℹ️  虚拟环境bin目录已在PATH中")
+                    startup_log(f"ℹ️  虚拟环境bin目录已在PATH中")
         else:
-            print(f"⚠️  虚拟环境存在但未找到site-packages目录")
+            startup_log(f"⚠️  虚拟环境存在但未找到site-packages目录")
             if lib_path.exists():
-                print(f"📁 lib目录内容:")
+                startup_log(f"📁 lib目录内容:")
                 for item in lib_path.iterdir():
-                    print(f"   - {item.name} ({'目录' if item.is_dir() else '文件'})")
+                    startup_log(f"   - {item.name} ({'目录' if item.is_dir() else '文件'})")
             else:
-                print(f"📁 lib目录不存在: {lib_path}")
+                startup_log(f"📁 lib目录不存在: {lib_path}")
     else:
-        print(f"⚠️  虚拟环境目录不存在: {venv_path}")
-        print("💡 提示: 请确保已创建虚拟环境 (.venv)")
-        print("💡 创建命令: uv sync 或 python -m venv .venv")
+        startup_log(f"⚠️  虚拟环境目录不存在: {venv_path}")
+        startup_log("💡 提示: 请确保已创建虚拟环境 (.venv)")
+        startup_log("💡 创建命令: uv sync 或 python -m venv .venv")
 
 # 在导入任何其他模块之前激活虚拟环境
-print("🚀 正在启动 Context Scraper MCP Server V9...")
-activate_virtual_environment()
+startup_log("🚀 正在启动 Context Scraper MCP Server V9...")
+with startup_profiler.phase("activate virtual environment"):
+    activate_virtual_environment()
 
 # ===== 导入依赖模块 =====
 
 import asyncio
 import json
 import time
-from typing import Optional, List, Dict, Any
-
-# V9 core components
-from v9_core.intent_analyzer import analyze_user_intent, UserIntent, SearchEngineIntent, IntentType
-from v9_core.crawl_config_manager import get_crawl_config, reload_crawl_config
-
-# Crawl4AI components
-from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig, CacheMode
-from mcp.server.fastmcp import Context, FastMCP
+from contextlib import aclosing, asynccontextmanager
+from typing import Optional, List, Dict, Any, TYPE_CHECKING
+
+with startup_profiler.phase("import core modules"):
+    # V9 core components (轻量模块，注册工具所需)
+    from v9_core.crawl_config_manager import reload_crawl_config
+    from v9_core.config_store import get_config_store, get_live_config, with_config_snapshot
+    from v9_core.result_cache import get_result_cache
+    from v9_core.corpus_store import get_corpus_store
+    from v9_core.host_scheduler import get_host_scheduler
+    from v9_core.metrics import get_metrics, instrument_tool, start_prometheus_server
+    from v9_core.keyword_matcher import KeywordMatcher
+    from v9_core import dedup, result_formatter, serp_parsers
+    from v9_core.render_wait import capture_render_wait, describe_render_wait, get_render_wait_engine
+    from v9_core.resource_blocking import get_resource_blocker
+    from v9_core.progress import cancellable, get_cancellation_stats, report_stage, report_step, start_progress
+    from mcp.server.fastmcp import Context, FastMCP
+
+if TYPE_CHECKING:
+    from crawl4ai import BrowserConfig, CrawlerRunConfig
+
+# 重量级模块延迟导入: 快速启动模式下由后台预热任务或首次使用时加载
+crawl4ai = LazyModule("crawl4ai")
+intent_analyzer_module = LazyModule("v9_core.intent_analyzer")
+browser_pool_module = LazyModule("v9_core.browser_pool")
+batch_dispatcher_module = LazyModule("v9_core.batch_dispatcher")
+http_fetcher_module = LazyModule("v9_core.http_fetcher")
+retry_engine_module = LazyModule("v9_core.retry_engine")
+config_factory_module = LazyModule("v9_core.config_factory")
+anti_detection_module = LazyModule("anti_detection")
+
+HEAVY_MODULES = [
+    crawl4ai,
+    config_factory_module,
+    browser_pool_module,
+    http_fetcher_module,
+    retry_engine_module,
+    batch_dispatcher_module,
+    intent_analyzer_module,
+    anti_detection_module,
+]
+
+# 反检测模块位于 legacy/servers
+if 'legacy/servers' not in sys.path:
+    sys.path.append('legacy/servers')
 
 # 初始化配置管理器
-config = get_crawl_config()
-print(f"⚙️  配置管理器已初始化")
+# config 始终指向配置存储的当前快照，外部修改配置文件后自动生效
+with startup_profiler.phase("load crawl config"):
+    config_store = get_config_store()
+    config = get_live_config()
+startup_log(f"⚙️  配置管理器已初始化")
+
+# 共享浏览器池和HTTP快速通道在第一次使用时创建，结果缓存不依赖重量级模块
+browser_pool = LazyObject(lambda: browser_pool_module.get_browser_pool())
+http_fetcher = LazyObject(lambda: http_fetcher_module.get_http_fetcher())
+result_cache = get_result_cache()
+corpus_store = get_corpus_store()
+host_scheduler = get_host_scheduler()
+metrics = get_metrics()
+
+if not FAST_START:
+    # 标准启动模式: 启动时同步导入所有重量级模块
+    with startup_profiler.phase("import heavy modules"):
+        preload_modules(HEAVY_MODULES)
+
+async def warm_up_server():
+    """导入重量级模块并预热浏览器池"""
+    await warm_up_modules(HEAVY_MODULES)
+    
+    prewarm_configs = []
+    if config.browser_pool.prewarm_on_startup:
+        prewarm_configs.append(get_default_browser_config())
+    
+    with startup_profiler.phase("prewarm browser pool", background=FAST_START):
+        await browser_pool.start(prewarm_configs)
+    
+    # 预先构建当前配置快照下各工具的 BrowserConfig / CrawlerRunConfig
+    with startup_profiler.phase("build crawler configs", background=FAST_START):
+        await asyncio.to_thread(config_factory_module.get_config_factory().prebuild)
+    
+    fingerprints = config.stealth_fingerprints
+    if fingerprints.pool_enabled and fingerprints.prewarm_on_startup:
+        with startup_profiler.phase("prewarm fingerprint pool", background=True):
+            try:
+                await get_fingerprint_pool().warm_up()
+            except ImportError as e:
+                print(f"⚠️ 指纹池预热跳过: {e}", file=sys.stderr)
+
+@asynccontextmanager
+async def server_lifespan(server: FastMCP):
+    """服务器生命周期: 启动时预热浏览器池并监视配置文件，退出时关闭所有浏览器并保存配置"""
+    warm_up_task = None
+    if FAST_START:
+        # 快速启动模式: 立即响应握手，预热在后台进行
+        warm_up_task = asyncio.create_task(warm_up_server())
+    else:
+        await warm_up_server()
+    
+    prometheus_runner = None
+    if config.metrics.prometheus_enabled:
+        try:
+            prometheus_runner = await start_prometheus_server(
+                metrics, config.metrics.prometheus_host, config.metrics.prometheus_port
+            )
+            startup_log(f"📊 Prometheus指标端点: http://{config.metrics.prometheus_host}:{config.metrics.prometheus_port}/metrics")
+        except Exception as e:
+            print(f"⚠️ Prometheus指标端点启动失败: {e}", file=sys.stderr)
+    
+    await config_store.start()
+    
+    # 语料库全文索引在后台构建，不阻塞握手
+    index_task = asyncio.create_task(corpus_store.build_index())
+    
+    startup_profiler.mark_ready()
+    try:
+        yield
+    finally:
+        await config_store.stop()
+        if warm_up_task is not None and not warm_up_task.done():
+            warm_up_task.cancel()
+            await asyncio.gather(warm_up_task, return_exceptions=True)
+        if prometheus_runner is not None:
+            await prometheus_runner.cleanup()
+        if http_fetcher_module.is_loaded:
+            await http_fetcher.close()
+        if browser_pool_module.is_loaded:
+            await browser_pool.shutdown()
+        await corpus_store.close()
+        await asyncio.gather(index_task, return_exceptions=True)
+
+# ===== smart_search_guide 关键词 (导入时编译为一个自动机) =====
+
+# Technical keywords (expanded)
+SEARCH_GUIDE_TECHNICAL_KEYWORDS = [
+    'api', 'code', 'programming', 'github', 'stackoverflow', 'python', 'javascript', 'java', 'react', 'vue',
+    'docker', 'kubernetes', 'aws', 'cloud', 'database', 'sql', 'nosql', 'mongodb', 'redis', 'nginx',
+    'linux', 'ubuntu', 'centos', 'bash', 'shell', 'git', 'devops', 'ci/cd', 'jenkins', 'terraform',
+    'machine learning', 'ai', 'deep learning', 'tensorflow', 'pytorch', 'data science', 'algorithm',
+    'framework', 'library', 'sdk', 'compiler', 'debugger', 'ide', 'vscode', 'intellij',
+    '编程', '代码', '开发', '技术', '算法', '数据库', '服务器', '云计算', '人工智能', '机器学习'
+]
+
+# Academic keywords (expanded)
+SEARCH_GUIDE_ACADEMIC_KEYWORDS = [
+    'research', 'paper', 'study', 'journal', 'publication', 'thesis', 'dissertation', 'conference',
+    'academic', 'scholar', 'university', 'college', 'professor', 'phd', 'master', 'bachelor',
+    'citation', 'bibliography', 'peer review', 'methodology', 'analysis', 'experiment', 'survey',
+    'arxiv', 'pubmed', 'ieee', 'acm', 'springer', 'elsevier', 'nature', 'science',
+    '研究', '论文', '学术', '期刊', '会议', '大学', '学者', '博士', '硕士', '实验', '调研'
+]
+
+# News keywords (expanded)
+SEARCH_GUIDE_NEWS_KEYWORDS = [
+    'news', 'latest', 'breaking', 'update', 'report', 'announcement', 'press release', 'headline',
+    'current', 'today', 'yesterday', 'recent', 'happening', 'event', 'incident', 'story',
+    '新闻', '最新', '今日', '昨日', '最近', '事件', '报道', '消息', '头条', '快讯'
+]
+
+# Privacy keywords (expanded)
+SEARCH_GUIDE_PRIVACY_KEYWORDS = [
+    'privacy', 'anonymous', 'private', 'secure', 'confidential', 'hidden', 'secret', 'vpn',
+    'tor', 'encryption', 'security', 'protect', 'safe', 'incognito', 'stealth',
+    '隐私', '匿名', '私密', '安全', '保护', '加密', '秘密', '隐身'
+]
+
+search_guide_matcher = KeywordMatcher({
+    "technical": SEARCH_GUIDE_TECHNICAL_KEYWORDS,
+    "academic": SEARCH_GUIDE_ACADEMIC_KEYWORDS,
+    "news": SEARCH_GUIDE_NEWS_KEYWORDS,
+    "privacy": SEARCH_GUIDE_PRIVACY_KEYWORDS,
+})
 
 # Create MCP server
-mcp = FastMCP("ContextScraperV9")
+mcp = FastMCP("ContextScraperV9", lifespan=server_lifespan)
 
 # ===== 配置管理工具 =====
 
+def _updated_values(section, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """返回更新后的字段取值 (已按字段类型转换)"""
+    return {key: getattr(section, key) for key in kwargs}
+
 @mcp.tool()
+@instrument_tool("configure_crawl_settings")
+@with_config_snapshot
 async def configure_crawl_settings(
     action: str = "show",
     setting_type: str = "all",
@@ -141,7 +321,7 @@ async def configure_crawl_settings(
     
     Args:
         action: 操作类型 (show/update/reset)
-        setting_type: 设置类型 (content_limits/quality_control/timing_control/user_preferences/all)
+        setting_type: 设置类型 (content_limits/quality_control/timing_control/render_wait/resource_blocking/concurrency/dedup/politeness/user_preferences/all)
         **kwargs: 具体的配置参数
         
     Returns:
@@ -151,6 +331,10 @@ async def configure_crawl_settings(
         - 查看当前配置: configure_crawl_settings("show", "all")
         - 更新内容限制: configure_crawl_settings("update", "content_limits", markdown_display_limit=5000)
         - 更新用户偏好: configure_crawl_settings("update", "user_preferences", show_word_count=False)
+        - 更新深度爬取并发: configure_crawl_settings("update", "concurrency", deep_crawl_concurrency=5)
+        - 按域名设置资源拦截: configure_crawl_settings("update", "resource_blocking", domain_profiles={"example.com": "full"})
+        - 放宽近似重复判定: configure_crawl_settings("update", "dedup", min_jaccard=0.7)
+        - 按域名限速: configure_crawl_settings("update", "politeness", domain_requests_per_second={"arxiv.org": 0.5})
     """
     
     try:
@@ -173,6 +357,53 @@ async def configure_crawl_settings(
 - 页面超时: {config.timing_control.page_timeout_ms}ms
 - 隐身延迟: {config.timing_control.stealth_delay_seconds}s
 - 动态内容延迟: {config.timing_control.dynamic_content_delay_seconds}s"""
+            elif setting_type == "render_wait":
+                wait_stats = get_render_wait_engine().get_stats()
+                return f"""⏳ 自适应渲染等待配置:
+- 启用: {config.render_wait.enabled} (启用后替代隐身/动态内容的固定延迟)
+- 安静窗口: {config.render_wait.quiet_window_ms}ms, 轮询间隔: {config.render_wait.poll_interval_ms}ms
+- 最长等待: {config.render_wait.max_wait_ms}ms
+- 最少正文词数: {config.render_wait.min_content_words}
+- 按域名学习: {config.render_wait.learn_per_domain} (样本数 {config.render_wait.learning_min_samples}, 平滑系数 {config.render_wait.learning_alpha})
+- 已学习域名: {wait_stats['domains_learned']}, 平均等待: {wait_stats['avg_wait_ms']:.0f}ms"""
+            elif setting_type == "resource_blocking":
+                blocking_stats = get_resource_blocker().get_stats()
+                return f"""🚫 资源拦截配置:
+- 启用: {config.resource_blocking.enabled}
+- 默认配置: {config.resource_blocking.default_profile} (text_only: 仅文本, text_css: 文本+样式, full: 不拦截)
+- 工具配置: {json.dumps(config.resource_blocking.tool_profiles, ensure_ascii=False)}
+- 域名配置: {json.dumps(config.resource_blocking.domain_profiles, ensure_ascii=False)}
+- 跟踪器域名: {', '.join(config.resource_blocking.blocked_domains)}
+- 已拦截: {blocking_stats['blocked_requests']} 个请求 (跟踪器 {blocking_stats['tracker_requests']} 个), 约 {blocking_stats['estimated_mb_saved']}MB
+- 按类型: {json.dumps(blocking_stats['blocked_by_type'], ensure_ascii=False)}"""
+            elif setting_type == "concurrency":
+                return f"""🚦 并发控制配置:
+- 深度爬取并发数: {config.concurrency.deep_crawl_concurrency}
+- 单链接超时: {config.concurrency.per_link_timeout_seconds}s
+- 深度爬取总时限: {config.concurrency.deep_crawl_deadline_seconds}s
+- 批量爬取并发数: {config.concurrency.batch_concurrency}
+- 单主机并发数: {config.concurrency.per_host_concurrency}
+- 批量URL上限: {config.concurrency.max_batch_urls}"""
+            elif setting_type == "dedup":
+                dedup_stats = dedup.get_dedup_stats()
+                return f"""🔁 重复页面检测配置:
+- 启用: {config.dedup.enabled}
+- 去掉跟踪参数: {config.dedup.strip_tracking_params} ({', '.join(config.dedup.tracking_params)})
+- AMP/移动版映射: {config.dedup.map_mobile_variants}
+- rel=canonical: {config.dedup.use_rel_canonical}
+- 内容指纹: {config.dedup.content_fingerprint} (SimHash 距离 ≤ {config.dedup.simhash_max_distance} 且 MinHash 相似度 ≥ {config.dedup.min_jaccard}, 至少 {config.dedup.min_fingerprint_words} 词)
+- 深度爬取补位候选链接: {config.dedup.refill_candidates}
+- 已合并: URL {dedup_stats['url_duplicates']}, canonical {dedup_stats['canonical_duplicates']}, 内容 {dedup_stats['content_duplicates']}; 补位 {dedup_stats['refilled']} 次"""
+            elif setting_type == "politeness":
+                scheduler_stats = host_scheduler.get_stats()
+                return f"""🐢 访问礼貌配置:
+- 启用: {config.politeness.enabled}
+- 默认速率: {config.politeness.default_requests_per_second} 请求/秒 (突发 {config.politeness.default_burst})
+- 单主机并发数: {config.politeness.max_concurrency_per_host}
+- 域名速率: {config.politeness.domain_requests_per_second}
+- 遵守robots.txt Crawl-delay: {config.politeness.respect_robots_crawl_delay} (上限 {config.politeness.max_crawl_delay_seconds}s)
+- 429/503减速因子: {config.politeness.slowdown_factor}, 恢复步长: {config.politeness.recovery_step}
+- 当前主机状态: {json.dumps(scheduler_stats['per_host'], ensure_ascii=False)}"""
             elif setting_type == "user_preferences":
                 return f"""👤 用户偏好设置:
 - 详细日志: {config.user_preferences.show_detailed_logs}
@@ -182,20 +413,35 @@ async def configure_crawl_settings(
         
         elif action == "update":
             if setting_type == "content_limits":
-                config.update_content_limits(**kwargs)
-                return f"✅ 内容限制配置已更新: {kwargs}"
+                updated = config.update_content_limits(**kwargs)
+                return f"✅ 内容限制配置已更新: {_updated_values(updated.content_limits, kwargs)}"
             elif setting_type == "quality_control":
-                config.update_quality_control(**kwargs)
-                return f"✅ 质量控制配置已更新: {kwargs}"
+                updated = config.update_quality_control(**kwargs)
+                return f"✅ 质量控制配置已更新: {_updated_values(updated.quality_control, kwargs)}"
             elif setting_type == "timing_control":
-                config.update_timing_control(**kwargs)
-                return f"✅ 时间控制配置已更新: {kwargs}"
+                updated = config.update_timing_control(**kwargs)
+                return f"✅ 时间控制配置已更新: {_updated_values(updated.timing_control, kwargs)}"
+            elif setting_type == "render_wait":
+                updated = config.update_render_wait(**kwargs)
+                return f"✅ 自适应渲染等待配置已更新: {_updated_values(updated.render_wait, kwargs)}"
+            elif setting_type == "resource_blocking":
+                updated = config.update_resource_blocking(**kwargs)
+                return f"✅ 资源拦截配置已更新: {_updated_values(updated.resource_blocking, kwargs)}"
+            elif setting_type == "concurrency":
+                updated = config.update_concurrency(**kwargs)
+                return f"✅ 并发控制配置已更新: {_updated_values(updated.concurrency, kwargs)}"
+            elif setting_type == "dedup":
+                updated = config.update_dedup(**kwargs)
+                return f"✅ 重复页面检测配置已更新: {_updated_values(updated.dedup, kwargs)}"
+            elif setting_type == "politeness":
+                updated = config.update_politeness(**kwargs)
+                return f"✅ 访问礼貌配置已更新: {_updated_values(updated.politeness, kwargs)}"
             elif setting_type == "user_preferences":
-                config.update_user_preferences(**kwargs)
-                return f"✅ 用户偏好设置已更新: {kwargs}"
+                updated = config.update_user_preferences(**kwargs)
+                return f"✅ 用户偏好设置已更新: {_updated_values(updated.user_preferences, kwargs)}"
         
         elif action == "reset":
-            config = reload_crawl_config()
+            reload_crawl_config()
             return "✅ 配置已重置为默认值"
         
         return f"❌ 不支持的操作: action={action}, setting_type={setting_type}"
@@ -204,6 +450,8 @@ async def configure_crawl_settings(
         return f"❌ 配置操作失败: {str(e)}"
 
 @mcp.tool()
+@instrument_tool("quick_config_content_limit")
+@with_config_snapshot
 async def quick_config_content_limit(limit: int = 3000) -> str:
     """
     快速设置内容显示限制
@@ -226,6 +474,8 @@ async def quick_config_content_limit(limit: int = 3000) -> str:
         return f"❌ 设置失败: {str(e)}"
 
 @mcp.tool()
+@instrument_tool("quick_config_word_threshold")
+@with_config_snapshot
 async def quick_config_word_threshold(threshold: int = 50) -> str:
     """
     快速设置词数阈值
@@ -262,82 +512,82 @@ def format_crawl_result(result, url: str, tool_name: str, extra_info: Dict[str,
     Returns:
         格式化的结果字符串
     """
+    with metrics.phase("formatting"):
+        return _format_crawl_result(result, url, tool_name, extra_info)
+
+def _format_crawl_result(result, url: str, tool_name: str, extra_info: Dict[str, Any] = None) -> str:
     global config
     
-    if not result.success:
-        return f"{tool_name} 失败\n\nURL: {url}\nError: {result.error_message}"
-    
-    # 基础信息
-    response = f"{tool_name} 成功\n\nURL: {url}\n"
-    
-    # 标题信息
-    title = result.metadata.get('title', 'Unknown')
-    response += f"Title: {title}\n"
+    # 基础爬取可配置为显示完整内容，其他工具使用配置的限制
+    if config.content_limits.basic_crawl_unlimited and tool_name == "Basic Crawl":
+        display_limit = None
+    else:
+        display_limit = config.content_limits.markdown_display_limit
     
-    # 词数统计（根据用户偏好）
-    if config.user_preferences.show_word_count:
-        word_count = len(result.markdown.split()) if result.markdown else 0
-        response += f"Word Count: {word_count}\n"
+    return result_formatter.format_crawl_result(
+        result, url, tool_name, extra_info,
+        show_word_count=config.user_preferences.show_word_count,
+        display_limit=display_limit
+    )
+
+async def save_result(url: str, run_config, result, tool: str):
+    """保存爬取结果: 写入结果缓存，并追加到持久语料库"""
+    await result_cache.put(url, run_config, result)
+    await corpus_store.put(url, result, tool)
+
+def describe_cache_hit(cached_result) -> str:
+    """生成缓存命中的说明信息"""
+    return f"HIT (缓存于 {cached_result.age_seconds:.0f}s 前)"
+
+def get_fingerprint_pool():
+    """获取全局隐身指纹池 (按配置创建)"""
+    global config
     
-    # 额外信息
-    if extra_info:
-        for key, value in extra_info.items():
-            response += f"{key}: {value}\n"
+    return anti_detection_module.get_fingerprint_pool(
+        pool_size=config.stealth_fingerprints.pool_size,
+        refill_threshold=config.stealth_fingerprints.refill_threshold
+    )
+
+def next_stealth_fingerprint():
+    """取出下一组隐身指纹: 启用指纹池时从池中取出预生成的指纹"""
+    global config
     
-    # 内容显示
-    if result.markdown:
-        if config.content_limits.basic_crawl_unlimited and tool_name == "Basic Crawl":
-            # 基础爬取显示完整内容
-            response += f"\nContent:\n\n{result.markdown}"
-        else:
-            # 其他工具使用配置的限制
-            limit = config.content_limits.markdown_display_limit
-            if len(result.markdown) > limit:
-                response += f"\nContent (前{limit}字符):\n\n{result.markdown[:limit]}..."
-            else:
-                response += f"\nContent:\n\n{result.markdown}"
-    else:
-        response += "\nContent: 无内容"
+    if config.stealth_fingerprints.pool_enabled:
+        return get_fingerprint_pool().acquire()
+    return anti_detection_module.create_stealth_fingerprint(use_pool=False)
+
+def get_stealth_browser_config() -> "BrowserConfig":
+    """获取隐身浏览器的共享启动配置 (不含指纹，所有隐身请求共用同一个常驻浏览器)"""
+    return anti_detection_module.get_stealth_launch_config()
+
+def acquire_stealth_browser(fingerprint=None):
+    """借出隐身浏览器: 共用启动配置，本次借用的每个页面应用一组轮换的指纹"""
+    fingerprint = fingerprint or next_stealth_fingerprint()
+    identity = browser_pool_module.PageIdentity.from_fingerprint(fingerprint)
+    return browser_pool.acquire(get_stealth_browser_config(), identity=identity)
+
+def get_default_browser_config() -> "BrowserConfig":
+    """
+    获取默认浏览器配置
     
-    return response
+    Returns:
+        基础爬取使用的BrowserConfig对象 (与浏览器池预热的配置一致，按配置快照缓存)
+    """
+    return config_factory_module.get_config_factory().browser_config("default")
 
-def get_crawler_config(tool_type: str = "default") -> CrawlerRunConfig:
+def get_crawler_config(tool_type: str = "default", dynamic_content: Optional[bool] = None, **overrides) -> "CrawlerRunConfig":
     """
     根据工具类型获取爬取配置
     
     Args:
         tool_type: 工具类型 (default/stealth/geolocation/retry/intelligence)
+        dynamic_content: 意图分析得到的动态内容标志 (intelligence 模式)
+        **overrides: 额外的 CrawlerRunConfig 参数 (如 stream=True)
         
     Returns:
-        配置好的CrawlerRunConfig对象
+        配置好的CrawlerRunConfig对象 (每份配置快照只构建一次，返回其浅拷贝)
     """
-    global config
-    
-    # 基础配置
-    cache_mode = CacheMode.BYPASS if config.cache_control.default_cache_mode == "BYPASS" else CacheMode.ENABLED
-    
-    base_config = {
-        "cache_mode": cache_mode,
-        "word_count_threshold": config.quality_control.word_count_threshold,
-    }
-    
-    # 根据工具类型添加特定配置
-    if tool_type == "default":
-        base_config.update({
-            "page_timeout": config.timing_control.page_timeout_ms,
-            "wait_until": config.browser_control.default_wait_until
-        })
-    elif tool_type == "stealth":
-        base_config.update({
-            "delay_before_return_html": config.timing_control.stealth_delay_seconds
-        })
-    elif tool_type == "intelligence":
-        # 智能模式根据内容类型动态设置延迟
-        base_config.update({
-            "delay_before_return_html": config.timing_control.dynamic_content_delay_seconds
-        })
-    
-    return CrawlerRunConfig(**base_config)
+    return config_factory_module.get_config_factory().crawler_config(tool_type, dynamic_content, **overrides)
 
 # ===== V6 Core Features =====
 
@@ -365,43 +615,11 @@ def smart_search_guide(search_query: str = "What do you want to search?") -> str
     # Detect language and content type
     has_chinese = any('\u4e00' <= char <= '\u9fff' for char in search_query)
     
-    # Technical keywords (expanded)
-    technical_keywords = [
-        'api', 'code', 'programming', 'github', 'stackoverflow', 'python', 'javascript', 'java', 'react', 'vue',
-        'docker', 'kubernetes', 'aws', 'cloud', 'database', 'sql', 'nosql', 'mongodb', 'redis', 'nginx',
-        'linux', 'ubuntu', 'centos', 'bash', 'shell', 'git', 'devops', 'ci/cd', 'jenkins', 'terraform',
-        'machine learning', 'ai', 'deep learning', 'tensorflow', 'pytorch', 'data science', 'algorithm',
-        'framework', 'library', 'sdk', 'compiler', 'debugger', 'ide', 'vscode', 'intellij',
-        '编程', '代码', '开发', '技术', '算法', '数据库', '服务器', '云计算', '人工智能', '机器学习'
-    ]
-    
-    # Academic keywords (expanded)
-    academic_keywords = [
-        'research', 'paper', 'study', 'journal', 'publication', 'thesis', 'dissertation', 'conference',
-        'academic', 'scholar', 'university', 'college', 'professor', 'phd', 'master', 'bachelor',
-        'citation', 'bibliography', 'peer review', 'methodology', 'analysis', 'experiment', 'survey',
-        'arxiv', 'pubmed', 'ieee', 'acm', 'springer', 'elsevier', 'nature', 'science',
-        '研究', '论文', '学术', '期刊', '会议', '大学', '学者', '博士', '硕士', '实验', '调研'
-    ]
-    
-    # News keywords (expanded)
-    news_keywords = [
-        'news', 'latest', 'breaking', 'update', 'report', 'announcement', 'press release', 'headline',
-        'current', 'today', 'yesterday', 'recent', 'happening', 'event', 'incident', 'story',
-        '新闻', '最新', '今日', '昨日', '最近', '事件', '报道', '消息', '头条', '快讯'
-    ]
-    
-    # Privacy keywords (expanded)
-    privacy_keywords = [
-        'privacy', 'anonymous', 'private', 'secure', 'confidential', 'hidden', 'secret', 'vpn',
-        'tor', 'encryption', 'security', 'protect', 'safe', 'incognito', 'stealth',
-        '隐私', '匿名', '私密', '安全', '保护', '加密', '秘密', '隐身'
-    ]
-    
-    is_technical = any(keyword in query_lower for keyword in technical_keywords)
-    is_academic = any(keyword in query_lower for keyword in academic_keywords)
-    is_news = any(keyword in query_lower for keyword in news_keywords)
-    is_sensitive = any(keyword in query_lower for keyword in privacy_keywords)
+    matched_categories = search_guide_matcher.categories(query_lower)
+    is_technical = "technical" in matched_categories
+    is_academic = "academic" in matched_categories
+    is_news = "news" in matched_categories
+    is_sensitive = "privacy" in matched_categories
     
     # Smart recommendation with priority logic
     if is_academic:
@@ -450,6 +668,21 @@ def smart_search_guide(search_query: str = "What do you want to search?") -> str
     global config
     content_limit = config.content_limits.markdown_display_limit
     
+    # 本地全文索引中已有的相关页面 (索引构建完成后才查询，不阻塞提示生成)
+    local_section = ""
+    if corpus_store.index is not None and corpus_store.index.ready:
+        local_hits = corpus_store.index.search(search_query, 3)
+        if local_hits:
+            hit_lines = "\n".join(f"- [{document.title or document.url}]({document.url})" for _, document in local_hits)
+            local_section = f"""## 📚 Already Fetched Locally (No Network Needed)
+{hit_lines}
+
+```
+local_search("{search_query}")
+```
+
+"""
+    
     return f"""# 🔍 AI Smart Search Assistant (V9 学术增强版)
 
 ## 📊 Search Analysis
@@ -459,7 +692,7 @@ def smart_search_guide(search_query: str = "What do you want to search?") -> str
 **Confidence**: {'High' if len([f for f in [is_technical, is_academic, is_news, is_sensitive] if f]) > 0 else 'Medium'}
 **Current Content Limit**: {content_limit} 字符
 
-## 🎯 AI Recommended Solution (Use First)
+{local_section}## 🎯 AI Recommended Solution (Use First)
 
 ### ⭐ Recommended: {primary_recommendation}
 **Analysis**: {primary_reason}
@@ -499,6 +732,8 @@ def smart_search_guide(search_query: str = "What do you want to search?") -> str
 ```
 搜索需求分析
     ↓
+之前爬取过? → Yes → local_search() / corpus_get() ✅
+    ↓ No
 学术研究? → Yes → academic_search() ✅
     ↓ No
 需要深度内容? → Yes → crawl_with_intelligence(url, "deep", 5) ✅
@@ -568,62 +803,184 @@ def _is_search_page(url: str) -> bool:
     ]
     return any(indicator in url.lower() for indicator in search_indicators)
 
-def _extract_search_result_links(markdown_content: str, deep_crawl_count: int) -> List[str]:
-    """从搜索结果页面提取链接"""
-    import re
+def _extract_search_result_links(result, url: str, deep_crawl_count: int) -> List[str]:
+    """
+    从搜索结果页提取结果链接
     
-    # 提取markdown中的链接
-    link_pattern = r'\[([^\]]+)\]\(([^)]+)\)'
-    matches = re.findall(link_pattern, markdown_content)
+    优先用对应搜索引擎的解析器直接解析HTML (跳过广告、还原跳转链接)；
+    缓存结果没有HTML或搜索引擎不受支持时，回退到从Markdown中提取。
+    """
+    records = serp_parsers.parse_serp(url, getattr(result, "html", None))
+    if records:
+        return serp_parsers.result_links(records, deep_crawl_count)
+    return serp_parsers.extract_markdown_links(result.markdown, deep_crawl_count)
+
+async def _crawl_search_results(crawler, links: List[str], crawl_config, target: Optional[int] = None) -> str:
+    """
+    并发爬取搜索结果链接的内容
     
-    # 过滤掉搜索引擎自身的链接和无效链接
-    filtered_links = []
-    exclude_patterns = [
-        'google.com', 'baidu.com', 'bing.com', 'duckduckgo.com',
-        'javascript:', 'mailto:', '#', 'webcache', 'translate.google'
-    ]
+    并发数、单链接超时和全局时限来自配置的 concurrency 部分；
+    结果按原始排名顺序返回，超过全局时限时返回已完成的部分结果。
     
-    for title, link in matches:
-        # 跳过排除的链接模式
-        if any(pattern in link.lower() for pattern in exclude_patterns):
-            continue
-            
-        # 确保是有效的HTTP链接
-        if link.startswith(('http://', 'https://')):
-            filtered_links.append(link)
-            
-        if len(filtered_links) >= deep_crawl_count:
-            break
+    启用去重 (dedup) 时，爬取前跳过同一页面的其他URL形式 (跟踪参数、AMP/移动版)，
+    爬取后把 rel=canonical 相同或内容近似重复的页面合并到先保留的结果下，
+    空出的名额由后续排名的链接补上，直到得到 target 个结果或链接用完。
     
-    return filtered_links
-
-async def _crawl_search_results(crawler, links: List[str], crawl_config) -> str:
-    """爬取搜索结果链接的内容"""
-    results = []
+    Args:
+        crawler: 爬虫实例
+        links: 按排名排列的候选链接 (可以多于 target，多出的用于补位)
+        crawl_config: 爬取配置
+        target: 需要的结果数，默认爬取全部链接
+    """
+    global config
+    
+    concurrency = config.concurrency
+    semaphore = asyncio.Semaphore(max(1, concurrency.deep_crawl_concurrency))
+    tracker = dedup.DuplicateTracker(config.dedup) if config.dedup.enabled else None
+    target = max(1, min(target or len(links), len(links))) if links else 0
     
+    # 爬取前: 规范化URL，同一页面的其他URL形式只爬一次 (获取失败时改用其他形式)
+    candidates = []
+    alternates: Dict[int, List[tuple]] = {}
+    collapsed: Dict[int, List[str]] = {}
     for i, link in enumerate(links, 1):
-        try:
-            print(f"🔍 正在爬取第{i}个搜索结果: {link}")
-            
-            result = await crawler.arun(url=link, config=crawl_config)
-            
-            if result.success and result.markdown:
-                # 限制每个结果的长度，避免内容过长
-                content = result.markdown[:2000] if len(result.markdown) > 2000 else result.markdown
-                title = result.metadata.get('title', f'搜索结果 {i}')
-                
-                results.append(f"## 📄 {title}\n**URL**: {link}\n\n{content}\n")
-            else:
-                results.append(f"## ❌ 搜索结果 {i}\n**URL**: {link}\n**错误**: 无法获取内容\n")
-                
-        except Exception as e:
-            results.append(f"## ❌ 搜索结果 {i}\n**URL**: {link}\n**错误**: {str(e)}\n")
+        if tracker is not None:
+            link = tracker.clean(link)
+            kept = tracker.claim_url(link, i)
+            if kept is not None:
+                alternates.setdefault(kept, []).append((i, link))
+                continue
+        candidates.append((i, link))
+    
+    if not candidates:
+        return "未能获取到有效的搜索结果内容"
+    
+    async def fetch_link(i: int, link: str):
+        # 依次尝试: 结果缓存 -> HTTP快速通道 -> 浏览器
+        result = await result_cache.get(link, crawl_config)
+        if result is None:
+            result = await http_fetcher.fetch(link, crawl_config)
+            if result is None:
+                print(f"🔍 正在爬取第{i}个搜索结果: {link}", file=sys.stderr)
+                result = await crawler.arun(url=link, config=crawl_config)
+            await save_result(link, crawl_config, result, "deep_crawl")
+        return result
+    
+    async def load_link(i: int, link: str) -> tuple:
+        """返回 (结果, 错误说明)"""
+        async with semaphore:
+            try:
+                result = await asyncio.wait_for(
+                    fetch_link(i, link),
+                    timeout=concurrency.per_link_timeout_seconds
+                )
+            except asyncio.TimeoutError:
+                return None, f"## ⏱️ 搜索结果 {i}\n**URL**: {link}\n**错误**: 超过单链接超时 ({concurrency.per_link_timeout_seconds}s)\n"
+            except Exception as e:
+                return None, f"## ❌ 搜索结果 {i}\n**URL**: {link}\n**错误**: {str(e)}\n"
+        if result.success and result.markdown:
+            return result, None
+        return None, f"## ❌ 搜索结果 {i}\n**URL**: {link}\n**错误**: 无法获取内容\n"
+    
+    def render_result(i: int, link: str, result) -> str:
+        # 限制每个结果的长度，避免内容过长
+        content = result_formatter.truncate_markdown(result.markdown, 2000)
+        title = result.metadata.get('title', f'搜索结果 {i}')
+        return f"## 📄 {title}\n**URL**: {link}\n\n{content}\n"
+    
+    sections: Dict[int, str] = {}
+    fetched = set()
+    running: Dict[asyncio.Task, tuple] = {}
+    next_candidate = 0
+    
+    def launch():
+        # 已保留的结果和进行中的链接凑满 target 后不再发起新的爬取
+        nonlocal next_candidate
+        while next_candidate < len(candidates) and len(sections) + len(running) < target:
+            i, link = candidates[next_candidate]
+            if next_candidate >= target:
+                dedup.record_refill()
+            next_candidate += 1
+            running[asyncio.create_task(load_link(i, link))] = (i, link)
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + concurrency.deep_crawl_deadline_seconds
+    launch()
+    try:
+        while running:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, _ = await asyncio.wait(running, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                i, link = running.pop(task)
+                result, error = task.result()
+                if result is None:
+                    if alternates.get(i):
+                        # 同一页面还有其他URL形式，用它代替失败的链接
+                        j, alternate = alternates[i].pop(0)
+                        alternates[j] = alternates.pop(i)
+                        candidates.insert(next_candidate, (j, alternate))
+                        print(f"↪️ 第{i}个搜索结果获取失败，改用同一页面的其他URL: {alternate}", file=sys.stderr)
+                    else:
+                        sections[i] = error
+                else:
+                    duplicate = None
+                    if tracker is not None:
+                        # 分词和指纹计算在线程中执行，不阻塞其他链接的爬取
+                        duplicate = await asyncio.to_thread(tracker.check_content, i, link, result)
+                    if duplicate is None:
+                        sections[i] = render_result(i, link, result)
+                        fetched.add(i)
+                    else:
+                        kept, reason = duplicate
+                        collapsed.setdefault(kept, []).append(f"{link} ({dedup.DUPLICATE_REASONS[reason]})")
+                        print(f"🔁 第{i}个搜索结果与第{kept}个重复，已合并: {link}", file=sys.stderr)
+                await report_step("deep_crawl", len(sections), target, f"深度爬取 [{len(sections)}/{target}] {link}")
+            launch()
+    except asyncio.CancelledError:
+        # 调用被取消时 asyncio.wait 不会取消子任务，需要手动取消并等待页面关闭
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        raise
     
-    return "\n".join(results) if results else "未能获取到有效的搜索结果内容"
+    # 超过全局时限: 取消未完成的链接，保留已完成的部分结果
+    if running:
+        for task in running:
+            task.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        print(f"⚠️ 深度爬取超过全局时限，{len(running)} 个链接未完成", file=sys.stderr)
+        for i, link in running.values():
+            sections[i] = f"## ⏱️ 搜索结果 {i}\n**URL**: {link}\n**错误**: 超过深度爬取总时限 ({concurrency.deep_crawl_deadline_seconds}s)，已跳过\n"
+    
+    # 按原始排名顺序重组结果，重复页面列在保留的结果下
+    results = []
+    for i in sorted(sections):
+        section = sections[i]
+        if i not in fetched:
+            results.append(section)
+            continue
+        merged = [f"{link} ({dedup.DUPLICATE_REASONS[dedup.DUPLICATE_URL]})" for _, link in alternates.get(i, [])]
+        merged += collapsed.get(i, [])
+        if merged:
+            section += "\n🔁 **已合并的重复页面**:\n" + "\n".join(f"- {item}" for item in merged) + "\n"
+        results.append(section)
+    
+    return "\n".join(results)
+
+# 多步骤工具的进度阶段及权重
+RETRY_PROGRESS_STAGES = (("crawl", 95), ("format", 5))
+INTELLIGENCE_PROGRESS_STAGES = (("analyze", 5), ("fetch", 35), ("deep_crawl", 55), ("format", 5))
+BATCH_PROGRESS_STAGES = (("crawl", 95), ("format", 5))
+ACADEMIC_PROGRESS_STAGES = (("search", 85), ("parse", 10), ("format", 5))
 
 # ===== 配置化爬取工具 =====
 
 @mcp.tool()
+@instrument_tool("crawl")
+@with_config_snapshot
+@cancellable
 async def crawl(url: str) -> str:
     """
     Basic webpage crawling with Markdown conversion (配置化版本).
@@ -642,21 +999,32 @@ async def crawl(url: str) -> str:
     try:
         global config
         
-        browser_config = BrowserConfig(
-            headless=config.browser_control.headless_mode,
-            browser_type=config.browser_control.browser_type
-        )
+        browser_config = get_default_browser_config()
+        crawl_config = get_crawler_config("default")
+        
+        cached_result = await result_cache.get(url, crawl_config)
+        if cached_result:
+            return format_crawl_result(cached_result, url, "Basic Crawl", {"Cache": describe_cache_hit(cached_result)})
+        
+        # 静态页面优先走HTTP快速通道，需要JavaScript时再升级到浏览器
+        fast_result = await http_fetcher.fetch(url, crawl_config)
+        if fast_result:
+            await save_result(url, crawl_config, fast_result, "crawl")
+            return format_crawl_result(fast_result, url, "Basic Crawl", {"Served By": http_fetcher_module.TIER_HTTP})
         
-        async with AsyncWebCrawler(config=browser_config) as crawler:
-            crawl_config = get_crawler_config("default")
+        async with browser_pool.acquire(browser_config) as crawler:
             result = await crawler.arun(url=url, config=crawl_config)
+            await save_result(url, crawl_config, result, "crawl")
             
-            return format_crawl_result(result, url, "Basic Crawl")
+            return format_crawl_result(result, url, "Basic Crawl", {"Served By": http_fetcher_module.TIER_BROWSER})
                 
     except Exception as e:
         return f"Basic Crawl Error\n\nURL: {url}\nException: {str(e)}"
 
 @mcp.tool()
+@instrument_tool("crawl_stealth")
+@with_config_snapshot
+@cancellable
 async def crawl_stealth(url: str) -> str:
     """
     Stealth web crawling with anti-detection techniques (配置化版本).
@@ -676,29 +1044,35 @@ async def crawl_stealth(url: str) -> str:
     try:
         global config
         
-        # Import anti-detection functionality
-        import sys
-        sys.path.append('legacy/servers')
-        from anti_detection import create_stealth_config
-        
-        # Use stealth configuration
-        browser_config = create_stealth_config()
         crawl_config = get_crawler_config("stealth")
         
-        async with AsyncWebCrawler(config=browser_config) as crawler:
-            result = await crawler.arun(url=url, config=crawl_config) 
+        cached_result = await result_cache.get(url, crawl_config, require_browser=True)
+        if cached_result:
+            return format_crawl_result(cached_result, url, "Stealth Crawling", {"Cache": describe_cache_hit(cached_result)})
+        
+        # Use stealth fingerprint (从预热的指纹池中轮换取出，在共享的隐身浏览器中按页面应用)
+        fingerprint = next_stealth_fingerprint()
+        
+        async with acquire_stealth_browser(fingerprint) as crawler:
+            with capture_render_wait() as render_wait:
+                result = await crawler.arun(url=url, config=crawl_config)
+            await save_result(url, crawl_config, result, "crawl_stealth")
             
             if result.success:
                 # Show disguise information
-                ua_info = browser_config.user_agent[:80] + "..." if len(browser_config.user_agent) > 80 else browser_config.user_agent
-                viewport_info = f"{browser_config.viewport_width}x{browser_config.viewport_height}"
+                ua_info = fingerprint.user_agent[:80] + "..." if len(fingerprint.user_agent) > 80 else fingerprint.user_agent
+                viewport_info = f"{fingerprint.viewport[0]}x{fingerprint.viewport[1]}"
                 
                 extra_info = {
                     "Disguised UA": ua_info,
                     "Viewport": viewport_info,
-                    "Anti-Detection": "Enabled",
-                    "Stealth Delay": f"{config.timing_control.stealth_delay_seconds}s"
+                    "Anti-Detection": "Enabled"
                 }
+                # 启用自适应等待时固定延迟不再生效，改为报告本次等待结果
+                if config.render_wait.enabled:
+                    extra_info["Render Wait"] = describe_render_wait(render_wait["outcome"])
+                else:
+                    extra_info["Stealth Delay"] = f"{config.timing_control.stealth_delay_seconds}s"
                 
                 return format_crawl_result(result, url, "Stealth Crawling", extra_info)
             else:
@@ -710,6 +1084,9 @@ async def crawl_stealth(url: str) -> str:
         return f"Stealth crawling error: {str(e)}"
 
 @mcp.tool()
+@instrument_tool("crawl_with_geolocation")
+@with_config_snapshot
+@cancellable
 async def crawl_with_geolocation(url: str, location: str = "random") -> str:
     """
     Geolocation spoofing crawl to bypass regional restrictions (配置化版本).
@@ -733,14 +1110,16 @@ async def crawl_with_geolocation(url: str, location: str = "random") -> str:
         # Import geolocation spoofing functionality
         import sys
         sys.path.append('legacy/servers')
-        from anti_detection import create_geo_spoofed_config
+        from anti_detection import GeolocationSpoofer
         
         # Create geolocation spoofing configuration
-        browser_config, geo_config = create_geo_spoofed_config(location)
+        geo_config = GeolocationSpoofer.get_random_location()
         crawl_config = get_crawler_config("geolocation")
         
-        async with AsyncWebCrawler(config=browser_config) as crawler:
+        async with acquire_stealth_browser() as crawler:
             result = await crawler.arun(url=url, config=crawl_config)
+            # 伪装位置的内容因地而异，不写入结果缓存，只保存到语料库
+            await corpus_store.put(url, result, "crawl_with_geolocation")
             
             if result.success:
                 extra_info = {
@@ -758,13 +1137,17 @@ async def crawl_with_geolocation(url: str, location: str = "random") -> str:
         return f"Geolocation spoofing crawl error: {str(e)}"
 
 @mcp.tool()
-async def crawl_with_retry(url: str, max_retries: Optional[int] = None) -> str:
+@instrument_tool("crawl_with_retry")
+@with_config_snapshot
+@cancellable
+async def crawl_with_retry(url: str, max_retries: Optional[int] = None, ctx: Context = None) -> str:
     """
     Retry crawling with exponential backoff for unstable websites (配置化版本).
     
     Args:
         url: Target webpage URL
         max_retries: Maximum number of retry attempts (如果不指定，使用配置文件中的值)
+        ctx: MCP context, used to report each attempt as a progress notification
         
     Returns:
         Webpage content with retry attempt information
@@ -782,32 +1165,39 @@ async def crawl_with_retry(url: str, max_retries: Optional[int] = None) -> str:
         if max_retries is None:
             max_retries = config.retry_control.max_retries
         
-        # Import retry manager
-        import sys
-        sys.path.append('legacy/servers')
-        from anti_detection import create_retry_manager, create_stealth_config
-        
-        retry_manager = create_retry_manager(max_retries)
-        browser_config = create_stealth_config()  # Use stealth mode to improve success rate
+        progress = start_progress(ctx, RETRY_PROGRESS_STAGES)
+        retry_engine = retry_engine_module.get_retry_engine()
         crawl_config = get_crawler_config("retry")
         
         start_time = time.time()
-        
-        async with AsyncWebCrawler(config=browser_config) as crawler:
-            result = await retry_manager.execute_with_retry(crawler, url, crawl_config)
+        attempts = 0
+        
+        # Use stealth mode to improve success rate
+        async with acquire_stealth_browser() as crawler:
+            async def attempt():
+                nonlocal attempts
+                attempts += 1
+                await report_step("crawl", attempts - 1, max_retries + 1, f"第{attempts}次尝试: {url}")
+                return await crawler.arun(url=url, config=crawl_config)
+            
+            # 重试引擎按失败类型决定是否重试，慢请求会发起对冲副本
+            result, outcome = await retry_engine.execute(url, attempt, max_retries=max_retries)
+            await corpus_store.put(url, result, "crawl_with_retry")
             
             elapsed_time = time.time() - start_time
+            await progress.finish(f"重试爬取结束: {outcome.describe()}")
             
             if result.success:
                 extra_info = {
                     "Time Taken": f"{elapsed_time:.2f}s",
                     "Max Retries": str(max_retries),
+                    "Attempts": outcome.describe(),
                     "Stealth Mode": "Enabled"
                 }
                 
                 return format_crawl_result(result, url, "Retry Crawling", extra_info)
             else:
-                return f"Retry crawling failed: {result.error_message}"
+                return f"Retry crawling failed ({outcome.describe()}): {result.error_message}"
                 
     except ImportError:
         return "Retry management module not found, please check legacy/servers/anti_detection.py"
@@ -815,10 +1205,14 @@ async def crawl_with_retry(url: str, max_retries: Optional[int] = None) -> str:
         return f"Retry crawling error: {str(e)}"
 
 @mcp.tool()
+@instrument_tool("crawl_with_intelligence")
+@with_config_snapshot
+@cancellable
 async def crawl_with_intelligence(
     url: str,
     crawl_mode: str = "smart",
-    deep_crawl_count: int = 3
+    deep_crawl_count: int = 3,
+    ctx: Context = None
 ) -> str:
     """
     Smart web crawling with content optimization and analysis (配置化版本).
@@ -830,6 +1224,7 @@ async def crawl_with_intelligence(
             - "smart": Smart analysis and content optimization (default)
             - "deep": Deep crawling, extract and crawl search result links
         deep_crawl_count: Number of search result links to crawl when crawl_mode="deep" (1-10)
+        ctx: MCP context, used to report page fetch and deep crawl progress
         
     Returns:
         Optimized webpage content in Markdown format
@@ -843,49 +1238,84 @@ async def crawl_with_intelligence(
     try:
         global config
         
+        progress = start_progress(ctx, INTELLIGENCE_PROGRESS_STAGES)
+        await report_stage("analyze", 0.0, f"分析URL意图: {url}")
+        
         # 根据爬取模式设置参数
         use_smart_analysis = crawl_mode in ["smart", "deep"]
         deep_search = crawl_mode == "deep"
+        prefers_browser = False
         
         # Analyze URL intent
         if use_smart_analysis and config.advanced_settings.enable_smart_analysis:
-            intent = analyze_user_intent(f"crawl {url}")
+            intent = intent_analyzer_module.analyze_user_intent(f"crawl {url}")
             
             # Adjust crawling strategy based on intent
-            browser_config = BrowserConfig(
-                headless=config.browser_control.headless_mode,
-                user_agent="Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-            )
+            browser_config = config_factory_module.get_config_factory().browser_config("smart")
             
-            # 动态调整延迟时间
-            delay_time = config.timing_control.dynamic_content_delay_seconds if intent.dynamic_content else config.timing_control.default_delay_seconds
+            # 动态内容直接使用浏览器，跳过HTTP快速通道
+            prefers_browser = intent.dynamic_content
             
-            crawl_config = CrawlerRunConfig(
-                cache_mode=CacheMode.BYPASS if config.cache_control.default_cache_mode == "BYPASS" else CacheMode.ENABLED,
-                word_count_threshold=config.quality_control.word_count_threshold,
-                delay_before_return_html=delay_time
-            )
+            # 动态内容等待渲染，静态内容使用默认延迟
+            crawl_config = get_crawler_config("intelligence", dynamic_content=intent.dynamic_content)
         else:
-            browser_config = BrowserConfig(headless=config.browser_control.headless_mode)
+            browser_config = get_default_browser_config()
             crawl_config = get_crawler_config("intelligence")
         
+        needs_deep_crawl = deep_search and _is_search_page(url)
+        
+        # 分层获取: 结果缓存 -> HTTP快速通道 -> 浏览器
+        await report_stage("fetch", 0.0, f"获取页面: {url}")
+        cached_result = await result_cache.get(url, crawl_config, require_browser=prefers_browser)
+        page_result = cached_result
+        served_by = http_fetcher_module.TIER_BROWSER
+        
+        if page_result is None and not prefers_browser:
+            page_result = await http_fetcher.fetch(url, crawl_config)
+            if page_result:
+                served_by = http_fetcher_module.TIER_HTTP
+                await save_result(url, crawl_config, page_result, "crawl_with_intelligence")
+        
+        # 已获得页面且不需要深度爬取时，无需借用浏览器
+        if page_result and not needs_deep_crawl:
+            extra_info = {"Crawl Mode": crawl_mode.title()}
+            if cached_result:
+                extra_info["Cache"] = describe_cache_hit(cached_result)
+            else:
+                extra_info["Served By"] = served_by
+            await progress.finish(f"页面已获取 ({served_by})")
+            return format_crawl_result(page_result, url, "V9 Smart Crawling", extra_info)
+        
         # Execute crawling
-        async with AsyncWebCrawler(config=browser_config) as crawler:
-            result = await crawler.arun(url=url, config=crawl_config)
+        async with browser_pool.acquire(browser_config) as crawler:
+            if page_result:
+                result = page_result
+            else:
+                await report_stage("fetch", 0.3, f"浏览器渲染页面: {url}")
+                result = await crawler.arun(url=url, config=crawl_config)
+                await save_result(url, crawl_config, result, "crawl_with_intelligence")
+            await report_stage("fetch", 1.0, "页面已获取")
             
             if result.success:
                 extra_info = {}
                 extra_info["Crawl Mode"] = crawl_mode.title()
+                if cached_result:
+                    extra_info["Cache"] = describe_cache_hit(cached_result)
+                else:
+                    extra_info["Served By"] = served_by
                 
                 # 深度搜索功能
-                if deep_search and _is_search_page(url):
+                if needs_deep_crawl:
                     extra_info["Deep Crawl Count"] = str(deep_crawl_count)
                     
                     # 解析搜索结果页面，提取链接
-                    search_links = _extract_search_result_links(result.markdown, deep_crawl_count)
+                    # 多取几个后续排名的链接，重复页面被合并时用来补位
+                    refill_count = config.dedup.refill_candidates if config.dedup.enabled else 0
+                    search_links = _extract_search_result_links(result, url, deep_crawl_count + refill_count)
                     
                     if search_links:
-                        deep_content = await _crawl_search_results(crawler, search_links, crawl_config)
+                        await report_stage("deep_crawl", 0.0, f"深度爬取 {min(deep_crawl_count, len(search_links))} 个搜索结果")
+                        deep_content = await _crawl_search_results(crawler, search_links, crawl_config, deep_crawl_count)
                         
                         # 从配置中获取分隔符长度，如果没有配置则使用默认值50
                         separator_length = getattr(config.user_preferences, 'separator_length', 50)
@@ -903,29 +1333,418 @@ async def crawl_with_intelligence(
                         
                         result = DeepResult(result, combined_content)
                 
+                await progress.finish("智能爬取完成")
                 return format_crawl_result(result, url, "V9 Smart Crawling", extra_info)
             else:
                 return f"Crawling failed: {result.error_message}"
                 
     except Exception as e:
         return f"Crawling process error: {str(e)}"
+
 @mcp.tool()
+@instrument_tool("crawl_batch")
+@with_config_snapshot
+@cancellable
+async def crawl_batch(
+    urls: List[str],
+    ctx: Context = None,
+    max_concurrency: Optional[int] = None
+) -> str:
+    """
+    Batch crawling of many URLs through one shared crawler with streamed progress.
+    
+    Args:
+        urls: List of target webpage URLs (duplicates, tracking-parameter and AMP/mobile variants are crawled once;
+              near-duplicate pages are collapsed in the summary)
+        ctx: MCP context, used to stream per-URL completions as progress/log notifications
+        max_concurrency: Maximum concurrent pages (如果不指定，使用配置文件中的值)
+        
+    Returns:
+        Compact per-URL summary (status, title, word count, preview)
+        
+    Use cases:
+        - Crawl a list of documentation pages: crawl_batch(["https://a.com", "https://b.com"])
+        - Limit load on slow sites: crawl_batch(urls, max_concurrency=2)
+    """
+    
+    try:
+        global config
+        
+        # 去重并保留原始顺序，只接受HTTP链接
+        unique_urls = list(dict.fromkeys(url.strip() for url in urls if url and url.strip()))
+        valid_urls = [url for url in unique_urls if url.startswith(('http://', 'https://'))]
+        invalid_count = len(unique_urls) - len(valid_urls)
+        
+        # 同一页面的其他URL形式 (跟踪参数、AMP/移动版) 只爬一次
+        tracker = dedup.DuplicateTracker(config.dedup) if config.dedup.enabled else None
+        url_aliases: Dict[str, List[str]] = {}
+        if tracker is not None:
+            kept_urls = []
+            for url in valid_urls:
+                cleaned = tracker.clean(url)
+                kept = tracker.claim_url(cleaned, cleaned)
+                if kept is None:
+                    kept_urls.append(cleaned)
+                else:
+                    url_aliases.setdefault(kept, []).append(url)
+            valid_urls = list(dict.fromkeys(kept_urls))
+        
+        max_batch_urls = config.concurrency.max_batch_urls
+        skipped_count = max(0, len(valid_urls) - max_batch_urls)
+        valid_urls = valid_urls[:max_batch_urls]
+        
+        if not valid_urls:
+            return "Batch Crawl Error\n\n没有有效的URL (需要以 http:// 或 https:// 开头)"
+        
+        total = len(valid_urls)
+        progress = start_progress(ctx, BATCH_PROGRESS_STAGES)
+        dispatcher = batch_dispatcher_module.create_batch_dispatcher(max_concurrency)
+        crawl_config = get_crawler_config("default", stream=True)
+        
+        start_time = time.time()
+        completed = 0
+        succeeded = 0
+        duplicate_count = 0
+        summaries: Dict[str, str] = {}
+        
+        async with browser_pool.acquire(get_default_browser_config()) as crawler:
+            results = await crawler.arun_many(urls=valid_urls, config=crawl_config, dispatcher=dispatcher)
+            
+            # 取消或出错时先关闭结果流并取消调度器中仍在运行的任务，再归还浏览器
+            # (crawl4ai 的流式包装不会关闭内部调度器的生成器)
+            try:
+                async with aclosing(results):
+                    async for result in results:
+                        completed += 1
+                        
+                        if result.success:
+                            succeeded += 1
+                            await corpus_store.put(result.url, result, "crawl_batch")
+                            duplicate = None
+                            if tracker is not None:
+                                duplicate = await asyncio.to_thread(tracker.check_content, result.url, result.url, result)
+                            if duplicate is not None:
+                                # 近似重复的页面只列出与哪个页面重复，不再输出预览
+                                duplicate_count += 1
+                                kept, reason = duplicate
+                                summaries[result.url] = f"🔁 {result.url}\n   Duplicate of: {kept} ({dedup.DUPLICATE_REASONS[reason]})"
+                                status_line = f"🔁 [{completed}/{total}] {result.url} (duplicate of {kept})"
+                            else:
+                                markdown = result.markdown or ""
+                                title = (result.metadata or {}).get('title') or 'Unknown'
+                                word_count = result_formatter.count_words(markdown)
+                                preview = " ".join(markdown[:200].split())
+                                summaries[result.url] = f"✅ {result.url}\n   Title: {title} | Words: {word_count}\n   {preview}"
+                                status_line = f"✅ [{completed}/{total}] {result.url} ({word_count} words)"
+                        else:
+                            summaries[result.url] = f"❌ {result.url}\n   Error: {result.error_message}"
+                            status_line = f"❌ [{completed}/{total}] {result.url}: {result.error_message}"
+                        
+                        # 每完成一个URL就通过MCP通知推送进度，而不是等全部完成
+                        await progress.step("crawl", completed, total, status_line)
+                        if ctx is not None:
+                            await ctx.info(status_line)
+            finally:
+                await dispatcher.cancel_pending()
+        
+        elapsed_time = time.time() - start_time
+        
+        response = f"Batch Crawl 完成\n\n"
+        response += f"URLs: {total} | 成功: {succeeded} | 失败: {total - succeeded}\n"
+        if duplicate_count:
+            response += f"近似重复 (已合并): {duplicate_count}\n"
+        if url_aliases:
+            response += f"同一页面的其他URL形式 (未重复爬取): {sum(len(aliases) for aliases in url_aliases.values())}\n"
+        response += f"Time Taken: {elapsed_time:.2f}s\n"
+        response += f"Concurrency: {dispatcher.max_concurrency} (单主机 {dispatcher.per_host_concurrency})\n"
+        if invalid_count:
+            response += f"忽略无效URL: {invalid_count}\n"
+        if skipped_count:
+            response += f"超过批量上限 ({max_batch_urls}) 未爬取: {skipped_count}\n"
+        
+        # 按输入顺序输出摘要，合并的URL列在对应页面下
+        lines = []
+        for url in valid_urls:
+            summary = summaries.get(url, f"❌ {url}\n   Error: 无结果")
+            if url in url_aliases:
+                summary += f"\n   Also at: {', '.join(url_aliases[url])}"
+            lines.append(summary)
+        response += "\n" + "\n".join(lines)
+        await progress.finish(f"批量爬取完成: {succeeded}/{total} 成功")
+        return response
+        
+    except Exception as e:
+        return f"Batch Crawl Error\n\nException: {str(e)}"
+
+# 学术搜索结果页的"无结果"特征 (小写匹配)
+EMPTY_SERP_MARKERS = (
+    "did not match any documents", "produced no results", "no results were found",
+    "no items found", "your search did not match", "找不到和您查询的", "没有找到"
+)
+# 少于该词数的搜索结果页视为空结果
+MIN_SERP_WORDS = 30
+# 这些问题换一种渲染策略也无法解决，直接失败
+ACADEMIC_FAST_FAIL_PROBLEMS = ("dns", "client_error", "rate_limited")
+
+def assess_search_result(result) -> Optional[str]:
+    """
+    检查搜索结果页的原始爬取结果
+    
+    根据状态码、验证码特征和结果数量判断，而不是在格式化后的文本里查找关键词。
+    
+    Returns:
+        问题类型 (retry_engine 的失败类型或 "empty_serp")，None 表示结果可用
+    """
+    if result is None:
+        return "unknown"
+    if not result.success or (result.status_code or 0) >= 400:
+        return retry_engine_module.classify_failure(result)
+    if retry_engine_module.detect_bot_wall(getattr(result, "html", None)):
+        return retry_engine_module.FAILURE_BOT_WALL
+    
+    markdown = result.markdown or ""
+    if result_formatter.count_words(markdown) < MIN_SERP_WORDS:
+        return "empty_serp"
+    head = markdown[:5000].lower()
+    if any(marker in head for marker in EMPTY_SERP_MARKERS):
+        return "empty_serp"
+    return None
+
+async def _crawl_serp_with(crawler, search_url: str, run_config) -> tuple:
+    """在给定爬虫上爬取搜索结果页，返回 (结果, 问题类型)"""
+    try:
+        result = await crawler.arun(url=search_url, config=run_config)
+    except Exception as e:
+        return None, retry_engine_module.classify_failure(None, e)
+    return result, assess_search_result(result)
+
+async def crawl_academic_serp(search_url: str, race_strategies: bool = False, require_html: bool = False) -> tuple:
+    """
+    获取学术搜索结果页
+    
+    默认先用隐身配置爬取，结果不可用且问题可能通过换策略解决时，
+    在同一个浏览器会话中用更强的渲染参数重试；race_strategies=True 时
+    隐身与标准策略并行执行，取第一个可用的结果。结果缓存只保存 Markdown，
+    require_html=True (需要解析HTML) 时跳过缓存。
+    
+    Returns:
+        (结果, 使用的策略, 问题列表, 是否成功)
+    """
+    stealth_run = get_crawler_config("stealth")
+    
+    cached_result = None if require_html else await result_cache.get(search_url, stealth_run, require_browser=True)
+    if cached_result and assess_search_result(cached_result) is None:
+        return cached_result, f"Cache ({describe_cache_hit(cached_result)})", [], True
+    
+    if race_strategies:
+        await report_stage("search", 0.0, f"隐身/标准策略并行竞速: {search_url}")
+        return await _race_academic_strategies(search_url, stealth_run)
+    
+    problems = []
+    await report_stage("search", 0.0, f"隐身模式爬取搜索结果页: {search_url}")
+    async with acquire_stealth_browser() as crawler:
+        result, problem = await _crawl_serp_with(crawler, search_url, stealth_run)
+        if problem is None:
+            await save_result(search_url, stealth_run, result, "academic_search")
+            return result, "Stealth", problems, True
+        
+        problems.append(f"stealth: {problem}")
+        if problem in ACADEMIC_FAST_FAIL_PROBLEMS:
+            return result, "Stealth", problems, False
+        
+        # 复用同一个浏览器会话，换用模拟用户行为的渲染参数
+        print(f"⚠️ 隐身模式结果不可用 ({problem})，在同一会话中回退到增强渲染", file=sys.stderr)
+        await report_stage("search", 0.0, f"隐身模式结果不可用 ({problem})，回退到增强渲染")
+        fallback_run = get_crawler_config(
+            "intelligence", magic=True, simulate_user=True, override_navigator=True
+        )
+        result, problem = await _crawl_serp_with(crawler, search_url, fallback_run)
+        if problem is None:
+            await save_result(search_url, stealth_run, result, "academic_search")
+            return result, "Stealth + Enhanced Fallback (same session)", problems, True
+        
+        problems.append(f"enhanced fallback: {problem}")
+        return result, "Stealth + Enhanced Fallback (same session)", problems, False
+
+async def _race_academic_strategies(search_url: str, stealth_run) -> tuple:
+    """并行执行隐身与标准策略，返回第一个可用的结果，其余任务取消"""
+    
+    async def run_strategy(strategy: str, acquire_browser, run_config):
+        async with acquire_browser() as crawler:
+            result, problem = await _crawl_serp_with(crawler, search_url, run_config)
+        return strategy, result, problem
+    
+    tasks = [
+        asyncio.create_task(run_strategy("Stealth", acquire_stealth_browser, stealth_run)),
+        asyncio.create_task(run_strategy("Standard", lambda: browser_pool.acquire(get_default_browser_config()), get_crawler_config("intelligence")))
+    ]
+    problems = []
+    last_result, last_strategy = None, "Race"
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            strategy, result, problem = await next_done
+            if problem is None:
+                await save_result(search_url, stealth_run, result, "academic_search")
+                return result, f"{strategy} (race winner)", problems, True
+            problems.append(f"{strategy.lower()}: {problem}")
+            last_result, last_strategy = result, strategy
+        return last_result, f"{last_strategy} (race, no usable result)", problems, False
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+# 支持的学术数据源
+ACADEMIC_SOURCES = ("google_scholar", "arxiv", "pubmed")
+ACADEMIC_SOURCE_NAMES = {"google_scholar": "Google Scholar", "arxiv": "arXiv", "pubmed": "PubMed"}
+
+def parse_academic_sources(source: str) -> List[str]:
+    """解析数据源参数: 单个数据源、"all" 或逗号分隔的列表；包含不支持的数据源时返回空列表"""
+    if source.strip().lower() == "all":
+        return list(ACADEMIC_SOURCES)
+    sources = []
+    for name in source.split(","):
+        name = name.strip().lower()
+        if name not in ACADEMIC_SOURCES:
+            return []
+        if name not in sources:
+            sources.append(name)
+    return sources
+
+def build_academic_search_url(source: str, query: str, num_search_results: int) -> tuple:
+    """构造学术数据源的搜索URL，返回 (search_url, crawl_method, search_info)"""
+    import urllib.parse
+    encoded_query = urllib.parse.quote_plus(query)
+    
+    # 🆕 使用优化的搜索方法
+    if source == "google_scholar":
+        # 使用 site:scholar.google.com 语法通过普通 Google 搜索
+        search_url = f"https://www.google.com/search?q=site:scholar.google.com+\"{query}\"&num={num_search_results}"
+        return search_url, "Google Site Search (Optimized)", f"搜索结果数: {num_search_results}"
+    if source == "arxiv":
+        # arXiv 直接搜索，使用默认返回数量
+        search_url = f"https://arxiv.org/search/?query={encoded_query}&searchtype=all"
+        return search_url, "arXiv Direct Search", "搜索结果数: 默认 (通常50条)"
+    # PubMed 搜索，使用默认返回数量
+    search_url = f"https://pubmed.ncbi.nlm.nih.gov/?term={encoded_query}"
+    return search_url, "PubMed Direct Search", "搜索结果数: 默认 (通常20条)"
+
+async def _search_academic_source(source: str, query: str, num_search_results: int, race_strategies: bool) -> Dict[str, Any]:
+    """爬取并解析单个学术数据源的搜索结果页"""
+    search_url, _, _ = build_academic_search_url(source, query, num_search_results)
+    try:
+        serp_result, strategy, problems, succeeded = await crawl_academic_serp(
+            search_url, race_strategies, require_html=True
+        )
+    except Exception as e:
+        return {"source": source, "url": search_url, "records": [], "error": str(e)}
+    
+    if not succeeded:
+        error = "; ".join(problems) or getattr(serp_result, "error_message", None) or "搜索结果页不可用"
+        return {"source": source, "url": search_url, "records": [], "error": error}
+    
+    parser = serp_parsers.ACADEMIC_PARSERS[source]
+    records = await asyncio.to_thread(parser, getattr(serp_result, "html", "") or "", search_url)
+    return {"source": source, "url": search_url, "records": records, "strategy": strategy, "error": None}
+
+def _format_academic_record(position: int, record, include_abstracts: bool) -> str:
+    """格式化一条合并后的学术记录"""
+    lines = [f"## {position}. {record.title}"]
+    if record.authors:
+        authors = ", ".join(record.authors[:6]) + (" et al." if len(record.authors) > 6 else "")
+        lines.append(f"- **作者**: {authors}")
+    details = []
+    if record.year:
+        details.append(f"**年份**: {record.year}")
+    if record.doi:
+        details.append(f"**DOI**: {record.doi}")
+    details.append(f"**来源**: {', '.join(ACADEMIC_SOURCE_NAMES.get(name, name) for name in record.sources)}")
+    lines.append("- " + " | ".join(details))
+    lines.append(f"- **URL**: {record.url}")
+    if include_abstracts and record.snippet:
+        lines.append(f"\n> {result_formatter.truncate_markdown(record.snippet, 400)}")
+    return "\n".join(lines)
+
+async def _multi_source_academic_search(
+    query: str,
+    sources: List[str],
+    num_search_results: int,
+    include_abstracts: bool,
+    race_strategies: bool
+) -> str:
+    """并发查询多个学术数据源，合并去重后返回统一排序的结果列表"""
+    started = time.time()
+    finished = 0
+    
+    async def search_source(source: str) -> Dict[str, Any]:
+        nonlocal finished
+        outcome = await _search_academic_source(source, query, num_search_results, race_strategies)
+        finished += 1
+        status = "失败" if outcome["error"] else f"{len(outcome['records'])} 条"
+        await report_step("search", finished, len(sources), f"{ACADEMIC_SOURCE_NAMES[source]}: {status}")
+        return outcome
+    
+    outcomes = await asyncio.gather(*(search_source(source) for source in sources))
+    await report_stage("parse", 1.0, "合并去重")
+    
+    records_by_source = {outcome["source"]: outcome["records"] for outcome in outcomes}
+    total_records = sum(len(records) for records in records_by_source.values())
+    merged = serp_parsers.merge_records(records_by_source, limit=num_search_results)
+    
+    status_lines = []
+    for outcome in outcomes:
+        name = ACADEMIC_SOURCE_NAMES[outcome["source"]]
+        if outcome["error"]:
+            status_lines.append(f"- ❌ {name}: {outcome['error']}")
+        else:
+            status_lines.append(f"- ✅ {name}: {len(outcome['records'])} 条 ({outcome['strategy']})")
+    
+    header = f"""# 🎓 学术搜索结果 (多数据源)
+
+**查询**: {query}
+**数据源**: {', '.join(ACADEMIC_SOURCE_NAMES[source] for source in sources)}
+**合并结果**: {len(merged)} 条 (去重前 {total_records} 条，按 DOI / 规范化标题去重)
+**耗时**: {time.time() - started:.2f}s (各数据源并发查询)
+
+**各数据源状态**:
+{chr(10).join(status_lines)}
+
+---
+
+"""
+    if not merged:
+        return header + "未能从任何数据源解析出论文记录"
+    
+    body = "\n\n".join(
+        _format_academic_record(position, record, include_abstracts)
+        for position, record in enumerate(merged, 1)
+    )
+    return header + body
+
+@mcp.tool()
+@instrument_tool("academic_search")
+@with_config_snapshot
+@cancellable
 async def academic_search(
     query: str,
     source: str = "google_scholar",
     deep_crawl_count: int = 5,
     num_search_results: int = 50,
-    include_abstracts: bool = True
+    include_abstracts: bool = True,
+    race_strategies: bool = False,
+    ctx: Context = None
 ) -> str:
     """
     Academic search with paper content extraction using optimized search methods.
     
     Args:
         query: Academic search query
-        source: Academic source (google_scholar/arxiv/pubmed)
+        source: Academic source (google_scholar/arxiv/pubmed), "all", or a comma-separated list such as "arxiv,pubmed"
         deep_crawl_count: Number of paper links to crawl in detail when using deep mode (1-10)
         num_search_results: Number of search results to request (default 50, only for Google Scholar)
         include_abstracts: Whether to include paper abstracts (currently for display info only)
+        race_strategies: Run stealth and standard crawling in parallel and keep the first usable page
+        ctx: MCP context, used to report per-source search progress
         
     Returns:
         Academic search results with paper details
@@ -935,63 +1754,43 @@ async def academic_search(
         - More results: academic_search("transformer", "google_scholar", 3, 100) 
         - arXiv papers: academic_search("deep learning", "arxiv")
         - Medical literature: academic_search("COVID-19", "pubmed")
+        - All sources merged: academic_search("protein folding", "all")
         
     Note:
         - Google Scholar uses site:scholar.google.com method to bypass restrictions
         - Uses stealth mode by default for better success rate against anti-bot protection
         - deep_crawl_count is for future deep crawling feature
-        - num_search_results only applies to Google Scholar search
+        - num_search_results only applies to Google Scholar search; in multi-source mode it also caps the merged list
     """
     
     try:
         global config
         
-        # URL encoding
-        import urllib.parse
-        encoded_query = urllib.parse.quote_plus(query)
-        
-        # 🆕 使用优化的搜索方法
-        if source == "google_scholar":
-            # 使用 site:scholar.google.com 语法通过普通 Google 搜索
-            search_url = f"https://www.google.com/search?q=site:scholar.google.com+\"{query}\"&num={num_search_results}"
-            crawl_method = "Google Site Search (Optimized)"
-            search_info = f"搜索结果数: {num_search_results}"
-        elif source == "arxiv":
-            # arXiv 直接搜索，使用默认返回数量
-            search_url = f"https://arxiv.org/search/?query={encoded_query}&searchtype=all"
-            crawl_method = "arXiv Direct Search"
-            search_info = "搜索结果数: 默认 (通常50条)"
-        elif source == "pubmed":
-            # PubMed 搜索，使用默认返回数量
-            search_url = f"https://pubmed.ncbi.nlm.nih.gov/?term={encoded_query}"
-            crawl_method = "PubMed Direct Search"
-            search_info = "搜索结果数: 默认 (通常20条)"
+        progress = start_progress(ctx, ACADEMIC_PROGRESS_STAGES)
+        sources = parse_academic_sources(source)
+        if not sources:
+            return f"❌ 不支持的学术数据源: {source}\n支持的数据源: {', '.join(ACADEMIC_SOURCES)}, all (或逗号分隔的多个数据源)"
+        if len(sources) > 1:
+            response = await _multi_source_academic_search(query, sources, num_search_results, include_abstracts, race_strategies)
+            await progress.finish("多数据源学术搜索完成")
+            return response
+        
+        source = sources[0]
+        search_url, crawl_method, search_info = build_academic_search_url(source, query, num_search_results)
+        
+        # 🆕 隐身模式优先，根据原始结果 (状态码/验证码/空结果) 决定是否回退
+        serp_result, strategy, problems, succeeded = await crawl_academic_serp(search_url, race_strategies)
+        crawl_method += f" ({strategy})"
+        await report_stage("format", 0.0, f"搜索结果页已获取 ({strategy})")
+        
+        if succeeded:
+            extra_info = {"Strategy": strategy}
+            if problems:
+                extra_info["Recovered From"] = "; ".join(problems)
+            result = format_crawl_result(serp_result, search_url, "Academic Search", extra_info)
         else:
-            return f"❌ 不支持的学术数据源: {source}\n支持的数据源: google_scholar, arxiv, pubmed"
-        
-        # 🆕 直接使用隐身模式，提高学术网站爬取成功率
-        try:
-            result = await crawl_stealth(search_url)
-            crawl_method += " (Stealth Mode)"
-            
-            # 检查是否成功获取内容
-            if "失败" in result or "Error" in result or "Sorry" in result:
-                print(f"⚠️ 隐身模式遇到问题，尝试智能爬取模式")
-                # 回退到智能爬取模式
-                result = await crawl_with_intelligence(
-                    url=search_url,
-                    crawl_mode="smart"
-                )
-                crawl_method = crawl_method.replace(" (Stealth Mode)", " (Intelligence Fallback)")
-            
-        except Exception as stealth_error:
-            print(f"⚠️ 隐身模式失败，回退到智能爬取模式: {stealth_error}")
-            # 回退到智能爬取模式
-            result = await crawl_with_intelligence(
-                url=search_url,
-                crawl_mode="smart"
-            )
-            crawl_method += " (Intelligence Fallback)"
+            error_message = getattr(serp_result, "error_message", None) or "搜索结果页不可用"
+            result = f"Academic Search 失败\n\nURL: {search_url}\n问题: {'; '.join(problems)}\nError: {error_message}"
         
         # 为学术搜索结果添加特殊标识和格式化
         academic_header = f"""# 🎓 学术搜索结果
@@ -1000,7 +1799,7 @@ async def academic_search(
 **数据源**: {source.replace('_', ' ').title()}
 **爬取方式**: {crawl_method}
 **{search_info}**
-**爬取模式**: Stealth (隐身模式优先)
+**爬取模式**: {'Stealth / Standard 并行竞速' if race_strategies else 'Stealth (隐身模式优先，同会话回退)'}
 **包含摘要**: {'是' if include_abstracts else '否'}
 **搜索URL**: {search_url}
 
@@ -1013,14 +1812,150 @@ async def academic_search(
 
 """
         
+        await progress.finish("学术搜索完成")
         return academic_header + result
         
     except Exception as e:
         return f"❌ 学术搜索失败: {str(e)}"
 
+# ===== 语料库工具 =====
+
+def _format_age(seconds: float) -> str:
+    """格式化抓取时间距今的时长"""
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} 分钟前"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f} 小时前"
+    return f"{seconds / 86400:.1f} 天前"
+
+@mcp.tool()
+@instrument_tool("corpus_get")
+@with_config_snapshot
+async def corpus_get(url: str, version: int = 0, max_age_hours: float = 0) -> str:
+    """
+    Return previously crawled content for a URL from the local corpus, without touching the network.
+    
+    Args:
+        url: Webpage URL crawled earlier by any v9 tool
+        version: 0 for the latest saved version, 1 for the one before it, and so on
+        max_age_hours: Only accept a version fetched within this many hours (0 = any age)
+        
+    Returns:
+        Saved Markdown content with fetch time and version information
+        
+    Use cases:
+        - Reuse a page crawled in an earlier session: corpus_get("https://example.com")
+        - Compare with an older version: corpus_get("https://example.com", version=1)
+        - Only use fresh content: corpus_get("https://example.com", max_age_hours=24)
+    """
+    try:
+        max_age_seconds = max_age_hours * 3600 if max_age_hours > 0 else None
+        document = await corpus_store.get(url, version, max_age_seconds)
+        if document is None:
+            versions = await corpus_store.history(url)
+            if not versions:
+                return f"📚 语料库中没有该URL: {url}\n💡 使用 crawl / crawl_with_intelligence 爬取后会自动保存"
+            if version >= len(versions):
+                return f"📚 该URL只保存了 {len(versions)} 个版本 (version 取值 0-{len(versions) - 1}): {url}"
+            return f"📚 该URL的已保存版本超过 {max_age_hours}h (最新抓取于 {_format_age(time.time() - versions[0].fetched_at)}): {url}"
+        
+        extra_info = {
+            "Served By": "Corpus (no network)",
+            "Fetched": _format_age(document.age_seconds),
+            "Version": f"{version + 1}/{document.versions} (newest first)",
+            "Crawled With": document.metadata.get("tool") or "unknown"
+        }
+        return format_crawl_result(document, url, "Corpus Get", extra_info)
+    except Exception as e:
+        return f"❌ 语料库读取失败: {str(e)}"
+
+@mcp.tool()
+@instrument_tool("corpus_search")
+@with_config_snapshot
+async def corpus_search(query: str, limit: int = 0) -> str:
+    """
+    Exact keyword scan over the latest saved version of every page in the local corpus, without touching the network.
+    For ranked full-text retrieval use local_search instead.
+    
+    Args:
+        query: Keywords separated by spaces; a page must contain all of them
+        limit: Maximum number of results (0 = use the configured default)
+        
+    Returns:
+        Matching pages with title, URL, fetch time and a snippet around the first match
+        
+    Use cases:
+        - Find pages crawled earlier about a topic: corpus_search("transformer attention")
+        - Then read one of them with corpus_get(url)
+    """
+    try:
+        global config
+        
+        limit = limit if limit > 0 else config.corpus.search_max_results
+        hits = await corpus_store.search(query, limit, config.corpus.snippet_chars)
+        if not hits:
+            return f"📚 语料库中没有同时包含所有关键词的页面: {query}"
+        
+        lines = [f"📚 语料库检索: {query} ({len(hits)} 个结果)\n"]
+        for position, hit in enumerate(hits, 1):
+            lines.append(f"{position}. **{hit.title or 'Untitled'}**")
+            lines.append(f"   URL: {hit.url}")
+            lines.append(f"   抓取于 {_format_age(time.time() - hit.fetched_at)} | Score: {hit.score:.0f}")
+            lines.append(f"   {hit.snippet}\n")
+        lines.append("💡 使用 corpus_get(url) 获取完整内容")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ 语料库检索失败: {str(e)}"
+
+@mcp.tool()
+@instrument_tool("local_search")
+@with_config_snapshot
+async def local_search(query: str, limit: int = 0) -> str:
+    """
+    Ranked full-text search (BM25) over everything already crawled, answered from a local in-memory index.
+    Chinese, Japanese and Korean queries are supported. Try this before paying for a new live web search.
+    
+    Args:
+        query: Free-text query (English or Chinese)
+        limit: Maximum number of results (0 = use the configured default)
+        
+    Returns:
+        Ranked pages with title, URL, fetch time, BM25 score and a snippet
+        
+    Use cases:
+        - Check what is already known before searching: local_search("transformer attention mechanism")
+        - Chinese queries: local_search("机器学习 模型压缩")
+        - Then read a hit with corpus_get(url)
+    """
+    try:
+        global config
+        
+        if corpus_store.index is None or not config.corpus.enabled:
+            return "🔎 本地全文索引未启用 (corpus.enabled / corpus.index_enabled)"
+        
+        start_time = time.perf_counter()
+        limit = limit if limit > 0 else config.corpus.search_max_results
+        hits = await corpus_store.ranked_search(query, limit, config.corpus.snippet_chars)
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        if not hits:
+            return f"🔎 本地语料中没有与查询相关的页面: {query} ({elapsed_ms:.1f}ms)\n💡 可使用 smart_search_guide 推荐的在线搜索"
+        
+        lines = [f"🔎 本地全文检索: {query} ({len(hits)} 个结果, {elapsed_ms:.1f}ms)\n"]
+        for position, hit in enumerate(hits, 1):
+            lines.append(f"{position}. **{hit.title or 'Untitled'}**")
+            lines.append(f"   URL: {hit.url}")
+            lines.append(f"   抓取于 {_format_age(time.time() - hit.fetched_at)} | BM25: {hit.score:.2f}")
+            lines.append(f"   {hit.snippet}\n")
+        lines.append("💡 使用 corpus_get(url) 获取完整内容，无需重新爬取")
+        return "\n".join(lines)
+    except Exception as e:
+        return f"❌ 本地全文检索失败: {str(e)}"
+
 # ===== 实验性功能 =====
 
 @mcp.tool()
+@instrument_tool("experimental_claude_analysis")
+@with_config_snapshot
 async def experimental_claude_analysis(
     content: str,
     analysis_type: str = "general",
@@ -1098,7 +2033,87 @@ Preview limit can be adjusted with: configure_crawl_settings("update", "content_
 
 # ===== 系统状态和信息工具 =====
 
+def _format_seconds(value: Optional[float]) -> str:
+    """格式化耗时 (毫秒/秒)"""
+    if value is None:
+        return "-"
+    return f"{value * 1000:.0f}ms" if value < 1 else f"{value:.2f}s"
+
+@mcp.tool()
+async def performance_stats(output_format: str = "text", reset: bool = False) -> str:
+    """
+    Show crawl latency histograms and per-domain counters.
+
+    Args:
+        output_format: Output format (text/json/prometheus)
+        reset: Clear all collected metrics after reporting
+
+    Returns:
+        Per-tool latency (p50/p95/p99), per-phase timings, output bytes and per-domain success/failure counts
+
+    Use cases:
+        - Find which phase (browser acquire, navigation, render wait, markdown conversion, formatting) dominates latency
+        - Check which domains are failing
+        - Scrape metrics into Prometheus: performance_stats("prometheus")
+    """
+    try:
+        if output_format == "prometheus":
+            report = metrics.to_prometheus()
+        elif output_format == "json":
+            report = json.dumps(metrics.snapshot(), ensure_ascii=False, indent=2, default=str)
+        else:
+            snapshot = metrics.snapshot()
+            lines = [
+                "Performance Stats",
+                "",
+                f"Uptime: {snapshot['uptime_seconds']:.0f}s",
+                "",
+                "⏱️ Tool Latency:"
+            ]
+            for tool, stats in sorted(snapshot["tools"].items()):
+                lines.append(
+                    f"- {tool}: {stats['count']} calls, p50 {_format_seconds(stats['p50'])}, "
+                    f"p95 {_format_seconds(stats['p95'])}, p99 {_format_seconds(stats['p99'])}, "
+                    f"max {_format_seconds(stats['max'])}, {stats['bytes_total']} bytes out, {stats['errors']} errors"
+                )
+            if not snapshot["tools"]:
+                lines.append("- (no tool calls yet)")
+
+            lines.extend(["", "🔬 Phase Latency:"])
+            for phase, stats in sorted(snapshot["phases"].items()):
+                lines.append(
+                    f"- {phase}: {stats['count']} samples, mean {_format_seconds(stats['mean'])}, "
+                    f"p50 {_format_seconds(stats['p50'])}, p95 {_format_seconds(stats['p95'])}, "
+                    f"p99 {_format_seconds(stats['p99'])}"
+                )
+            if not snapshot["phases"]:
+                lines.append("- (no pages crawled yet)")
+
+            lines.extend(["", "🌐 Domains:"])
+            domains = sorted(
+                snapshot["domains"].items(),
+                key=lambda item: item[1]["success"] + item[1]["failure"],
+                reverse=True
+            )
+            for domain, counters in domains:
+                lines.append(
+                    f"- {domain}: {counters['success']} ok, {counters['failure']} failed, "
+                    f"{counters['bytes']} bytes, status {counters['status_codes']}"
+                )
+            if not domains:
+                lines.append("- (no domains yet)")
+            report = "\n".join(lines)
+
+        if reset:
+            metrics.reset()
+        return report
+
+    except Exception as e:
+        return f"Performance Stats Error: {str(e)}"
+
 @mcp.tool()
+@instrument_tool("system_status")
+@with_config_snapshot
 async def system_status() -> str:
     """
     Display system status and available tools information (配置化版本).
@@ -1123,6 +2138,48 @@ async def system_status() -> str:
         if venv_path.exists() and os.environ.get('VIRTUAL_ENV'):
             venv_status = f"已激活 ({venv_path})"
         
+        pool_stats = browser_pool.get_stats()
+        cache_stats = result_cache.get_stats()
+        corpus_stats = corpus_store.get_stats()
+        if corpus_store.index is None:
+            index_line = "disabled"
+        else:
+            index_stats = corpus_store.index.get_stats()
+            index_line = (
+                f"{index_stats['documents']} docs, {index_stats['terms']} terms, "
+                f"{index_stats['queries']} queries (avg {index_stats['avg_query_ms']:.1f}ms), built in {index_stats['build_seconds']:.2f}s"
+            ) if index_stats['ready'] else "building"
+        if not corpus_stats['enabled']:
+            corpus_line = "disabled"
+        elif not corpus_stats['loaded']:
+            corpus_line = "not loaded yet (index is rebuilt on first use)"
+        else:
+            corpus_line = (
+                f"{corpus_stats['urls']} URLs, {corpus_stats['versions']} versions in {corpus_stats['segments']} segments, "
+                f"{corpus_stats['size_mb']}MB ({corpus_stats['stale_mb']}MB stale), {corpus_stats['writes']} writes, {corpus_stats['compactions']} compactions"
+            )
+        store_stats = config_store.get_stats()
+        factory_stats = config_factory_module.get_config_factory().get_stats()
+        cancellation_stats = get_cancellation_stats()
+        render_wait_stats = get_render_wait_engine().get_stats()
+        blocking_stats = get_resource_blocker().get_stats()
+        dedup_stats = dedup.get_dedup_stats()
+        fast_path_stats = http_fetcher.get_stats()
+        scheduler_stats = host_scheduler.get_stats()
+        if anti_detection_module.is_loaded and config.stealth_fingerprints.pool_enabled:
+            fingerprint_stats = get_fingerprint_pool().get_stats()
+            fingerprint_line = f"{fingerprint_stats['ready']}/{fingerprint_stats['pool_size']} ready, {fingerprint_stats['issued']} issued, {fingerprint_stats['misses']} cold misses"
+        else:
+            fingerprint_line = "not loaded" if config.stealth_fingerprints.pool_enabled else "disabled"
+        if retry_engine_module.is_loaded:
+            retry_stats = retry_engine_module.get_retry_engine().get_stats()
+            retry_line = (
+                f"{retry_stats['retries']} retries, {retry_stats['hedges']} hedges ({retry_stats['hedge_wins']} won), "
+                f"{retry_stats['budget_exhausted']} budget exhausted, failures {retry_stats['failures'] or '{}'}"
+            )
+        else:
+            retry_line = "not loaded"
+        
         status_info = f"""Context Scraper MCP Server V9
 
 Version: 9.0.0
@@ -1130,7 +2187,7 @@ Status: Active
 Python: {current_python}
 Virtual Environment: {venv_status}
 Enhancement: Unified Configuration Management + User Configurable Parameters + Academic Search
-Total Tools: 11
+Total Tools: 16
 
 Available Tools:
 • crawl - Basic webpage crawling (配置化)
@@ -1138,11 +2195,16 @@ Available Tools:
 • crawl_stealth - Anti-detection crawling (配置化)
 • crawl_with_retry - Retry mechanism for unstable sites (配置化)
 • crawl_with_geolocation - Geographic location spoofing (配置化)
+• crawl_batch - Batch crawling with streamed progress (🆕 NEW)
 • academic_search - Academic paper search and extraction (🆕 NEW)
+• corpus_get - Saved content of a previously crawled URL (🆕 NEW)
+• corpus_search - Keyword scan over the local corpus (🆕 NEW)
+• local_search - Ranked BM25 search over everything already crawled (🆕 NEW)
 • experimental_claude_analysis - AI content analysis (配置化)
 • configure_crawl_settings - 配置管理工具
 • quick_config_content_limit - 快速设置内容限制
 • quick_config_word_threshold - 快速设置词数阈值
+• performance_stats - Latency histograms and per-domain counters (🆕 NEW)
 • system_status - Display system information
 
 V9 New Features:
@@ -1161,9 +2223,26 @@ Current Configuration:
 - 🎯 Word Count Threshold: {config.quality_control.word_count_threshold} words
 - ⏱️ Page Timeout: {config.timing_control.page_timeout_ms}ms
 - 🔄 Max Retries: {config.retry_control.max_retries}
+- 🔁 Retry Engine: {retry_line}
+- 💾 Result Cache: {cache_stats['entries']} entries, {cache_stats['size_mb']}MB, hit rate {cache_stats['hit_rate']:.0%}
+- 📚 Corpus: {corpus_line}
+- 🔎 Local Index: {index_line}
+- ⚡ HTTP Fast Path: {fast_path_stats['served']} served, {fast_path_stats['escalated']} escalated to browser
+- 🐢 Politeness: {scheduler_stats['hosts']} hosts, {scheduler_stats['throttled']}/{scheduler_stats['requests']} requests throttled, {scheduler_stats['slowdowns']} slowdowns on 429/503
+- 🌐 Browser Pool: {pool_stats['browsers']}/{pool_stats['max_browsers']} browsers warm, {pool_stats['reused']} reuses, {pool_stats['recycled']} recycled
+- 🥷 Fingerprint Pool: {fingerprint_line}
+- ⚙️ Config Store: {store_stats['saves']} saves, {store_stats['reloads']} hot reloads, {store_stats['rejected_reloads']} rejected edits, {"watching" if store_stats['watching'] else "not watching"}{", save pending" if store_stats['pending_save'] else ""}
+- 🏭 Config Factory: {factory_stats['built']} built ({factory_stats['build_seconds'] * 1000:.0f}ms), {factory_stats['hits']} reused, hit rate {factory_stats['hit_rate']:.0%}
+- ⏳ Render Wait: {render_wait_stats['settled']} settled, {render_wait_stats['capped']} capped, avg {render_wait_stats['avg_wait_ms']:.0f}ms, {render_wait_stats['domains_learned']} domains learned{"" if config.render_wait.enabled else " (disabled)"}
+- 🚫 Resource Blocking: {blocking_stats['blocked_requests']} requests blocked ({blocking_stats['tracker_requests']} trackers), ~{blocking_stats['estimated_mb_saved']}MB saved{"" if config.resource_blocking.enabled else " (disabled)"}
+- 🔁 Dedup: {dedup_stats['url_duplicates']} URL / {dedup_stats['canonical_duplicates']} canonical / {dedup_stats['content_duplicates']} content duplicates collapsed, {dedup_stats['refilled']} slots refilled{"" if config.dedup.enabled else " (disabled)"}
+- 🛑 Cancelled Calls: {cancellation_stats['cancelled']} ({cancellation_stats['tearing_down']} still releasing pages)
 - 👤 Show Word Count: {config.user_preferences.show_word_count}
 - 👤 Show Detailed Logs: {config.user_preferences.show_detailed_logs}
 
+Startup Timings:
+{startup_profiler.format_report()}
+
 Configuration Management:
 - 🔧 View all settings: configure_crawl_settings("show", "all")
 - ⚡ Quick content limit: quick_config_content_limit(5000)
@@ -1174,6 +2253,7 @@ Academic Search Features:
 - 🎓 Google Scholar integration: academic_search("query", "google_scholar", 5)
 - 📄 arXiv paper search: academic_search("query", "arxiv", 3)
 - 🏥 PubMed medical literature: academic_search("query", "pubmed", 5)
+- 🔀 All sources merged & deduplicated: academic_search("query", "all")
 - 🔍 Deep content extraction from academic sources
 - 📊 Automatic paper metadata extraction
 
@@ -1229,6 +2309,7 @@ def show_v9_welcome():
     print("   - Unified configuration management")
     print("   - 🎓 Academic search (Google Scholar, arXiv, PubMed)")
     print("   - 🌐 Deep search with content extraction")
+    print("   - 📚 Local corpus of crawled pages with full-text search")
     print("=" * 50)
     print("Usage Instructions:")
     print("   - smart_search_guide: Smart search guide with academic support")
@@ -1237,8 +2318,13 @@ def show_v9_welcome():
     print("   - crawl_stealth: Stealth mode crawling")
     print("   - crawl_with_geolocation: Geolocation spoofing")
     print("   - crawl_with_retry: Retry mode crawling")
+    print("   - crawl_batch: Batch crawling with streamed progress")
+    print("   - corpus_get: Saved content of a previously crawled URL")
+    print("   - corpus_search: Keyword scan over the local corpus")
+    print("   - local_search: Ranked BM25 search over everything already crawled")
     print("   - experimental_claude_analysis: Claude analysis")
     print("   - configure_crawl_settings: Configuration management")
+    print("   - performance_stats: Latency histograms and per-domain counters")
     print()
     print("Configuration Commands:")
     print("   - configure_crawl_settings('show', 'all'): View all settings")
@@ -1249,6 +2335,7 @@ def show_v9_welcome():
     print("   - academic_search('machine learning', 'google_scholar', 5)")
     print("   - academic_search('transformer', 'arxiv', 3)")
     print("   - academic_search('COVID-19', 'pubmed', 5)")
+    print("   - academic_search('protein folding', 'all')  # 多数据源并发、合并去重")
     print()
     print("Deep Search Examples:")
     print("   - crawl_with_intelligence('https://google.com/search?q=AI', 'deep', 5)")
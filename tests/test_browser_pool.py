@@ -0,0 +1,190 @@
+# tests/test_browser_pool.py - 浏览器池分组与启动并发测试
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crawl4ai import BrowserConfig, CrawlerRunConfig
+
+from v9_core import browser_pool as browser_pool_module
+from v9_core import resource_blocking as resource_blocking_module
+from v9_core.browser_pool import BrowserPool, PageIdentity, browser_config_signature
+from v9_core.crawl_config_manager import ResourceBlockingControl
+from v9_core.resource_blocking import RESOURCE_PROFILE_KEY
+
+
+class FakeCrawler:
+    """不启动 Chromium 的 AsyncWebCrawler 替身"""
+
+    launched = 0
+    launch_delay = 0.0
+
+    def __init__(self, config=None):
+        self.config = config
+        self.closed = False
+
+    async def start(self):
+        FakeCrawler.launched += 1
+        await asyncio.sleep(FakeCrawler.launch_delay)
+
+    async def close(self):
+        self.closed = True
+
+
+def stealth_config(user_agent: str, viewport: tuple) -> BrowserConfig:
+    """模拟每次轮换指纹得到的隐身配置: UA、请求头、视窗各不相同"""
+    width, height = viewport
+    return BrowserConfig(
+        headless=True,
+        user_agent=user_agent,
+        headers={"sec-ch-ua": user_agent[:10]},
+        viewport_width=width,
+        viewport_height=height,
+        extra_args=["--disable-blink-features=AutomationControlled", f"--window-size={width},{height}"]
+    )
+
+
+@pytest.fixture
+def fake_crawler(monkeypatch):
+    FakeCrawler.launched = 0
+    FakeCrawler.launch_delay = 0.0
+    monkeypatch.setattr(browser_pool_module, "AsyncWebCrawler", FakeCrawler)
+    monkeypatch.setattr(browser_pool_module, "install_pool_hooks", lambda crawler: None)
+    return FakeCrawler
+
+
+def test_signature_ignores_page_level_identity():
+    """UA、请求头与视窗不同的配置具有相同的启动形状"""
+    first = stealth_config("Mozilla/5.0 (Windows NT 10.0) Chrome/120", (1920, 1080))
+    second = stealth_config("Mozilla/5.0 (Macintosh) Chrome/121", (1366, 768))
+    assert browser_config_signature(first) == browser_config_signature(second)
+    assert browser_config_signature(first) != browser_config_signature(BrowserConfig(headless=False))
+
+
+@pytest.mark.asyncio
+async def test_stealth_acquires_reuse_one_browser(fake_crawler):
+    """两次轮换指纹的隐身借用共用同一个常驻浏览器，并各自保留页面身份"""
+    pool = BrowserPool(max_browsers=4, idle_timeout_seconds=0)
+    first = stealth_config("Mozilla/5.0 (Windows NT 10.0) Chrome/120", (1920, 1080))
+    second = stealth_config("Mozilla/5.0 (Macintosh) Chrome/121", (1366, 768))
+
+    async with pool.acquire(first) as crawler:
+        assert crawler._identity is None
+    async with pool.acquire(second) as crawler:
+        assert crawler._identity == PageIdentity.from_browser_config(second)
+
+    assert pool.get_stats()["launched"] == 1
+    assert pool.get_stats()["reused"] == 1
+    await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_acquires_share_one_launch(fake_crawler):
+    """同一形状的并发借用只启动一次浏览器，启动期间不阻塞其他形状"""
+    fake_crawler.launch_delay = 0.05
+    pool = BrowserPool(max_browsers=4, idle_timeout_seconds=0)
+    stealth = stealth_config("Mozilla/5.0 (Windows NT 10.0) Chrome/120", (1920, 1080))
+
+    async def borrow(browser_config):
+        async with pool.acquire(browser_config) as crawler:
+            return crawler._entry
+
+    entries = await asyncio.gather(
+        *(borrow(stealth) for _ in range(5)),
+        borrow(BrowserConfig(headless=False))
+    )
+
+    assert len({id(entry) for entry in entries[:5]}) == 1
+    assert pool.get_stats()["launched"] == 2
+    await pool.shutdown()
+
+
+class FakePage:
+    """记录页面级覆盖的 Playwright Page 替身"""
+
+    def __init__(self):
+        self.viewport = None
+        self.headers = None
+
+    async def set_viewport_size(self, viewport):
+        self.viewport = viewport
+
+    async def set_extra_http_headers(self, headers):
+        self.headers = headers
+
+
+class FakeStrategy:
+    def __init__(self):
+        self.hooks = {}
+
+    def set_hook(self, name, hook):
+        self.hooks[name] = hook
+
+
+@pytest.mark.asyncio
+async def test_page_identity_hook_applies_identity():
+    """借用者的页面身份在页面创建时覆盖视窗与请求头"""
+    strategy = FakeStrategy()
+    crawler = type("Crawler", (), {"crawler_strategy": strategy})()
+    browser_pool_module.install_page_identity_hook(crawler)
+
+    launched = stealth_config("Mozilla/5.0 (Windows NT 10.0) Chrome/120", (1920, 1080))
+    entry = browser_pool_module.PooledBrowser(
+        key="test", crawler=crawler, identity=PageIdentity.from_browser_config(launched)
+    )
+    borrower = stealth_config("Mozilla/5.0 (Macintosh) Chrome/121", (1366, 768))
+    pooled = browser_pool_module.PooledCrawler(entry, PageIdentity.from_browser_config(borrower))
+
+    page = FakePage()
+    await strategy.hooks["on_page_context_created"](page, context=None, config=pooled._with_identity(None))
+
+    assert page.viewport == {"width": 1366, "height": 768}
+    assert page.headers["User-Agent"] == borrower.user_agent
+
+
+class RecordingBlocker:
+    """记录每个页面所用拦截配置的 ResourceBlocker 替身"""
+
+    def __init__(self):
+        self.profiles = {}
+
+    async def attach(self, page, profile, blocked_domains):
+        self.profiles[page] = profile
+
+
+class RacingCrawler:
+    """按 crawl4ai _crawl_web 的顺序执行: 写入 config.url，等待创建页面，再触发页面钩子"""
+
+    def __init__(self, page_delays):
+        self.crawler_strategy = FakeStrategy()
+        self.page_delays = page_delays
+
+    async def arun(self, url, config=None, **kwargs):
+        config.url = url
+        await asyncio.sleep(self.page_delays[url])
+        await self.crawler_strategy.hooks["on_page_context_created"](url, context=None, config=config)
+        return SimpleNamespace(success=True, status_code=200, response_headers={}, error_message=None)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_pages_resolve_their_own_profile(monkeypatch):
+    """共用一个 CrawlerRunConfig 的并发页面各自按自己的域名选择拦截配置"""
+    settings = ResourceBlockingControl(domain_profiles={"fragile.example": "full", "news.example": "text_only"})
+    monkeypatch.setattr(resource_blocking_module, "get_crawl_config", lambda: SimpleNamespace(resource_blocking=settings))
+
+    fragile, news = "https://fragile.example/app", "https://news.example/story"
+    # 先开始的页面创建得更慢，共享配置时它的钩子会读到后写入的URL
+    crawler = RacingCrawler({fragile: 0.05, news: 0.0})
+    blocker = RecordingBlocker()
+    resource_blocking_module.install_resource_blocking_hook(crawler, blocker)
+    pooled = browser_pool_module.PooledCrawler(browser_pool_module.PooledBrowser(key="test", crawler=crawler))
+
+    run_config = CrawlerRunConfig(shared_data={RESOURCE_PROFILE_KEY: "text_css"})
+    await asyncio.gather(pooled.arun(fragile, config=run_config), pooled.arun(news, config=run_config))
+
+    assert blocker.profiles == {fragile: "full", news: "text_only"}
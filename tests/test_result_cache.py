@@ -0,0 +1,51 @@
+# tests/test_result_cache.py - 结果缓存键与服务层级测试
+
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v9_core.config_factory import build_crawler_config
+from v9_core.crawl_config_manager import get_crawl_config
+from v9_core.result_cache import TIER_HTTP, ResultCache, make_cache_key
+
+URL = "https://example.com/article?b=2&a=1"
+
+
+def test_tool_configs_have_distinct_keys():
+    """各工具 (含动态/静态意图) 的配置计算出不同的缓存键"""
+    snapshot = get_crawl_config()
+    configs = [
+        build_crawler_config(snapshot, "default"),
+        build_crawler_config(snapshot, "stealth"),
+        build_crawler_config(snapshot, "geolocation"),
+        build_crawler_config(snapshot, "retry"),
+        build_crawler_config(snapshot, "intelligence"),
+        build_crawler_config(snapshot, "intelligence", dynamic_content=False),
+        build_crawler_config(snapshot, "intelligence", magic=True, simulate_user=True, override_navigator=True),
+    ]
+    keys = {make_cache_key(URL, run_config) for run_config in configs}
+    assert len(keys) == len(configs)
+
+
+def test_key_ignores_url_normalization_noise():
+    """查询参数顺序、片段与默认端口不影响缓存键"""
+    run_config = build_crawler_config(get_crawl_config(), "default")
+    assert make_cache_key(URL, run_config) == make_cache_key("HTTPS://Example.com:443/article?a=1&b=2#top", run_config)
+
+
+@pytest.mark.asyncio
+async def test_http_tier_entry_not_served_to_browser_callers(tmp_path):
+    """HTTP 快速通道写入的条目不会返回给需要浏览器的调用方"""
+    cache = ResultCache(cache_dir=str(tmp_path))
+    run_config = build_crawler_config(get_crawl_config(), "intelligence")
+    fast_result = SimpleNamespace(success=True, markdown="# Title\n\nbody", metadata={}, status_code=200, tier=TIER_HTTP)
+
+    await cache.put(URL, run_config, fast_result)
+
+    assert await cache.get(URL, run_config, require_browser=True) is None
+    cached = await cache.get(URL, run_config)
+    assert cached is not None and cached.tier == TIER_HTTP
@@ -0,0 +1,65 @@
+# tests/test_retry_engine.py - 重试引擎失败分类与对冲测试
+
+import asyncio
+import os
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from v9_core.retry_engine import FAILURE_BOT_WALL, RetryEngine
+
+URL = "https://example.com/page"
+CAPTCHA_HTML = "<html><title>Just a moment...</title><body>Verify you are human</body></html>"
+
+
+def page(html: str, markdown: str) -> SimpleNamespace:
+    return SimpleNamespace(success=True, status_code=200, html=html, markdown=markdown, error_message=None)
+
+
+@pytest.mark.asyncio
+async def test_bot_wall_served_with_200_is_a_failure():
+    """HTTP 200 返回的验证码页按 bot_wall 失败处理，不当作成功结果"""
+    engine = RetryEngine(max_retries=2, base_delay_seconds=0)
+
+    async def attempt():
+        return page(CAPTCHA_HTML, "Verify you are human")
+
+    result, outcome = await engine.execute(URL, attempt)
+    assert not result.success
+    assert outcome.failures == [FAILURE_BOT_WALL]
+    assert outcome.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_long_page_mentioning_captcha_is_kept():
+    """正文充足的页面即使引用了验证码脚本也视为成功"""
+    engine = RetryEngine(max_retries=0)
+    html = '<script src="https://www.google.com/recaptcha/api.js"></script>' + "<p>word</p>" * 500
+
+    async def attempt():
+        return page(html, "word " * 500)
+
+    result, outcome = await engine.execute(URL, attempt)
+    assert result.success
+    assert outcome.failures == []
+
+
+@pytest.mark.asyncio
+async def test_hedge_waits_for_free_host_slot():
+    """主机并发名额已满时不发起对冲副本"""
+    engine = RetryEngine(max_retries=0, hedge_after_seconds=0.1)
+    calls = 0
+
+    async def attempt():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.35)
+        return page("<p>ok</p>", "ok")
+
+    result, outcome = await engine.execute(URL, attempt, can_hedge=lambda: False)
+    assert result.success
+    assert calls == 1
+    assert outcome.hedges == 0
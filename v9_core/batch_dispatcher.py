@@ -0,0 +1,154 @@
+# v9_core/batch_dispatcher.py - V9 批量爬取调度器
+"""
+批量爬取调度器
+
+作为 crawl4ai `arun_many` 的 dispatcher 使用。crawl4ai 自带的 SemaphoreDispatcher
+只有全局并发限制且不支持流式返回，这里在同一个共享爬虫上增加:
+- 全局并发上限
+- 按主机 (host) 的并发上限，并经过全局按主机调度器限速
+- 经过全局重试引擎重试 (按失败类型、时间预算和主机重试预算)
+- 按完成顺序流式返回结果
+"""
+
+import asyncio
+import time
+import uuid
+from typing import AsyncGenerator, Dict, List, Optional
+from urllib.parse import urlparse
+
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.async_dispatcher import BaseDispatcher
+from crawl4ai.models import CrawlerTaskResult, CrawlResult
+
+from v9_core.browser_pool import copy_run_config
+from v9_core.host_scheduler import get_host_scheduler
+from v9_core.metrics import get_metrics
+from v9_core.retry_engine import RetryEngine, get_retry_engine
+
+
+class HostAwareDispatcher(BaseDispatcher):
+    """带主机级并发限制和重试的批量调度器"""
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        per_host_concurrency: int = 2,
+        max_retries: int = 3,
+        retry_engine: Optional[RetryEngine] = None
+    ):
+        super().__init__()
+        self.max_concurrency = max(1, max_concurrency)
+        self.per_host_concurrency = max(1, per_host_concurrency)
+        self.max_retries = max(0, max_retries)
+        self.retry_engine = retry_engine or get_retry_engine()
+
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: List[asyncio.Task] = []
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_host_semaphore(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self._host_semaphores[host]
+
+    async def crawl_url(
+        self,
+        url: str,
+        config: CrawlerRunConfig,
+        task_id: str,
+        monitor=None
+    ) -> CrawlerTaskResult:
+        """爬取单个URL，失败时交给重试引擎按失败类型决定是否重试"""
+        start_time = time.time()
+        host_semaphore = self._get_host_semaphore(url)
+        scheduler = get_host_scheduler()
+
+        async def attempt():
+            # 先等待主机令牌，再占用全局并发名额，避免被限速的主机阻塞其他主机；
+            # 退避等待发生在尝试之间，不占用并发名额
+            async with host_semaphore, scheduler.slot(url), self._semaphore:
+                async with get_metrics().track_page(url) as page_record:
+                    try:
+                        # 每次尝试使用独立的配置副本，并发页面的钩子不会读到其他页面的URL
+                        result = await self.crawler.arun(url, config=copy_run_config(config))
+                    except Exception as e:
+                        result = CrawlResult(url=url, html="", metadata={}, success=False, error_message=str(e))
+                    page_record["result"] = result
+            scheduler.report(url, result.status_code, result.response_headers)
+            return result
+
+        # 对冲副本同样占用主机并发名额，名额已满时副本只能排在原请求之后，此时不发起对冲
+        result, outcome = await self.retry_engine.execute(
+            url, attempt, max_retries=self.max_retries, can_hedge=lambda: not host_semaphore.locked()
+        )
+        retry_count = max(0, outcome.attempts - 1)
+
+        return CrawlerTaskResult(
+            task_id=task_id,
+            url=url,
+            result=result,
+            memory_usage=0.0,
+            peak_memory=0.0,
+            start_time=start_time,
+            end_time=time.time(),
+            error_message="" if result.success else (result.error_message or ""),
+            retry_count=retry_count
+        )
+
+    def _start_tasks(self, crawler, urls: List[str], config: CrawlerRunConfig) -> List[asyncio.Task]:
+        self.crawler = crawler
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._tasks = [
+            asyncio.create_task(self.crawl_url(url, config, str(uuid.uuid4())))
+            for url in urls
+        ]
+        return self._tasks
+
+    async def cancel_pending(self):
+        """取消尚未完成的爬取任务并等待其退出"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def run_urls(
+        self,
+        urls: List[str],
+        crawler,
+        config: CrawlerRunConfig,
+        monitor=None
+    ) -> List[CrawlerTaskResult]:
+        """爬取所有URL，按输入顺序返回"""
+        tasks = self._start_tasks(crawler, urls, config)
+        try:
+            return await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run_urls_stream(
+        self,
+        urls: List[str],
+        crawler,
+        config: CrawlerRunConfig
+    ) -> AsyncGenerator[CrawlerTaskResult, None]:
+        """爬取所有URL，按完成顺序逐个返回"""
+        tasks = self._start_tasks(crawler, urls, config)
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # 调用方提前停止迭代时，取消尚未完成的任务
+            await self.cancel_pending()
+
+
+def create_batch_dispatcher(max_concurrency: Optional[int] = None) -> HostAwareDispatcher:
+    """根据爬取配置创建批量调度器"""
+    from v9_core.crawl_config_manager import get_crawl_config
+    config = get_crawl_config()
+    return HostAwareDispatcher(
+        max_concurrency=max_concurrency or config.concurrency.batch_concurrency,
+        per_host_concurrency=config.concurrency.per_host_concurrency,
+        max_retries=config.retry_control.max_retries,
+        retry_engine=get_retry_engine()
+    )
@@ -0,0 +1,515 @@
+# v9_core/browser_pool.py - V9 进程级共享浏览器池
+"""
+进程级共享浏览器池
+
+每个 MCP 工具调用原先都会 `async with AsyncWebCrawler(...)` 启动一次完整的
+Chromium，启动耗时占据了大部分延迟。浏览器池在服务器启动时预热，按
+BrowserConfig 的启动形状 (shape) 分组保存常驻的 AsyncWebCrawler，
+每次请求只打开新的页面；浏览器在服务一定页数后或崩溃后自动回收重建。
+
+UA、请求头、视窗这类页面级身份不参与分组，而是在每个页面创建时单独应用，
+因此每次轮换指纹的隐身请求也能共用同一个常驻浏览器。
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import sys
+import time
+import weakref
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig, CrawlerRunConfig
+
+from v9_core.host_scheduler import get_host_scheduler
+from v9_core.metrics import get_metrics, install_phase_hooks
+from v9_core.render_wait import install_render_wait_hook
+from v9_core.resource_blocking import install_resource_blocking_hook
+
+# 浏览器崩溃的典型错误信息 (Playwright / Chromium)
+BROWSER_CRASH_MARKERS = (
+    "target closed",
+    "target page, context or browser has been closed",
+    "browser has been closed",
+    "browser has disconnected",
+    "browser closed",
+    "connection closed",
+    "page crashed",
+)
+
+
+def is_browser_crash(message: Optional[str]) -> bool:
+    """根据错误信息判断浏览器是否已崩溃"""
+    if not message:
+        return False
+    lowered = message.lower()
+    return any(marker in lowered for marker in BROWSER_CRASH_MARKERS)
+
+
+# 页面级字段: 在页面上单独应用，不影响浏览器启动形状
+PAGE_LEVEL_FIELDS = (
+    "user_agent",
+    "user_agent_mode",
+    "user_agent_generator_config",
+    "headers",
+    "viewport_width",
+    "viewport_height",
+    "verbose",
+)
+
+# 随视窗变化的启动参数，同样属于页面级身份
+PAGE_LEVEL_ARG_PREFIXES = ("--window-size=",)
+
+# 按对象缓存的形状签名: 配置工厂共享的 BrowserConfig 只计算一次签名
+_signature_cache: "weakref.WeakKeyDictionary[BrowserConfig, str]" = weakref.WeakKeyDictionary()
+
+
+def browser_config_signature(browser_config: BrowserConfig) -> str:
+    """计算 BrowserConfig 的启动形状签名，作为浏览器池的分组键 (不含 UA、请求头、视窗)"""
+    signature = _signature_cache.get(browser_config)
+    if signature is None:
+        shape = {
+            name: value for name, value in browser_config.to_dict().items()
+            if name not in PAGE_LEVEL_FIELDS
+        }
+        shape["extra_args"] = [
+            arg for arg in shape.get("extra_args") or []
+            if not arg.startswith(PAGE_LEVEL_ARG_PREFIXES)
+        ]
+        signature_json = json.dumps(shape, sort_keys=True, default=str)
+        signature = hashlib.sha256(signature_json.encode("utf-8")).hexdigest()[:16]
+        _signature_cache[browser_config] = signature
+    return signature
+
+
+@dataclass(frozen=True)
+class PageIdentity:
+    """页面级身份: 在共享浏览器的每个页面上单独应用的 UA、请求头与视窗"""
+    user_agent: str = ""
+    headers: Tuple[Tuple[str, str], ...] = ()
+    viewport: Optional[Tuple[int, int]] = None
+
+    @classmethod
+    def from_browser_config(cls, browser_config: BrowserConfig) -> "PageIdentity":
+        """从 BrowserConfig 中取出页面级身份"""
+        headers = dict(browser_config.headers or {})
+        user_agent = headers.pop("User-Agent", None) or browser_config.user_agent or ""
+        return cls(
+            user_agent=user_agent,
+            headers=tuple(sorted(headers.items())),
+            viewport=(browser_config.viewport_width, browser_config.viewport_height)
+        )
+
+    @classmethod
+    def from_fingerprint(cls, fingerprint: Any) -> "PageIdentity":
+        """从隐身指纹 (StealthFingerprint) 构建页面级身份"""
+        return cls(
+            user_agent=fingerprint.user_agent,
+            headers=tuple(sorted(dict(fingerprint.headers).items())),
+            viewport=tuple(fingerprint.viewport)
+        )
+
+
+# 借出时覆盖了页面身份的 CrawlerRunConfig 副本 -> 该页面应使用的身份
+_page_identities: "weakref.WeakKeyDictionary[CrawlerRunConfig, PageIdentity]" = weakref.WeakKeyDictionary()
+
+
+def copy_run_config(config=None) -> CrawlerRunConfig:
+    """
+    返回 CrawlerRunConfig 的浅拷贝，保留已登记的页面身份
+
+    crawl4ai 先写入 config.url、等待创建页面后才触发 on_page_context_created 钩子，
+    并发的 arun 共用一个配置对象时钩子会读到其他页面的URL，因此每次 arun 使用独立副本。
+    """
+    copied = copy.copy(config or CrawlerRunConfig())
+    identity = _page_identities.get(config) if config is not None else None
+    if identity is not None:
+        _page_identities[copied] = identity
+    return copied
+
+
+async def apply_page_identity(page: Any, identity: PageIdentity):
+    """在页面上应用视窗、请求头与 UA (navigator.userAgent 通过 CDP 覆盖，仅 Chromium 支持)"""
+    if identity.viewport:
+        width, height = identity.viewport
+        await page.set_viewport_size({"width": width, "height": height})
+
+    headers = dict(identity.headers)
+    if identity.user_agent:
+        headers["User-Agent"] = identity.user_agent
+    if headers:
+        await page.set_extra_http_headers(headers)
+
+    if identity.user_agent:
+        try:
+            session = await page.context.new_cdp_session(page)
+            await session.send("Network.setUserAgentOverride", {"userAgent": identity.user_agent})
+        except Exception:
+            # 非 Chromium 浏览器不支持 CDP，只能依靠请求头
+            pass
+
+
+def install_page_identity_hook(crawler: Any):
+    """
+    在 crawl4ai 爬虫策略的 on_page_context_created 钩子上安装页面身份覆盖
+
+    crawl4ai 每种钩子只保存一个函数，这里保留已安装的钩子并先调用它。
+    """
+    strategy = getattr(crawler, "crawler_strategy", None)
+    if strategy is None or not hasattr(strategy, "set_hook"):
+        return
+    previous = strategy.hooks.get("on_page_context_created")
+
+    async def hook(page=None, *args, **kwargs):
+        if previous is not None:
+            await previous(page, *args, **kwargs)
+        run_config = kwargs.get("config")
+        identity = _page_identities.get(run_config) if run_config is not None else None
+        if page is not None and identity is not None:
+            await apply_page_identity(page, identity)
+        return page
+
+    try:
+        strategy.set_hook("on_page_context_created", hook)
+    except ValueError:
+        pass
+
+
+def install_pool_hooks(crawler: Any):
+    """为浏览器池中的爬虫安装阶段计时、渲染等待、资源拦截与页面身份钩子"""
+    install_phase_hooks(crawler)
+    install_render_wait_hook(crawler)
+    install_resource_blocking_hook(crawler)
+    install_page_identity_hook(crawler)
+
+
+@dataclass
+class PooledBrowser:
+    """浏览器池中的一个常驻浏览器"""
+    key: str
+    crawler: AsyncWebCrawler
+    identity: Optional[PageIdentity] = None
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    pages_served: int = 0
+    active_leases: int = 0
+    healthy: bool = True
+    retired: bool = False
+
+
+class PooledCrawler:
+    """
+    借出给调用方的爬虫代理
+
+    接口与 AsyncWebCrawler 一致，额外统计已服务页数并识别浏览器崩溃，
+    调用方无需关心浏览器的生命周期。单页请求经过按主机调度器限速，
+    并记录各阶段耗时；借用者的页面身份与浏览器启动时不同时，在每个页面上覆盖。
+    """
+
+    def __init__(self, entry: PooledBrowser, identity: Optional[PageIdentity] = None):
+        self._entry = entry
+        self._identity = identity if identity != entry.identity else None
+
+    def _with_identity(self, config):
+        """返回登记了页面身份的 CrawlerRunConfig 副本 (浅拷贝，不改变 crawl4ai 的上下文签名)"""
+        if self._identity is None:
+            return config
+        config = copy.copy(config or CrawlerRunConfig())
+        _page_identities[config] = self._identity
+        return config
+
+    def _page_config(self, config):
+        """返回本次 arun 独立使用的 CrawlerRunConfig 副本，并登记借用者的页面身份"""
+        config = copy_run_config(config)
+        if self._identity is not None:
+            _page_identities[config] = self._identity
+        return config
+
+    async def arun(self, url: str, config=None, **kwargs):
+        """爬取单个页面"""
+        config = self._page_config(config)
+        scheduler = get_host_scheduler()
+        try:
+            async with scheduler.slot(url), get_metrics().track_page(url) as page_record:
+                result = await self._entry.crawler.arun(url=url, config=config, **kwargs)
+                page_record["result"] = result
+        except Exception as e:
+            if is_browser_crash(str(e)):
+                self._entry.healthy = False
+            raise
+
+        scheduler.report(url, result.status_code, result.response_headers)
+        self._entry.pages_served += 1
+        if not result.success and is_browser_crash(result.error_message):
+            self._entry.healthy = False
+        return result
+
+    async def arun_many(self, urls: List[str], config=None, **kwargs):
+        """批量爬取页面"""
+        self._entry.pages_served += len(urls)
+        return await self._entry.crawler.arun_many(urls=urls, config=self._with_identity(config), **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._entry.crawler, name)
+
+
+class BrowserPool:
+    """进程级共享浏览器池"""
+
+    def __init__(
+        self,
+        max_browsers: int = 4,
+        max_pages_per_browser: int = 100,
+        idle_timeout_seconds: int = 300,
+        enabled: bool = True
+    ):
+        self.max_browsers = max_browsers
+        self.max_pages_per_browser = max_pages_per_browser
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.enabled = enabled
+
+        self._browsers: Dict[str, PooledBrowser] = {}
+        self._lock = asyncio.Lock()
+        self._launching: Dict[str, asyncio.Future] = {}
+        self._reaper_task: Optional[asyncio.Task] = None
+        self._started = False
+        self._stats = {"launched": 0, "recycled": 0, "crashed": 0, "reused": 0}
+
+    async def start(self, prewarm_configs: Optional[List[BrowserConfig]] = None):
+        """启动浏览器池，可选地预热指定配置的浏览器"""
+        if self._started:
+            return
+        self._started = True
+
+        if self.idle_timeout_seconds > 0:
+            self._reaper_task = asyncio.create_task(self._reap_idle_browsers())
+
+        for browser_config in prewarm_configs or []:
+            try:
+                entry = await self._checkout(browser_config)
+                await self._release(entry)
+            except Exception as e:
+                print(f"⚠️ 浏览器预热失败: {e}", file=sys.stderr)
+
+        print(f"✅ 浏览器池已启动 (最多 {self.max_browsers} 个浏览器, 每个浏览器 {self.max_pages_per_browser} 页后回收)", file=sys.stderr)
+
+    async def shutdown(self):
+        """关闭浏览器池中的所有浏览器"""
+        if self._reaper_task:
+            self._reaper_task.cancel()
+            try:
+                await self._reaper_task
+            except asyncio.CancelledError:
+                pass
+            self._reaper_task = None
+
+        async with self._lock:
+            entries = list(self._browsers.values())
+            self._browsers.clear()
+
+        for entry in entries:
+            await self._close_entry(entry)
+
+        self._started = False
+        print("✅ 浏览器池已关闭", file=sys.stderr)
+
+    @asynccontextmanager
+    async def acquire(
+        self,
+        browser_config: BrowserConfig,
+        identity: Optional[PageIdentity] = None
+    ) -> AsyncIterator[Any]:
+        """
+        借出一个与 browser_config 启动形状匹配的常驻爬虫
+
+        Args:
+            browser_config: 浏览器配置
+            identity: 页面级身份 (如隐身指纹)，默认取 browser_config 中的 UA、请求头与视窗
+
+        Yields:
+            与 AsyncWebCrawler 接口一致的爬虫对象
+        """
+        if identity is None:
+            identity = PageIdentity.from_browser_config(browser_config)
+
+        if not self.enabled:
+            # 不使用池时同样包装为 PooledCrawler，保证请求经过按主机调度器
+            async with AsyncWebCrawler(config=browser_config) as crawler:
+                install_pool_hooks(crawler)
+                entry = PooledBrowser(
+                    key="unpooled", crawler=crawler,
+                    identity=PageIdentity.from_browser_config(browser_config)
+                )
+                yield PooledCrawler(entry, identity)
+            return
+
+        if not self._started:
+            await self.start()
+
+        with get_metrics().phase("browser_acquire"):
+            entry = await self._checkout(browser_config)
+
+        try:
+            yield PooledCrawler(entry, identity)
+        except Exception as e:
+            if is_browser_crash(str(e)):
+                entry.healthy = False
+            raise
+        finally:
+            await self._release(entry)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取浏览器池统计信息"""
+        return {
+            "enabled": self.enabled,
+            "browsers": len(self._browsers),
+            "max_browsers": self.max_browsers,
+            "active_leases": sum(entry.active_leases for entry in self._browsers.values()),
+            **self._stats
+        }
+
+    def _needs_recycle(self, entry: PooledBrowser) -> bool:
+        return not entry.healthy or entry.pages_served >= self.max_pages_per_browser
+
+    def _retire(self, entry: PooledBrowser):
+        """将浏览器移出池，等最后一个借用者归还后关闭 (调用方需持有锁)"""
+        if entry.retired:
+            return
+        entry.retired = True
+        if self._browsers.get(entry.key) is entry:
+            del self._browsers[entry.key]
+        self._stats["recycled"] += 1
+
+    def _retire_for_close(self, entry: PooledBrowser, to_close: List[PooledBrowser]):
+        """退役浏览器，无人借用时加入待关闭列表 (调用方需持有锁)"""
+        self._retire(entry)
+        if entry.active_leases == 0:
+            to_close.append(entry)
+
+    async def _checkout(self, browser_config: BrowserConfig) -> PooledBrowser:
+        """
+        借出匹配启动形状的浏览器，必要时启动新浏览器
+
+        全局锁只保护池的簿记；启动和关闭浏览器都在锁外进行，同一形状的并发请求
+        等待同一次启动，其他形状的借用不受影响。
+        """
+        key = browser_config_signature(browser_config)
+        while True:
+            to_close: List[PooledBrowser] = []
+            launching = None
+            async with self._lock:
+                entry = self._browsers.get(key)
+                if entry is not None and self._needs_recycle(entry):
+                    if not entry.healthy:
+                        self._stats["crashed"] += 1
+                    self._retire_for_close(entry, to_close)
+                    entry = None
+
+                if entry is not None:
+                    self._stats["reused"] += 1
+                    entry.active_leases += 1
+                    entry.last_used = time.monotonic()
+                else:
+                    launching = self._launching.get(key)
+                    is_launcher = launching is None
+                    if is_launcher:
+                        launching = asyncio.get_running_loop().create_future()
+                        self._launching[key] = launching
+
+            for stale_entry in to_close:
+                await self._close_entry(stale_entry)
+            if entry is not None:
+                return entry
+
+            if not is_launcher:
+                # 同一形状已在启动中: 等待后重新查找 (启动失败时由下一个请求重试)
+                await asyncio.shield(launching)
+                continue
+
+            try:
+                entry = await self._launch(key, browser_config)
+            finally:
+                async with self._lock:
+                    self._launching.pop(key, None)
+                launching.set_result(None)
+            return entry
+
+    async def _launch(self, key: str, browser_config: BrowserConfig) -> PooledBrowser:
+        """在锁外启动新浏览器，再登记到池中并借出"""
+        crawler = AsyncWebCrawler(config=browser_config)
+        await crawler.start()
+        install_pool_hooks(crawler)
+        entry = PooledBrowser(
+            key=key, crawler=crawler,
+            identity=PageIdentity.from_browser_config(browser_config)
+        )
+
+        to_close: List[PooledBrowser] = []
+        async with self._lock:
+            # 超出容量时淘汰最久未使用的浏览器
+            while len(self._browsers) >= self.max_browsers:
+                lru_entry = min(self._browsers.values(), key=lambda item: item.last_used)
+                self._retire_for_close(lru_entry, to_close)
+            self._browsers[key] = entry
+            self._stats["launched"] += 1
+            entry.active_leases += 1
+
+        for evicted_entry in to_close:
+            await self._close_entry(evicted_entry)
+        return entry
+
+    async def _release(self, entry: PooledBrowser):
+        """归还浏览器，需要回收且无人借用时在锁外关闭"""
+        async with self._lock:
+            entry.active_leases -= 1
+            entry.last_used = time.monotonic()
+            if self._needs_recycle(entry) and not entry.retired:
+                if not entry.healthy:
+                    self._stats["crashed"] += 1
+                self._retire(entry)
+            should_close = entry.retired and entry.active_leases == 0
+
+        if should_close:
+            await self._close_entry(entry)
+
+    async def _close_entry(self, entry: PooledBrowser):
+        try:
+            await entry.crawler.close()
+        except Exception as e:
+            print(f"⚠️ 关闭浏览器失败: {e}", file=sys.stderr)
+
+    async def _reap_idle_browsers(self):
+        """定期关闭空闲超时的浏览器"""
+        interval = max(1, min(60, self.idle_timeout_seconds // 2))
+        while True:
+            await asyncio.sleep(interval)
+            now = time.monotonic()
+            idle_entries = []
+            async with self._lock:
+                for entry in list(self._browsers.values()):
+                    if entry.active_leases == 0 and now - entry.last_used > self.idle_timeout_seconds:
+                        self._retire(entry)
+                        idle_entries.append(entry)
+            for entry in idle_entries:
+                await self._close_entry(entry)
+
+
+# 全局浏览器池实例
+_browser_pool = None
+
+def get_browser_pool() -> BrowserPool:
+    """获取全局浏览器池实例"""
+    global _browser_pool
+    if _browser_pool is None:
+        from v9_core.crawl_config_manager import get_crawl_config
+        pool_config = get_crawl_config().browser_pool
+        _browser_pool = BrowserPool(
+            max_browsers=pool_config.max_browsers,
+            max_pages_per_browser=pool_config.max_pages_per_browser,
+            idle_timeout_seconds=pool_config.idle_timeout_seconds,
+            enabled=pool_config.enabled
+        )
+    return _browser_pool
@@ -0,0 +1,198 @@
+# v9_core/config_factory.py - V9 爬取配置工厂
+"""
+BrowserConfig / CrawlerRunConfig 缓存工厂
+
+构造一个 BrowserConfig 约需 50ms (内部会创建 UA 生成器)，CrawlerRunConfig
+约需 17ms，原来每个请求都要重新构造。工厂把构造好的对象缓存在配置快照上，
+键为 (对象类型, 工具类型, 意图标志)；快照本身就是配置版本，配置修改后
+新快照重新构建，旧快照的缓存随快照一起释放。
+- BrowserConfig 直接共享: 同一个对象的形状签名稳定，浏览器池可以按对象缓存签名
+- CrawlerRunConfig 返回浅拷贝: crawl4ai 运行时会写入 config.url 等字段
+"""
+
+import copy
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from crawl4ai import BrowserConfig, CacheMode, CrawlerRunConfig
+
+from v9_core.crawl_config_manager import CrawlConfigManager, get_crawl_config
+from v9_core.render_wait import RENDER_WAIT_FLAG
+from v9_core.resource_blocking import RESOURCE_PROFILE_KEY
+from v9_core.result_cache import TOOL_TYPE_KEY
+
+# 预先构建 CrawlerRunConfig 的工具类型
+CRAWLER_CONFIG_TYPES = ("default", "stealth", "geolocation", "retry", "intelligence")
+# 预先构建 BrowserConfig 的工具类型
+BROWSER_CONFIG_TYPES = ("default", "smart")
+
+# 智能分析模式使用的固定 User-Agent
+SMART_USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+
+
+def _cache_mode(snapshot: CrawlConfigManager) -> CacheMode:
+    return CacheMode.BYPASS if snapshot.cache_control.default_cache_mode == "BYPASS" else CacheMode.ENABLED
+
+
+def _render_delay(snapshot: CrawlConfigManager, delay_seconds: float, shared_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    返回HTML前的等待参数: 启用自适应等待时用页面稳定检测替代固定延迟
+    (由浏览器池安装的 before_retrieve_html 钩子执行)
+    """
+    if snapshot.render_wait.enabled:
+        shared_data[RENDER_WAIT_FLAG] = True
+        return {"delay_before_return_html": 0}
+    return {"delay_before_return_html": delay_seconds}
+
+
+def build_crawler_config(
+    snapshot: CrawlConfigManager,
+    tool_type: str = "default",
+    dynamic_content: Optional[bool] = None,
+    **overrides
+) -> CrawlerRunConfig:
+    """
+    根据配置快照构建 CrawlerRunConfig
+
+    Args:
+        snapshot: 配置快照
+        tool_type: 工具类型 (default/stealth/geolocation/retry/intelligence)
+        dynamic_content: 意图分析得到的动态内容标志，None 表示未做意图分析
+        **overrides: 额外的 CrawlerRunConfig 参数 (如 stream=True)
+    """
+    base_config = {
+        "cache_mode": _cache_mode(snapshot),
+        "word_count_threshold": snapshot.quality_control.word_count_threshold,
+    }
+    # 传给浏览器池安装的钩子 (自适应等待、资源拦截)；工具类型参与结果缓存键
+    shared_data: Dict[str, Any] = {TOOL_TYPE_KEY: tool_type}
+    resource_blocking = snapshot.resource_blocking
+    if resource_blocking.enabled:
+        shared_data[RESOURCE_PROFILE_KEY] = resource_blocking.tool_profiles.get(
+            tool_type, resource_blocking.default_profile
+        )
+
+    # 根据工具类型添加特定配置
+    if tool_type == "default":
+        base_config.update({
+            "page_timeout": snapshot.timing_control.page_timeout_ms,
+            "wait_until": snapshot.browser_control.default_wait_until
+        })
+    elif tool_type == "stealth":
+        base_config.update(_render_delay(snapshot, snapshot.timing_control.stealth_delay_seconds, shared_data))
+    elif tool_type == "intelligence":
+        # 意图分析判断为静态内容时不需要等待动态内容
+        if dynamic_content is False:
+            base_config.update({
+                "delay_before_return_html": snapshot.timing_control.default_delay_seconds
+            })
+        else:
+            base_config.update(_render_delay(snapshot, snapshot.timing_control.dynamic_content_delay_seconds, shared_data))
+
+    base_config["shared_data"] = shared_data
+    base_config.update(overrides)
+    return CrawlerRunConfig(**base_config)
+
+
+def build_browser_config(snapshot: CrawlConfigManager, tool_type: str = "default") -> BrowserConfig:
+    """
+    根据配置快照构建 BrowserConfig
+
+    Args:
+        snapshot: 配置快照
+        tool_type: 工具类型 (default: 基础爬取/浏览器池预热, smart: 智能分析模式)
+    """
+    if tool_type == "smart":
+        return BrowserConfig(
+            headless=snapshot.browser_control.headless_mode,
+            user_agent=SMART_USER_AGENT
+        )
+    return BrowserConfig(
+        headless=snapshot.browser_control.headless_mode,
+        browser_type=snapshot.browser_control.browser_type
+    )
+
+
+class ConfigFactory:
+    """按配置快照缓存 BrowserConfig / CrawlerRunConfig 的工厂"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "built": 0,
+            "build_seconds": 0.0,
+        }
+
+    def _get(self, snapshot: Optional[CrawlConfigManager], key: tuple, builder) -> Any:
+        snapshot = snapshot or get_crawl_config()
+
+        def timed_builder(current_snapshot: CrawlConfigManager) -> Any:
+            start = time.perf_counter()
+            value = builder(current_snapshot)
+            with self._lock:
+                self.stats["built"] += 1
+                self.stats["build_seconds"] += time.perf_counter() - start
+            return value
+
+        with self._lock:
+            self.stats["requests"] += 1
+        return snapshot.derived(key, timed_builder)
+
+    def crawler_config(
+        self,
+        tool_type: str = "default",
+        dynamic_content: Optional[bool] = None,
+        snapshot: Optional[CrawlConfigManager] = None,
+        **overrides
+    ) -> CrawlerRunConfig:
+        """
+        获取 CrawlerRunConfig (缓存对象的浅拷贝，调用方可以自由修改)
+
+        Args:
+            tool_type: 工具类型
+            dynamic_content: 意图分析得到的动态内容标志
+            snapshot: 配置快照，默认使用当前请求的快照
+            **overrides: 额外参数，取值需可哈希 (作为缓存键的一部分)
+        """
+        key = ("crawler_config", tool_type, dynamic_content, tuple(sorted(overrides.items())))
+        template = self._get(
+            snapshot, key,
+            lambda current: build_crawler_config(current, tool_type, dynamic_content, **overrides)
+        )
+        return copy.copy(template)
+
+    def browser_config(self, tool_type: str = "default", snapshot: Optional[CrawlConfigManager] = None) -> BrowserConfig:
+        """获取共享的 BrowserConfig (调用方不应修改)"""
+        return self._get(
+            snapshot, ("browser_config", tool_type),
+            lambda current: build_browser_config(current, tool_type)
+        )
+
+    def prebuild(self, snapshot: Optional[CrawlConfigManager] = None):
+        """预先构建常用的配置对象 (耗时约几百毫秒，应在线程中调用)"""
+        snapshot = snapshot or get_crawl_config()
+        for tool_type in BROWSER_CONFIG_TYPES:
+            self.browser_config(tool_type, snapshot=snapshot)
+        for tool_type in CRAWLER_CONFIG_TYPES:
+            self.crawler_config(tool_type, snapshot=snapshot)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取工厂统计"""
+        with self._lock:
+            stats = dict(self.stats)
+        stats["hits"] = stats["requests"] - stats["built"]
+        stats["hit_rate"] = stats["hits"] / stats["requests"] if stats["requests"] else 0.0
+        return stats
+
+
+# 全局配置工厂实例
+_config_factory = None
+
+def get_config_factory() -> ConfigFactory:
+    """获取全局配置工厂实例"""
+    global _config_factory
+    if _config_factory is None:
+        _config_factory = ConfigFactory()
+    return _config_factory
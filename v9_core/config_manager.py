@@ -1,6 +1,7 @@
 # v9_core/config_manager.py - V9 统一配置管理器
 import json
 import os
+import sys
 from pathlib import Path
 from typing import Dict, Any, Optional
 from dataclasses import dataclass, asdict
@@ -101,7 +102,7 @@ class V6ConfigManager:
                     for name, config in data.items()
                 }
             except Exception as e:
-                print(f"⚠️ 搜索引擎配置加载失败: {e}")
+                print(f"⚠️ 搜索引擎配置加载失败: {e}", file=sys.stderr)
         
         # 返回默认配置
         return self._get_default_search_engines()
@@ -149,7 +150,7 @@ class V6ConfigManager:
                     data = json.load(f)
                 return UserPreferences(**data)
             except Exception as e:
-                print(f"⚠️ 用户偏好加载失败: {e}")
+                print(f"⚠️ 用户偏好加载失败: {e}", file=sys.stderr)
         
         return UserPreferences()
     
@@ -161,7 +162,7 @@ class V6ConfigManager:
                     data = json.load(f)
                 return SystemConfig(**data)
             except Exception as e:
-                print(f"⚠️ 系统配置加载失败: {e}")
+                print(f"⚠️ 系统配置加载失败: {e}", file=sys.stderr)
         
         return SystemConfig()
     
@@ -174,7 +175,7 @@ class V6ConfigManager:
                 claude_data = data.get('claude_api', {})
                 return ClaudeConfig(**claude_data)
             except Exception as e:
-                print(f"⚠️ Claude配置加载失败: {e}")
+                print(f"⚠️ Claude配置加载失败: {e}", file=sys.stderr)
         
         return ClaudeConfig()
     
@@ -195,7 +196,7 @@ class V6ConfigManager:
             with open(self.search_engines_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
         except Exception as e:
-            print(f"⚠️ 搜索引擎配置保存失败: {e}")
+            print(f"⚠️ 搜索引擎配置保存失败: {e}", file=sys.stderr)
     
     def save_user_preferences(self):
         """保存用户偏好"""
@@ -203,7 +204,7 @@ class V6ConfigManager:
             with open(self.user_preferences_file, 'w', encoding='utf-8') as f:
                 json.dump(asdict(self.user_preferences), f, indent=2, ensure_ascii=False)
         except Exception as e:
-            print(f"⚠️ 用户偏好保存失败: {e}")
+            print(f"⚠️ 用户偏好保存失败: {e}", file=sys.stderr)
     
     def save_system_config(self):
         """保存系统配置"""
@@ -211,7 +212,7 @@ class V6ConfigManager:
             with open(self.system_config_file, 'w', encoding='utf-8') as f:
                 json.dump(asdict(self.system_config), f, indent=2, ensure_ascii=False)
         except Exception as e:
-            print(f"⚠️ 系统配置保存失败: {e}")
+            print(f"⚠️ 系统配置保存失败: {e}", file=sys.stderr)
     
     def save_claude_config(self):
         """保存Claude配置"""
@@ -232,7 +233,7 @@ class V6ConfigManager:
             with open(self.claude_config_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
         except Exception as e:
-            print(f"⚠️ Claude配置保存失败: {e}")
+            print(f"⚠️ Claude配置保存失败: {e}", file=sys.stderr)
     
     def get_enabled_search_engines(self) -> Dict[str, SearchEngineConfig]:
         """获取启用的搜索引擎"""
@@ -0,0 +1,394 @@
+# v9_core/config_store.py - V9 配置存储
+"""
+爬取配置存储
+
+原来每次 `update_*` 都在事件循环上同步重写整个 crawl_config.json，
+磁盘上的外部修改要等到重置才生效。这里的配置存储:
+- 持有一个不可变的配置快照，读取方直接取 `current` 引用，无需加锁；
+  更新时复制出新快照再整体替换 (copy-on-write)
+- 更新后防抖一段时间再写盘，写盘在线程中进行，
+  先写同目录临时文件再 os.replace，保证文件不会写出半截
+- 轮询配置文件的 (mtime, size)，外部修改通过校验后热加载，
+  校验失败保留原快照；自己写入的文件不会触发重新加载
+- 工具调用期间固定一份快照 (with_config_snapshot)，同一请求内的所有读取
+  看到同一版本的配置，不会读到一半旧一半新的配置
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import fields
+from functools import wraps
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from v9_core.crawl_config_manager import CONFIG_SECTIONS, ConfigValidationError, CrawlConfigManager
+
+# 更新后等待多久再写盘 (秒)，期间的多次更新合并为一次写入
+DEFAULT_DEBOUNCE_SECONDS = 0.5
+# 配置文件轮询间隔 (秒)
+DEFAULT_POLL_INTERVAL_SECONDS = 2.0
+
+# 当前请求固定的配置快照
+_pinned_snapshot: ContextVar[Optional[CrawlConfigManager]] = ContextVar("pinned_config_snapshot", default=None)
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """返回文件的 (mtime_ns, size)，文件不存在时返回 None"""
+    try:
+        stat = path.stat()
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def validate_config_data(config_data: Any) -> List[str]:
+    """
+    校验配置数据 (取值可转换为字段类型即视为通过)
+
+    Returns:
+        错误列表，为空表示通过
+    """
+    if not isinstance(config_data, dict):
+        return ["配置文件顶层必须是对象"]
+
+    errors = []
+    for section_name in CONFIG_SECTIONS:
+        section_data = config_data.get(section_name)
+        if section_data is not None and not isinstance(section_data, dict):
+            errors.append(f"{section_name}: 必须是对象")
+    if errors:
+        return errors
+
+    try:
+        CrawlConfigManager(config_data=config_data)
+    except ConfigValidationError as e:
+        return e.errors
+    return []
+
+
+def write_json_atomic(path: Path, data: Dict[str, Any]) -> Tuple[int, int]:
+    """
+    原子写入JSON文件: 写同目录临时文件、fsync 后 os.replace
+
+    Returns:
+        写入后文件的 (mtime_ns, size)
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ConfigStore:
+    """持有配置快照的存储，负责防抖写盘和文件热加载"""
+
+    def __init__(
+        self,
+        config_file: Optional[str] = None,
+        debounce_seconds: float = DEFAULT_DEBOUNCE_SECONDS,
+        poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS
+    ):
+        self.debounce_seconds = max(0.0, debounce_seconds)
+        self.poll_interval_seconds = max(0.1, poll_interval_seconds)
+
+        try:
+            self._current = CrawlConfigManager(config_file)
+        except ConfigValidationError as e:
+            # 配置文件取值有误时使用默认配置启动，文件保持原样等待修正
+            print(f"❌ 配置文件校验失败，使用默认配置: {e}", file=sys.stderr)
+            self._current = CrawlConfigManager(config_file, config_data={})
+        self.config_file = self._current.config_file
+        self._file_signature = _file_signature(self.config_file)
+
+        # 只保护写者之间的快照替换和写盘状态，读取 current 不需要加锁
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._dirty = False
+        self._save_handle: Optional[asyncio.TimerHandle] = None
+        self._save_task: Optional[asyncio.Task] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        self._subscribers: Dict[str, List[Callable[[Any], None]]] = {}
+
+        self.stats = {
+            "updates": 0,
+            "saves": 0,
+            "save_errors": 0,
+            "reloads": 0,
+            "rejected_reloads": 0,
+        }
+
+    @property
+    def current(self) -> CrawlConfigManager:
+        """当前配置快照 (发布后不会再被修改)"""
+        return self._current
+
+    def _publish(self, snapshot: CrawlConfigManager):
+        previous, self._current = self._current, snapshot
+        for section, callbacks in self._subscribers.items():
+            settings = getattr(snapshot, section)
+            if settings == getattr(previous, section):
+                continue
+            for callback in callbacks:
+                try:
+                    callback(settings)
+                except Exception as e:
+                    print(f"⚠️  配置段 {section} 的订阅者更新失败: {e}", file=sys.stderr)
+
+    def subscribe(self, section: str, callback: Callable[[Any], None]):
+        """
+        订阅配置段的变化
+
+        tool 更新、reload 或配置文件热加载发布的新快照中该段取值改变时，
+        以新的配置段调用 callback。回调在发布快照的线程中执行 (可能是文件监视线程)，
+        只应修改设置字段，不能再调用 update。
+        """
+        if section not in CONFIG_SECTIONS:
+            raise ConfigValidationError([f"未知配置段: {section}"])
+        self._subscribers.setdefault(section, []).append(callback)
+
+    def update(self, section: str, **kwargs) -> CrawlConfigManager:
+        """
+        更新某个配置段并安排写盘
+
+        Args:
+            section: 配置段名称，如 content_limits
+            **kwargs: 要更新的字段，取值按字段类型转换 (如 "5000" -> 5000)
+
+        Returns:
+            更新后的配置快照
+
+        Raises:
+            ConfigValidationError: 配置段或字段未知，或取值无法转换
+        """
+        if section not in CONFIG_SECTIONS:
+            raise ConfigValidationError([f"未知配置段: {section}"])
+
+        with self._lock:
+            current = self._current
+            field_names = {field_info.name for field_info in fields(getattr(current, section))}
+            unknown = [key for key in kwargs if key not in field_names]
+            if unknown:
+                raise ConfigValidationError([f"{section}: 未知字段 {key}" for key in unknown])
+
+            config_data = current.to_dict()
+            config_data[section].update(kwargs)
+
+            # 新快照构造时完成校验，校验失败不会替换当前快照
+            self._publish(CrawlConfigManager(self.config_file, config_data=config_data))
+            self._dirty = True
+            self.stats["updates"] += 1
+
+        self._schedule_save()
+        return self._current
+
+    def reload(self) -> CrawlConfigManager:
+        """立即从文件重新加载配置 (丢弃尚未写盘的修改)"""
+        with self._lock:
+            self._cancel_pending_save()
+            self._dirty = False
+            self._publish(CrawlConfigManager(self.config_file))
+            self._file_signature = _file_signature(self.config_file)
+            self.stats["reloads"] += 1
+        return self._current
+
+    # ---- 写盘 ----
+
+    def _schedule_save(self):
+        """在事件循环上防抖写盘；没有运行中的事件循环时同步写入"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._save_now()
+            return
+
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+        self._save_handle = loop.call_later(self.debounce_seconds, self._start_background_save)
+
+    def _start_background_save(self):
+        self._save_handle = None
+        if self._save_task is not None and not self._save_task.done():
+            # 上一次写盘还没完成，完成后再写
+            self._save_task.add_done_callback(lambda _: self._schedule_save())
+            return
+        self._save_task = asyncio.get_running_loop().create_task(asyncio.to_thread(self._save_now))
+
+    def _cancel_pending_save(self):
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+
+    def _save_now(self) -> bool:
+        """把当前快照写入配置文件 (在工作线程或无事件循环时调用)"""
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return True
+                snapshot = self._current
+                self._dirty = False
+            try:
+                signature = write_json_atomic(self.config_file, snapshot.to_dict())
+            except Exception as e:
+                with self._lock:
+                    self._dirty = True
+                self.stats["save_errors"] += 1
+                print(f"❌ 配置保存失败: {e}", file=sys.stderr)
+                return False
+            with self._lock:
+                self._file_signature = signature
+            self.stats["saves"] += 1
+            print(f"✅ 配置已保存: {self.config_file}", file=sys.stderr)
+            return True
+
+    async def flush(self):
+        """立即写入尚未保存的修改"""
+        self._cancel_pending_save()
+        if self._save_task is not None and not self._save_task.done():
+            await asyncio.gather(self._save_task, return_exceptions=True)
+        if self._dirty:
+            await asyncio.to_thread(self._save_now)
+
+    # ---- 文件监视 ----
+
+    def _read_external_change(self) -> Optional[CrawlConfigManager]:
+        """读取并校验外部修改后的配置文件，返回新快照；无变化或校验失败返回 None"""
+        signature = _file_signature(self.config_file)
+        if signature is None or signature == self._file_signature:
+            return None
+
+        try:
+            with open(self.config_file, 'r', encoding='utf-8') as f:
+                config_data = json.load(f)
+            errors = validate_config_data(config_data)
+            snapshot = None if errors else CrawlConfigManager(self.config_file, config_data=config_data)
+        except Exception as e:
+            errors = [str(e)]
+
+        with self._lock:
+            # 同一版本的文件只处理一次，校验失败后等待下一次修改
+            self._file_signature = signature
+            if errors:
+                self.stats["rejected_reloads"] += 1
+                print(f"❌ 配置文件修改未通过校验，继续使用原配置: {'; '.join(errors)}", file=sys.stderr)
+                return None
+            if self._dirty:
+                # 本地还有未写盘的修改时，以文件内容为准
+                self._cancel_pending_save()
+                self._dirty = False
+            self._publish(snapshot)
+            self.stats["reloads"] += 1
+        print(f"🔄 配置文件已修改，热加载完成: {self.config_file}", file=sys.stderr)
+        return snapshot
+
+    def check_for_changes(self) -> bool:
+        """同步检查一次配置文件，返回是否热加载了新配置"""
+        return self._read_external_change() is not None
+
+    async def _watch_loop(self):
+        while True:
+            await asyncio.sleep(self.poll_interval_seconds)
+            try:
+                await asyncio.to_thread(self._read_external_change)
+            except Exception as e:
+                print(f"⚠️  配置文件监视出错: {e}", file=sys.stderr)
+
+    async def start(self):
+        """启动配置文件监视"""
+        if self._watch_task is None or self._watch_task.done():
+            self._watch_task = asyncio.create_task(self._watch_loop())
+            print(f"👀 配置文件监视已启动 (每{self.poll_interval_seconds}秒检查)", file=sys.stderr)
+
+    async def stop(self):
+        """停止文件监视并写入尚未保存的修改"""
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            await asyncio.gather(self._watch_task, return_exceptions=True)
+            self._watch_task = None
+        await self.flush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取存储统计"""
+        return {
+            **self.stats,
+            "pending_save": self._dirty,
+            "watching": self._watch_task is not None and not self._watch_task.done(),
+        }
+
+
+class LiveConfig:
+    """指向当前配置快照的只读视图 (请求内为该请求固定的快照)，供长期持有配置引用的模块使用"""
+
+    def __init__(self, store: ConfigStore):
+        object.__setattr__(self, "_store", store)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(_pinned_snapshot.get() or self._store.current, name)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("配置快照只读，请使用 update_* 方法修改")
+
+
+# 全局配置存储实例
+_config_store = None
+_config_store_lock = threading.Lock()
+
+def get_config_store() -> ConfigStore:
+    """获取全局配置存储实例"""
+    global _config_store
+    if _config_store is None:
+        with _config_store_lock:
+            if _config_store is None:
+                _config_store = ConfigStore()
+    return _config_store
+
+def get_live_config() -> LiveConfig:
+    """获取指向全局配置存储当前快照的视图"""
+    return LiveConfig(get_config_store())
+
+def current_snapshot() -> CrawlConfigManager:
+    """获取当前请求固定的配置快照，未固定时返回存储的最新快照"""
+    return _pinned_snapshot.get() or get_config_store().current
+
+@contextmanager
+def pin_config_snapshot(snapshot: Optional[CrawlConfigManager] = None) -> Iterator[CrawlConfigManager]:
+    """
+    在上下文内固定一份配置快照
+
+    上下文内创建的子任务继承同一份快照；已经固定时沿用外层快照。
+    """
+    pinned = _pinned_snapshot.get()
+    if pinned is not None and snapshot is None:
+        yield pinned
+        return
+    snapshot = snapshot or get_config_store().current
+    token = _pinned_snapshot.set(snapshot)
+    try:
+        yield snapshot
+    finally:
+        _pinned_snapshot.reset(token)
+
+def with_config_snapshot(func: Callable) -> Callable:
+    """异步工具装饰器: 每次调用固定一份配置快照"""
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        with pin_config_snapshot():
+            return await func(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,660 @@
+# v9_core/corpus_store.py - V9 持久爬取语料库
+"""
+追加写入的本地爬取语料库
+
+结果缓存按配置和TTL存放，过期即删除；语料库则保存每个工具爬取到的所有页面，
+跨会话保留，agent 可以直接取回或检索之前爬过的内容而不访问网络。
+
+存储格式: 语料目录下的段文件 (segment-000001.v9c ...) 只追加写入，每条记录为
+    头部 (魔数, 元数据长度, 正文长度, CRC32) + 元数据JSON + 正文 (UTF-8 Markdown)
+段文件超过 segment_max_mb 后封存，新记录写入下一个段。
+索引 (URL哈希 -> 按抓取时间排序的各版本位置) 在首次使用时扫描段文件头部重建，
+最后一个段的尾部如果是写了一半的记录 (进程崩溃) 会被截掉。
+
+读取: 段文件通过 mmap 只读映射，取正文时直接切片映射区，检索时正则直接在
+映射区上匹配，不需要先把文件读入内存。
+压缩: 每个URL只保留最近 max_versions_per_url 个版本 (以及 max_age_days 内的版本)，
+被替换的旧版本成为失效记录；已封存段的失效比例超过 compaction_min_stale_ratio 时，
+把其中仍有效的记录搬到当前段，再删除旧段文件。
+
+全文检索: 可选的 BM25 索引 (v9_core.search_index) 由语料库维护，
+启动后在后台全量构建，之后每次写入新版本时增量更新。
+"""
+
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from v9_core.result_cache import normalize_url
+from v9_core.search_index import BM25Index, tokenize
+
+# 记录头部: 魔数, 元数据长度, 正文长度, CRC32(元数据 + 正文)
+RECORD_MAGIC = b"V9CR"
+RECORD_HEADER = struct.Struct("<4sIII")
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".v9c"
+
+# 单个检索词在一篇文档中计分的最大出现次数
+MAX_TERM_HITS = 20
+
+
+def url_hash(url: str) -> str:
+    """规范化URL的哈希 (索引键)"""
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass
+class CorpusRecord:
+    """一条语料记录在段文件中的位置和元数据"""
+    url: str
+    url_hash: str
+    fetched_at: float
+    segment: int
+    offset: int
+    meta_len: int
+    body_len: int
+    title: str = ""
+    tool: str = ""
+    status_code: Optional[int] = None
+    content_hash: str = ""
+
+    @property
+    def record_len(self) -> int:
+        return RECORD_HEADER.size + self.meta_len + self.body_len
+
+    @property
+    def body_offset(self) -> int:
+        return self.offset + RECORD_HEADER.size + self.meta_len
+
+
+@dataclass
+class CorpusDocument:
+    """从语料库读取的页面，接口与 CrawlResult 的常用字段一致"""
+    url: str
+    markdown: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    status_code: Optional[int] = None
+    fetched_at: float = 0.0
+    versions: int = 1
+    success: bool = True
+    error_message: Optional[str] = None
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+
+@dataclass
+class CorpusHit:
+    """检索结果"""
+    url: str
+    title: str
+    fetched_at: float
+    score: float
+    snippet: str
+
+
+class CorpusStore:
+    """段文件 + URL索引的持久语料库"""
+
+    def __init__(
+        self,
+        corpus_dir: str = "v9_corpus",
+        segment_max_mb: int = 64,
+        max_versions_per_url: int = 3,
+        max_age_days: int = 0,
+        compaction_min_stale_ratio: float = 0.5,
+        enabled: bool = True,
+        index: Optional[BM25Index] = None
+    ):
+        self.corpus_dir = Path(corpus_dir)
+        self.segment_max_bytes = max(1, segment_max_mb) * 1024 * 1024
+        self.max_versions_per_url = max(1, max_versions_per_url)
+        self.max_age_seconds = max_age_days * 86400
+        self.compaction_min_stale_ratio = compaction_min_stale_ratio
+        self.enabled = enabled
+        self.index = index
+
+        # URL哈希 -> 按抓取时间排序的版本 (最后一个为最新)
+        self._versions: Dict[str, List[CorpusRecord]] = {}
+        self._segment_sizes: Dict[int, int] = {}
+        self._segment_live: Dict[int, int] = {}
+        self._maps: Dict[int, mmap.mmap] = {}
+        self._writer = None
+        self._active_segment = 0
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._compaction_task: Optional[asyncio.Task] = None
+        self._closing = False
+        self._stats = {"writes": 0, "unchanged": 0, "reads": 0, "searches": 0, "compactions": 0, "reclaimed_bytes": 0}
+
+    # ----- 公共接口 -----
+
+    async def put(self, url: str, result: Any, tool: str = "") -> Optional[CorpusRecord]:
+        """
+        保存成功的爬取结果
+
+        与该URL最新版本内容相同时不重复写入。
+
+        Returns:
+            新写入的记录，未写入时返回 None
+        """
+        if not self.enabled or not getattr(result, "success", False):
+            return None
+        markdown = getattr(result, "markdown", None)
+        if not markdown:
+            return None
+        metadata = getattr(result, "metadata", None) or {}
+        try:
+            async with self._lock:
+                record = await asyncio.to_thread(
+                    self._put_sync, url, str(markdown), metadata.get("title") or "",
+                    getattr(result, "status_code", None), tool
+                )
+        except Exception as e:
+            print(f"⚠️ 语料库写入失败: {e}", file=sys.stderr)
+            return None
+        if record is not None:
+            self._schedule_compaction()
+        return record
+
+    async def get(self, url: str, version: int = 0, max_age_seconds: Optional[float] = None) -> Optional[CorpusDocument]:
+        """
+        读取URL的已保存内容
+
+        Args:
+            url: 页面URL
+            version: 0 为最新版本，1 为上一个版本，依此类推
+            max_age_seconds: 只接受该时间内抓取的版本
+        """
+        if not self.enabled:
+            return None
+        async with self._lock:
+            return await asyncio.to_thread(self._get_sync, url, version, max_age_seconds)
+
+    async def history(self, url: str) -> List[CorpusRecord]:
+        """获取URL的所有已保存版本 (最新的在前)"""
+        if not self.enabled:
+            return []
+        async with self._lock:
+            await asyncio.to_thread(self._ensure_loaded)
+            return list(reversed(self._versions.get(url_hash(url), [])))
+
+    async def search(self, query: str, limit: int = 10, snippet_chars: int = 240) -> List[CorpusHit]:
+        """
+        在每个URL的最新版本中检索所有关键词
+
+        关键词按空白分隔，不区分大小写 (仅限ASCII字母)，标题命中的权重更高。
+        """
+        terms = [term for term in query.split() if term]
+        if not self.enabled or not terms:
+            return []
+        async with self._lock:
+            return await asyncio.to_thread(self._search_sync, terms, limit, snippet_chars)
+
+    async def build_index(self):
+        """从语料库全量构建全文索引 (已构建或未启用索引时不做任何事)"""
+        if not self.enabled or self.index is None or self.index.ready:
+            return
+        async with self._lock:
+            await asyncio.to_thread(self._build_index_sync)
+
+    async def ranked_search(self, query: str, limit: int = 10, snippet_chars: int = 240) -> List[CorpusHit]:
+        """
+        按 BM25 得分检索每个URL的最新版本 (索引尚未构建时先构建)
+        """
+        if not self.enabled or self.index is None:
+            return []
+        if not self.index.ready:
+            await self.build_index()
+        ranked = self.index.search(query, limit)
+        if not ranked:
+            return []
+        async with self._lock:
+            return await asyncio.to_thread(self._ranked_hits_sync, query, ranked, snippet_chars)
+
+    async def compact(self) -> int:
+        """
+        压缩失效比例超过阈值的已封存段
+
+        Returns:
+            回收的字节数
+        """
+        if not self.enabled:
+            return 0
+        async with self._lock:
+            return await asyncio.to_thread(self._compact_sync)
+
+    async def close(self):
+        """等待后台压缩完成，落盘并释放所有映射 (进行中的索引构建会提前结束)"""
+        self._closing = True
+        if self._compaction_task is not None:
+            await asyncio.gather(self._compaction_task, return_exceptions=True)
+        async with self._lock:
+            await asyncio.to_thread(self._close_sync)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取语料库统计"""
+        total = sum(self._segment_sizes.values())
+        live = sum(self._segment_live.values())
+        return {
+            "enabled": self.enabled,
+            "loaded": self._loaded,
+            "urls": len(self._versions),
+            "versions": sum(len(versions) for versions in self._versions.values()),
+            "segments": len(self._segment_sizes),
+            "size_mb": round(total / (1024 * 1024), 2),
+            "stale_mb": round((total - live) / (1024 * 1024), 2),
+            **self._stats
+        }
+
+    # ----- 段文件与索引 -----
+
+    def _segment_path(self, segment: int) -> Path:
+        return self.corpus_dir / f"{SEGMENT_PREFIX}{segment:06d}{SEGMENT_SUFFIX}"
+
+    def _ensure_loaded(self):
+        """首次使用时扫描段文件头部重建索引"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.corpus_dir.exists():
+            return
+
+        segments = sorted(
+            int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)])
+            for path in self.corpus_dir.glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}")
+        )
+        for segment in segments:
+            # 只校验最后一个段的正文CRC (只有它可能有写了一半的记录)
+            self._scan_segment(segment, verify=segment == segments[-1])
+        if segments:
+            self._active_segment = segments[-1]
+
+        now = time.time()
+        for versions in self._versions.values():
+            versions.sort(key=lambda record: record.fetched_at)
+            self._prune_versions(versions, now)
+
+    def _scan_segment(self, segment: int, verify: bool):
+        path = self._segment_path(segment)
+        size = path.stat().st_size
+        self._segment_sizes[segment] = size
+        self._segment_live[segment] = 0
+        if size == 0:
+            return
+
+        view = self._map(segment, size)
+        offset = 0
+        while offset < size:
+            record = self._read_record(view, segment, offset, size, verify)
+            if record is None:
+                break
+            self._versions.setdefault(record.url_hash, []).append(record)
+            self._segment_live[segment] += record.record_len
+            offset += record.record_len
+
+        if offset < size:
+            if verify:
+                # 截掉进程崩溃时写了一半的尾部记录
+                print(f"⚠️ 语料库段 {path.name} 尾部有 {size - offset} 字节不完整记录，已截断", file=sys.stderr)
+                self._unmap(segment)
+                os.truncate(path, offset)
+                self._segment_sizes[segment] = offset
+            else:
+                print(f"⚠️ 语料库段 {path.name} 在偏移 {offset} 处损坏，之后的记录被忽略", file=sys.stderr)
+
+    @staticmethod
+    def _read_record(view: mmap.mmap, segment: int, offset: int, size: int, verify: bool) -> Optional[CorpusRecord]:
+        if offset + RECORD_HEADER.size > size:
+            return None
+        magic, meta_len, body_len, crc = RECORD_HEADER.unpack_from(view, offset)
+        end = offset + RECORD_HEADER.size + meta_len + body_len
+        if magic != RECORD_MAGIC or end > size:
+            return None
+        meta_start = offset + RECORD_HEADER.size
+        if verify and zlib.crc32(view[meta_start:end]) != crc:
+            return None
+        try:
+            meta = json.loads(view[meta_start:meta_start + meta_len])
+        except ValueError:
+            return None
+        return CorpusRecord(
+            url=meta["url"],
+            url_hash=meta["url_hash"],
+            fetched_at=meta["fetched_at"],
+            segment=segment,
+            offset=offset,
+            meta_len=meta_len,
+            body_len=body_len,
+            title=meta.get("title", ""),
+            tool=meta.get("tool", ""),
+            status_code=meta.get("status_code"),
+            content_hash=meta.get("content_hash", "")
+        )
+
+    def _map(self, segment: int, end: int) -> mmap.mmap:
+        """获取覆盖到 end 的只读映射 (当前段增长后重新映射)"""
+        view = self._maps.get(segment)
+        if view is None or len(view) < end:
+            self._unmap(segment)
+            with open(self._segment_path(segment), "rb") as f:
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self._maps[segment] = view
+        return view
+
+    def _unmap(self, segment: int):
+        view = self._maps.pop(segment, None)
+        if view is not None:
+            view.close()
+
+    def _decode(self, segment: int, start: int, end: int) -> str:
+        """直接从映射区解码文本 (不经过中间 bytes 拷贝)，UTF-8 截断处的字符被丢弃"""
+        view = self._map(segment, end)
+        with memoryview(view) as buffer:
+            return str(buffer[start:end], "utf-8", "ignore")
+
+    def _body(self, record: CorpusRecord) -> str:
+        return self._decode(record.segment, record.body_offset, record.body_offset + record.body_len)
+
+    def _append(self, meta: Dict[str, Any], body: bytes) -> CorpusRecord:
+        """把一条记录追加到当前段 (超过段大小上限时先切换到新段)"""
+        meta_bytes = json.dumps(meta, ensure_ascii=False).encode("utf-8")
+        if self._writer is None or self._segment_sizes.get(self._active_segment, 0) >= self.segment_max_bytes:
+            self._roll_segment()
+
+        offset = self._segment_sizes[self._active_segment]
+        crc = zlib.crc32(body, zlib.crc32(meta_bytes))
+        self._writer.write(RECORD_HEADER.pack(RECORD_MAGIC, len(meta_bytes), len(body), crc) + meta_bytes + body)
+        self._writer.flush()
+
+        record = CorpusRecord(
+            url=meta["url"],
+            url_hash=meta["url_hash"],
+            fetched_at=meta["fetched_at"],
+            segment=self._active_segment,
+            offset=offset,
+            meta_len=len(meta_bytes),
+            body_len=len(body),
+            title=meta["title"],
+            tool=meta["tool"],
+            status_code=meta["status_code"],
+            content_hash=meta["content_hash"]
+        )
+        self._segment_sizes[self._active_segment] += record.record_len
+        self._segment_live[self._active_segment] += record.record_len
+        return record
+
+    def _roll_segment(self):
+        """打开当前段用于追加；当前段已满时封存并新建下一个段"""
+        self.corpus_dir.mkdir(parents=True, exist_ok=True)
+        if self._writer is not None:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+            self._writer.close()
+            self._writer = None
+        if self._active_segment == 0 or self._segment_sizes.get(self._active_segment, 0) >= self.segment_max_bytes:
+            self._active_segment += 1
+        self._writer = open(self._segment_path(self._active_segment), "ab")
+        self._segment_sizes.setdefault(self._active_segment, 0)
+        self._segment_live.setdefault(self._active_segment, 0)
+
+    def _prune_versions(self, versions: List[CorpusRecord], now: float):
+        """超出版本数上限或过期的旧版本标记为失效 (最新版本始终保留)"""
+        while len(versions) > 1 and (
+            len(versions) > self.max_versions_per_url
+            or (self.max_age_seconds and now - versions[0].fetched_at > self.max_age_seconds)
+        ):
+            stale = versions.pop(0)
+            self._segment_live[stale.segment] -= stale.record_len
+
+    # ----- 同步实现 (在线程中执行，调用方持有锁) -----
+
+    def _put_sync(self, url: str, markdown: str, title: str, status_code: Optional[int], tool: str) -> Optional[CorpusRecord]:
+        self._ensure_loaded()
+        body = markdown.encode("utf-8")
+        key = url_hash(url)
+        content_hash = hashlib.sha256(body).hexdigest()[:32]
+        versions = self._versions.setdefault(key, [])
+        if versions and versions[-1].content_hash == content_hash:
+            self._stats["unchanged"] += 1
+            return None
+
+        record = self._append({
+            "url": url,
+            "url_hash": key,
+            "fetched_at": time.time(),
+            "title": title,
+            "status_code": status_code,
+            "tool": tool,
+            "content_hash": content_hash,
+        }, body)
+        versions.append(record)
+        self._prune_versions(versions, record.fetched_at)
+        self._stats["writes"] += 1
+        # 索引构建前写入的记录由全量构建覆盖
+        if self.index is not None and self.index.ready:
+            self.index.add(key, url, title, markdown, record.fetched_at)
+        return record
+
+    def _build_index_sync(self):
+        if self.index.ready:
+            return
+        self._ensure_loaded()
+        start = time.perf_counter()
+        for versions in list(self._versions.values()):
+            if self._closing:
+                return
+            record = versions[-1]
+            self.index.add(record.url_hash, record.url, record.title, self._body(record), record.fetched_at)
+        elapsed = time.perf_counter() - start
+        self.index.record_build(elapsed)
+        print(f"🔎 语料库全文索引已构建: {len(self._versions)} 个页面, 耗时 {elapsed:.2f}s", file=sys.stderr)
+
+    def _ranked_hits_sync(self, query: str, ranked: List[Any], snippet_chars: int) -> List[CorpusHit]:
+        # 用原文中能找到的第一个检索词定位摘要
+        patterns = [
+            re.compile(re.escape(term.encode("utf-8")), re.IGNORECASE)
+            for term in dict.fromkeys(tokenize(query))
+        ]
+        hits = []
+        for score, document in ranked:
+            versions = self._versions.get(document.key)
+            if not versions:
+                continue
+            record = versions[-1]
+            start, end = record.body_offset, record.body_offset + record.body_len
+            view = self._map(record.segment, end)
+            first_match = None
+            for pattern in patterns:
+                match = pattern.search(view, start, end)
+                if match is not None:
+                    first_match = match.start()
+                    break
+            hits.append(CorpusHit(
+                url=record.url,
+                title=record.title,
+                fetched_at=record.fetched_at,
+                score=score,
+                snippet=self._snippet(record, first_match, snippet_chars)
+            ))
+        return hits
+
+    def _get_sync(self, url: str, version: int, max_age_seconds: Optional[float]) -> Optional[CorpusDocument]:
+        self._ensure_loaded()
+        versions = self._versions.get(url_hash(url))
+        if not versions or version < 0 or version >= len(versions):
+            return None
+        record = versions[-1 - version]
+        if max_age_seconds is not None and time.time() - record.fetched_at > max_age_seconds:
+            return None
+        self._stats["reads"] += 1
+        return CorpusDocument(
+            url=record.url,
+            markdown=self._body(record),
+            metadata={"title": record.title, "tool": record.tool},
+            status_code=record.status_code,
+            fetched_at=record.fetched_at,
+            versions=len(versions)
+        )
+
+    def _search_sync(self, terms: List[str], limit: int, snippet_chars: int) -> List[CorpusHit]:
+        self._ensure_loaded()
+        self._stats["searches"] += 1
+        patterns = [re.compile(re.escape(term.encode("utf-8")), re.IGNORECASE) for term in terms]
+        lowered_terms = [term.lower() for term in terms]
+
+        hits = []
+        for versions in self._versions.values():
+            record = versions[-1]
+            start, end = record.body_offset, record.body_offset + record.body_len
+            view = self._map(record.segment, end)
+            score = 0.0
+            first_match = None
+            for pattern, term in zip(patterns, lowered_terms):
+                # 正则直接在映射区上匹配，不复制正文
+                count = 0
+                for match in pattern.finditer(view, start, end):
+                    if first_match is None:
+                        first_match = match.start()
+                    count += 1
+                    if count >= MAX_TERM_HITS:
+                        break
+                in_title = term in record.title.lower()
+                if count == 0 and not in_title:
+                    break
+                score += count + (5 if in_title else 0)
+            else:
+                hits.append((score, record, first_match))
+
+        hits.sort(key=lambda item: (item[0], item[1].fetched_at), reverse=True)
+        results = []
+        for score, record, first_match in hits[:max(1, limit)]:
+            results.append(CorpusHit(
+                url=record.url,
+                title=record.title,
+                fetched_at=record.fetched_at,
+                score=score,
+                snippet=self._snippet(record, first_match, snippet_chars)
+            ))
+        return results
+
+    def _snippet(self, record: CorpusRecord, match_offset: Optional[int], snippet_chars: int) -> str:
+        """截取首个命中位置附近的文本 (命中前保留约三分之一)"""
+        start, end = record.body_offset, record.body_offset + record.body_len
+        if match_offset is None:
+            match_offset = start
+        # UTF-8 每个字符最多4字节，按字节多取一些再按字符截断
+        before = self._decode(record.segment, max(start, match_offset - snippet_chars * 4), match_offset)
+        after = self._decode(record.segment, match_offset, min(end, match_offset + snippet_chars * 4))
+        before = " ".join(before.split())[-(snippet_chars // 3):] if before.strip() else ""
+        after = " ".join(after.split())
+        text = f"{before} {after}" if before else after
+        return text[:snippet_chars]
+
+    def _compact_sync(self) -> int:
+        self._ensure_loaded()
+        now = time.time()
+        for versions in self._versions.values():
+            self._prune_versions(versions, now)
+
+        candidates = [
+            segment for segment, size in self._segment_sizes.items()
+            if segment != self._active_segment and size
+            and (size - self._segment_live[segment]) / size >= self.compaction_min_stale_ratio
+        ]
+        if not candidates:
+            return 0
+
+        moving: Dict[int, List[CorpusRecord]] = {segment: [] for segment in candidates}
+        for versions in self._versions.values():
+            for record in versions:
+                if record.segment in moving:
+                    moving[record.segment].append(record)
+
+        reclaimed = 0
+        for segment in candidates:
+            for record in sorted(moving[segment], key=lambda item: item.offset):
+                view = self._map(segment, record.offset + record.record_len)
+                meta = json.loads(view[record.offset + RECORD_HEADER.size:record.body_offset])
+                body = view[record.body_offset:record.body_offset + record.body_len]
+                moved = self._append(meta, body)
+                record.segment, record.offset = moved.segment, moved.offset
+            if self._writer is not None:
+                # 有效记录落盘后才能删除旧段
+                self._writer.flush()
+                os.fsync(self._writer.fileno())
+
+            reclaimed += self._segment_sizes[segment] - self._segment_live[segment]
+            self._unmap(segment)
+            self._segment_path(segment).unlink(missing_ok=True)
+            del self._segment_sizes[segment]
+            del self._segment_live[segment]
+
+        self._stats["compactions"] += 1
+        self._stats["reclaimed_bytes"] += reclaimed
+        print(f"🗜️ 语料库压缩完成: {len(candidates)} 个段, 回收 {reclaimed / 1024:.0f}KB", file=sys.stderr)
+        return reclaimed
+
+    def _close_sync(self):
+        if self._writer is not None:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+            self._writer.close()
+            self._writer = None
+        for segment in list(self._maps):
+            self._unmap(segment)
+
+    # ----- 后台压缩 -----
+
+    def _needs_compaction(self) -> bool:
+        return any(
+            segment != self._active_segment and size
+            and (size - self._segment_live[segment]) / size >= self.compaction_min_stale_ratio
+            for segment, size in self._segment_sizes.items()
+        )
+
+    def _schedule_compaction(self):
+        if self._compaction_task is not None and not self._compaction_task.done():
+            return
+        if self._needs_compaction():
+            self._compaction_task = asyncio.create_task(self.compact())
+
+
+# 全局语料库实例
+_corpus_store = None
+
+def get_corpus_store() -> CorpusStore:
+    """获取全局语料库实例"""
+    global _corpus_store
+    if _corpus_store is None:
+        from v9_core.crawl_config_manager import get_crawl_config
+        corpus_config = get_crawl_config().corpus
+        corpus_dir = Path(corpus_config.corpus_dir)
+        if not corpus_dir.is_absolute():
+            corpus_dir = Path(__file__).parent.parent / corpus_dir
+        index = BM25Index(
+            k1=corpus_config.bm25_k1,
+            b=corpus_config.bm25_b,
+            title_weight=corpus_config.index_title_weight
+        ) if corpus_config.index_enabled else None
+        _corpus_store = CorpusStore(
+            corpus_dir=str(corpus_dir),
+            segment_max_mb=corpus_config.segment_max_mb,
+            max_versions_per_url=corpus_config.max_versions_per_url,
+            max_age_days=corpus_config.max_age_days,
+            compaction_min_stale_ratio=corpus_config.compaction_min_stale_ratio,
+            enabled=corpus_config.enabled,
+            index=index
+        )
+    return _corpus_store
@@ -2,57 +2,345 @@
 """
 爬取配置管理器
 统一管理所有爬取相关的参数配置
+
+每个 CrawlConfigManager 实例都是一份只读的配置快照: 各配置段是
+frozen + slots 的 dataclass，构造时按字段类型校验并转换取值
+(如 "5000" -> 5000)，无法转换时抛出 ConfigValidationError。
+修改配置由配置存储 (v9_core.config_store) 生成新的快照并整体替换。
 """
 
+import itertools
 import json
+import math
 import os
+import sys
 from pathlib import Path
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_args, get_origin
+from dataclasses import dataclass, field, fields
+
+_TRUE_STRINGS = {"true", "1", "yes", "on"}
+_FALSE_STRINGS = {"false", "0", "no", "off"}
+
+# 资源拦截配置名称 (见 v9_core.resource_blocking)
+RESOURCE_PROFILE_NAMES = ("text_only", "text_css", "full")
+
+# 配置快照版本号，每创建一份快照递增
+_snapshot_versions = itertools.count(1)
+
+
+class ConfigValidationError(ValueError):
+    """配置取值无法通过校验"""
+
+    def __init__(self, errors: List[str]):
+        self.errors = list(errors)
+        super().__init__("; ".join(self.errors))
+
+
+class FrozenDict(dict):
+    """只读字典，JSON序列化和显示与普通字典相同"""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("配置快照只读，请使用 update_* 方法修改")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+
+def _coerce_value(expected_type: Any, value: Any) -> Any:
+    """按字段类型校验并转换配置取值，无法转换时抛出 ValueError"""
+    origin = get_origin(expected_type)
+
+    if expected_type is bool:
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, int) and value in (0, 1):
+            return bool(value)
+        if isinstance(value, str) and value.strip().lower() in _TRUE_STRINGS | _FALSE_STRINGS:
+            return value.strip().lower() in _TRUE_STRINGS
+        raise ValueError(f"无法转换为 bool: {value!r}")
+
+    if expected_type is int:
+        if isinstance(value, int) and not isinstance(value, bool):
+            return value
+        if isinstance(value, str):
+            try:
+                return int(value.strip())
+            except ValueError:
+                pass
+            try:
+                value = float(value.strip())
+            except ValueError:
+                raise ValueError(f"无法转换为 int: {value!r}") from None
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        raise ValueError(f"无法转换为 int: {value!r}")
+
+    if expected_type is float:
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            number = float(value)
+        elif isinstance(value, str):
+            try:
+                number = float(value.strip())
+            except ValueError:
+                raise ValueError(f"无法转换为 float: {value!r}") from None
+        else:
+            raise ValueError(f"无法转换为 float: {value!r}")
+        if not math.isfinite(number):
+            raise ValueError(f"必须是有限数值: {value!r}")
+        return number
+
+    if expected_type is str:
+        if isinstance(value, str):
+            return value
+        raise ValueError(f"无法转换为 str: {value!r}")
+
+    if origin is tuple:
+        item_type = get_args(expected_type)[0]
+        if isinstance(value, str):
+            value = [part.strip() for part in value.split(",") if part.strip()]
+        if isinstance(value, (list, tuple)):
+            return tuple(_coerce_value(item_type, item) for item in value)
+        raise ValueError(f"必须是列表: {value!r}")
+
+    if origin is dict:
+        _, value_type = get_args(expected_type)
+        if isinstance(value, str):
+            try:
+                value = json.loads(value)
+            except json.JSONDecodeError:
+                raise ValueError(f"必须是JSON对象: {value!r}") from None
+        if isinstance(value, dict):
+            return FrozenDict((str(key), _coerce_value(value_type, item)) for key, item in value.items())
+        raise ValueError(f"必须是对象: {value!r}")
+
+    return value
+
+
+class ConfigSection:
+    """配置段基类: 构造时按字段类型校验并转换所有取值"""
+
+    __slots__ = ()
 
-@dataclass
-class ContentLimits:
+    def __post_init__(self):
+        errors = []
+        for field_info in fields(self):
+            value = getattr(self, field_info.name)
+            try:
+                coerced = _coerce_value(field_info.type, value)
+                choices = field_info.metadata.get("choices")
+                # 字典类型的字段校验每个取值
+                for choice in (coerced.values() if isinstance(coerced, dict) else (coerced,)):
+                    if choices and choice not in choices:
+                        raise ValueError(f"必须是 {'/'.join(choices)} 之一: {choice!r}")
+                if isinstance(coerced, (int, float)) and not isinstance(coerced, bool) and coerced < 0:
+                    raise ValueError(f"不能为负数: {coerced!r}")
+            except ValueError as e:
+                errors.append(f"{type(self).__name__}.{field_info.name}: {e}")
+                continue
+            if coerced is not value:
+                object.__setattr__(self, field_info.name, coerced)
+        if errors:
+            raise ConfigValidationError(errors)
+
+@dataclass(frozen=True, slots=True)
+class ContentLimits(ConfigSection):
     """内容长度限制配置"""
     markdown_display_limit: int = 3000
     claude_preview_limit: int = 100
     basic_crawl_unlimited: bool = True
 
-@dataclass
-class QualityControl:
+@dataclass(frozen=True, slots=True)
+class QualityControl(ConfigSection):
     """质量控制配置"""
     word_count_threshold: int = 50
-    min_content_quality: str = "medium"
+    min_content_quality: str = field(default="medium", metadata={"choices": ("low", "medium", "high")})
 
-@dataclass
-class TimingControl:
+@dataclass(frozen=True, slots=True)
+class TimingControl(ConfigSection):
     """时间控制配置"""
     page_timeout_ms: int = 30000
-    stealth_delay_seconds: int = 1
-    dynamic_content_delay_seconds: int = 2
-    default_delay_seconds: int = 0
+    stealth_delay_seconds: float = 1.0
+    dynamic_content_delay_seconds: float = 2.0
+    default_delay_seconds: float = 0.0
+
+@dataclass(frozen=True, slots=True)
+class RenderWaitControl(ConfigSection):
+    """自适应渲染等待配置 (替代隐身/动态内容的固定延迟)"""
+    enabled: bool = True
+    quiet_window_ms: int = 500
+    poll_interval_ms: int = 100
+    max_wait_ms: int = 8000
+    min_content_words: int = 50
+    learn_per_domain: bool = True
+    learning_min_samples: int = 3
+    learning_alpha: float = 0.3
+    max_domains: int = 500
+
+@dataclass(frozen=True, slots=True)
+class ResourceBlockingControl(ConfigSection):
+    """资源拦截配置 (text_only/text_css/full)"""
+    enabled: bool = True
+    default_profile: str = field(default="text_css", metadata={"choices": RESOURCE_PROFILE_NAMES})
+    tool_profiles: Dict[str, str] = field(default_factory=lambda: {
+        "default": "text_css",
+        "stealth": "full",
+        "geolocation": "text_css",
+        "retry": "text_css",
+        "intelligence": "text_css"
+    }, metadata={"choices": RESOURCE_PROFILE_NAMES})
+    domain_profiles: Dict[str, str] = field(default_factory=dict, metadata={"choices": RESOURCE_PROFILE_NAMES})
+    blocked_domains: Tuple[str, ...] = (
+        "google-analytics.com", "googletagmanager.com", "doubleclick.net",
+        "googlesyndication.com", "googleadservices.com", "adservice.google.com",
+        "connect.facebook.net", "hotjar.com", "scorecardresearch.com",
+        "amazon-adsystem.com", "criteo.com", "taboola.com", "outbrain.com",
+        "hm.baidu.com", "cnzz.com"
+    )
 
-@dataclass
-class RetryControl:
+@dataclass(frozen=True, slots=True)
+class ConcurrencyControl(ConfigSection):
+    """并发控制配置"""
+    deep_crawl_concurrency: int = 3
+    per_link_timeout_seconds: int = 30
+    deep_crawl_deadline_seconds: int = 90
+    batch_concurrency: int = 8
+    per_host_concurrency: int = 2
+    max_batch_urls: int = 500
+
+@dataclass(frozen=True, slots=True)
+class DedupControl(ConfigSection):
+    """重复页面检测配置 (深度爬取/批量爬取)"""
+    enabled: bool = True
+    strip_tracking_params: bool = True
+    tracking_params: Tuple[str, ...] = (
+        "utm_*", "gclid", "dclid", "gbraid", "wbraid", "fbclid", "msclkid", "yclid",
+        "mc_cid", "mc_eid", "_ga", "_gl", "igshid", "spm", "ref_src", "share_source"
+    )
+    map_mobile_variants: bool = True
+    use_rel_canonical: bool = True
+    content_fingerprint: bool = True
+    simhash_max_distance: int = 18
+    min_jaccard: float = 0.8
+    min_fingerprint_words: int = 50
+    refill_candidates: int = 5
+
+@dataclass(frozen=True, slots=True)
+class RetryControl(ConfigSection):
     """重试控制配置"""
     max_retries: int = 3
     retry_backoff_factor: int = 2
     retry_max_delay_seconds: int = 10
+    base_delay_seconds: float = 1.0
+    total_timeout_seconds: int = 90
+    retryable_failures: Tuple[str, ...] = (
+        "connection", "timeout", "rate_limited", "server_error", "render_crash", "unknown"
+    )
+    hedge_enabled: bool = True
+    hedge_after_seconds: float = 10.0
+    max_hedges: int = 1
+    host_retry_budget: int = 10
+    retry_budget_ratio: float = 0.2
+    retry_budget_refill_per_second: float = 0.1
 
-@dataclass
-class CacheControl:
+@dataclass(frozen=True, slots=True)
+class CacheControl(ConfigSection):
     """缓存控制配置"""
-    default_cache_mode: str = "BYPASS"
+    default_cache_mode: str = field(default="BYPASS", metadata={"choices": ("BYPASS", "ENABLED")})
     enable_smart_caching: bool = False
+    cache_dir: str = "v9_cache"
+    default_ttl_seconds: int = 3600
+    domain_ttl_seconds: Dict[str, int] = field(default_factory=dict)
+    max_cache_size_mb: int = 200
+
+@dataclass(frozen=True, slots=True)
+class CorpusControl(ConfigSection):
+    """持久语料库配置"""
+    enabled: bool = True
+    corpus_dir: str = "v9_corpus"
+    segment_max_mb: int = 64
+    max_versions_per_url: int = 3
+    max_age_days: int = 0
+    compaction_min_stale_ratio: float = 0.5
+    search_max_results: int = 10
+    snippet_chars: int = 240
+    index_enabled: bool = True
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+    index_title_weight: int = 3
 
-@dataclass
-class BrowserControl:
+@dataclass(frozen=True, slots=True)
+class BrowserControl(ConfigSection):
     """浏览器控制配置"""
-    default_wait_until: str = "domcontentloaded"
+    default_wait_until: str = field(
+        default="domcontentloaded", metadata={"choices": ("commit", "domcontentloaded", "load", "networkidle")}
+    )
     headless_mode: bool = True
-    browser_type: str = "chromium"
+    browser_type: str = field(default="chromium", metadata={"choices": ("chromium", "firefox", "webkit")})
+
+@dataclass(frozen=True, slots=True)
+class BrowserPoolControl(ConfigSection):
+    """浏览器池配置"""
+    enabled: bool = True
+    max_browsers: int = 4
+    max_pages_per_browser: int = 100
+    idle_timeout_seconds: int = 300
+    prewarm_on_startup: bool = True
+
+@dataclass(frozen=True, slots=True)
+class FastPathControl(ConfigSection):
+    """HTTP快速通道配置"""
+    enabled: bool = True
+    timeout_seconds: int = 10
+    min_word_count: int = 50
+    max_response_bytes: int = 5 * 1024 * 1024
+    connection_limit: int = 20
+    per_host_limit: int = 4
+    skip_domains: Tuple[str, ...] = (
+        "google.com", "bing.com", "baidu.com", "duckduckgo.com"
+    )
+
+@dataclass(frozen=True, slots=True)
+class PolitenessControl(ConfigSection):
+    """按主机的访问礼貌配置 (令牌桶限速)"""
+    enabled: bool = True
+    default_requests_per_second: float = 2.0
+    default_burst: int = 4
+    max_concurrency_per_host: int = 2
+    domain_requests_per_second: Dict[str, float] = field(default_factory=lambda: {
+        "google.com": 0.5,
+        "scholar.google.com": 0.2,
+        "bing.com": 1.0,
+        "baidu.com": 1.0,
+        "duckduckgo.com": 0.5
+    })
+    respect_robots_crawl_delay: bool = True
+    robots_timeout_seconds: int = 5
+    max_crawl_delay_seconds: int = 30
+    slowdown_factor: float = 2.0
+    recovery_step: float = 0.1
+    min_rate_fraction: float = 0.05
+    default_retry_after_seconds: int = 10
+    max_retry_after_seconds: int = 120
+
+@dataclass(frozen=True, slots=True)
+class MetricsControl(ConfigSection):
+    """性能指标配置"""
+    enabled: bool = True
+    max_domains: int = 200
+    prometheus_enabled: bool = False
+    prometheus_host: str = "127.0.0.1"
+    prometheus_port: int = 9464
+
+@dataclass(frozen=True, slots=True)
+class StealthFingerprintControl(ConfigSection):
+    """隐身指纹池配置"""
+    pool_enabled: bool = True
+    pool_size: int = 200
+    refill_threshold: int = 50
+    prewarm_on_startup: bool = True
 
-@dataclass
-class UserPreferences:
+@dataclass(frozen=True, slots=True)
+class UserPreferences(ConfigSection):
     """用户偏好设置"""
     show_detailed_logs: bool = True
     show_word_count: bool = True
@@ -60,22 +348,36 @@ class UserPreferences:
     compact_output: bool = False
     separator_length: int = 50
 
-@dataclass
-class AdvancedSettings:
+@dataclass(frozen=True, slots=True)
+class AdvancedSettings(ConfigSection):
     """高级设置"""
     enable_content_optimization: bool = True
     enable_smart_analysis: bool = True
     auto_detect_dynamic_content: bool = True
 
+# 配置段名称 (同时是 CrawlConfigManager 的属性名和配置文件中的键)
+CONFIG_SECTIONS = (
+    "content_limits", "quality_control", "timing_control", "render_wait", "resource_blocking", "concurrency",
+    "dedup", "retry_control", "cache_control", "corpus", "browser_control", "browser_pool",
+    "fast_path", "politeness", "metrics", "stealth_fingerprints",
+    "user_preferences", "advanced_settings",
+)
+
 class CrawlConfigManager:
-    """爬取配置管理器"""
+    """爬取配置管理器 (只读配置快照)"""
+    
+    __slots__ = ("config_file", "version", "_config_data", "_derived", "_frozen") + CONFIG_SECTIONS
     
-    def __init__(self, config_file: Optional[str] = None):
+    def __init__(self, config_file: Optional[str] = None, config_data: Optional[Dict[str, Any]] = None):
         """
         初始化配置管理器
         
         Args:
             config_file: 配置文件路径，如果为None则使用默认路径
+            config_data: 已解析的配置数据，提供时不再读取配置文件
+            
+        Raises:
+            ConfigValidationError: 配置取值无法转换为字段类型
         """
         if config_file is None:
             # 默认配置文件路径
@@ -83,18 +385,56 @@ class CrawlConfigManager:
             config_file = current_dir / "v9_config" / "crawl_config.json"
         
         self.config_file = Path(config_file)
+        self.version = next(_snapshot_versions)
+        self._derived = {}
         self._config_data = {}
-        self._load_config()
+        if config_data is None:
+            self._load_config()
+        else:
+            self._config_data = config_data
         
-        # 初始化配置对象
-        self.content_limits = self._create_content_limits()
-        self.quality_control = self._create_quality_control()
-        self.timing_control = self._create_timing_control()
-        self.retry_control = self._create_retry_control()
-        self.cache_control = self._create_cache_control()
-        self.browser_control = self._create_browser_control()
-        self.user_preferences = self._create_user_preferences()
-        self.advanced_settings = self._create_advanced_settings()
+        # 初始化配置对象 (收集所有配置段的校验错误后一起报告)
+        errors = []
+        self.content_limits = self._create_section(self._create_content_limits, errors)
+        self.quality_control = self._create_section(self._create_quality_control, errors)
+        self.timing_control = self._create_section(self._create_timing_control, errors)
+        self.render_wait = self._create_section(self._create_render_wait_control, errors)
+        self.resource_blocking = self._create_section(self._create_resource_blocking_control, errors)
+        self.concurrency = self._create_section(self._create_concurrency_control, errors)
+        self.dedup = self._create_section(self._create_dedup_control, errors)
+        self.retry_control = self._create_section(self._create_retry_control, errors)
+        self.cache_control = self._create_section(self._create_cache_control, errors)
+        self.corpus = self._create_section(self._create_corpus_control, errors)
+        self.browser_control = self._create_section(self._create_browser_control, errors)
+        self.browser_pool = self._create_section(self._create_browser_pool_control, errors)
+        self.fast_path = self._create_section(self._create_fast_path_control, errors)
+        self.politeness = self._create_section(self._create_politeness_control, errors)
+        self.metrics = self._create_section(self._create_metrics_control, errors)
+        self.stealth_fingerprints = self._create_section(self._create_stealth_fingerprint_control, errors)
+        self.user_preferences = self._create_section(self._create_user_preferences, errors)
+        self.advanced_settings = self._create_section(self._create_advanced_settings, errors)
+        if errors:
+            raise ConfigValidationError(errors)
+        self._frozen = True
+    
+    def __setattr__(self, name: str, value: Any):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("配置快照只读，请使用 update_* 方法修改")
+        object.__setattr__(self, name, value)
+    
+    def derived(self, key: Any, builder: Callable[["CrawlConfigManager"], Any]) -> Any:
+        """
+        获取由本快照派生的对象 (如各工具的CrawlerRunConfig)，每个快照只构建一次
+        
+        Args:
+            key: 派生对象的键
+            builder: 以快照为参数构建派生对象的函数
+        """
+        try:
+            return self._derived[key]
+        except KeyError:
+            value = self._derived[key] = builder(self)
+            return value
     
     def _load_config(self):
         """加载配置文件"""
@@ -102,14 +442,22 @@ class CrawlConfigManager:
             if self.config_file.exists():
                 with open(self.config_file, 'r', encoding='utf-8') as f:
                     self._config_data = json.load(f)
-                print(f"✅ 爬取配置已加载: {self.config_file}")
+                print(f"✅ 爬取配置已加载: {self.config_file}", file=sys.stderr)
             else:
-                print(f"⚠️  配置文件不存在，使用默认配置: {self.config_file}")
+                print(f"⚠️  配置文件不存在，使用默认配置: {self.config_file}", file=sys.stderr)
                 self._config_data = {}
         except Exception as e:
-            print(f"❌ 配置文件加载失败: {e}")
+            print(f"❌ 配置文件加载失败: {e}", file=sys.stderr)
             self._config_data = {}
     
+    def _create_section(self, creator: Callable[[], Any], errors: List[str]) -> Any:
+        """创建一个配置段，校验失败时记录错误"""
+        try:
+            return creator()
+        except ConfigValidationError as e:
+            errors.extend(e.errors)
+            return None
+    
     def _create_content_limits(self) -> ContentLimits:
         """创建内容限制配置"""
         config = self._config_data.get("content_limits", {})
@@ -137,13 +485,80 @@ class CrawlConfigManager:
             default_delay_seconds=config.get("default_delay_seconds", 0)
         )
     
+    def _create_render_wait_control(self) -> RenderWaitControl:
+        """创建自适应渲染等待配置"""
+        config = self._config_data.get("render_wait", {})
+        defaults = RenderWaitControl()
+        return RenderWaitControl(
+            enabled=config.get("enabled", defaults.enabled),
+            quiet_window_ms=config.get("quiet_window_ms", defaults.quiet_window_ms),
+            poll_interval_ms=config.get("poll_interval_ms", defaults.poll_interval_ms),
+            max_wait_ms=config.get("max_wait_ms", defaults.max_wait_ms),
+            min_content_words=config.get("min_content_words", defaults.min_content_words),
+            learn_per_domain=config.get("learn_per_domain", defaults.learn_per_domain),
+            learning_min_samples=config.get("learning_min_samples", defaults.learning_min_samples),
+            learning_alpha=config.get("learning_alpha", defaults.learning_alpha),
+            max_domains=config.get("max_domains", defaults.max_domains)
+        )
+    
+    def _create_resource_blocking_control(self) -> ResourceBlockingControl:
+        """创建资源拦截配置"""
+        config = self._config_data.get("resource_blocking", {})
+        defaults = ResourceBlockingControl()
+        return ResourceBlockingControl(
+            enabled=config.get("enabled", defaults.enabled),
+            default_profile=config.get("default_profile", defaults.default_profile),
+            tool_profiles=config.get("tool_profiles", defaults.tool_profiles),
+            domain_profiles=config.get("domain_profiles", defaults.domain_profiles),
+            blocked_domains=config.get("blocked_domains", defaults.blocked_domains)
+        )
+    
+    def _create_concurrency_control(self) -> ConcurrencyControl:
+        """创建并发控制配置"""
+        config = self._config_data.get("concurrency", {})
+        return ConcurrencyControl(
+            deep_crawl_concurrency=config.get("deep_crawl_concurrency", 3),
+            per_link_timeout_seconds=config.get("per_link_timeout_seconds", 30),
+            deep_crawl_deadline_seconds=config.get("deep_crawl_deadline_seconds", 90),
+            batch_concurrency=config.get("batch_concurrency", 8),
+            per_host_concurrency=config.get("per_host_concurrency", 2),
+            max_batch_urls=config.get("max_batch_urls", 500)
+        )
+    
+    def _create_dedup_control(self) -> DedupControl:
+        """创建重复页面检测配置"""
+        config = self._config_data.get("dedup", {})
+        defaults = DedupControl()
+        return DedupControl(
+            enabled=config.get("enabled", defaults.enabled),
+            strip_tracking_params=config.get("strip_tracking_params", defaults.strip_tracking_params),
+            tracking_params=config.get("tracking_params", defaults.tracking_params),
+            map_mobile_variants=config.get("map_mobile_variants", defaults.map_mobile_variants),
+            use_rel_canonical=config.get("use_rel_canonical", defaults.use_rel_canonical),
+            content_fingerprint=config.get("content_fingerprint", defaults.content_fingerprint),
+            simhash_max_distance=config.get("simhash_max_distance", defaults.simhash_max_distance),
+            min_jaccard=config.get("min_jaccard", defaults.min_jaccard),
+            min_fingerprint_words=config.get("min_fingerprint_words", defaults.min_fingerprint_words),
+            refill_candidates=config.get("refill_candidates", defaults.refill_candidates)
+        )
+    
     def _create_retry_control(self) -> RetryControl:
         """创建重试控制配置"""
         config = self._config_data.get("retry_control", {})
+        defaults = RetryControl()
         return RetryControl(
             max_retries=config.get("max_retries", 3),
             retry_backoff_factor=config.get("retry_backoff_factor", 2),
-            retry_max_delay_seconds=config.get("retry_max_delay_seconds", 10)
+            retry_max_delay_seconds=config.get("retry_max_delay_seconds", 10),
+            base_delay_seconds=config.get("base_delay_seconds", defaults.base_delay_seconds),
+            total_timeout_seconds=config.get("total_timeout_seconds", defaults.total_timeout_seconds),
+            retryable_failures=config.get("retryable_failures", defaults.retryable_failures),
+            hedge_enabled=config.get("hedge_enabled", defaults.hedge_enabled),
+            hedge_after_seconds=config.get("hedge_after_seconds", defaults.hedge_after_seconds),
+            max_hedges=config.get("max_hedges", defaults.max_hedges),
+            host_retry_budget=config.get("host_retry_budget", defaults.host_retry_budget),
+            retry_budget_ratio=config.get("retry_budget_ratio", defaults.retry_budget_ratio),
+            retry_budget_refill_per_second=config.get("retry_budget_refill_per_second", defaults.retry_budget_refill_per_second)
         )
     
     def _create_cache_control(self) -> CacheControl:
@@ -151,7 +566,30 @@ class CrawlConfigManager:
         config = self._config_data.get("cache_control", {})
         return CacheControl(
             default_cache_mode=config.get("default_cache_mode", "BYPASS"),
-            enable_smart_caching=config.get("enable_smart_caching", False)
+            enable_smart_caching=config.get("enable_smart_caching", False),
+            cache_dir=config.get("cache_dir", "v9_cache"),
+            default_ttl_seconds=config.get("default_ttl_seconds", 3600),
+            domain_ttl_seconds=config.get("domain_ttl_seconds", {}),
+            max_cache_size_mb=config.get("max_cache_size_mb", 200)
+        )
+    
+    def _create_corpus_control(self) -> CorpusControl:
+        """创建持久语料库配置"""
+        config = self._config_data.get("corpus", {})
+        defaults = CorpusControl()
+        return CorpusControl(
+            enabled=config.get("enabled", defaults.enabled),
+            corpus_dir=config.get("corpus_dir", defaults.corpus_dir),
+            segment_max_mb=config.get("segment_max_mb", defaults.segment_max_mb),
+            max_versions_per_url=config.get("max_versions_per_url", defaults.max_versions_per_url),
+            max_age_days=config.get("max_age_days", defaults.max_age_days),
+            compaction_min_stale_ratio=config.get("compaction_min_stale_ratio", defaults.compaction_min_stale_ratio),
+            search_max_results=config.get("search_max_results", defaults.search_max_results),
+            snippet_chars=config.get("snippet_chars", defaults.snippet_chars),
+            index_enabled=config.get("index_enabled", defaults.index_enabled),
+            bm25_k1=config.get("bm25_k1", defaults.bm25_k1),
+            bm25_b=config.get("bm25_b", defaults.bm25_b),
+            index_title_weight=config.get("index_title_weight", defaults.index_title_weight)
         )
     
     def _create_browser_control(self) -> BrowserControl:
@@ -163,6 +601,74 @@ class CrawlConfigManager:
             browser_type=config.get("browser_type", "chromium")
         )
     
+    def _create_browser_pool_control(self) -> BrowserPoolControl:
+        """创建浏览器池配置"""
+        config = self._config_data.get("browser_pool", {})
+        return BrowserPoolControl(
+            enabled=config.get("enabled", True),
+            max_browsers=config.get("max_browsers", 4),
+            max_pages_per_browser=config.get("max_pages_per_browser", 100),
+            idle_timeout_seconds=config.get("idle_timeout_seconds", 300),
+            prewarm_on_startup=config.get("prewarm_on_startup", True)
+        )
+    
+    def _create_fast_path_control(self) -> FastPathControl:
+        """创建HTTP快速通道配置"""
+        config = self._config_data.get("fast_path", {})
+        defaults = FastPathControl()
+        return FastPathControl(
+            enabled=config.get("enabled", defaults.enabled),
+            timeout_seconds=config.get("timeout_seconds", defaults.timeout_seconds),
+            min_word_count=config.get("min_word_count", defaults.min_word_count),
+            max_response_bytes=config.get("max_response_bytes", defaults.max_response_bytes),
+            connection_limit=config.get("connection_limit", defaults.connection_limit),
+            per_host_limit=config.get("per_host_limit", defaults.per_host_limit),
+            skip_domains=config.get("skip_domains", defaults.skip_domains)
+        )
+    
+    def _create_politeness_control(self) -> PolitenessControl:
+        """创建访问礼貌配置"""
+        config = self._config_data.get("politeness", {})
+        defaults = PolitenessControl()
+        return PolitenessControl(
+            enabled=config.get("enabled", defaults.enabled),
+            default_requests_per_second=config.get("default_requests_per_second", defaults.default_requests_per_second),
+            default_burst=config.get("default_burst", defaults.default_burst),
+            max_concurrency_per_host=config.get("max_concurrency_per_host", defaults.max_concurrency_per_host),
+            domain_requests_per_second=config.get("domain_requests_per_second", defaults.domain_requests_per_second),
+            respect_robots_crawl_delay=config.get("respect_robots_crawl_delay", defaults.respect_robots_crawl_delay),
+            robots_timeout_seconds=config.get("robots_timeout_seconds", defaults.robots_timeout_seconds),
+            max_crawl_delay_seconds=config.get("max_crawl_delay_seconds", defaults.max_crawl_delay_seconds),
+            slowdown_factor=config.get("slowdown_factor", defaults.slowdown_factor),
+            recovery_step=config.get("recovery_step", defaults.recovery_step),
+            min_rate_fraction=config.get("min_rate_fraction", defaults.min_rate_fraction),
+            default_retry_after_seconds=config.get("default_retry_after_seconds", defaults.default_retry_after_seconds),
+            max_retry_after_seconds=config.get("max_retry_after_seconds", defaults.max_retry_after_seconds)
+        )
+    
+    def _create_metrics_control(self) -> MetricsControl:
+        """创建性能指标配置"""
+        config = self._config_data.get("metrics", {})
+        defaults = MetricsControl()
+        return MetricsControl(
+            enabled=config.get("enabled", defaults.enabled),
+            max_domains=config.get("max_domains", defaults.max_domains),
+            prometheus_enabled=config.get("prometheus_enabled", defaults.prometheus_enabled),
+            prometheus_host=config.get("prometheus_host", defaults.prometheus_host),
+            prometheus_port=config.get("prometheus_port", defaults.prometheus_port)
+        )
+    
+    def _create_stealth_fingerprint_control(self) -> StealthFingerprintControl:
+        """创建隐身指纹池配置"""
+        config = self._config_data.get("stealth_fingerprints", {})
+        defaults = StealthFingerprintControl()
+        return StealthFingerprintControl(
+            pool_enabled=config.get("pool_enabled", defaults.pool_enabled),
+            pool_size=config.get("pool_size", defaults.pool_size),
+            refill_threshold=config.get("refill_threshold", defaults.refill_threshold),
+            prewarm_on_startup=config.get("prewarm_on_startup", defaults.prewarm_on_startup)
+        )
+    
     def _create_user_preferences(self) -> UserPreferences:
         """创建用户偏好配置"""
         config = self._config_data.get("user_preferences", {})
@@ -185,99 +691,213 @@ class CrawlConfigManager:
     
     def update_content_limits(self, **kwargs):
         """更新内容限制配置"""
-        for key, value in kwargs.items():
-            if hasattr(self.content_limits, key):
-                setattr(self.content_limits, key, value)
-        self._save_config()
+        return get_config_store().update("content_limits", **kwargs)
     
     def update_quality_control(self, **kwargs):
         """更新质量控制配置"""
-        for key, value in kwargs.items():
-            if hasattr(self.quality_control, key):
-                setattr(self.quality_control, key, value)
-        self._save_config()
+        return get_config_store().update("quality_control", **kwargs)
     
     def update_timing_control(self, **kwargs):
         """更新时间控制配置"""
-        for key, value in kwargs.items():
-            if hasattr(self.timing_control, key):
-                setattr(self.timing_control, key, value)
-        self._save_config()
+        return get_config_store().update("timing_control", **kwargs)
+    
+    def update_render_wait(self, **kwargs):
+        """更新自适应渲染等待配置"""
+        return get_config_store().update("render_wait", **kwargs)
+    
+    def update_resource_blocking(self, **kwargs):
+        """更新资源拦截配置"""
+        return get_config_store().update("resource_blocking", **kwargs)
+    
+    def update_concurrency(self, **kwargs):
+        """更新并发控制配置"""
+        return get_config_store().update("concurrency", **kwargs)
+    
+    def update_dedup(self, **kwargs):
+        """更新重复页面检测配置"""
+        return get_config_store().update("dedup", **kwargs)
+    
+    def update_politeness(self, **kwargs):
+        """更新访问礼貌配置 (按主机调度器订阅该配置段，修改立即生效)"""
+        return get_config_store().update("politeness", **kwargs)
     
     def update_user_preferences(self, **kwargs):
         """更新用户偏好配置"""
-        for key, value in kwargs.items():
-            if hasattr(self.user_preferences, key):
-                setattr(self.user_preferences, key, value)
-        self._save_config()
+        return get_config_store().update("user_preferences", **kwargs)
     
-    def _save_config(self):
-        """保存配置到文件"""
-        try:
-            # 确保目录存在
-            self.config_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # 构建配置数据
-            config_data = {
-                "content_limits": {
-                    "description": "内容长度限制配置",
-                    "markdown_display_limit": self.content_limits.markdown_display_limit,
-                    "claude_preview_limit": self.content_limits.claude_preview_limit,
-                    "basic_crawl_unlimited": self.content_limits.basic_crawl_unlimited
-                },
-                "quality_control": {
-                    "description": "爬取质量控制配置",
-                    "word_count_threshold": self.quality_control.word_count_threshold,
-                    "min_content_quality": self.quality_control.min_content_quality
-                },
-                "timing_control": {
-                    "description": "时间控制配置",
-                    "page_timeout_ms": self.timing_control.page_timeout_ms,
-                    "stealth_delay_seconds": self.timing_control.stealth_delay_seconds,
-                    "dynamic_content_delay_seconds": self.timing_control.dynamic_content_delay_seconds,
-                    "default_delay_seconds": self.timing_control.default_delay_seconds
-                },
-                "retry_control": {
-                    "description": "重试控制配置",
-                    "max_retries": self.retry_control.max_retries,
-                    "retry_backoff_factor": self.retry_control.retry_backoff_factor,
-                    "retry_max_delay_seconds": self.retry_control.retry_max_delay_seconds
-                },
-                "cache_control": {
-                    "description": "缓存控制配置",
-                    "default_cache_mode": self.cache_control.default_cache_mode,
-                    "enable_smart_caching": self.cache_control.enable_smart_caching
-                },
-                "browser_control": {
-                    "description": "浏览器控制配置",
-                    "default_wait_until": self.browser_control.default_wait_until,
-                    "headless_mode": self.browser_control.headless_mode,
-                    "browser_type": self.browser_control.browser_type
-                },
-                "user_preferences": {
-                    "description": "用户偏好设置",
-                    "show_detailed_logs": self.user_preferences.show_detailed_logs,
-                    "show_word_count": self.user_preferences.show_word_count,
-                    "show_timing_info": self.user_preferences.show_timing_info,
-                    "compact_output": self.user_preferences.compact_output,
-                    "separator_length": self.user_preferences.separator_length
-                },
-                "advanced_settings": {
-                    "description": "高级设置",
-                    "enable_content_optimization": self.advanced_settings.enable_content_optimization,
-                    "enable_smart_analysis": self.advanced_settings.enable_smart_analysis,
-                    "auto_detect_dynamic_content": self.advanced_settings.auto_detect_dynamic_content
-                }
+    def to_dict(self) -> Dict[str, Any]:
+        """构建写入配置文件的数据"""
+        return {
+            "content_limits": {
+                "description": "内容长度限制配置",
+                "markdown_display_limit": self.content_limits.markdown_display_limit,
+                "claude_preview_limit": self.content_limits.claude_preview_limit,
+                "basic_crawl_unlimited": self.content_limits.basic_crawl_unlimited
+            },
+            "quality_control": {
+                "description": "爬取质量控制配置",
+                "word_count_threshold": self.quality_control.word_count_threshold,
+                "min_content_quality": self.quality_control.min_content_quality
+            },
+            "timing_control": {
+                "description": "时间控制配置",
+                "page_timeout_ms": self.timing_control.page_timeout_ms,
+                "stealth_delay_seconds": self.timing_control.stealth_delay_seconds,
+                "dynamic_content_delay_seconds": self.timing_control.dynamic_content_delay_seconds,
+                "default_delay_seconds": self.timing_control.default_delay_seconds
+            },
+            "render_wait": {
+                "description": "自适应渲染等待配置",
+                "enabled": self.render_wait.enabled,
+                "quiet_window_ms": self.render_wait.quiet_window_ms,
+                "poll_interval_ms": self.render_wait.poll_interval_ms,
+                "max_wait_ms": self.render_wait.max_wait_ms,
+                "min_content_words": self.render_wait.min_content_words,
+                "learn_per_domain": self.render_wait.learn_per_domain,
+                "learning_min_samples": self.render_wait.learning_min_samples,
+                "learning_alpha": self.render_wait.learning_alpha,
+                "max_domains": self.render_wait.max_domains
+            },
+            "resource_blocking": {
+                "description": "资源拦截配置 (text_only: 仅文本, text_css: 文本+样式, full: 不拦截)",
+                "enabled": self.resource_blocking.enabled,
+                "default_profile": self.resource_blocking.default_profile,
+                "tool_profiles": self.resource_blocking.tool_profiles,
+                "domain_profiles": self.resource_blocking.domain_profiles,
+                "blocked_domains": self.resource_blocking.blocked_domains
+            },
+            "concurrency": {
+                "description": "并发控制配置",
+                "deep_crawl_concurrency": self.concurrency.deep_crawl_concurrency,
+                "per_link_timeout_seconds": self.concurrency.per_link_timeout_seconds,
+                "deep_crawl_deadline_seconds": self.concurrency.deep_crawl_deadline_seconds,
+                "batch_concurrency": self.concurrency.batch_concurrency,
+                "per_host_concurrency": self.concurrency.per_host_concurrency,
+                "max_batch_urls": self.concurrency.max_batch_urls
+            },
+            "dedup": {
+                "description": "重复页面检测配置 (爬取前规范化URL，爬取后按 rel=canonical 和 SimHash/MinHash 指纹合并重复页面)",
+                "enabled": self.dedup.enabled,
+                "strip_tracking_params": self.dedup.strip_tracking_params,
+                "tracking_params": self.dedup.tracking_params,
+                "map_mobile_variants": self.dedup.map_mobile_variants,
+                "use_rel_canonical": self.dedup.use_rel_canonical,
+                "content_fingerprint": self.dedup.content_fingerprint,
+                "simhash_max_distance": self.dedup.simhash_max_distance,
+                "min_jaccard": self.dedup.min_jaccard,
+                "min_fingerprint_words": self.dedup.min_fingerprint_words,
+                "refill_candidates": self.dedup.refill_candidates
+            },
+            "retry_control": {
+                "description": "重试控制配置",
+                "max_retries": self.retry_control.max_retries,
+                "retry_backoff_factor": self.retry_control.retry_backoff_factor,
+                "retry_max_delay_seconds": self.retry_control.retry_max_delay_seconds,
+                "base_delay_seconds": self.retry_control.base_delay_seconds,
+                "total_timeout_seconds": self.retry_control.total_timeout_seconds,
+                "retryable_failures": self.retry_control.retryable_failures,
+                "hedge_enabled": self.retry_control.hedge_enabled,
+                "hedge_after_seconds": self.retry_control.hedge_after_seconds,
+                "max_hedges": self.retry_control.max_hedges,
+                "host_retry_budget": self.retry_control.host_retry_budget,
+                "retry_budget_ratio": self.retry_control.retry_budget_ratio,
+                "retry_budget_refill_per_second": self.retry_control.retry_budget_refill_per_second
+            },
+            "cache_control": {
+                "description": "缓存控制配置",
+                "default_cache_mode": self.cache_control.default_cache_mode,
+                "enable_smart_caching": self.cache_control.enable_smart_caching,
+                "cache_dir": self.cache_control.cache_dir,
+                "default_ttl_seconds": self.cache_control.default_ttl_seconds,
+                "domain_ttl_seconds": self.cache_control.domain_ttl_seconds,
+                "max_cache_size_mb": self.cache_control.max_cache_size_mb
+            },
+            "corpus": {
+                "description": "持久语料库配置 (所有工具的爬取结果跨会话保存，可用 corpus_get/corpus_search 读取)",
+                "enabled": self.corpus.enabled,
+                "corpus_dir": self.corpus.corpus_dir,
+                "segment_max_mb": self.corpus.segment_max_mb,
+                "max_versions_per_url": self.corpus.max_versions_per_url,
+                "max_age_days": self.corpus.max_age_days,
+                "compaction_min_stale_ratio": self.corpus.compaction_min_stale_ratio,
+                "search_max_results": self.corpus.search_max_results,
+                "snippet_chars": self.corpus.snippet_chars,
+                "index_enabled": self.corpus.index_enabled,
+                "bm25_k1": self.corpus.bm25_k1,
+                "bm25_b": self.corpus.bm25_b,
+                "index_title_weight": self.corpus.index_title_weight
+            },
+            "browser_control": {
+                "description": "浏览器控制配置",
+                "default_wait_until": self.browser_control.default_wait_until,
+                "headless_mode": self.browser_control.headless_mode,
+                "browser_type": self.browser_control.browser_type
+            },
+            "browser_pool": {
+                "description": "浏览器池配置",
+                "enabled": self.browser_pool.enabled,
+                "max_browsers": self.browser_pool.max_browsers,
+                "max_pages_per_browser": self.browser_pool.max_pages_per_browser,
+                "idle_timeout_seconds": self.browser_pool.idle_timeout_seconds,
+                "prewarm_on_startup": self.browser_pool.prewarm_on_startup
+            },
+            "fast_path": {
+                "description": "HTTP快速通道配置",
+                "enabled": self.fast_path.enabled,
+                "timeout_seconds": self.fast_path.timeout_seconds,
+                "min_word_count": self.fast_path.min_word_count,
+                "max_response_bytes": self.fast_path.max_response_bytes,
+                "connection_limit": self.fast_path.connection_limit,
+                "per_host_limit": self.fast_path.per_host_limit,
+                "skip_domains": self.fast_path.skip_domains
+            },
+            "politeness": {
+                "description": "按主机访问礼貌配置",
+                "enabled": self.politeness.enabled,
+                "default_requests_per_second": self.politeness.default_requests_per_second,
+                "default_burst": self.politeness.default_burst,
+                "max_concurrency_per_host": self.politeness.max_concurrency_per_host,
+                "domain_requests_per_second": self.politeness.domain_requests_per_second,
+                "respect_robots_crawl_delay": self.politeness.respect_robots_crawl_delay,
+                "robots_timeout_seconds": self.politeness.robots_timeout_seconds,
+                "max_crawl_delay_seconds": self.politeness.max_crawl_delay_seconds,
+                "slowdown_factor": self.politeness.slowdown_factor,
+                "recovery_step": self.politeness.recovery_step,
+                "min_rate_fraction": self.politeness.min_rate_fraction,
+                "default_retry_after_seconds": self.politeness.default_retry_after_seconds,
+                "max_retry_after_seconds": self.politeness.max_retry_after_seconds
+            },
+            "metrics": {
+                "description": "性能指标配置",
+                "enabled": self.metrics.enabled,
+                "max_domains": self.metrics.max_domains,
+                "prometheus_enabled": self.metrics.prometheus_enabled,
+                "prometheus_host": self.metrics.prometheus_host,
+                "prometheus_port": self.metrics.prometheus_port
+            },
+            "stealth_fingerprints": {
+                "description": "隐身指纹池配置",
+                "pool_enabled": self.stealth_fingerprints.pool_enabled,
+                "pool_size": self.stealth_fingerprints.pool_size,
+                "refill_threshold": self.stealth_fingerprints.refill_threshold,
+                "prewarm_on_startup": self.stealth_fingerprints.prewarm_on_startup
+            },
+            "user_preferences": {
+                "description": "用户偏好设置",
+                "show_detailed_logs": self.user_preferences.show_detailed_logs,
+                "show_word_count": self.user_preferences.show_word_count,
+                "show_timing_info": self.user_preferences.show_timing_info,
+                "compact_output": self.user_preferences.compact_output,
+                "separator_length": self.user_preferences.separator_length
+            },
+            "advanced_settings": {
+                "description": "高级设置",
+                "enable_content_optimization": self.advanced_settings.enable_content_optimization,
+                "enable_smart_analysis": self.advanced_settings.enable_smart_analysis,
+                "auto_detect_dynamic_content": self.advanced_settings.auto_detect_dynamic_content
             }
-            
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, indent=2, ensure_ascii=False)
-            
-            print(f"✅ 配置已保存: {self.config_file}")
-            
-        except Exception as e:
-            print(f"❌ 配置保存失败: {e}")
-    
+        }
+
     def get_config_summary(self) -> str:
         """获取配置摘要"""
         return f"""爬取配置摘要:
@@ -296,9 +916,86 @@ class CrawlConfigManager:
   - 隐身延迟: {self.timing_control.stealth_delay_seconds}s
   - 动态内容延迟: {self.timing_control.dynamic_content_delay_seconds}s
 
+⏳ 自适应渲染等待:
+  - 启用: {self.render_wait.enabled} (启用后替代隐身/动态内容的固定延迟)
+  - 安静窗口: {self.render_wait.quiet_window_ms}ms
+  - 最长等待: {self.render_wait.max_wait_ms}ms
+  - 最少正文词数: {self.render_wait.min_content_words}
+  - 按域名学习: {self.render_wait.learn_per_domain}
+
+🚫 资源拦截:
+  - 启用: {self.resource_blocking.enabled}
+  - 默认配置: {self.resource_blocking.default_profile}
+  - 工具配置: {self.resource_blocking.tool_profiles}
+  - 域名配置: {self.resource_blocking.domain_profiles}
+  - 跟踪器域名: {len(self.resource_blocking.blocked_domains)} 个
+
+🚦 并发控制:
+  - 深度爬取并发数: {self.concurrency.deep_crawl_concurrency}
+  - 单链接超时: {self.concurrency.per_link_timeout_seconds}s
+  - 深度爬取总时限: {self.concurrency.deep_crawl_deadline_seconds}s
+  - 批量爬取并发数: {self.concurrency.batch_concurrency}
+  - 单主机并发数: {self.concurrency.per_host_concurrency}
+  - 批量URL上限: {self.concurrency.max_batch_urls}
+
+🔁 重复页面检测:
+  - 启用: {self.dedup.enabled}
+  - 去掉跟踪参数: {self.dedup.strip_tracking_params} ({len(self.dedup.tracking_params)} 个)
+  - AMP/移动版映射: {self.dedup.map_mobile_variants}
+  - rel=canonical: {self.dedup.use_rel_canonical}
+  - 内容指纹: {self.dedup.content_fingerprint} (SimHash 距离 ≤ {self.dedup.simhash_max_distance} 且 MinHash 相似度 ≥ {self.dedup.min_jaccard})
+  - 补位候选链接: {self.dedup.refill_candidates}
+
 🔄 重试控制:
   - 最大重试: {self.retry_control.max_retries} 次
   - 退避因子: {self.retry_control.retry_backoff_factor}
+  - 单请求时间预算: {self.retry_control.total_timeout_seconds}s
+  - 可重试失败类型: {', '.join(self.retry_control.retryable_failures)}
+  - 对冲请求: {f"{self.retry_control.hedge_after_seconds}s 后发起 (最多 {self.retry_control.max_hedges} 个)" if self.retry_control.hedge_enabled else "关闭"}
+  - 单主机重试预算: {self.retry_control.host_retry_budget} 次
+
+💾 缓存控制:
+  - 智能缓存: {self.cache_control.enable_smart_caching}
+  - 默认TTL: {self.cache_control.default_ttl_seconds}s
+  - 域名TTL: {self.cache_control.domain_ttl_seconds}
+  - 缓存容量: {self.cache_control.max_cache_size_mb}MB
+
+📚 持久语料库:
+  - 启用: {self.corpus.enabled}
+  - 目录: {self.corpus.corpus_dir}
+  - 每个URL保留版本数: {self.corpus.max_versions_per_url}
+  - 保留天数: {self.corpus.max_age_days or "不限"}
+  - 全文索引 (BM25): {self.corpus.index_enabled}
+
+🌐 浏览器池:
+  - 启用: {self.browser_pool.enabled}
+  - 最大浏览器数: {self.browser_pool.max_browsers}
+  - 单浏览器回收页数: {self.browser_pool.max_pages_per_browser}
+  - 空闲超时: {self.browser_pool.idle_timeout_seconds}s
+
+⚡ HTTP快速通道:
+  - 启用: {self.fast_path.enabled}
+  - 请求超时: {self.fast_path.timeout_seconds}s
+  - 最少词数: {self.fast_path.min_word_count}
+  - 跳过域名: {', '.join(self.fast_path.skip_domains)}
+
+🐢 访问礼貌:
+  - 启用: {self.politeness.enabled}
+  - 默认速率: {self.politeness.default_requests_per_second} 请求/秒 (突发 {self.politeness.default_burst})
+  - 单主机并发数: {self.politeness.max_concurrency_per_host}
+  - 域名速率: {self.politeness.domain_requests_per_second}
+  - 遵守robots.txt Crawl-delay: {self.politeness.respect_robots_crawl_delay}
+  - 429/503减速因子: {self.politeness.slowdown_factor}
+
+📊 性能指标:
+  - 启用: {self.metrics.enabled}
+  - 域名计数上限: {self.metrics.max_domains}
+  - Prometheus端点: {f"http://{self.metrics.prometheus_host}:{self.metrics.prometheus_port}/metrics" if self.metrics.prometheus_enabled else "关闭"}
+
+🥷 隐身指纹池:
+  - 启用: {self.stealth_fingerprints.pool_enabled}
+  - 池大小: {self.stealth_fingerprints.pool_size} (剩余少于 {self.stealth_fingerprints.refill_threshold} 时补充)
+  - 启动时预热: {self.stealth_fingerprints.prewarm_on_startup}
 
 👤 用户偏好:
   - 详细日志: {self.user_preferences.show_detailed_logs}
@@ -308,18 +1005,16 @@ class CrawlConfigManager:
   - 分隔符长度: {self.user_preferences.separator_length}
 """
 
-# 全局配置管理器实例
-_config_manager = None
+def get_config_store():
+    """获取全局配置存储 (延迟导入，避免循环依赖)"""
+    from v9_core.config_store import get_config_store as _get_config_store
+    return _get_config_store()
 
 def get_crawl_config() -> CrawlConfigManager:
-    """获取全局配置管理器实例"""
-    global _config_manager
-    if _config_manager is None:
-        _config_manager = CrawlConfigManager()
-    return _config_manager
+    """获取当前配置快照 (在固定了快照的请求内返回该请求的快照)"""
+    from v9_core.config_store import current_snapshot
+    return current_snapshot()
 
 def reload_crawl_config():
-    """重新加载配置"""
-    global _config_manager
-    _config_manager = CrawlConfigManager()
-    return _config_manager
+    """重新从文件加载配置"""
+    return get_config_store().reload()
\ No newline at end of file
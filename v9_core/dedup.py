@@ -0,0 +1,345 @@
+# v9_core/dedup.py - V9 重复页面检测
+"""
+深度爬取和批量爬取的重复页面检测
+
+搜索结果里经常同时出现同一篇文章的镜像、转载以及 AMP/移动版，
+逐个渲染既浪费浏览器时间，也浪费输出的 token。去重分两步:
+
+爬取前 (URL规范化):
+- clean_url: 去掉跟踪参数 (utm_*、gclid、fbclid 等)，还原 Google AMP 缓存链接，
+  得到实际请求的URL (只做不改变页面内容的变换)
+- url_key: 在 clean_url 的基础上把 AMP/移动版映射到桌面版
+  (www./m./mobile./amp. 等主机前缀、/amp 路径、amp=1 参数)，忽略协议，
+  只用作去重键，不直接请求 (映射后的主机不一定存在)
+
+爬取后 (内容指纹):
+- 页面声明的 rel=canonical 与已保留页面的URL键相同时视为重复
+- 正文按三词滑窗 (中文按二字组) 计算 64 位 SimHash 和 MinHash (bottom-k) 样本:
+  SimHash 汉明距离不超过 simhash_max_distance 的已保留页面作为候选，
+  再用 MinHash 估计滑窗集合的 Jaccard 相似度，不低于 min_jaccard 时视为近似重复
+  (转载、镜像、导航/页脚不同的副本)。只用 SimHash 时，少量模板差异就会让
+  距离在阈值附近波动；只用 MinHash 时每对页面都要做集合运算
+
+DuplicateTracker 在一次工具调用内记录已保留的页面，先保留的页面胜出。
+"""
+
+import hashlib
+import html as html_module
+import heapq
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+from v9_core.result_cache import normalize_url
+from v9_core.search_index import tokenize
+
+# 重复原因
+DUPLICATE_URL = "url"
+DUPLICATE_CANONICAL = "canonical"
+DUPLICATE_CONTENT = "content"
+
+DUPLICATE_REASONS = {
+    DUPLICATE_URL: "同一页面的其他URL形式",
+    DUPLICATE_CANONICAL: "rel=canonical 指向同一页面",
+    DUPLICATE_CONTENT: "内容近似重复",
+}
+
+# 映射到桌面版时去掉的主机标签 (去掉后至少保留两级域名)
+MOBILE_HOST_LABELS = frozenset({"www", "m", "mobile", "amp", "wap"})
+# 只表示 AMP/移动版的查询参数
+VARIANT_QUERY_PARAMS = {"amp": None, "outputtype": "amp", "m": "1"}
+
+FINGERPRINT_BITS = 64
+# MinHash (bottom-k) 样本数，Jaccard 估计的标准差约为 sqrt(J(1-J)/k)
+SKETCH_SIZE = 128
+# 三词滑窗
+SHINGLE_SIZE = 3
+# 只取正文前面的部分计算指纹，长文档的计算时间有上限
+MAX_FINGERPRINT_TOKENS = 5000
+
+_LINK_TAG_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_REL_CANONICAL_RE = re.compile(r"""\brel\s*=\s*["']?[^"'>]*\bcanonical\b""", re.IGNORECASE)
+_HREF_RE = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+# Markdown 链接/图片的目标地址不参与指纹 (同一篇文章的镜像链接地址各不相同)
+_MARKDOWN_TARGET_RE = re.compile(r"\]\([^)]*\)")
+# canonical 只在 <head> 中声明，只扫描HTML开头
+CANONICAL_SCAN_CHARS = 200_000
+
+
+def _is_tracking_param(name: str, tracking_params: Tuple[str, ...]) -> bool:
+    name = name.lower()
+    for pattern in tracking_params:
+        if pattern.endswith("*"):
+            if name.startswith(pattern[:-1]):
+                return True
+        elif name == pattern:
+            return True
+    return False
+
+
+def unwrap_amp_cache(url: str) -> str:
+    """还原 Google AMP 缓存链接 (google.com/amp/s/...、*.cdn.ampproject.org/c/s/...)"""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    path = parts.path
+    if host.endswith(".cdn.ampproject.org"):
+        match = re.match(r"^/(?:[a-z]/)?(s/)?(.+)$", path)
+    elif re.match(r"^(?:www\.)?google\.[a-z.]+$", host):
+        match = re.match(r"^/amp/(s/)?(.+)$", path)
+    else:
+        return url
+    if match is None or "." not in match.group(2).split("/", 1)[0]:
+        return url
+    scheme = "https" if match.group(1) else "http"
+    target = f"{scheme}://{match.group(2)}"
+    return f"{target}?{parts.query}" if parts.query else target
+
+
+def clean_url(url: str, tracking_params: Tuple[str, ...] = ()) -> str:
+    """去掉跟踪参数并还原 AMP 缓存链接，得到实际请求的URL (没有变化时原样返回)"""
+    url = unwrap_amp_cache(url.strip())
+    if not tracking_params:
+        return url
+    parts = urlsplit(url)
+    if not parts.query:
+        return url
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    kept = [(name, value) for name, value in params if not _is_tracking_param(name, tracking_params)]
+    if len(kept) == len(params):
+        return url
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(kept), parts.fragment))
+
+
+def url_key(url: str, tracking_params: Tuple[str, ...] = (), map_variants: bool = True) -> str:
+    """
+    计算URL的去重键
+
+    Args:
+        url: 页面URL
+        tracking_params: 去掉的跟踪参数 (以 * 结尾表示前缀)
+        map_variants: 是否把 AMP/移动版映射到桌面版
+
+    Returns:
+        去掉协议的规范化URL
+    """
+    parts = urlsplit(normalize_url(clean_url(url, tracking_params)))
+    host = parts.netloc
+    path = parts.path
+    query = parts.query
+
+    if map_variants:
+        labels = host.split(".")
+        while len(labels) > 2 and labels[0] in MOBILE_HOST_LABELS:
+            labels.pop(0)
+        # en.m.wikipedia.org 之类的中间标签
+        labels = [label for i, label in enumerate(labels) if not (0 < i < len(labels) - 2 and label in ("m", "mobile"))]
+        host = ".".join(labels)
+
+        path = re.sub(r"\.amp\.html?$", ".html", path)
+        path = re.sub(r"^/amp(?=/)", "", path)
+        path = re.sub(r"/amp/?$", "/", path)
+
+        params = [
+            (name, value) for name, value in parse_qsl(query, keep_blank_values=True)
+            if not (name.lower() in VARIANT_QUERY_PARAMS
+                    and VARIANT_QUERY_PARAMS[name.lower()] in (None, value.lower()))
+        ]
+        query = urlencode(params)
+
+    if len(path) > 1:
+        path = path.rstrip("/")
+    return f"{host}{path}?{query}" if query else f"{host}{path}"
+
+
+def extract_canonical_url(html: Optional[str], base_url: str) -> Optional[str]:
+    """从HTML中提取 <link rel="canonical"> 的绝对URL"""
+    if not html:
+        return None
+    for tag in _LINK_TAG_RE.finditer(html[:CANONICAL_SCAN_CHARS]):
+        tag_text = tag.group()
+        if not _REL_CANONICAL_RE.search(tag_text):
+            continue
+        href = _HREF_RE.search(tag_text)
+        if href is None:
+            continue
+        value = html_module.unescape(next(group for group in href.groups() if group is not None)).strip()
+        canonical = urljoin(base_url, value)
+        if canonical.startswith(("http://", "https://")):
+            return canonical
+    return None
+
+
+def fingerprint_tokens(text: str) -> List[str]:
+    """计算指纹用的词序列 (去掉 Markdown 链接地址)"""
+    return tokenize(_MARKDOWN_TARGET_RE.sub("]", text or ""))[:MAX_FINGERPRINT_TOKENS]
+
+
+@dataclass(slots=True)
+class ContentFingerprint:
+    """正文指纹: 64 位 SimHash 和滑窗哈希的 bottom-k 样本 (MinHash)"""
+    simhash: int
+    sketch: frozenset
+
+
+def fingerprint(tokens: List[str]) -> ContentFingerprint:
+    """按三词滑窗计算正文指纹 (SimHash 以滑窗出现次数为权重)"""
+    if len(tokens) >= SHINGLE_SIZE:
+        shingles = Counter(" ".join(tokens[i:i + SHINGLE_SIZE]) for i in range(len(tokens) - SHINGLE_SIZE + 1))
+    else:
+        shingles = Counter(tokens)
+
+    # 先按 (字节位置, 字节值) 累计权重，再展开到 64 个位，逐位累加的循环次数减少到 1/8
+    byte_weights = [[0] * 256 for _ in range(FINGERPRINT_BITS // 8)]
+    hashes = []
+    for shingle, count in shingles.items():
+        digest = hashlib.blake2b(shingle.encode("utf-8"), digest_size=FINGERPRINT_BITS // 8).digest()
+        hashes.append(int.from_bytes(digest, "little"))
+        for position, byte in enumerate(digest):
+            byte_weights[position][byte] += count
+
+    weights = [0] * FINGERPRINT_BITS
+    for position, counts in enumerate(byte_weights):
+        for byte, count in enumerate(counts):
+            if not count:
+                continue
+            for bit in range(8):
+                if byte >> bit & 1:
+                    weights[position * 8 + bit] += count
+                else:
+                    weights[position * 8 + bit] -= count
+
+    value = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            value |= 1 << bit
+    return ContentFingerprint(simhash=value, sketch=frozenset(heapq.nsmallest(SKETCH_SIZE, hashes)))
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """两个 SimHash 不同的位数"""
+    return (a ^ b).bit_count()
+
+
+def estimate_jaccard(a: ContentFingerprint, b: ContentFingerprint) -> float:
+    """用 bottom-k 样本估计两篇正文滑窗集合的 Jaccard 相似度 (滑窗少于 k 个时是精确值)"""
+    union = heapq.nsmallest(SKETCH_SIZE, a.sketch | b.sketch)
+    if not union:
+        return 0.0
+    shared = sum(1 for value in union if value in a.sketch and value in b.sketch)
+    return shared / len(union)
+
+
+# 全局去重统计
+_dedup_stats = Counter()
+
+
+class DuplicateTracker:
+    """在一次工具调用内跟踪已保留的页面"""
+
+    def __init__(self, settings: Any):
+        """
+        Args:
+            settings: 去重配置 (DedupControl)
+        """
+        self.settings = settings
+        self._tracking_params = settings.tracking_params if settings.strip_tracking_params else ()
+        # 爬取前登记的URL键 (只用于跳过同一页面的其他URL形式)
+        self._claims: Dict[str, Any] = {}
+        # 已保留页面的URL键和 canonical 键 (爬取失败的页面不会进入)
+        self._keys: Dict[str, Any] = {}
+        self._fingerprints: List[Tuple[ContentFingerprint, Any]] = []
+
+    def clean(self, url: str) -> str:
+        """实际请求的URL"""
+        return clean_url(url, self._tracking_params)
+
+    def key(self, url: str) -> str:
+        """URL的去重键"""
+        return url_key(url, self._tracking_params, self.settings.map_mobile_variants)
+
+    def claim_url(self, url: str, ref: Any) -> Optional[Any]:
+        """
+        爬取前登记URL
+
+        Args:
+            url: 页面URL
+            ref: 调用方的页面标识 (排名或URL)
+
+        Returns:
+            已登记的同一页面的标识，没有重复时返回 None
+        """
+        key = self.key(url)
+        existing = self._claims.get(key)
+        if existing is not None and existing != ref:
+            _dedup_stats[DUPLICATE_URL] += 1
+            return existing
+        self._claims[key] = ref
+        return None
+
+    def check_content(self, ref: Any, url: str, result: Any) -> Optional[Tuple[Any, str]]:
+        """
+        爬取后检查页面内容，没有重复时把页面记为已保留
+
+        只与已保留的页面比较: 先完成的页面胜出，爬取失败的页面不会吞掉之后的副本。
+
+        Args:
+            ref: 页面标识 (与 claim_url 相同)
+            url: 页面URL
+            result: 爬取结果 (CrawlResult 或兼容对象)
+
+        Returns:
+            (已保留页面的标识, 重复原因)，没有重复时返回 None
+        """
+        canonical_key = None
+        if self.settings.use_rel_canonical:
+            canonical = extract_canonical_url(getattr(result, "html", None), getattr(result, "url", None) or url)
+            if canonical is not None:
+                canonical_key = self.key(canonical)
+                existing = self._keys.get(canonical_key)
+                if existing is not None and existing != ref:
+                    return self._duplicate(existing, DUPLICATE_CANONICAL)
+
+            # 已保留页面的 rel=canonical 指向本页
+            existing = self._keys.get(self.key(url))
+            if existing is not None and existing != ref:
+                return self._duplicate(existing, DUPLICATE_CANONICAL)
+
+        content = None
+        if self.settings.content_fingerprint:
+            tokens = fingerprint_tokens(str(getattr(result, "markdown", "") or ""))
+            # 太短的页面 (错误页、跳转页) 指纹不可靠
+            if len(tokens) >= self.settings.min_fingerprint_words:
+                content = fingerprint(tokens)
+                for kept, kept_ref in self._fingerprints:
+                    if (kept_ref != ref
+                            and hamming_distance(content.simhash, kept.simhash) <= self.settings.simhash_max_distance
+                            and estimate_jaccard(content, kept) >= self.settings.min_jaccard):
+                        return self._duplicate(kept_ref, DUPLICATE_CONTENT)
+
+        self._keys.setdefault(self.key(url), ref)
+        if canonical_key is not None:
+            self._keys.setdefault(canonical_key, ref)
+        if content is not None:
+            self._fingerprints.append((content, ref))
+        return None
+
+    def _duplicate(self, kept_ref: Any, reason: str) -> Tuple[Any, str]:
+        _dedup_stats[reason] += 1
+        return kept_ref, reason
+
+
+def record_refill(count: int = 1):
+    """记录用后续排名链接补位的次数"""
+    _dedup_stats["refilled"] += count
+
+
+def get_dedup_stats() -> Dict[str, int]:
+    """获取去重统计"""
+    return {
+        "url_duplicates": _dedup_stats[DUPLICATE_URL],
+        "canonical_duplicates": _dedup_stats[DUPLICATE_CANONICAL],
+        "content_duplicates": _dedup_stats[DUPLICATE_CONTENT],
+        "refilled": _dedup_stats["refilled"],
+    }
@@ -0,0 +1,363 @@
+# v9_core/host_scheduler.py - V9 按主机访问礼貌调度器
+"""
+按主机的访问礼貌调度器
+
+所有爬取路径 (浏览器池、批量调度器、HTTP快速通道) 在发出请求前都经过同一个调度器:
+- 每个主机一个令牌桶，按域名配置速率和突发量
+- 每个主机的并发上限
+- 遵守 robots.txt 中的 Crawl-delay / Request-rate
+- 遇到 429/503 时按 Retry-After 暂停该主机并降低速率 (乘性减速)，
+  成功响应后逐步恢复 (加性恢复)
+
+集中限速可以避免突发请求触发验证码，从而减少由封禁引起的重试风暴。
+"""
+
+import asyncio
+import sys
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, AsyncIterator, Dict, Mapping, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+# 需要减速的状态码
+SLOWDOWN_STATUS_CODES = (429, 503)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """解析 Retry-After 头 (秒数或HTTP日期)"""
+    if not value:
+        return None
+    value = str(value).strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def get_header(headers: Optional[Mapping[str, Any]], name: str) -> Optional[str]:
+    """大小写不敏感地读取响应头"""
+    if not headers:
+        return None
+    for key, value in headers.items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+
+@dataclass
+class TokenBucket:
+    """预约式令牌桶: 令牌可以透支，透支量决定调用方需要等待的时间"""
+    rate: float
+    capacity: float
+    tokens: float = 0.0
+    updated_at: float = field(default_factory=time.monotonic)
+
+    def __post_init__(self):
+        self.tokens = self.capacity
+
+    def _refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.rate)
+            self.updated_at = now
+
+    def reserve(self, now: float, not_before: float = 0.0) -> float:
+        """
+        预约一个令牌
+
+        Returns:
+            调用方需要等待的秒数
+        """
+        start = max(now, not_before)
+        self._refill(start)
+        self.tokens -= 1
+        wait = start - now
+        if self.tokens < 0:
+            wait += -self.tokens / self.rate
+        return wait
+
+
+@dataclass
+class HostState:
+    """单个主机的调度状态"""
+    host: str
+    base_rate: float
+    burst: int
+    concurrency: int
+    semaphore: asyncio.Semaphore
+    bucket: TokenBucket
+    rate_multiplier: float = 1.0
+    crawl_delay: Optional[float] = None
+    blocked_until: float = 0.0
+    robots_checked: bool = False
+    robots_lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    requests: int = 0
+    throttled: int = 0
+    total_wait_seconds: float = 0.0
+    slowdowns: int = 0
+
+    @property
+    def effective_rate(self) -> float:
+        rate = self.base_rate * self.rate_multiplier
+        if self.crawl_delay:
+            rate = min(rate, 1.0 / self.crawl_delay)
+        return rate
+
+    def apply_rate(self):
+        """把当前有效速率同步到令牌桶 (有 Crawl-delay 时不允许突发)"""
+        self.bucket.rate = self.effective_rate
+        self.bucket.capacity = 1 if self.crawl_delay else self.burst
+        self.bucket.tokens = min(self.bucket.tokens, self.bucket.capacity)
+
+
+class HostScheduler:
+    """按主机的访问礼貌调度器"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        default_requests_per_second: float = 2.0,
+        default_burst: int = 4,
+        max_concurrency_per_host: int = 2,
+        domain_requests_per_second: Optional[Dict[str, float]] = None,
+        respect_robots_crawl_delay: bool = True,
+        robots_timeout_seconds: float = 5,
+        max_crawl_delay_seconds: float = 30,
+        slowdown_factor: float = 2.0,
+        recovery_step: float = 0.1,
+        min_rate_fraction: float = 0.05,
+        default_retry_after_seconds: float = 10,
+        max_retry_after_seconds: float = 120
+    ):
+        self._hosts: Dict[str, HostState] = {}
+        self.configure(
+            enabled=enabled,
+            default_requests_per_second=default_requests_per_second,
+            default_burst=default_burst,
+            max_concurrency_per_host=max_concurrency_per_host,
+            domain_requests_per_second=domain_requests_per_second,
+            respect_robots_crawl_delay=respect_robots_crawl_delay,
+            robots_timeout_seconds=robots_timeout_seconds,
+            max_crawl_delay_seconds=max_crawl_delay_seconds,
+            slowdown_factor=slowdown_factor,
+            recovery_step=recovery_step,
+            min_rate_fraction=min_rate_fraction,
+            default_retry_after_seconds=default_retry_after_seconds,
+            max_retry_after_seconds=max_retry_after_seconds
+        )
+
+    def configure(
+        self,
+        enabled: bool,
+        default_requests_per_second: float,
+        default_burst: int,
+        max_concurrency_per_host: int,
+        domain_requests_per_second: Optional[Dict[str, float]],
+        respect_robots_crawl_delay: bool,
+        robots_timeout_seconds: float,
+        max_crawl_delay_seconds: float,
+        slowdown_factor: float,
+        recovery_step: float,
+        min_rate_fraction: float,
+        default_retry_after_seconds: float,
+        max_retry_after_seconds: float
+    ):
+        """更新调度设置，已知主机的减速、暂停和 Crawl-delay 状态保持不变"""
+        self.enabled = enabled
+        self.default_requests_per_second = max(0.01, default_requests_per_second)
+        self.default_burst = max(1, default_burst)
+        self.max_concurrency_per_host = max(1, max_concurrency_per_host)
+        # 更具体的域名优先匹配 (scholar.google.com 优先于 google.com)
+        self.domain_requests_per_second = dict(sorted(
+            ((domain.lower(), rate) for domain, rate in (domain_requests_per_second or {}).items()),
+            key=lambda item: -len(item[0])
+        ))
+        self.respect_robots_crawl_delay = respect_robots_crawl_delay
+        self.robots_timeout_seconds = robots_timeout_seconds
+        self.max_crawl_delay_seconds = max_crawl_delay_seconds
+        self.slowdown_factor = max(1.0, slowdown_factor)
+        self.recovery_step = recovery_step
+        self.min_rate_fraction = min(1.0, max(0.001, min_rate_fraction))
+        self.default_retry_after_seconds = default_retry_after_seconds
+        self.max_retry_after_seconds = max_retry_after_seconds
+
+        for host, state in self._hosts.items():
+            state.base_rate = self.get_host_rate(host)
+            state.burst = self.default_burst
+            if state.concurrency != self.max_concurrency_per_host:
+                # 信号量容量不能修改: 换用新的信号量，进行中的请求仍归还到旧信号量
+                state.concurrency = self.max_concurrency_per_host
+                state.semaphore = asyncio.Semaphore(state.concurrency)
+            state.apply_rate()
+
+    def get_host_rate(self, host: str) -> float:
+        """获取主机的配置速率 (支持子域名匹配)"""
+        for domain, rate in self.domain_requests_per_second.items():
+            if host == domain or host.endswith("." + domain):
+                return max(0.01, rate)
+        return self.default_requests_per_second
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """
+        等待直到可以向 url 所在主机发出请求
+
+        在上下文中发出请求；请求完成后应调用 report() 上报状态码。
+        """
+        host = (urlsplit(url).hostname or "").lower()
+        if not self.enabled or not host:
+            yield
+            return
+
+        state = self._get_state(host)
+        if self.respect_robots_crawl_delay and not state.robots_checked:
+            await self._load_robots(state, url)
+
+        async with state.semaphore:
+            now = time.monotonic()
+            wait = state.bucket.reserve(now, state.blocked_until)
+            state.requests += 1
+            if wait > 0:
+                state.throttled += 1
+                state.total_wait_seconds += wait
+                await asyncio.sleep(wait)
+            yield
+
+    def report(self, url: str, status_code: Optional[int], headers: Optional[Mapping[str, Any]] = None):
+        """上报请求结果，429/503 时减速并暂停该主机，成功时逐步恢复速率"""
+        if not self.enabled or status_code is None:
+            return
+        host = (urlsplit(url).hostname or "").lower()
+        state = self._hosts.get(host)
+        if state is None:
+            return
+
+        if status_code in SLOWDOWN_STATUS_CODES:
+            retry_after = parse_retry_after(get_header(headers, "Retry-After"))
+            if retry_after is None:
+                retry_after = self.default_retry_after_seconds
+            retry_after = min(retry_after, self.max_retry_after_seconds)
+
+            state.blocked_until = max(state.blocked_until, time.monotonic() + retry_after)
+            state.rate_multiplier = max(self.min_rate_fraction, state.rate_multiplier / self.slowdown_factor)
+            state.slowdowns += 1
+            state.apply_rate()
+            print(f"🐢 {host} 返回 {status_code}，暂停 {retry_after:.0f}s，速率降至 {state.effective_rate:.2f} 请求/秒", file=sys.stderr)
+        elif status_code < 400 and state.rate_multiplier < 1.0:
+            state.rate_multiplier = min(1.0, state.rate_multiplier + self.recovery_step)
+            state.apply_rate()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取调度统计信息"""
+        hosts = {
+            host: {
+                "rate": round(state.effective_rate, 3),
+                "crawl_delay": state.crawl_delay,
+                "requests": state.requests,
+                "throttled": state.throttled,
+                "wait_seconds": round(state.total_wait_seconds, 2),
+                "slowdowns": state.slowdowns,
+                "blocked_for": round(max(0.0, state.blocked_until - time.monotonic()), 1)
+            }
+            for host, state in self._hosts.items()
+        }
+        return {
+            "enabled": self.enabled,
+            "hosts": len(hosts),
+            "requests": sum(item["requests"] for item in hosts.values()),
+            "throttled": sum(item["throttled"] for item in hosts.values()),
+            "slowdowns": sum(item["slowdowns"] for item in hosts.values()),
+            "per_host": hosts
+        }
+
+    def _get_state(self, host: str) -> HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            rate = self.get_host_rate(host)
+            state = HostState(
+                host=host,
+                base_rate=rate,
+                burst=self.default_burst,
+                concurrency=self.max_concurrency_per_host,
+                semaphore=asyncio.Semaphore(self.max_concurrency_per_host),
+                bucket=TokenBucket(rate=rate, capacity=self.default_burst)
+            )
+            self._hosts[host] = state
+        return state
+
+    async def _load_robots(self, state: HostState, url: str):
+        """读取 robots.txt 中的 Crawl-delay (每个主机只读取一次，失败时忽略)"""
+        async with state.robots_lock:
+            if state.robots_checked:
+                return
+            state.robots_checked = True
+
+            parts = urlsplit(url)
+            robots_url = f"{parts.scheme}://{parts.netloc}/robots.txt"
+            try:
+                robots_text = await self._fetch_robots(robots_url)
+            except Exception:
+                return
+            if not robots_text:
+                return
+
+            parser = RobotFileParser()
+            parser.parse(robots_text.splitlines())
+            delay = parser.crawl_delay("*")
+            request_rate = parser.request_rate("*")
+            if request_rate and request_rate.requests:
+                rate_delay = request_rate.seconds / request_rate.requests
+                delay = max(float(delay or 0), rate_delay)
+
+            if delay:
+                state.crawl_delay = min(float(delay), self.max_crawl_delay_seconds)
+                state.apply_rate()
+
+    async def _fetch_robots(self, robots_url: str) -> Optional[str]:
+        import aiohttp
+
+        timeout = aiohttp.ClientTimeout(total=self.robots_timeout_seconds)
+        async with aiohttp.ClientSession(timeout=timeout) as session:
+            async with session.get(robots_url, allow_redirects=True) as response:
+                if response.status != 200:
+                    return None
+                return await response.text(errors="replace")
+
+
+# 全局调度器实例
+_host_scheduler = None
+
+def _politeness_settings(politeness) -> Dict[str, Any]:
+    """把 politeness 配置段转换为调度器参数"""
+    return {
+        "enabled": politeness.enabled,
+        "default_requests_per_second": politeness.default_requests_per_second,
+        "default_burst": politeness.default_burst,
+        "max_concurrency_per_host": politeness.max_concurrency_per_host,
+        "domain_requests_per_second": politeness.domain_requests_per_second,
+        "respect_robots_crawl_delay": politeness.respect_robots_crawl_delay,
+        "robots_timeout_seconds": politeness.robots_timeout_seconds,
+        "max_crawl_delay_seconds": politeness.max_crawl_delay_seconds,
+        "slowdown_factor": politeness.slowdown_factor,
+        "recovery_step": politeness.recovery_step,
+        "min_rate_fraction": politeness.min_rate_fraction,
+        "default_retry_after_seconds": politeness.default_retry_after_seconds,
+        "max_retry_after_seconds": politeness.max_retry_after_seconds,
+    }
+
+def get_host_scheduler() -> HostScheduler:
+    """获取全局按主机调度器实例 (politeness 配置修改或热加载后原地更新设置)"""
+    global _host_scheduler
+    if _host_scheduler is None:
+        from v9_core.config_store import get_config_store
+        store = get_config_store()
+        scheduler = HostScheduler(**_politeness_settings(store.current.politeness))
+        store.subscribe("politeness", lambda politeness: scheduler.configure(**_politeness_settings(politeness)))
+        _host_scheduler = scheduler
+    return _host_scheduler
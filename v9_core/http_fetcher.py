@@ -0,0 +1,326 @@
+# v9_core/http_fetcher.py - V9 HTTP 快速通道
+"""
+HTTP 快速通道 (分层抓取的第一层)
+
+静态页面 (文档站点、arXiv 摘要页、PubMed 记录等) 不需要启动 Chromium。
+快速通道使用常驻的 aiohttp 会话 (keep-alive 连接池) 直接获取 HTML，
+复用 crawl4ai 的清洗和 Markdown 生成流程；检测到页面依赖 JavaScript
+(空白正文、noscript 提示、SPA 外壳) 或被拦截时返回 None，由调用方升级到浏览器。
+"""
+
+import asyncio
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+from crawl4ai import CrawlerRunConfig
+from crawl4ai.markdown_generation_strategy import DefaultMarkdownGenerator
+
+from v9_core.host_scheduler import get_host_scheduler
+from v9_core.metrics import get_metrics
+# 服务层级标签由结果缓存定义 (缓存条目记录层级)，这里一并导出供工具响应使用
+from v9_core.result_cache import TIER_BROWSER, TIER_HTTP
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,zh-CN;q=0.8,zh;q=0.7",
+}
+
+# 需要 JavaScript 才能渲染的页面特征
+NOSCRIPT_MARKERS = (
+    "enable javascript",
+    "javascript is required",
+    "javascript is disabled",
+    "requires javascript",
+    "please turn on javascript",
+    "启用javascript",
+    "开启javascript",
+)
+
+SPA_SHELL_PATTERNS = (
+    re.compile(r'<div[^>]+id=["\'](root|app|__next|__nuxt|svelte)["\'][^>]*>\s*</div>', re.IGNORECASE),
+    re.compile(r'<app-root[^>]*>\s*</app-root>', re.IGNORECASE),
+    re.compile(r'\bng-app\b', re.IGNORECASE),
+)
+
+BOT_WALL_MARKERS = (
+    "captcha",
+    "unusual traffic",
+    "are you a robot",
+    "verify you are human",
+    "cf-challenge",
+    "安全验证",
+)
+
+BODY_PATTERN = re.compile(r'<body[^>]*>(.*)</body>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<script\b.*?</script>|<style\b.*?</style>|<[^>]+>', re.IGNORECASE | re.DOTALL)
+
+
+@dataclass
+class FastPathResult:
+    """快速通道的爬取结果，接口与 CrawlResult 的常用字段一致"""
+    url: str
+    html: str
+    markdown: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    links: Dict[str, List[Dict]] = field(default_factory=dict)
+    status_code: Optional[int] = None
+    success: bool = True
+    error_message: Optional[str] = None
+    tier: str = TIER_HTTP
+
+
+def detect_javascript_requirement(html: str, min_word_count: int) -> Optional[str]:
+    """
+    判断页面是否需要浏览器渲染
+
+    Returns:
+        需要升级到浏览器的原因，静态页面返回None
+    """
+    lowered = html.lower()
+
+    body_match = BODY_PATTERN.search(html)
+    body = body_match.group(1) if body_match else html
+    visible_text = TAG_PATTERN.sub(" ", body)
+    word_count = len(visible_text.split())
+
+    if word_count == 0:
+        return "empty body"
+
+    # 正文很短且带有验证提示时通常是反爬拦截页 (长文章中出现这些词不算)
+    if word_count < min_word_count * 4 and any(marker in lowered for marker in BOT_WALL_MARKERS):
+        return "bot wall"
+
+    if "<noscript" in lowered and any(marker in lowered for marker in NOSCRIPT_MARKERS):
+        if word_count < min_word_count * 4:
+            return "noscript marker"
+
+    if any(pattern.search(html) for pattern in SPA_SHELL_PATTERNS) and word_count < min_word_count * 4:
+        return "SPA shell"
+
+    if word_count < min_word_count:
+        return f"too little text ({word_count} words)"
+
+    return None
+
+
+class HttpFetcher:
+    """基于 aiohttp 的 HTTP 快速通道"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        timeout_seconds: float = 10,
+        min_word_count: int = 50,
+        max_response_bytes: int = 5 * 1024 * 1024,
+        connection_limit: int = 20,
+        per_host_limit: int = 4,
+        skip_domains: Optional[List[str]] = None
+    ):
+        self._session: Optional[aiohttp.ClientSession] = None
+        # 设置修改后换下的会话: 其上可能还有进行中的请求，关闭快速通道时一并关闭
+        self._retired_sessions: List[aiohttp.ClientSession] = []
+        self.configure(
+            enabled=enabled,
+            timeout_seconds=timeout_seconds,
+            min_word_count=min_word_count,
+            max_response_bytes=max_response_bytes,
+            connection_limit=connection_limit,
+            per_host_limit=per_host_limit,
+            skip_domains=skip_domains
+        )
+        self._markdown_generator = DefaultMarkdownGenerator()
+        self._stats = {"served": 0, "escalated": 0, "errors": 0}
+        self._escalation_reasons: Dict[str, int] = {}
+
+    def configure(
+        self,
+        enabled: bool,
+        timeout_seconds: float,
+        min_word_count: int,
+        max_response_bytes: int,
+        connection_limit: int,
+        per_host_limit: int,
+        skip_domains: Optional[List[str]]
+    ):
+        """更新快速通道设置；连接池或超时改变时，下一个请求换用新的会话"""
+        session_settings = (timeout_seconds, connection_limit, per_host_limit)
+        if self._session is not None and session_settings != (
+            self.timeout_seconds, self.connection_limit, self.per_host_limit
+        ):
+            self._retired_sessions.append(self._session)
+            self._session = None
+
+        self.enabled = enabled
+        self.timeout_seconds = timeout_seconds
+        self.min_word_count = min_word_count
+        self.max_response_bytes = max_response_bytes
+        self.connection_limit = connection_limit
+        self.per_host_limit = per_host_limit
+        self.skip_domains = [domain.lower() for domain in (skip_domains or [])]
+
+    def should_try(self, url: str) -> bool:
+        """判断URL是否适合走快速通道"""
+        if not self.enabled or not url.startswith(("http://", "https://")):
+            return False
+        host = (urlsplit(url).hostname or "").lower()
+        return not any(host == domain or host.endswith("." + domain) for domain in self.skip_domains)
+
+    async def fetch(self, url: str, run_config: Optional[CrawlerRunConfig] = None) -> Optional[FastPathResult]:
+        """
+        尝试通过 HTTP 快速通道获取页面
+
+        Args:
+            url: 目标URL
+            run_config: 爬取配置 (用于清洗和Markdown生成)
+
+        Returns:
+            FastPathResult，需要升级到浏览器时返回None
+        """
+        if not self.should_try(url):
+            return None
+
+        scheduler = get_host_scheduler()
+        metrics = get_metrics()
+        try:
+            session = self._get_session()
+            async with scheduler.slot(url):
+                fetch_started = time.perf_counter()
+                async with session.get(url, allow_redirects=True) as response:
+                    scheduler.report(url, response.status, response.headers)
+                    # 4xx/5xx 通常意味着反爬拦截或临时故障，交给浏览器层处理
+                    if response.status >= 400:
+                        return self._escalate(f"HTTP {response.status}")
+
+                    content_type = response.headers.get("Content-Type", "").lower()
+                    if "html" not in content_type:
+                        return self._escalate(f"content type {content_type or 'unknown'}")
+
+                    if (response.content_length or 0) > self.max_response_bytes:
+                        return self._escalate("response too large")
+
+                    body = await response.content.read(self.max_response_bytes + 1)
+                    if len(body) > self.max_response_bytes:
+                        return self._escalate("response too large")
+
+                    html = body.decode(response.get_encoding() or "utf-8", errors="replace")
+                    status_code = response.status
+                    final_url = str(response.url)
+                    metrics.observe_phase("http_fetch", time.perf_counter() - fetch_started)
+        except Exception as e:
+            self._stats["errors"] += 1
+            return self._escalate(f"request error: {type(e).__name__}")
+
+        reason = detect_javascript_requirement(html, self.min_word_count)
+        if reason:
+            return self._escalate(reason)
+
+        try:
+            with metrics.phase("markdown_conversion"):
+                result = await asyncio.to_thread(self._html_to_result, final_url, html, status_code, run_config)
+        except Exception as e:
+            self._stats["errors"] += 1
+            return self._escalate(f"conversion error: {type(e).__name__}")
+
+        if not result.markdown.strip():
+            return self._escalate("empty markdown")
+
+        self._stats["served"] += 1
+        metrics.record_page(url, True, len(result.markdown.encode("utf-8")), status_code)
+        return result
+
+    async def close(self):
+        """关闭HTTP会话"""
+        sessions, self._retired_sessions = self._retired_sessions + [self._session], []
+        for session in sessions:
+            if session is not None and not session.closed:
+                await session.close()
+        self._session = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取快速通道统计信息"""
+        return {
+            "enabled": self.enabled,
+            **self._stats,
+            "escalation_reasons": dict(self._escalation_reasons)
+        }
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.per_host_limit,
+                keepalive_timeout=30,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                headers=DEFAULT_HEADERS,
+                timeout=aiohttp.ClientTimeout(total=self.timeout_seconds)
+            )
+        return self._session
+
+    def _escalate(self, reason: str) -> None:
+        self._stats["escalated"] += 1
+        reason_key = reason.split(" (")[0]
+        self._escalation_reasons[reason_key] = self._escalation_reasons.get(reason_key, 0) + 1
+        return None
+
+    def _html_to_result(
+        self,
+        url: str,
+        html: str,
+        status_code: int,
+        run_config: Optional[CrawlerRunConfig]
+    ) -> FastPathResult:
+        """复用 crawl4ai 的清洗策略和Markdown生成器 (与浏览器层输出一致)"""
+        run_config = run_config or CrawlerRunConfig()
+        params = run_config.__dict__.copy()
+        params.pop("url", None)
+
+        scraped = run_config.scraping_strategy.scrap(url, html, **params)
+        markdown_generator = run_config.markdown_generator or self._markdown_generator
+        markdown_result = markdown_generator.generate_markdown(input_html=scraped.cleaned_html, base_url=url)
+
+        return FastPathResult(
+            url=url,
+            html=html,
+            markdown=markdown_result.raw_markdown,
+            metadata=scraped.metadata or {},
+            links=scraped.links.model_dump(),
+            status_code=status_code
+        )
+
+
+# 全局HTTP快速通道实例
+_http_fetcher = None
+
+def _fast_path_settings(fast_path) -> Dict[str, Any]:
+    """把 fast_path 配置段转换为快速通道参数"""
+    return {
+        "enabled": fast_path.enabled,
+        "timeout_seconds": fast_path.timeout_seconds,
+        "min_word_count": fast_path.min_word_count,
+        "max_response_bytes": fast_path.max_response_bytes,
+        "connection_limit": fast_path.connection_limit,
+        "per_host_limit": fast_path.per_host_limit,
+        "skip_domains": fast_path.skip_domains,
+    }
+
+def get_http_fetcher() -> HttpFetcher:
+    """获取全局HTTP快速通道实例 (fast_path 配置修改或热加载后原地更新设置)"""
+    global _http_fetcher
+    if _http_fetcher is None:
+        from v9_core.config_store import get_config_store
+        store = get_config_store()
+        fetcher = HttpFetcher(**_fast_path_settings(store.current.fast_path))
+        store.subscribe("fast_path", lambda fast_path: fetcher.configure(**_fast_path_settings(fast_path)))
+        _http_fetcher = fetcher
+    return _http_fetcher
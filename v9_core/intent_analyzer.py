@@ -4,6 +4,8 @@ from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 from enum import Enum
 
+from v9_core.keyword_matcher import KeywordMatcher
+
 class IntentType(Enum):
     """意图类型"""
     SEARCH = "search"           # 搜索请求
@@ -121,6 +123,46 @@ class V6IntentAnalyzer:
             "japanese": ["日文", "日语", "日本", "japanese", "japan"],
             "korean": ["韩文", "韩语", "韩国", "korean", "korea"]
         }
+        
+        # 隐含搜索引擎偏好指示词 (按优先级顺序检查)
+        self.implicit_engine_indicators = {
+            # 1. 学术内容偏好 - 最高优先级，Google 在学术搜索方面最强
+            "academic": ["学术", "论文", "研究", "paper", "research", "academic", "scholar", "科研", "期刊", "文献"],
+            # 2. 隐私保护偏好 - 高优先级，DuckDuckGo 专注隐私
+            "privacy": ["隐私", "匿名", "privacy", "anonymous", "私密", "保护", "安全搜索"],
+            # 3. 技术内容偏好 - 高优先级，Google 在技术搜索方面更强
+            "tech": [
+                "编程", "代码", "技术", "开发", "programming", "coding", "development", 
+                "api", "github", "教程", "tutorial", "框架", "framework", "库", "library",
+                "算法", "algorithm", "数据结构", "机器学习", "人工智能", "AI", "软件", "software",
+                "python", "java", "javascript", "react", "vue", "node", "数据库", "database"
+            ],
+            # 4. 明确的中文地域偏好 - 中等优先级，更精确匹配（避免覆盖技术内容）
+            "chinese_local": [
+                "中国新闻", "国内资讯", "本土品牌", "大陆政策", "中文小说", "国产", 
+                "内地", "中文论坛", "国内网站", "中国公司", "国内服务"
+            ],
+            # 5. 新闻资讯偏好 - 较低优先级
+            "news": ["新闻", "资讯", "消息", "news", "breaking", "latest"],
+            "chinese_news": ["中国新闻", "国内新闻", "大陆新闻"]
+        }
+        
+        # 特殊需求关键词
+        self.special_needs_keywords = {
+            "stealth": ["隐身", "偷偷", "悄悄", "绕过", "避开", "stealth", "anonymous"],
+            "dynamic": ["动态", "异步", "等待", "加载", "dynamic", "ajax", "spa"],
+            "batch": ["批量", "多个", "一批", "batch", "multiple", "bulk"]
+        }
+        
+        # 预编译关键词自动机: 搜索引擎名称区分大小写匹配原始输入，其余类别匹配小写输入
+        self._engine_matcher = KeywordMatcher(self.search_engine_keywords)
+        self._text_matcher = KeywordMatcher({
+            **{("intent", intent): keywords for intent, keywords in self.intent_keywords.items()},
+            **{("content", name): keywords for name, keywords in self.content_type_keywords.items()},
+            **{("language", name): keywords for name, keywords in self.language_keywords.items()},
+            **{("implicit", name): keywords for name, keywords in self.implicit_engine_indicators.items()},
+            **{("special", name): keywords for name, keywords in self.special_needs_keywords.items()},
+        })
     
     def analyze(self, user_input: str) -> UserIntent:
         """分析用户意图"""
@@ -128,20 +170,23 @@ class V6IntentAnalyzer:
         processed_input = user_input.lower().strip()
         tokens = self._tokenize(processed_input)
         
+        # 一次扫描得到所有类别的关键词命中
+        hits = self._text_matcher.scan(processed_input)
+        
         # 分析搜索引擎意图 (最高优先级)
-        search_engine, engine_intent = self._analyze_search_engine_intent(user_input)
+        search_engine, engine_intent = self._analyze_search_engine_intent(user_input, hits)
         
         # 分析主要意图
-        primary_intent, confidence = self._analyze_primary_intent(processed_input)
+        primary_intent, confidence = self._analyze_primary_intent(processed_input, hits)
         
         # 分析内容类型
-        content_type = self._analyze_content_type(processed_input)
+        content_type = self._analyze_content_type(processed_input, hits)
         
         # 分析语言偏好
-        language_preference = self._analyze_language_preference(processed_input)
+        language_preference = self._analyze_language_preference(processed_input, hits)
         
         # 分析特殊需求
-        special_needs = self._analyze_special_needs(processed_input)
+        special_needs = self._analyze_special_needs(processed_input, hits)
         
         # 提取搜索关键词
         search_keywords = self._extract_search_keywords(user_input, search_engine)
@@ -167,51 +212,40 @@ class V6IntentAnalyzer:
         tokens = re.findall(r'\w+', text)
         return tokens
     
-    def _analyze_search_engine_intent(self, user_input: str) -> tuple[Optional[str], SearchEngineIntent]:
+    def _analyze_search_engine_intent(self, user_input: str, hits: Optional[Dict] = None) -> tuple[Optional[str], SearchEngineIntent]:
         """分析搜索引擎意图 - 核心功能，必须准确"""
         
         # 检查明确指定的搜索引擎
-        for engine, keywords in self.search_engine_keywords.items():
-            for keyword in keywords:
-                if keyword in user_input:
-                    # 找到明确指定的搜索引擎
-                    return engine, SearchEngineIntent.EXPLICIT
+        engine_hits = self._engine_matcher.scan(user_input)
+        for engine in self.search_engine_keywords:
+            if engine in engine_hits:
+                # 找到明确指定的搜索引擎
+                return engine, SearchEngineIntent.EXPLICIT
         
         # 检查隐含偏好 (基于内容类型) - 按优化后的优先级顺序检查
+        if hits is None:
+            hits = self._text_matcher.scan(user_input.lower())
         
-        # 1. 学术内容偏好 - 最高优先级，Google 在学术搜索方面最强
-        academic_indicators = ["学术", "论文", "研究", "paper", "research", "academic", "scholar", "科研", "期刊", "文献"]
-        if any(word in user_input.lower() for word in academic_indicators):
+        # 1. 学术内容偏好
+        if ("implicit", "academic") in hits:
             return "google", SearchEngineIntent.IMPLICIT
         
-        # 2. 隐私保护偏好 - 高优先级，DuckDuckGo 专注隐私
-        privacy_indicators = ["隐私", "匿名", "privacy", "anonymous", "私密", "保护", "安全搜索"]
-        if any(word in user_input.lower() for word in privacy_indicators):
+        # 2. 隐私保护偏好
+        if ("implicit", "privacy") in hits:
             return "duckduckgo", SearchEngineIntent.IMPLICIT
         
-        # 3. 技术内容偏好 - 高优先级，Google 在技术搜索方面更强（扩展关键词，提升优先级）
-        tech_indicators = [
-            "编程", "代码", "技术", "开发", "programming", "coding", "development", 
-            "api", "github", "教程", "tutorial", "框架", "framework", "库", "library",
-            "算法", "algorithm", "数据结构", "机器学习", "人工智能", "AI", "软件", "software",
-            "python", "java", "javascript", "react", "vue", "node", "数据库", "database"
-        ]
-        if any(word in user_input.lower() for word in tech_indicators):
+        # 3. 技术内容偏好
+        if ("implicit", "tech") in hits:
             return "google", SearchEngineIntent.IMPLICIT
         
-        # 4. 明确的中文地域偏好 - 中等优先级，更精确匹配（避免覆盖技术内容）
-        chinese_local_indicators = [
-            "中国新闻", "国内资讯", "本土品牌", "大陆政策", "中文小说", "国产", 
-            "内地", "中文论坛", "国内网站", "中国公司", "国内服务"
-        ]
-        if any(phrase in user_input.lower() for phrase in chinese_local_indicators):
+        # 4. 明确的中文地域偏好
+        if ("implicit", "chinese_local") in hits:
             return "baidu", SearchEngineIntent.IMPLICIT
         
-        # 5. 新闻资讯偏好 - 较低优先级，根据明确的地域需求选择
-        news_indicators = ["新闻", "资讯", "消息", "news", "breaking", "latest"]
-        if any(word in user_input.lower() for word in news_indicators):
+        # 5. 新闻资讯偏好 - 根据明确的地域需求选择
+        if ("implicit", "news") in hits:
             # 只有明确提到中国/国内的新闻才用百度
-            if any(phrase in user_input.lower() for phrase in ["中国新闻", "国内新闻", "大陆新闻"]):
+            if ("implicit", "chinese_news") in hits:
                 return "baidu", SearchEngineIntent.IMPLICIT
             else:
                 return "google", SearchEngineIntent.IMPLICIT
@@ -219,41 +253,43 @@ class V6IntentAnalyzer:
         # 默认选择 Google（全球化考虑，技术内容更全面）
         return "google", SearchEngineIntent.AUTO
     
-    def _analyze_primary_intent(self, processed_input: str) -> tuple[IntentType, float]:
+    def _analyze_primary_intent(self, processed_input: str, hits: Optional[Dict] = None) -> tuple[IntentType, float]:
         """分析主要意图"""
-        intent_scores = {}
+        if hits is None:
+            hits = self._text_matcher.scan(processed_input)
         
-        for intent_type, keywords in self.intent_keywords.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in processed_input:
-                    score += 1
-            
-            if score > 0:
-                intent_scores[intent_type] = score
+        # 得分为命中的不同关键词数量
+        intent_scores = {}
+        for intent_type in self.intent_keywords:
+            matched = hits.get(("intent", intent_type))
+            if matched:
+                intent_scores[intent_type] = len(matched)
         
         if intent_scores:
             # 找到得分最高的意图
             primary_intent = max(intent_scores, key=intent_scores.get)
             max_score = intent_scores[primary_intent]
-            total_keywords = sum(len(keywords) for keywords in self.intent_keywords.values())
             confidence = min(max_score / 3.0, 1.0)  # 标准化置信度
             return primary_intent, confidence
         
         # 默认为搜索意图
         return IntentType.SEARCH, 0.5
     
-    def _analyze_content_type(self, processed_input: str) -> Optional[str]:
+    def _analyze_content_type(self, processed_input: str, hits: Optional[Dict] = None) -> Optional[str]:
         """分析内容类型"""
-        for content_type, keywords in self.content_type_keywords.items():
-            if any(keyword in processed_input for keyword in keywords):
+        if hits is None:
+            hits = self._text_matcher.scan(processed_input)
+        for content_type in self.content_type_keywords:
+            if ("content", content_type) in hits:
                 return content_type
         return None
     
-    def _analyze_language_preference(self, processed_input: str) -> Optional[str]:
+    def _analyze_language_preference(self, processed_input: str, hits: Optional[Dict] = None) -> Optional[str]:
         """分析语言偏好"""
-        for language, keywords in self.language_keywords.items():
-            if any(keyword in processed_input for keyword in keywords):
+        if hits is None:
+            hits = self._text_matcher.scan(processed_input)
+        for language in self.language_keywords:
+            if ("language", language) in hits:
                 return language
         
         # 基于输入文本的字符判断
@@ -265,16 +301,13 @@ class V6IntentAnalyzer:
         
         return None
     
-    def _analyze_special_needs(self, processed_input: str) -> Dict[str, bool]:
+    def _analyze_special_needs(self, processed_input: str, hits: Optional[Dict] = None) -> Dict[str, bool]:
         """分析特殊需求"""
-        stealth_keywords = ["隐身", "偷偷", "悄悄", "绕过", "避开", "stealth", "anonymous"]
-        dynamic_keywords = ["动态", "异步", "等待", "加载", "dynamic", "ajax", "spa"]
-        batch_keywords = ["批量", "多个", "一批", "batch", "multiple", "bulk"]
-        
+        if hits is None:
+            hits = self._text_matcher.scan(processed_input)
         return {
-            "stealth": any(keyword in processed_input for keyword in stealth_keywords),
-            "dynamic": any(keyword in processed_input for keyword in dynamic_keywords),
-            "batch": any(keyword in processed_input for keyword in batch_keywords)
+            need: ("special", need) in hits
+            for need in self.special_needs_keywords
         }
     
     def _extract_search_keywords(self, user_input: str, search_engine: Optional[str]) -> List[str]:
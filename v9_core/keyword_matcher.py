@@ -0,0 +1,92 @@
+# v9_core/keyword_matcher.py - V9 多模式关键词匹配器
+"""
+基于 Aho-Corasick 自动机的多模式关键词匹配器
+
+意图分析需要判断输入中出现了哪些类别的关键词。逐个关键词做 `keyword in text`
+的成本随关键词数量线性增长；自动机在构建时把所有关键词编译到一棵带失败指针的
+字典树中，之后一次扫描即可返回所有类别的命中，耗时只与输入长度相关。
+匹配语义与子串匹配 `keyword in text` 完全一致 (区分大小写，调用方自行规范化)。
+"""
+
+from collections import deque
+from typing import Dict, Hashable, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Aho-Corasick 多模式关键词匹配器"""
+
+    def __init__(self, categories: Dict[Hashable, Iterable[str]]):
+        """
+        构建自动机
+
+        Args:
+            categories: 类别 -> 关键词列表；同一关键词可以属于多个类别
+        """
+        # 每个节点: 子节点转移表、失败指针、命中输出 (类别, 关键词)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[Tuple[Hashable, str], ...]] = [()]
+
+        for category, keywords in categories.items():
+            for keyword in dict.fromkeys(keywords):
+                if keyword:
+                    self._add_keyword(category, keyword)
+
+        self._build_failure_links()
+
+    def _add_keyword(self, category: Hashable, keyword: str):
+        node = 0
+        for char in keyword:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = next_node
+        self._output[node] = self._output[node] + ((category, keyword),)
+
+    def _build_failure_links(self):
+        """广度优先构建失败指针，并把失败链上的输出合并到每个节点"""
+        queue = deque()
+        for child in self._goto[0].values():
+            self._fail[child] = 0
+            queue.append(child)
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                fail_target = self._goto[fail].get(char, 0)
+                self._fail[child] = fail_target if fail_target != child else 0
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+                queue.append(child)
+
+    def scan(self, text: str) -> Dict[Hashable, Set[str]]:
+        """
+        单次扫描文本
+
+        Returns:
+            类别 -> 命中的关键词集合 (只包含有命中的类别)
+        """
+        hits: Dict[Hashable, Set[str]] = {}
+        goto = self._goto
+        fail = self._fail
+        output = self._output
+        node = 0
+
+        for char in text:
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for category, keyword in output[node]:
+                hits.setdefault(category, set()).add(keyword)
+
+        return hits
+
+    def categories(self, text: str) -> Set[Hashable]:
+        """返回文本中命中的所有类别"""
+        return set(self.scan(text))
@@ -0,0 +1,386 @@
+# v9_core/metrics.py - V9 性能指标与延迟直方图
+"""
+性能指标收集
+
+记录每个工具调用和每次页面爬取的耗时，按阶段拆分:
+- browser_acquire: 从浏览器池借出爬虫
+- navigation: page.goto 直到响应返回 (crawl4ai before_goto -> after_goto 钩子)
+- render_wait: 等待页面渲染 (after_goto -> before_retrieve_html)
+- html_capture: 延迟与获取HTML (before_retrieve_html -> before_return_html)
+- markdown_conversion: 清洗和Markdown生成 (before_return_html -> arun 返回，或快速通道的转换)
+- http_fetch: HTTP快速通道请求
+- formatting: 格式化工具输出
+
+所有数据保存在固定桶数的直方图中，内存占用不随请求数增长；
+域名维度的计数器有数量上限，超出后归入 "other"。
+"""
+
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# 延迟桶: 1ms 到约 262s，按2倍递增
+LATENCY_BUCKETS = tuple(0.001 * 2 ** i for i in range(19))
+# 字节桶: 256B 到 64MB，按4倍递增
+BYTES_BUCKETS = tuple(256 * 4 ** i for i in range(10))
+
+OTHER_DOMAIN = "other"
+
+# 当前请求的阶段时间戳 (由 crawl4ai 钩子写入)
+_page_marks: contextvars.ContextVar[Optional[Dict[str, float]]] = contextvars.ContextVar(
+    "v9_page_marks", default=None
+)
+
+
+class Histogram:
+    """固定桶直方图"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        """按桶内线性插值估算分位数"""
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                lower = self.buckets[index - 1] if index > 0 else 0.0
+                upper = self.buckets[index] if index < len(self.buckets) else self.max
+                fraction = (rank - cumulative) / bucket_count
+                estimate = lower + (upper - lower) * fraction
+                return min(max(estimate, self.min), self.max)
+            cumulative += bucket_count
+        return self.max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "max": self.max
+        }
+
+
+@dataclass
+class DomainCounters:
+    """单个域名的页面计数"""
+    success: int = 0
+    failure: int = 0
+    bytes: int = 0
+    status_codes: Dict[int, int] = field(default_factory=dict)
+
+
+class MetricsRegistry:
+    """进程级性能指标注册表"""
+
+    def __init__(self, enabled: bool = True, max_domains: int = 200):
+        self.configure(enabled, max_domains)
+        self.started_at = time.time()
+
+        self._lock = threading.Lock()
+        self._tool_latency: Dict[str, Histogram] = {}
+        self._tool_bytes: Dict[str, Histogram] = {}
+        self._tool_errors: Dict[str, int] = {}
+        self._phase_latency: Dict[str, Histogram] = {}
+        self._domains: Dict[str, DomainCounters] = {}
+
+    def configure(self, enabled: bool, max_domains: int):
+        """更新指标设置，已记录的数据保留"""
+        self.enabled = enabled
+        self.max_domains = max_domains
+
+    # ----- 记录 -----
+
+    def observe_tool(self, tool: str, seconds: float, output_bytes: int = 0, error: bool = False):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._tool_latency.setdefault(tool, Histogram()).observe(seconds)
+            self._tool_bytes.setdefault(tool, Histogram(BYTES_BUCKETS)).observe(output_bytes)
+            if error:
+                self._tool_errors[tool] = self._tool_errors.get(tool, 0) + 1
+
+    def observe_phase(self, phase: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._phase_latency.setdefault(phase, Histogram()).observe(seconds)
+
+    def record_page(self, url: str, success: bool, content_bytes: int = 0, status_code: Optional[int] = None):
+        """记录一次页面爬取的结果 (按域名计数)"""
+        if not self.enabled:
+            return
+        domain = (urlsplit(url).hostname or "").lower() or OTHER_DOMAIN
+        with self._lock:
+            counters = self._domains.get(domain)
+            if counters is None:
+                if len(self._domains) >= self.max_domains:
+                    domain = OTHER_DOMAIN
+                counters = self._domains.setdefault(domain, DomainCounters())
+            if success:
+                counters.success += 1
+            else:
+                counters.failure += 1
+            counters.bytes += content_bytes
+            if status_code is not None:
+                counters.status_codes[status_code] = counters.status_codes.get(status_code, 0) + 1
+
+    @contextmanager
+    def phase(self, name: str):
+        """计时一个阶段"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_phase(name, time.perf_counter() - start)
+
+    @asynccontextmanager
+    async def track_page(self, url: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        跟踪一次 crawler.arun 调用
+
+        调用方在上下文中执行 arun，并把结果写入 yield 出的字典的 "result" 键；
+        已安装阶段钩子的浏览器会在同一任务上下文中写入各阶段时间戳。
+        """
+        marks: Dict[str, float] = {}
+        token = _page_marks.set(marks)
+        record: Dict[str, Any] = {"result": None}
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            end = time.perf_counter()
+            _page_marks.reset(token)
+            self.observe_phase("page_total", end - start)
+            self._observe_page_marks(marks, end)
+
+            result = record["result"]
+            if result is not None:
+                markdown = getattr(result, "markdown", None)
+                self.record_page(
+                    url,
+                    bool(getattr(result, "success", False)),
+                    len(str(markdown).encode("utf-8")) if markdown else 0,
+                    getattr(result, "status_code", None)
+                )
+            else:
+                self.record_page(url, False)
+
+    def _observe_page_marks(self, marks: Dict[str, float], end: float):
+        spans = (
+            ("navigation", "before_goto", "after_goto"),
+            ("render_wait", "after_goto", "before_retrieve_html"),
+            ("html_capture", "before_retrieve_html", "before_return_html"),
+        )
+        for phase, start_mark, end_mark in spans:
+            if start_mark in marks and end_mark in marks:
+                self.observe_phase(phase, marks[end_mark] - marks[start_mark])
+        if "before_return_html" in marks:
+            self.observe_phase("markdown_conversion", end - marks["before_return_html"])
+
+    # ----- 导出 -----
+
+    def snapshot(self) -> Dict[str, Any]:
+        """获取所有指标的摘要"""
+        with self._lock:
+            return {
+                "uptime_seconds": time.time() - self.started_at,
+                "tools": {
+                    tool: {
+                        **histogram.summary(),
+                        "errors": self._tool_errors.get(tool, 0),
+                        "bytes_total": int(self._tool_bytes[tool].sum),
+                        "bytes_p95": self._tool_bytes[tool].quantile(0.95)
+                    }
+                    for tool, histogram in self._tool_latency.items()
+                },
+                "phases": {
+                    phase: histogram.summary()
+                    for phase, histogram in self._phase_latency.items()
+                },
+                "domains": {
+                    domain: {
+                        "success": counters.success,
+                        "failure": counters.failure,
+                        "bytes": counters.bytes,
+                        "status_codes": dict(counters.status_codes)
+                    }
+                    for domain, counters in self._domains.items()
+                }
+            }
+
+    def reset(self):
+        """清空所有指标"""
+        with self._lock:
+            self._tool_latency.clear()
+            self._tool_bytes.clear()
+            self._tool_errors.clear()
+            self._phase_latency.clear()
+            self._domains.clear()
+            self.started_at = time.time()
+
+    def to_prometheus(self) -> str:
+        """导出 Prometheus 文本格式"""
+        lines: List[str] = []
+        with self._lock:
+            lines.append("# HELP v9_tool_duration_seconds MCP tool call latency")
+            lines.append("# TYPE v9_tool_duration_seconds histogram")
+            for tool, histogram in sorted(self._tool_latency.items()):
+                lines.extend(_prometheus_histogram("v9_tool_duration_seconds", {"tool": tool}, histogram))
+
+            lines.append("# HELP v9_tool_output_bytes MCP tool output size")
+            lines.append("# TYPE v9_tool_output_bytes histogram")
+            for tool, histogram in sorted(self._tool_bytes.items()):
+                lines.extend(_prometheus_histogram("v9_tool_output_bytes", {"tool": tool}, histogram))
+
+            lines.append("# HELP v9_tool_errors_total MCP tool calls that raised")
+            lines.append("# TYPE v9_tool_errors_total counter")
+            for tool, errors in sorted(self._tool_errors.items()):
+                lines.append(f'v9_tool_errors_total{{tool="{_escape(tool)}"}} {errors}')
+
+            lines.append("# HELP v9_phase_duration_seconds Crawl phase latency")
+            lines.append("# TYPE v9_phase_duration_seconds histogram")
+            for phase, histogram in sorted(self._phase_latency.items()):
+                lines.extend(_prometheus_histogram("v9_phase_duration_seconds", {"phase": phase}, histogram))
+
+            lines.append("# HELP v9_pages_total Crawled pages by domain and outcome")
+            lines.append("# TYPE v9_pages_total counter")
+            lines.append("# HELP v9_page_bytes_total Markdown bytes produced by domain")
+            lines.append("# TYPE v9_page_bytes_total counter")
+            for domain, counters in sorted(self._domains.items()):
+                label = _escape(domain)
+                lines.append(f'v9_pages_total{{domain="{label}",outcome="success"}} {counters.success}')
+                lines.append(f'v9_pages_total{{domain="{label}",outcome="failure"}} {counters.failure}')
+                lines.append(f'v9_page_bytes_total{{domain="{label}"}} {counters.bytes}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _prometheus_histogram(name: str, labels: Dict[str, str], histogram: Histogram) -> List[str]:
+    label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    lines = []
+    cumulative = 0
+    for bound, bucket_count in zip(histogram.buckets, histogram.counts):
+        cumulative += bucket_count
+        lines.append(f'{name}_bucket{{{label_text},le="{bound:g}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{label_text},le="+Inf"}} {histogram.count}')
+    lines.append(f'{name}_sum{{{label_text}}} {histogram.sum}')
+    lines.append(f'{name}_count{{{label_text}}} {histogram.count}')
+    return lines
+
+
+def install_phase_hooks(crawler: Any):
+    """
+    在 crawl4ai 爬虫策略上安装阶段计时钩子
+
+    钩子只在当前任务处于 track_page 上下文时记录时间戳，并发请求之间互不影响。
+    """
+    strategy = getattr(crawler, "crawler_strategy", None)
+    if strategy is None or not hasattr(strategy, "set_hook"):
+        return
+
+    def make_hook(mark: str):
+        async def hook(page=None, *args, **kwargs):
+            marks = _page_marks.get()
+            if marks is not None:
+                marks[mark] = time.perf_counter()
+            return page
+        return hook
+
+    for mark in ("before_goto", "after_goto", "before_retrieve_html", "before_return_html"):
+        try:
+            strategy.set_hook(mark, make_hook(mark))
+        except ValueError:
+            pass
+
+
+async def start_prometheus_server(registry: "MetricsRegistry", host: str, port: int):
+    """
+    启动 Prometheus 文本格式的指标端点 (GET /metrics)
+
+    MCP 默认使用 stdio 传输，因此端点由独立的 aiohttp 服务提供。
+
+    Returns:
+        aiohttp AppRunner，关闭时调用 runner.cleanup()
+    """
+    from aiohttp import web
+
+    async def handle_metrics(request):
+        return web.Response(
+            text=registry.to_prometheus(),
+            content_type="text/plain",
+            charset="utf-8",
+            headers={"X-Content-Type-Options": "nosniff"}
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    return runner
+
+
+def instrument_tool(name: str, registry: Optional["MetricsRegistry"] = None) -> Callable:
+    """记录异步工具函数的耗时、输出字节数和异常次数"""
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            metrics = registry or get_metrics()
+            start = time.perf_counter()
+            try:
+                output = await func(*args, **kwargs)
+            except BaseException:
+                metrics.observe_tool(name, time.perf_counter() - start, error=True)
+                raise
+            output_bytes = len(output.encode("utf-8")) if isinstance(output, str) else 0
+            metrics.observe_tool(name, time.perf_counter() - start, output_bytes)
+            return output
+        return wrapper
+    return decorator
+
+
+# 全局指标注册表
+_metrics = None
+
+def get_metrics() -> MetricsRegistry:
+    """获取全局指标注册表 (metrics 配置修改或热加载后原地更新设置)"""
+    global _metrics
+    if _metrics is None:
+        from v9_core.config_store import get_config_store
+        store = get_config_store()
+        metrics_config = store.current.metrics
+        registry = MetricsRegistry(
+            enabled=metrics_config.enabled,
+            max_domains=metrics_config.max_domains
+        )
+        store.subscribe("metrics", lambda metrics_config: registry.configure(
+            metrics_config.enabled, metrics_config.max_domains
+        ))
+        _metrics = registry
+    return _metrics
@@ -0,0 +1,184 @@
+# v9_core/progress.py - V9 进度通知与取消
+"""
+MCP 进度通知与协作式取消
+
+进度: ProgressTracker 按阶段权重把各阶段内的完成比例折算为 0-100 的总进度，
+根据已用时间估算剩余时间 (参考 legacy 的 V5ProgressTracker)，再通过
+ctx.report_progress 推送给客户端。当前请求的 tracker 放在 ContextVar 中，
+深层的辅助函数直接调用 report_stage / report_step，不需要逐层传参；
+没有 ctx 或客户端没有请求进度时不发送任何通知。
+
+取消: MCP 客户端取消请求时，SDK 会取消处理该请求的 anyio 取消范围。
+anyio 的取消是持续的，范围内之后的每一次 await 都会再次被取消，
+crawl4ai 关闭页面、浏览器池归还租约等清理代码里的 await 也会被打断，
+页面和浏览器名额因此泄漏。cancellable 把工具主体放到独立任务中执行，
+取消时只向该任务投递一次 CancelledError，清理代码可以正常执行完。
+"""
+
+import asyncio
+import sys
+import time
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Sequence, Set, Tuple
+
+# 同一阶段内两次进度通知的最小间隔 (秒)，阶段切换和完成时总是发送
+MIN_REPORT_INTERVAL_SECONDS = 0.25
+
+_current_tracker: ContextVar[Optional["ProgressTracker"]] = ContextVar("progress_tracker", default=None)
+
+
+class ProgressTracker:
+    """按阶段权重计算总进度和剩余时间，并通过 MCP 进度通知推送"""
+
+    def __init__(
+        self,
+        ctx: Any,
+        stages: Sequence[Tuple[str, float]],
+        min_interval: float = MIN_REPORT_INTERVAL_SECONDS
+    ):
+        """
+        Args:
+            ctx: FastMCP Context，None 表示不发送通知
+            stages: 按执行顺序排列的 (阶段名称, 权重)
+            min_interval: 同一阶段内的最小通知间隔 (秒)
+        """
+        self.ctx = ctx
+        self.min_interval = min_interval
+        self.start_time = time.monotonic()
+        self.progress = 0.0
+        self.stage: Optional[str] = None
+        self._last_report = 0.0
+
+        # 每个阶段在总进度中的起点和跨度 (百分比)
+        total_weight = sum(weight for _, weight in stages) or 1.0
+        self._spans: Dict[str, Tuple[float, float]] = {}
+        offset = 0.0
+        for name, weight in stages:
+            self._spans[name] = (offset / total_weight * 100, weight / total_weight * 100)
+            offset += weight
+
+    def eta_seconds(self) -> Optional[float]:
+        """根据已用时间和当前进度估算剩余时间"""
+        if self.progress <= 0 or self.progress >= 100:
+            return None
+        elapsed = time.monotonic() - self.start_time
+        return elapsed / self.progress * (100 - self.progress)
+
+    async def update(self, stage: str, fraction: float = 0.0, message: Optional[str] = None):
+        """
+        更新进度
+
+        Args:
+            stage: 当前阶段名称
+            fraction: 当前阶段的完成比例 (0-1)
+            message: 进度说明
+        """
+        start, span = self._spans.get(stage, (self.progress, 0.0))
+        fraction = max(0.0, min(1.0, fraction))
+        # 进度只增不减 (例如回退到其他策略时)
+        progress = max(self.progress, min(100.0, start + span * fraction))
+
+        now = time.monotonic()
+        stage_changed = stage != self.stage
+        self.progress = progress
+        self.stage = stage
+        if not stage_changed and fraction < 1.0 and now - self._last_report < self.min_interval:
+            return
+        self._last_report = now
+
+        if self.ctx is None:
+            return
+        text = message or stage
+        eta = self.eta_seconds()
+        if eta is not None:
+            text = f"{text} (预计剩余 {eta:.0f}s)"
+        try:
+            await self.ctx.report_progress(round(progress, 1), 100, text)
+        except Exception:
+            # 进度通知失败 (如客户端已断开) 不影响爬取本身
+            pass
+
+    async def step(self, stage: str, done: int, total: int, message: Optional[str] = None):
+        """按已完成数量更新阶段进度"""
+        await self.update(stage, done / total if total else 1.0, message)
+
+    async def finish(self, message: str = "完成"):
+        """进度推进到100%"""
+        self.progress = 100.0
+        self.stage = None
+        if self.ctx is None:
+            return
+        try:
+            await self.ctx.report_progress(100, 100, message)
+        except Exception:
+            pass
+
+
+def start_progress(ctx: Any, stages: Sequence[Tuple[str, float]]) -> ProgressTracker:
+    """
+    为当前工具调用创建进度跟踪器，之后的 report_stage / report_step 都上报给它
+
+    跟踪器保存在当前上下文中，应在 cancellable 工具内调用:
+    cancellable 为每次调用创建独立任务，任务拥有自己的上下文副本。
+    """
+    tracker = ProgressTracker(ctx, stages)
+    _current_tracker.set(tracker)
+    return tracker
+
+
+async def report_stage(stage: str, fraction: float = 0.0, message: Optional[str] = None):
+    """向当前请求的进度跟踪器上报阶段进度 (没有跟踪器时不做任何事)"""
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        await tracker.update(stage, fraction, message)
+
+
+async def report_step(stage: str, done: int, total: int, message: Optional[str] = None):
+    """向当前请求的进度跟踪器上报已完成数量"""
+    tracker = _current_tracker.get()
+    if tracker is not None:
+        await tracker.step(stage, done, total, message)
+
+
+# 被取消后仍在执行清理的工具任务 (保持引用，避免任务被回收)
+_tearing_down: Set[asyncio.Task] = set()
+_cancellation_stats = {"cancelled": 0}
+
+
+def _finish_teardown(task: asyncio.Task):
+    _tearing_down.discard(task)
+    # 取回清理过程中的异常，避免 "exception was never retrieved" 警告
+    if not task.cancelled():
+        task.exception()
+
+
+def cancellable(func: Callable) -> Callable:
+    """
+    异步工具装饰器: 在独立任务中执行工具主体
+
+    客户端取消请求时向该任务投递一次取消，任务中的 finally / async with
+    清理 (关闭页面、归还浏览器租约、取消子任务) 在后台执行完，不会被再次打断。
+    """
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        task = asyncio.create_task(func(*args, **kwargs))
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done():
+                task.cancel()
+                _tearing_down.add(task)
+                task.add_done_callback(_finish_teardown)
+            _cancellation_stats["cancelled"] += 1
+            print(f"🛑 工具调用已取消，正在释放页面和浏览器: {func.__name__}", file=sys.stderr)
+            raise
+    return wrapper
+
+
+def get_cancellation_stats() -> Dict[str, int]:
+    """获取取消统计"""
+    return {
+        "cancelled": _cancellation_stats["cancelled"],
+        "tearing_down": len(_tearing_down),
+    }
@@ -0,0 +1,290 @@
+# v9_core/render_wait.py - V9 自适应渲染等待
+"""
+自适应渲染等待
+
+原来隐身模式和智能模式在每个页面返回HTML前固定 sleep
+(stealth_delay_seconds / dynamic_content_delay_seconds)：静态页面白白多等 1-2 秒，
+慢的单页应用等完了也还没渲染完。这里改为在页面内观察:
+- 网络: 一段时间内没有新的资源请求完成
+- DOM: MutationObserver 一段时间内没有观察到变化
+- 正文: 主内容区域的词数不再增长 (中文按字计)
+三者同时安静 quiet_window_ms 且正文达到最少词数即返回，最长等待 max_wait_ms。
+
+每个域名记录页面稳定所需时间的指数滑动平均，样本足够后据此预设下一次等待:
+至少先等典型稳定时间的一半 (避免单页应用在请求数据前短暂安静被误判)，
+上限收紧到典型稳定时间的几倍，始终不安静的页面 (动画/轮播) 也不会每次都等满上限。
+
+等待通过 crawl4ai 的 before_retrieve_html 钩子执行，只对 shared_data 中带
+RENDER_WAIT_FLAG 的 CrawlerRunConfig 生效。
+"""
+
+import asyncio
+import contextvars
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from v9_core.crawl_config_manager import get_crawl_config
+
+# CrawlerRunConfig.shared_data 中启用自适应等待的标记
+RENDER_WAIT_FLAG = "adaptive_render_wait"
+
+# 在页面中执行的等待脚本: 返回 Promise，稳定或超时后 resolve
+RENDER_WAIT_SCRIPT = """
+async ({quietMs, pollMs, minMs, maxMs, minWords}) => {
+  const start = performance.now();
+  let lastMutation = start;
+  let lastNetwork = start;
+  const mutations = new MutationObserver(() => { lastMutation = performance.now(); });
+  mutations.observe(document.documentElement || document, {childList: true, subtree: true, characterData: true});
+  let resources = null;
+  try {
+    resources = new PerformanceObserver(() => { lastNetwork = performance.now(); });
+    resources.observe({type: "resource"});
+  } catch (e) {}
+
+  const countWords = () => {
+    const root = document.querySelector("main, article, [role=main]") || document.body;
+    const text = root ? (root.innerText || root.textContent || "") : "";
+    const tokens = text.match(/[\\u3040-\\u30ff\\u3400-\\u9fff\\uac00-\\ud7af]|[^\\s\\u3040-\\u30ff\\u3400-\\u9fff\\uac00-\\ud7af]+/g);
+    return tokens ? tokens.length : 0;
+  };
+
+  let words = countWords();
+  let lastGrowth = start;
+  let settled = false;
+  while (true) {
+    await new Promise(resolve => setTimeout(resolve, pollMs));
+    const now = performance.now();
+    const current = countWords();
+    if (current !== words) {
+      words = current;
+      lastGrowth = now;
+    }
+    const elapsed = now - start;
+    const quiet = now - Math.max(lastMutation, lastNetwork, lastGrowth);
+    const ready = document.readyState === "complete";
+    // 正文够长时安静一个窗口即可；正文很短 (如确实是短页面) 需要安静两个窗口
+    if (elapsed >= minMs && ready && quiet >= quietMs && (words >= minWords || quiet >= quietMs * 2)) {
+      settled = true;
+      break;
+    }
+    if (elapsed >= maxMs) {
+      break;
+    }
+  }
+  mutations.disconnect();
+  if (resources) resources.disconnect();
+  return {settled, elapsedMs: performance.now() - start, contentSettledMs: lastGrowth - start, words};
+}
+"""
+
+
+@dataclass
+class DomainSettleStats:
+    """单个域名的页面稳定时间统计"""
+    samples: int = 0
+    settle_ms: float = 0.0
+    capped: int = 0
+
+
+class RenderWaitLearner:
+    """按域名学习页面稳定所需时间 (指数滑动平均)，LRU 限制域名数量"""
+
+    def __init__(self, max_domains: int = 500):
+        self.max_domains = max(1, max_domains)
+        self._domains: "OrderedDict[str, DomainSettleStats]" = OrderedDict()
+
+    def plan(self, host: str, quiet_ms: int, max_wait_ms: int, min_samples: int) -> Tuple[int, int]:
+        """
+        根据域名历史预设本次等待
+
+        Returns:
+            (最短等待毫秒, 最长等待毫秒)
+        """
+        stats = self._domains.get(host)
+        if stats is None or stats.samples < max(1, min_samples):
+            return 0, max_wait_ms
+        self._domains.move_to_end(host)
+        min_ms = int(min(stats.settle_ms * 0.5, max_wait_ms))
+        max_ms = int(min(max_wait_ms, max(stats.settle_ms * 3 + quiet_ms, quiet_ms * 2)))
+        return min_ms, max_ms
+
+    def record(self, host: str, settle_ms: float, settled: bool, alpha: float):
+        """记录一次页面稳定时间 (未稳定时记录正文停止增长的时间)"""
+        stats = self._domains.get(host)
+        if stats is None:
+            stats = self._domains[host] = DomainSettleStats(settle_ms=settle_ms)
+            while len(self._domains) > self.max_domains:
+                self._domains.popitem(last=False)
+        else:
+            stats.settle_ms += min(1.0, max(0.01, alpha)) * (settle_ms - stats.settle_ms)
+            self._domains.move_to_end(host)
+        stats.samples += 1
+        if not settled:
+            stats.capped += 1
+
+    def get_domain(self, host: str) -> Optional[DomainSettleStats]:
+        return self._domains.get(host)
+
+    def __len__(self) -> int:
+        return len(self._domains)
+
+
+class RenderWaitEngine:
+    """在页面内等待渲染稳定，替代固定的 delay_before_return_html"""
+
+    def __init__(self, learner: Optional[RenderWaitLearner] = None):
+        self.learner = learner or RenderWaitLearner()
+        self.stats = {
+            "pages": 0,
+            "settled": 0,
+            "capped": 0,
+            "errors": 0,
+            "wait_ms": 0.0,
+        }
+
+    async def wait(self, page: Any, settings: Any, url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        等待页面渲染稳定
+
+        Args:
+            page: Playwright Page
+            settings: 自适应等待配置 (RenderWaitControl)
+            url: 页面URL (用于按域名学习)，默认使用 page.url
+
+        Returns:
+            等待结果 {settled, elapsedMs, contentSettledMs, words}，页面已关闭或跳转时返回 None
+        """
+        quiet_ms = max(50, settings.quiet_window_ms)
+        max_wait_ms = max(quiet_ms, settings.max_wait_ms)
+        host = urlparse(url or getattr(page, "url", "") or "").netloc.lower()
+        learn = settings.learn_per_domain and bool(host)
+
+        min_ms, max_ms = (0, max_wait_ms)
+        if learn:
+            min_ms, max_ms = self.learner.plan(host, quiet_ms, max_wait_ms, settings.learning_min_samples)
+
+        params = {
+            "quietMs": quiet_ms,
+            "pollMs": max(20, settings.poll_interval_ms),
+            "minMs": min_ms,
+            "maxMs": max_ms,
+            "minWords": settings.min_content_words,
+        }
+        started = time.perf_counter()
+        try:
+            # 页面脚本被阻塞时 evaluate 可能不返回，外层再加一个超时
+            outcome = await asyncio.wait_for(
+                page.evaluate(RENDER_WAIT_SCRIPT, params),
+                timeout=max_ms / 1000 + 2
+            )
+        except Exception:
+            # 页面跳转导致执行上下文销毁、页面已关闭等，直接返回当前HTML
+            self.stats["errors"] += 1
+            self.stats["wait_ms"] += (time.perf_counter() - started) * 1000
+            return None
+
+        self.stats["pages"] += 1
+        self.stats["wait_ms"] += outcome["elapsedMs"]
+        if outcome["settled"]:
+            self.stats["settled"] += 1
+        else:
+            self.stats["capped"] += 1
+
+        if learn:
+            settle_ms = outcome["elapsedMs"] if outcome["settled"] else outcome["contentSettledMs"]
+            self.learner.record(host, settle_ms, outcome["settled"], settings.learning_alpha)
+        return outcome
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取等待统计"""
+        waits = self.stats["pages"] + self.stats["errors"]
+        return {
+            **self.stats,
+            "avg_wait_ms": self.stats["wait_ms"] / waits if waits else 0.0,
+            "domains_learned": len(self.learner),
+        }
+
+
+def render_wait_enabled(run_config: Any) -> bool:
+    """判断 CrawlerRunConfig 是否启用了自适应等待"""
+    shared_data = getattr(run_config, "shared_data", None)
+    return bool(shared_data and shared_data.get(RENDER_WAIT_FLAG))
+
+
+# 当前请求的等待结果记录 (由 before_retrieve_html 钩子写入)
+_wait_record: contextvars.ContextVar[Optional[Dict[str, Any]]] = contextvars.ContextVar(
+    "v9_render_wait_record", default=None
+)
+
+
+@contextmanager
+def capture_render_wait() -> Iterator[Dict[str, Any]]:
+    """
+    捕获一次 crawler.arun 调用中的自适应等待结果
+
+    调用方在上下文中执行 arun，钩子在同一任务上下文中把等待结果写入 yield 出的字典的 "outcome" 键。
+    """
+    record: Dict[str, Any] = {"outcome": None}
+    token = _wait_record.set(record)
+    try:
+        yield record
+    finally:
+        _wait_record.reset(token)
+
+
+def describe_render_wait(outcome: Optional[Dict[str, Any]]) -> str:
+    """格式化等待结果，用于工具响应"""
+    if not outcome:
+        return "Adaptive (not measured)"
+    elapsed_ms = round(outcome["elapsedMs"])
+    if outcome["settled"]:
+        return f"Adaptive, settled in {elapsed_ms}ms"
+    return f"Adaptive, capped at {elapsed_ms}ms"
+
+
+def install_render_wait_hook(crawler: Any, engine: Optional[RenderWaitEngine] = None):
+    """
+    在 crawl4ai 爬虫策略的 before_retrieve_html 钩子上安装自适应等待
+
+    crawl4ai 每种钩子只保存一个函数，这里保留已安装的钩子 (如阶段计时)，
+    并在等待结束后再调用它，使等待时间计入 render_wait 阶段而不是 html_capture。
+    """
+    strategy = getattr(crawler, "crawler_strategy", None)
+    if strategy is None or not hasattr(strategy, "set_hook"):
+        return
+    engine = engine or get_render_wait_engine()
+    previous = strategy.hooks.get("before_retrieve_html")
+
+    async def hook(page=None, *args, **kwargs):
+        run_config = kwargs.get("config")
+        if page is not None and render_wait_enabled(run_config):
+            # 按页面实际导航到的 page.url 学习，不读取可能被并发请求改写的 config.url
+            outcome = await engine.wait(page, get_crawl_config().render_wait)
+            record = _wait_record.get()
+            if record is not None:
+                record["outcome"] = outcome
+        if previous is not None:
+            await previous(page, *args, **kwargs)
+        return page
+
+    try:
+        strategy.set_hook("before_retrieve_html", hook)
+    except ValueError:
+        pass
+
+
+# 全局自适应等待引擎
+_render_wait_engine = None
+
+def get_render_wait_engine() -> RenderWaitEngine:
+    """获取全局自适应等待引擎 (等待参数每次从当前配置快照读取)"""
+    global _render_wait_engine
+    if _render_wait_engine is None:
+        max_domains = get_crawl_config().render_wait.max_domains
+        _render_wait_engine = RenderWaitEngine(RenderWaitLearner(max_domains=max_domains))
+    return _render_wait_engine
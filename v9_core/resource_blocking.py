@@ -0,0 +1,185 @@
+# v9_core/resource_blocking.py - V9 资源拦截配置
+"""
+按配置拦截页面子资源
+
+提取正文只需要 HTML 和生成 DOM 的脚本，图片、字体、音视频以及统计/广告脚本
+下载后都不会进入 Markdown。这里在 crawl4ai 创建页面后 (on_page_context_created
+钩子) 用 Playwright 的 page.route 按资源类型和域名拦截请求:
+- text_only: 拦截图片、音视频、字体、样式表和跟踪器
+- text_css:  拦截图片、音视频、字体和跟踪器，保留样式表 (部分站点靠CSS显示内容)
+- full:      不拦截 (不安装路由，没有额外开销)
+
+工具类型使用的配置由配置工厂写入 CrawlerRunConfig.shared_data，
+按域名的配置 (resource_blocking.domain_profiles) 优先于工具配置。
+截图/PDF 请求需要完整资源，始终使用 full。
+被拦截的请求没有下载，字节数按资源类型的典型大小估算。
+"""
+
+from collections import Counter
+from typing import Any, Dict, Iterable, Optional
+from urllib.parse import urlparse
+
+from v9_core.crawl_config_manager import get_crawl_config
+
+# CrawlerRunConfig.shared_data 中记录工具类型对应拦截配置的键
+RESOURCE_PROFILE_KEY = "resource_profile"
+
+# 各配置拦截的资源类型 (Playwright request.resource_type)
+RESOURCE_PROFILES: Dict[str, frozenset] = {
+    "text_only": frozenset({"image", "media", "font", "stylesheet"}),
+    "text_css": frozenset({"image", "media", "font"}),
+    "full": frozenset(),
+}
+
+# 被拦截资源的典型传输大小 (字节)，用于估算节省的流量
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 40_000,
+    "media": 500_000,
+    "font": 30_000,
+    "stylesheet": 15_000,
+    "script": 30_000,
+}
+DEFAULT_RESOURCE_BYTES = 5_000
+
+
+def host_matches(host: str, domains: Iterable[str]) -> Optional[str]:
+    """返回与主机匹配的最具体的域名 (自身或上级域名)，没有匹配时返回 None"""
+    best = None
+    for domain in domains:
+        if host == domain or host.endswith("." + domain):
+            if best is None or len(domain) > len(best):
+                best = domain
+    return best
+
+
+def resolve_profile(settings: Any, tool_profile: Optional[str], url: Optional[str]) -> str:
+    """
+    确定页面使用的拦截配置
+
+    Args:
+        settings: 资源拦截配置 (ResourceBlockingControl)
+        tool_profile: 工具类型对应的配置 (来自 shared_data)
+        url: 页面URL
+
+    Returns:
+        拦截配置名称
+    """
+    host = urlparse(url or "").netloc.lower()
+    domain = host_matches(host, settings.domain_profiles) if host else None
+    if domain is not None:
+        return settings.domain_profiles[domain]
+    return tool_profile or settings.default_profile
+
+
+class ResourceBlocker:
+    """在页面上安装请求拦截并统计拦截结果"""
+
+    def __init__(self):
+        self.stats = {
+            "pages": 0,
+            "blocked_requests": 0,
+            "tracker_requests": 0,
+            "estimated_bytes_saved": 0,
+        }
+        self.blocked_by_type: Counter = Counter()
+        self.pages_by_profile: Counter = Counter()
+
+    async def attach(self, page: Any, profile: str, blocked_domains: Iterable[str]):
+        """
+        在页面上安装拦截路由
+
+        Args:
+            page: Playwright Page
+            profile: 拦截配置名称 (text_only/text_css/full)
+            blocked_domains: 跟踪器/广告域名
+        """
+        self.pages_by_profile[profile] += 1
+        blocked_types = RESOURCE_PROFILES.get(profile, frozenset())
+        if not blocked_types:
+            return
+        blocked_domains = tuple(blocked_domains)
+
+        async def handle(route):
+            request = route.request
+            resource_type = request.resource_type
+            if resource_type in blocked_types:
+                tracker = False
+            elif resource_type == "document" and request.frame.parent_frame is None:
+                # 主文档本身从不拦截
+                await route.fallback()
+                return
+            else:
+                host = urlparse(request.url).netloc.lower()
+                tracker = host_matches(host, blocked_domains) is not None
+                if not tracker:
+                    await route.fallback()
+                    return
+
+            self.stats["blocked_requests"] += 1
+            if tracker:
+                self.stats["tracker_requests"] += 1
+            self.blocked_by_type[resource_type] += 1
+            self.stats["estimated_bytes_saved"] += ESTIMATED_RESOURCE_BYTES.get(resource_type, DEFAULT_RESOURCE_BYTES)
+            try:
+                await route.abort("blockedbyclient")
+            except Exception:
+                # 页面已关闭时路由可能已失效
+                pass
+
+        await page.route("**/*", handle)
+        self.stats["pages"] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取拦截统计"""
+        return {
+            **self.stats,
+            "estimated_mb_saved": round(self.stats["estimated_bytes_saved"] / (1024 * 1024), 1),
+            "blocked_by_type": dict(self.blocked_by_type),
+            "pages_by_profile": dict(self.pages_by_profile),
+        }
+
+
+def install_resource_blocking_hook(crawler: Any, blocker: Optional[ResourceBlocker] = None):
+    """
+    在 crawl4ai 爬虫策略的 on_page_context_created 钩子上安装资源拦截
+
+    crawl4ai 每种钩子只保存一个函数，这里保留已安装的钩子并先调用它。
+    """
+    strategy = getattr(crawler, "crawler_strategy", None)
+    if strategy is None or not hasattr(strategy, "set_hook"):
+        return
+    blocker = blocker or get_resource_blocker()
+    previous = strategy.hooks.get("on_page_context_created")
+
+    async def hook(page=None, *args, **kwargs):
+        if previous is not None:
+            await previous(page, *args, **kwargs)
+        run_config = kwargs.get("config")
+        shared_data = getattr(run_config, "shared_data", None) or {}
+        tool_profile = shared_data.get(RESOURCE_PROFILE_KEY)
+        settings = get_crawl_config().resource_blocking
+        # 没有工具配置说明该 CrawlerRunConfig 不来自配置工厂或拦截已关闭
+        if page is None or tool_profile is None or not settings.enabled:
+            return page
+        if getattr(run_config, "screenshot", False) or getattr(run_config, "pdf", False):
+            profile = "full"
+        else:
+            profile = resolve_profile(settings, tool_profile, getattr(run_config, "url", None))
+        await blocker.attach(page, profile, settings.blocked_domains)
+        return page
+
+    try:
+        strategy.set_hook("on_page_context_created", hook)
+    except ValueError:
+        pass
+
+
+# 全局资源拦截器
+_resource_blocker = None
+
+def get_resource_blocker() -> ResourceBlocker:
+    """获取全局资源拦截器"""
+    global _resource_blocker
+    if _resource_blocker is None:
+        _resource_blocker = ResourceBlocker()
+    return _resource_blocker
@@ -0,0 +1,363 @@
+# v9_core/result_cache.py - V9 内容寻址爬取结果缓存
+"""
+内容寻址的磁盘爬取结果缓存
+
+缓存键由规范化后的URL、工具类型和影响页面内容的 CrawlerRunConfig 字段
+(渲染/隐身参数、传给钩子的 shared_data) 计算得出；每个域名可以设置独立的TTL，
+超出容量时按LRU淘汰，Markdown以gzip压缩存储。同一会话内重复爬取同一页面时
+可以直接返回，无需重新渲染。条目记录服务层级，需要浏览器的调用方不会命中
+HTTP 快速通道 (未执行 JavaScript) 的结果。
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# 影响页面内容的 CrawlerRunConfig 字段 (超时、缓存模式等不影响内容的字段不参与计算)
+CONTENT_CONFIG_FIELDS = (
+    "word_count_threshold",
+    "css_selector",
+    "target_elements",
+    "excluded_tags",
+    "excluded_selector",
+    "only_text",
+    "js_code",
+    "wait_for",
+    "scan_full_page",
+    "process_iframes",
+    "remove_overlay_elements",
+    "magic",
+    "simulate_user",
+    "override_navigator",
+    "user_agent",
+    "user_agent_mode",
+    "wait_until",
+    "delay_before_return_html",
+    "locale",
+    "timezone_id",
+    "geolocation",
+    "shared_data",
+)
+
+# CrawlerRunConfig.shared_data 中记录工具类型的键 (由配置工厂写入)
+TOOL_TYPE_KEY = "v9_tool_type"
+
+# 结果的服务层级
+TIER_HTTP = "HTTP fast path (aiohttp)"
+TIER_BROWSER = "Browser (Chromium)"
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """规范化URL: 小写协议和主机、去掉默认端口和片段、排序查询参数"""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    path = parts.path or "/"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def make_cache_key(url: str, run_config: Any = None) -> str:
+    """根据规范化URL和内容相关配置 (含 shared_data 中的工具类型与渲染标志) 计算缓存键"""
+    config_fields = {
+        name: getattr(run_config, name, None)
+        for name in CONTENT_CONFIG_FIELDS
+    } if run_config is not None else {}
+    key_source = json.dumps(
+        {"url": normalize_url(url), "config": config_fields},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CachedCrawlResult:
+    """从缓存读取的爬取结果，接口与 CrawlResult 的常用字段一致"""
+    url: str
+    markdown: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    status_code: Optional[int] = None
+    cached_at: float = 0.0
+    tier: str = TIER_BROWSER
+    success: bool = True
+    error_message: Optional[str] = None
+
+    @property
+    def age_seconds(self) -> float:
+        return max(0.0, time.time() - self.cached_at)
+
+
+@dataclass
+class _CacheEntry:
+    path: Path
+    size: int
+    expires_at: float
+
+
+class ResultCache:
+    """磁盘爬取结果缓存"""
+
+    def __init__(
+        self,
+        cache_dir: str = "v9_cache",
+        max_size_mb: int = 200,
+        default_ttl_seconds: int = 3600,
+        domain_ttl_seconds: Optional[Dict[str, int]] = None,
+        enabled: bool = True
+    ):
+        self.cache_dir = Path(cache_dir)
+        self._index: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._total_size = 0
+        self._loaded = False
+        self._lock = asyncio.Lock()
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        self.configure(
+            cache_dir=cache_dir,
+            max_size_mb=max_size_mb,
+            default_ttl_seconds=default_ttl_seconds,
+            domain_ttl_seconds=domain_ttl_seconds,
+            enabled=enabled
+        )
+
+    def configure(
+        self,
+        cache_dir: str,
+        max_size_mb: int,
+        default_ttl_seconds: int,
+        domain_ttl_seconds: Optional[Dict[str, int]],
+        enabled: bool
+    ):
+        """更新缓存设置；缩小容量后在下一次写入时淘汰，更换目录后重新扫描索引"""
+        if Path(cache_dir) != self.cache_dir:
+            self.cache_dir = Path(cache_dir)
+            self._index = OrderedDict()
+            self._total_size = 0
+            self._loaded = False
+        self.max_size_bytes = max_size_mb * 1024 * 1024
+        self.default_ttl_seconds = default_ttl_seconds
+        self.domain_ttl_seconds = domain_ttl_seconds or {}
+        self.enabled = enabled
+
+    def get_ttl(self, url: str) -> int:
+        """获取URL所属域名的TTL (支持子域名匹配)"""
+        host = (urlsplit(url).hostname or "").lower()
+        for domain, ttl in self.domain_ttl_seconds.items():
+            domain = domain.lower()
+            if host == domain or host.endswith("." + domain):
+                return ttl
+        return self.default_ttl_seconds
+
+    async def get(
+        self,
+        url: str,
+        run_config: Any = None,
+        require_browser: bool = False
+    ) -> Optional[CachedCrawlResult]:
+        """
+        读取缓存，未命中或已过期时返回None
+
+        Args:
+            url: 页面URL
+            run_config: 本次爬取的 CrawlerRunConfig
+            require_browser: 调用方需要浏览器渲染 (隐身、动态内容)，HTTP 快速通道的条目视为未命中
+        """
+        if not self.enabled:
+            return None
+
+        key = make_cache_key(url, run_config)
+        async with self._lock:
+            self._ensure_loaded()
+            entry = self._index.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry.expires_at and entry.expires_at < time.time():
+                self._remove(key)
+                self._stats["misses"] += 1
+                return None
+            self._index.move_to_end(key)
+
+        try:
+            payload = await asyncio.to_thread(self._read_payload, entry.path)
+        except Exception:
+            async with self._lock:
+                self._remove(key)
+                self._stats["misses"] += 1
+            return None
+
+        tier = payload.get("tier", TIER_BROWSER)
+        if require_browser and tier == TIER_HTTP:
+            self._stats["misses"] += 1
+            return None
+
+        self._stats["hits"] += 1
+        return CachedCrawlResult(
+            url=payload.get("url", url),
+            markdown=payload.get("markdown", ""),
+            metadata=payload.get("metadata") or {},
+            status_code=payload.get("status_code"),
+            cached_at=payload.get("cached_at", 0.0),
+            tier=tier
+        )
+
+    async def put(self, url: str, run_config: Any, result: Any):
+        """写入成功的爬取结果"""
+        if not self.enabled or not getattr(result, "success", False):
+            return
+        markdown = getattr(result, "markdown", None)
+        if not markdown:
+            return
+
+        now = time.time()
+        ttl = self.get_ttl(url)
+        payload = {
+            "url": url,
+            "markdown": str(markdown),
+            "metadata": getattr(result, "metadata", None) or {},
+            "status_code": getattr(result, "status_code", None),
+            "tier": getattr(result, "tier", TIER_BROWSER),
+            "cached_at": now,
+            "expires_at": now + ttl if ttl > 0 else 0
+        }
+
+        key = make_cache_key(url, run_config)
+        path = self._entry_path(key)
+        try:
+            size = await asyncio.to_thread(self._write_payload, path, payload)
+        except Exception as e:
+            print(f"⚠️ 缓存写入失败: {e}", file=sys.stderr)
+            return
+
+        async with self._lock:
+            self._ensure_loaded()
+            if key in self._index:
+                self._total_size -= self._index[key].size
+            self._index[key] = _CacheEntry(path=path, size=size, expires_at=payload["expires_at"])
+            self._index.move_to_end(key)
+            self._total_size += size
+            self._stats["writes"] += 1
+            self._evict()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计信息"""
+        lookups = self._stats["hits"] + self._stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._index),
+            "size_mb": round(self._total_size / (1024 * 1024), 2),
+            "max_size_mb": round(self.max_size_bytes / (1024 * 1024), 2),
+            "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            **self._stats
+        }
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json.gz"
+
+    def _ensure_loaded(self):
+        """首次使用时扫描缓存目录重建索引 (按访问时间排序恢复LRU顺序)"""
+        if self._loaded:
+            return
+        self._loaded = True
+        if not self.cache_dir.exists():
+            return
+
+        entries = []
+        for path in self.cache_dir.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.name[:-len(".json.gz")], path, stat.st_size))
+
+        for _, key, path, size in sorted(entries):
+            # 过期时间在读取时校验
+            self._index[key] = _CacheEntry(path=path, size=size, expires_at=0)
+            self._total_size += size
+        self._evict()
+
+    def _remove(self, key: str):
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        self._total_size -= entry.size
+        try:
+            entry.path.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+    def _evict(self):
+        """超出容量时按LRU顺序淘汰"""
+        while self._total_size > self.max_size_bytes and self._index:
+            oldest_key = next(iter(self._index))
+            self._remove(oldest_key)
+            self._stats["evictions"] += 1
+
+    @staticmethod
+    def _read_payload(path: Path) -> Dict[str, Any]:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            payload = json.load(f)
+        if payload.get("expires_at") and payload["expires_at"] < time.time():
+            raise ValueError("cache entry expired")
+        # 更新修改时间，重启后仍能恢复LRU顺序
+        os.utime(path)
+        return payload
+
+    @staticmethod
+    def _write_payload(path: Path, payload: Dict[str, Any]) -> int:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 同一键可能被并发写入，每次写入使用独立的临时文件
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8", compresslevel=6) as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        return path.stat().st_size
+
+
+# 全局结果缓存实例
+_result_cache = None
+
+def _cache_settings(cache_config) -> Dict[str, Any]:
+    """把 cache_control 配置段转换为结果缓存参数 (相对目录以项目根目录为基准)"""
+    cache_dir = Path(cache_config.cache_dir)
+    if not cache_dir.is_absolute():
+        cache_dir = Path(__file__).parent.parent / cache_dir
+    return {
+        "cache_dir": str(cache_dir),
+        "max_size_mb": cache_config.max_cache_size_mb,
+        "default_ttl_seconds": cache_config.default_ttl_seconds,
+        "domain_ttl_seconds": cache_config.domain_ttl_seconds,
+        "enabled": cache_config.enable_smart_caching,
+    }
+
+def get_result_cache() -> ResultCache:
+    """获取全局结果缓存实例 (cache_control 配置修改或热加载后原地更新设置)"""
+    global _result_cache
+    if _result_cache is None:
+        from v9_core.config_store import get_config_store
+        store = get_config_store()
+        cache = ResultCache(**_cache_settings(store.current.cache_control))
+        store.subscribe("cache_control", lambda cache_config: cache.configure(**_cache_settings(cache_config)))
+        _result_cache = cache
+    return _result_cache
@@ -0,0 +1,166 @@
+# v9_core/result_formatter.py - V9 流式结果格式化器
+"""
+内存有界的爬取结果格式化器
+
+多MB的页面在原来的格式化流程中会被复制多次: `response +=` 反复拼接、
+`markdown.split()` 为统计词数生成完整的词列表、`markdown[:limit]` 复制截断部分。
+这里的格式化器:
+- 按固定大小的分块输出，format_crawl_result 把分块写入同一个缓冲区，
+  iter_crawl_result 可以直接交给流式传输
+- 分块统计词数，临时内存只与分块大小相关
+- 在段落/行/词边界截断，不截断 Markdown 链接，未闭合的代码块会补上结束标记；
+  截断点之后的内容不会被复制
+"""
+
+import io
+from typing import Any, Dict, Iterator, Optional
+
+# 输出分块大小 (字符)
+CHUNK_SIZE = 64 * 1024
+# 截断时向前查找安全边界的最大距离 (字符)
+BOUNDARY_LOOKBACK = 512
+
+
+def count_words(text: Optional[str], chunk_size: int = CHUNK_SIZE) -> int:
+    """
+    统计空白分隔的词数，结果与 len(text.split()) 一致
+
+    按分块统计，跨分块的词只计一次，不会生成整篇文本的词列表。
+    """
+    if not text:
+        return 0
+
+    total = 0
+    previous_ends_in_word = False
+    for start in range(0, len(text), chunk_size):
+        chunk = text[start:start + chunk_size]
+        total += len(chunk.split())
+        # 上一块以非空白结尾、这一块以非空白开头: 同一个词被拆成了两半
+        if previous_ends_in_word and not chunk[0].isspace():
+            total -= 1
+        previous_ends_in_word = not chunk[-1].isspace()
+    return total
+
+
+def find_safe_cut(text: str, limit: int, lookback: int = BOUNDARY_LOOKBACK) -> int:
+    """
+    在不超过 limit 的位置寻找安全的截断点
+
+    优先级: 段落边界 > 行边界 > 词边界；不会落在 Markdown 链接 `[...](...)` 内部。
+    所有查找都在原字符串上进行，不复制内容。
+    """
+    if limit >= len(text):
+        return len(text)
+    if limit <= 0:
+        return 0
+
+    window_start = max(0, limit - lookback)
+    cut = text.rfind("\n\n", window_start, limit)
+    if cut <= 0:
+        cut = text.rfind("\n", window_start, limit)
+    if cut <= 0:
+        cut = max(text.rfind(" ", window_start, limit), text.rfind("\t", window_start, limit))
+    if cut <= 0:
+        cut = limit
+
+    # 截断点位于未闭合的链接中时，退回到链接开始之前
+    link_open = text.rfind("[", window_start, cut)
+    if link_open != -1:
+        link_close = text.find(")", link_open, cut)
+        if link_close == -1 and text.find("](", link_open, limit + lookback) != -1:
+            cut = link_open
+    return cut
+
+
+def _is_inside_code_fence(text: str, end: int) -> bool:
+    """判断 text[:end] 是否停在未闭合的 ``` 代码块中 (str.count 带范围参数，不复制)"""
+    return text.count("```", 0, end) % 2 == 1
+
+
+def iter_text(text: str, start: int = 0, end: Optional[int] = None, chunk_size: int = CHUNK_SIZE) -> Iterator[str]:
+    """按分块输出 text[start:end]"""
+    end = len(text) if end is None else end
+    for position in range(start, end, chunk_size):
+        yield text[position:min(end, position + chunk_size)]
+
+
+def iter_crawl_result(
+    result: Any,
+    url: str,
+    tool_name: str,
+    extra_info: Optional[Dict[str, Any]] = None,
+    show_word_count: bool = True,
+    display_limit: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> Iterator[str]:
+    """
+    以分块形式输出格式化后的爬取结果
+
+    Args:
+        result: 爬取结果对象 (CrawlResult / CachedCrawlResult / FastPathResult)
+        url: 目标URL
+        tool_name: 工具名称
+        extra_info: 额外信息字典
+        show_word_count: 是否显示词数
+        display_limit: 内容显示上限 (字符)，None 表示不截断
+        chunk_size: 分块大小
+
+    Yields:
+        输出文本分块
+    """
+    if not result.success:
+        yield f"{tool_name} 失败\n\nURL: {url}\nError: {result.error_message}"
+        return
+
+    markdown = result.markdown
+    metadata = result.metadata or {}
+
+    yield f"{tool_name} 成功\n\nURL: {url}\n"
+    yield f"Title: {metadata.get('title', 'Unknown')}\n"
+
+    if show_word_count:
+        yield f"Word Count: {count_words(markdown, chunk_size) if markdown else 0}\n"
+
+    if extra_info:
+        for key, value in extra_info.items():
+            yield f"{key}: {value}\n"
+
+    if not markdown:
+        yield "\nContent: 无内容"
+        return
+
+    if display_limit is None or len(markdown) <= display_limit:
+        yield "\nContent:\n\n"
+        yield from iter_text(markdown, chunk_size=chunk_size)
+        return
+
+    cut = find_safe_cut(markdown, display_limit)
+    yield f"\nContent (前{display_limit}字符):\n\n"
+    yield from iter_text(markdown, end=cut, chunk_size=chunk_size)
+    if _is_inside_code_fence(markdown, cut):
+        yield "\n```"
+    yield "..."
+
+
+def format_crawl_result(
+    result: Any,
+    url: str,
+    tool_name: str,
+    extra_info: Optional[Dict[str, Any]] = None,
+    show_word_count: bool = True,
+    display_limit: Optional[int] = None
+) -> str:
+    """把格式化后的爬取结果写入单个缓冲区并返回字符串"""
+    buffer = io.StringIO()
+    for chunk in iter_crawl_result(result, url, tool_name, extra_info, show_word_count, display_limit):
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+
+def truncate_markdown(text: Optional[str], limit: int) -> str:
+    """在安全边界截断 Markdown (不超过 limit 字符)"""
+    if not text or len(text) <= limit:
+        return text or ""
+    cut = find_safe_cut(text, limit)
+    suffix = "\n```" if _is_inside_code_fence(text, cut) else ""
+    return text[:cut] + suffix
@@ -0,0 +1,452 @@
+# v9_core/retry_engine.py - V9 重试引擎
+"""
+带失败分类、时间预算和对冲请求的重试引擎
+
+原来的重试逻辑对所有失败一视同仁地指数退避，DNS错误和404也会被重试到用尽次数。这里:
+- 按失败类型分类 (DNS、连接、超时、4xx、429、5xx、反爬墙、渲染崩溃)，只重试可重试的类型
+- 退避等待使用 full jitter (在 [0, 上限] 内随机)，避免同时失败的请求同步重试
+- 每个请求有总时间预算，预算用尽后不再发起新的尝试
+- 可选的对冲请求: 首次尝试超过阈值仍未完成时并行发起一个副本，先成功者胜出
+- 按主机的重试预算: 重试和对冲都要消耗该主机的令牌，一个故障站点不会占满全部重试容量
+"""
+
+import asyncio
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from crawl4ai.models import CrawlResult
+
+# 失败类型
+FAILURE_DNS = "dns"
+FAILURE_CONNECTION = "connection"
+FAILURE_TIMEOUT = "timeout"
+FAILURE_RATE_LIMITED = "rate_limited"
+FAILURE_CLIENT_ERROR = "client_error"
+FAILURE_SERVER_ERROR = "server_error"
+FAILURE_BOT_WALL = "bot_wall"
+FAILURE_RENDER_CRASH = "render_crash"
+FAILURE_UNKNOWN = "unknown"
+
+DEFAULT_RETRYABLE_FAILURES = (
+    FAILURE_CONNECTION,
+    FAILURE_TIMEOUT,
+    FAILURE_RATE_LIMITED,
+    FAILURE_SERVER_ERROR,
+    FAILURE_RENDER_CRASH,
+    FAILURE_UNKNOWN
+)
+
+# 错误信息中的特征 (小写匹配)，按顺序检查
+ERROR_PATTERNS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    (FAILURE_DNS, (
+        "err_name_not_resolved", "name or service not known", "nodename nor servname",
+        "getaddrinfo", "temporary failure in name resolution", "no address associated"
+    )),
+    (FAILURE_RENDER_CRASH, (
+        "page crashed", "target crashed", "target closed", "has been closed",
+        "browser has disconnected", "execution context was destroyed"
+    )),
+    (FAILURE_TIMEOUT, ("timeout", "timed out", "err_timed_out")),
+    (FAILURE_CONNECTION, (
+        "err_connection", "connection refused", "connection reset", "connection aborted",
+        "err_empty_response", "err_network_changed", "err_internet_disconnected",
+        "cannot connect to host", "server disconnected", "err_ssl", "err_http2"
+    )),
+)
+
+# 反爬墙页面特征 (只检查页面开头部分)
+BOT_WALL_MARKERS = (
+    "captcha", "cf-challenge", "cf_chl_", "just a moment...", "attention required! | cloudflare",
+    "unusual traffic from your computer", "/sorry/index", "are you a robot", "verify you are human",
+    "access denied", "请输入验证码", "安全验证"
+)
+BOT_WALL_SCAN_CHARS = 20_000
+# 成功返回的页面正文少于该词数且带有反爬特征时视为反爬墙 (正常页面也可能引用验证码脚本)
+BOT_WALL_MAX_WORDS = 300
+
+
+def detect_bot_wall(html: Optional[str]) -> bool:
+    """页面开头是否包含验证码/反爬墙特征"""
+    if not html:
+        return False
+    head = html[:BOT_WALL_SCAN_CHARS].lower()
+    return any(marker in head for marker in BOT_WALL_MARKERS)
+
+
+def is_bot_wall_page(result: Any) -> bool:
+    """成功返回 (如 HTTP 200) 的页面是否实际上是验证码/反爬墙"""
+    if result is None or not getattr(result, "success", False):
+        return False
+    if not detect_bot_wall(getattr(result, "html", None)):
+        return False
+    markdown = getattr(result, "markdown", None)
+    return len(str(markdown or "").split()) < BOT_WALL_MAX_WORDS
+
+
+def classify_failure(result: Any = None, error: Optional[BaseException] = None) -> str:
+    """
+    判断一次失败尝试的类型
+
+    Args:
+        result: 爬取结果 (CrawlResult 或兼容对象)，可以为 None
+        error: 尝试中抛出的异常，可以为 None
+
+    Returns:
+        FAILURE_* 常量之一
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return FAILURE_TIMEOUT
+
+    status_code = getattr(result, "status_code", None) if result is not None else None
+    if status_code == 429:
+        return FAILURE_RATE_LIMITED
+
+    html = (getattr(result, "html", None) or "") if result is not None else ""
+    if (status_code in (401, 403, 503) or status_code is None) and detect_bot_wall(html):
+        return FAILURE_BOT_WALL
+
+    if status_code is not None and status_code >= 500:
+        return FAILURE_SERVER_ERROR
+    if status_code == 408:
+        return FAILURE_TIMEOUT
+    if status_code is not None and status_code >= 400:
+        return FAILURE_CLIENT_ERROR
+
+    message = str(error) if error is not None else (getattr(result, "error_message", None) or "")
+    message = message.lower()
+    for failure_class, patterns in ERROR_PATTERNS:
+        if any(pattern in message for pattern in patterns):
+            return failure_class
+    return FAILURE_UNKNOWN
+
+
+def failed_result(url: str, error_message: str) -> CrawlResult:
+    """构造失败的爬取结果"""
+    return CrawlResult(url=url, html="", metadata={}, success=False, error_message=error_message)
+
+
+class HostRetryBudget:
+    """
+    按主机的重试令牌桶
+
+    每个主机最多保存 capacity 个令牌，每次原始请求存入 ratio 个令牌，
+    另外按 refill_per_second 随时间补充；每次重试或对冲消耗 1 个令牌。
+    """
+
+    def __init__(self, capacity: float = 10, ratio: float = 0.2, refill_per_second: float = 0.1):
+        self._tokens: Dict[str, float] = {}
+        self._updated: Dict[str, float] = {}
+        self.configure(capacity, ratio, refill_per_second)
+
+    def configure(self, capacity: float, ratio: float, refill_per_second: float):
+        """更新令牌桶参数，各主机剩余的令牌保留 (超出新容量的部分在下次补充时截断)"""
+        self.capacity = max(1.0, capacity)
+        self.ratio = max(0.0, ratio)
+        self.refill_per_second = max(0.0, refill_per_second)
+
+    def _refill(self, host: str, now: float) -> float:
+        tokens = self._tokens.get(host, self.capacity)
+        elapsed = now - self._updated.get(host, now)
+        tokens = min(self.capacity, tokens + elapsed * self.refill_per_second)
+        self._tokens[host] = tokens
+        self._updated[host] = now
+        return tokens
+
+    def record_request(self, host: str):
+        """原始请求存入令牌"""
+        tokens = self._refill(host, time.monotonic())
+        self._tokens[host] = min(self.capacity, tokens + self.ratio)
+
+    def try_spend(self, host: str) -> bool:
+        """尝试为一次重试/对冲消耗令牌"""
+        tokens = self._refill(host, time.monotonic())
+        if tokens < 1.0:
+            return False
+        self._tokens[host] = tokens - 1.0
+        return True
+
+    def available(self, host: str) -> float:
+        return self._refill(host, time.monotonic())
+
+
+@dataclass
+class RetryOutcome:
+    """一次带重试执行的过程记录"""
+    attempts: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    failures: List[str] = field(default_factory=list)
+    budget_exhausted: bool = False
+    deadline_exceeded: bool = False
+    elapsed_seconds: float = 0.0
+
+    def describe(self) -> str:
+        """生成简短的过程描述"""
+        parts = [f"{self.attempts} attempt(s)"]
+        if self.hedges:
+            parts.append(f"{self.hedges} hedge(s), {self.hedge_wins} won")
+        if self.failures:
+            parts.append("failures: " + ", ".join(self.failures))
+        if self.budget_exhausted:
+            parts.append("host retry budget exhausted")
+        if self.deadline_exceeded:
+            parts.append("time budget exceeded")
+        return "; ".join(parts)
+
+
+class RetryEngine:
+    """带失败分类、时间预算、对冲请求和主机重试预算的重试引擎"""
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay_seconds: float = 1.0,
+        backoff_factor: float = 2,
+        max_delay_seconds: float = 10,
+        total_timeout_seconds: float = 90,
+        retryable_failures: Optional[Iterable[str]] = None,
+        hedge_enabled: bool = True,
+        hedge_after_seconds: float = 10,
+        max_hedges: int = 1,
+        host_budget: Optional[HostRetryBudget] = None
+    ):
+        self.host_budget = host_budget or HostRetryBudget()
+        self._stats: Dict[str, Any] = {
+            "requests": 0, "succeeded": 0, "retries": 0, "hedges": 0, "hedge_wins": 0,
+            "budget_exhausted": 0, "deadline_exceeded": 0, "failures": {}
+        }
+        self.configure(
+            max_retries=max_retries,
+            base_delay_seconds=base_delay_seconds,
+            backoff_factor=backoff_factor,
+            max_delay_seconds=max_delay_seconds,
+            total_timeout_seconds=total_timeout_seconds,
+            retryable_failures=retryable_failures,
+            hedge_enabled=hedge_enabled,
+            hedge_after_seconds=hedge_after_seconds,
+            max_hedges=max_hedges
+        )
+
+    def configure(
+        self,
+        max_retries: int,
+        base_delay_seconds: float,
+        backoff_factor: float,
+        max_delay_seconds: float,
+        total_timeout_seconds: float,
+        retryable_failures: Optional[Iterable[str]],
+        hedge_enabled: bool,
+        hedge_after_seconds: float,
+        max_hedges: int
+    ):
+        """更新重试策略，统计与主机重试预算保持不变"""
+        self.max_retries = max(0, max_retries)
+        self.base_delay_seconds = max(0.0, base_delay_seconds)
+        self.backoff_factor = max(1.0, backoff_factor)
+        self.max_delay_seconds = max(0.0, max_delay_seconds)
+        self.total_timeout_seconds = max(1.0, total_timeout_seconds)
+        self.retryable_failures = frozenset(
+            DEFAULT_RETRYABLE_FAILURES if retryable_failures is None else retryable_failures
+        )
+        self.hedge_enabled = hedge_enabled and max_hedges > 0
+        self.hedge_after_seconds = max(0.1, hedge_after_seconds)
+        self.max_hedges = max(0, max_hedges)
+
+    def backoff_delay(self, retry_index: int) -> float:
+        """第 retry_index 次重试前的等待时间 (full jitter)"""
+        ceiling = min(self.max_delay_seconds, self.base_delay_seconds * self.backoff_factor ** retry_index)
+        return random.uniform(0, ceiling)
+
+    def is_retryable(self, failure_class: str) -> bool:
+        return failure_class in self.retryable_failures
+
+    async def execute(
+        self,
+        url: str,
+        attempt: Callable[[], Awaitable[Any]],
+        max_retries: Optional[int] = None,
+        hedge: Optional[bool] = None,
+        can_hedge: Optional[Callable[[], bool]] = None
+    ) -> Tuple[Any, RetryOutcome]:
+        """
+        执行带重试的爬取
+
+        Args:
+            url: 目标URL (用于主机重试预算和失败结果)
+            attempt: 每次调用发起一次爬取并返回爬取结果的协程工厂
+            max_retries: 覆盖默认的最大重试次数
+            hedge: 覆盖默认的对冲开关
+            can_hedge: 发起对冲前的检查 (如主机并发名额是否空闲)，返回 False 时本轮不发起对冲
+
+        Returns:
+            (最终结果, 过程记录)；所有尝试失败时返回最后一次失败结果
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.total_timeout_seconds
+        retries_allowed = self.max_retries if max_retries is None else max(0, max_retries)
+        hedge_enabled = self.hedge_enabled if hedge is None else (hedge and self.max_hedges > 0)
+        host = (urlsplit(url).hostname or "").lower()
+        outcome = RetryOutcome()
+
+        self._stats["requests"] += 1
+        self.host_budget.record_request(host)
+
+        result = None
+        for retry_index in range(retries_allowed + 1):
+            if retry_index > 0:
+                if not self.host_budget.try_spend(host):
+                    outcome.budget_exhausted = True
+                    break
+                delay = self.backoff_delay(retry_index - 1)
+                if loop.time() + delay >= deadline:
+                    outcome.deadline_exceeded = True
+                    break
+                self._stats["retries"] += 1
+                await asyncio.sleep(delay)
+
+            result, failure_class = await self._attempt_with_hedge(
+                url, attempt, host, deadline, hedge_enabled, outcome, can_hedge
+            )
+            if result.success:
+                break
+
+            failure_class = failure_class or classify_failure(result)
+            outcome.failures.append(failure_class)
+            failures = self._stats["failures"]
+            failures[failure_class] = failures.get(failure_class, 0) + 1
+            if outcome.deadline_exceeded or not self.is_retryable(failure_class):
+                break
+
+        outcome.elapsed_seconds = loop.time() - started
+        if result is not None and result.success:
+            self._stats["succeeded"] += 1
+        if outcome.budget_exhausted:
+            self._stats["budget_exhausted"] += 1
+        if outcome.deadline_exceeded:
+            self._stats["deadline_exceeded"] += 1
+        return result, outcome
+
+    async def _call(self, url: str, attempt: Callable[[], Awaitable[Any]]) -> Tuple[Any, Optional[str]]:
+        """执行一次尝试，异常和反爬墙页面转换为失败结果；返回 (结果, 已知的失败类型)"""
+        try:
+            result = await attempt()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            return failed_result(url, str(e) or type(e).__name__), classify_failure(None, e)
+        if is_bot_wall_page(result):
+            # 反爬墙页面常以 HTTP 200 返回，按失败处理，避免被当作正文缓存
+            result.success = False
+            result.error_message = "Blocked by bot wall (captcha/challenge page)"
+            return result, FAILURE_BOT_WALL
+        return result, None
+
+    async def _attempt_with_hedge(
+        self,
+        url: str,
+        attempt: Callable[[], Awaitable[Any]],
+        host: str,
+        deadline: float,
+        hedge_enabled: bool,
+        outcome: RetryOutcome,
+        can_hedge: Optional[Callable[[], bool]] = None
+    ) -> Tuple[Any, Optional[str]]:
+        """发起一次尝试，超过对冲阈值仍未完成时并行发起副本，返回先成功的结果"""
+        loop = asyncio.get_running_loop()
+        outcome.attempts += 1
+        primary = asyncio.create_task(self._call(url, attempt))
+        pending = {primary}
+        hedges_left = self.max_hedges if hedge_enabled else 0
+        last_failure = None
+
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    outcome.deadline_exceeded = True
+                    result = failed_result(
+                        url, f"Timeout: exceeded total retry time budget of {self.total_timeout_seconds:.0f}s"
+                    )
+                    return result, FAILURE_TIMEOUT
+
+                timeout = min(remaining, self.hedge_after_seconds) if hedges_left else remaining
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    result, failure_class = task.result()
+                    if result.success:
+                        if task is not primary:
+                            outcome.hedge_wins += 1
+                            self._stats["hedge_wins"] += 1
+                        return result, None
+                    last_failure = (result, failure_class)
+
+                if not done and hedges_left:
+                    if can_hedge is not None and not can_hedge():
+                        # 副本无法立即开始 (只会排在原请求之后)，等下一个阈值再检查
+                        continue
+                    hedges_left -= 1
+                    if self.host_budget.try_spend(host):
+                        outcome.hedges += 1
+                        self._stats["hedges"] += 1
+                        pending.add(asyncio.create_task(self._call(url, attempt)))
+                    else:
+                        outcome.budget_exhausted = True
+                        hedges_left = 0
+            return last_failure
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取重试统计信息"""
+        return {**self._stats, "failures": dict(self._stats["failures"])}
+
+
+# 全局重试引擎实例
+_retry_engine = None
+
+def _retry_settings(retry) -> Dict[str, Any]:
+    """把 retry_control 配置段转换为重试引擎参数"""
+    return {
+        "max_retries": retry.max_retries,
+        "base_delay_seconds": retry.base_delay_seconds,
+        "backoff_factor": retry.retry_backoff_factor,
+        "max_delay_seconds": retry.retry_max_delay_seconds,
+        "total_timeout_seconds": retry.total_timeout_seconds,
+        "retryable_failures": retry.retryable_failures,
+        "hedge_enabled": retry.hedge_enabled,
+        "hedge_after_seconds": retry.hedge_after_seconds,
+        "max_hedges": retry.max_hedges,
+    }
+
+def _configure_retry_engine(engine: RetryEngine, retry):
+    engine.configure(**_retry_settings(retry))
+    engine.host_budget.configure(
+        retry.host_retry_budget, retry.retry_budget_ratio, retry.retry_budget_refill_per_second
+    )
+
+def get_retry_engine() -> RetryEngine:
+    """获取全局重试引擎实例 (retry_control 配置修改或热加载后原地更新设置)"""
+    global _retry_engine
+    if _retry_engine is None:
+        from v9_core.config_store import get_config_store
+        store = get_config_store()
+        retry = store.current.retry_control
+        engine = RetryEngine(
+            **_retry_settings(retry),
+            host_budget=HostRetryBudget(
+                capacity=retry.host_retry_budget,
+                ratio=retry.retry_budget_ratio,
+                refill_per_second=retry.retry_budget_refill_per_second
+            )
+        )
+        store.subscribe("retry_control", lambda retry: _configure_retry_engine(engine, retry))
+        _retry_engine = engine
+    return _retry_engine
@@ -0,0 +1,187 @@
+# v9_core/search_index.py - V9 本地全文索引
+"""
+语料库的 BM25 倒排索引
+
+索引每个URL最新版本的正文和标题，查询在内存中完成 (毫秒级)，
+agent 可以先检索已经爬过的内容，再决定是否发起新的在线搜索。
+
+分词 (中日韩文本没有空格分隔，不依赖额外的分词库):
+- 拉丁字母/数字: 按非单词字符切分，转小写，去掉常见英文停用词，
+  简单归并英文复数 (transformers -> transformer)
+- 中日韩字符: 连续片段切成相邻二字组 ("机器学习" -> 机器/器学/学习)，单字片段保留单字
+查询使用相同的分词，包含完整词语的文档会同时命中多个二字组，得分更高。
+
+索引由语料库维护: 启动后在后台从语料库构建，之后每次写入新版本时增量更新
+(同一URL的旧版本从倒排表中移除)。
+"""
+
+import heapq
+import itertools
+import math
+import re
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+_CJK_RANGES = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uac00-\ud7af"
+_TOKEN_RE = re.compile(f"[{_CJK_RANGES}]+|[^\\W_{_CJK_RANGES}]+")
+_CJK_RE = re.compile(f"[{_CJK_RANGES}]")
+
+# 超过该长度的拉丁词 (base64、哈希等) 不进入索引
+MAX_TOKEN_LENGTH = 40
+
+ENGLISH_STOPWORDS = frozenset("""
+a an and are as at be but by for from has have he in is it its of on or that the their they
+this to was were will with you your we our not no can do does did so if than then there these
+those which who what when where how all any more most other some such into out up about over
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """把文本切分为索引词 (拉丁词小写，中日韩字符切成二字组)"""
+    tokens = []
+    for match in _TOKEN_RE.finditer(text.lower()):
+        token = match.group()
+        if _CJK_RE.match(token):
+            if len(token) == 1:
+                tokens.append(token)
+            else:
+                tokens.extend(token[i:i + 2] for i in range(len(token) - 1))
+        elif len(token) <= MAX_TOKEN_LENGTH and token not in ENGLISH_STOPWORDS:
+            if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+                token = token[:-1]
+            tokens.append(token)
+    return tokens
+
+
+@dataclass(slots=True)
+class IndexedDocument:
+    """索引中的一篇文档"""
+    key: str
+    url: str
+    title: str
+    fetched_at: float
+    length: int
+    terms: Tuple[str, ...]
+
+
+class BM25Index:
+    """支持增量更新的 BM25 倒排索引 (线程安全)"""
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75, title_weight: int = 3):
+        self.k1 = k1
+        self.b = b
+        self.title_weight = title_weight
+        # 构建完成前查询会先等待语料库构建索引
+        self.ready = False
+
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._docs: Dict[int, IndexedDocument] = {}
+        self._keys: Dict[str, int] = {}
+        self._doc_ids = itertools.count(1)
+        self._total_length = 0
+        self._stats = {"queries": 0, "query_seconds": 0.0, "build_seconds": 0.0}
+
+    def add(self, key: str, url: str, title: str, text: str, fetched_at: float):
+        """
+        索引一篇文档 (同一个 key 的旧文档被替换)
+
+        Args:
+            key: 文档键 (URL哈希)
+            url: 页面URL
+            title: 页面标题 (词频乘以 title_weight)
+            text: 正文
+            fetched_at: 抓取时间
+        """
+        frequencies = Counter(tokenize(text))
+        for token in tokenize(title):
+            frequencies[token] += self.title_weight
+        document = IndexedDocument(
+            key=key,
+            url=url,
+            title=title,
+            fetched_at=fetched_at,
+            length=sum(frequencies.values()),
+            terms=tuple(frequencies)
+        )
+
+        with self._lock:
+            self._remove_locked(key)
+            doc_id = next(self._doc_ids)
+            for term, count in frequencies.items():
+                self._postings.setdefault(term, {})[doc_id] = count
+            self._docs[doc_id] = document
+            self._keys[key] = doc_id
+            self._total_length += document.length
+
+    def remove(self, key: str):
+        """从索引中移除文档"""
+        with self._lock:
+            self._remove_locked(key)
+
+    def _remove_locked(self, key: str):
+        doc_id = self._keys.pop(key, None)
+        if doc_id is None:
+            return
+        document = self._docs.pop(doc_id)
+        self._total_length -= document.length
+        for term in document.terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[float, IndexedDocument]]:
+        """
+        按 BM25 得分检索
+
+        Returns:
+            [(得分, 文档)]，得分从高到低
+        """
+        start = time.perf_counter()
+        terms = list(dict.fromkeys(tokenize(query)))
+        with self._lock:
+            total_docs = len(self._docs)
+            if not terms or not total_docs:
+                return []
+            average_length = self._total_length / total_docs or 1.0
+
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (total_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    length_norm = 1 - self.b + self.b * self._docs[doc_id].length / average_length
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + self.k1 * length_norm)
+
+            top = heapq.nlargest(max(1, limit), scores.items(), key=lambda item: item[1])
+            results = [(score, self._docs[doc_id]) for doc_id, score in top]
+            self._stats["queries"] += 1
+            self._stats["query_seconds"] += time.perf_counter() - start
+        return results
+
+    def record_build(self, seconds: float):
+        """记录一次全量构建的耗时并标记索引可用"""
+        with self._lock:
+            self._stats["build_seconds"] = seconds
+            self.ready = True
+
+    def get_stats(self) -> Dict[str, object]:
+        """获取索引统计"""
+        with self._lock:
+            queries = self._stats["queries"]
+            return {
+                "ready": self.ready,
+                "documents": len(self._docs),
+                "terms": len(self._postings),
+                "queries": queries,
+                "avg_query_ms": self._stats["query_seconds"] / queries * 1000 if queries else 0.0,
+                "build_seconds": self._stats["build_seconds"],
+            }
@@ -0,0 +1,531 @@
+# v9_core/serp_parsers.py - V9 搜索结果页结构化解析
+"""
+搜索结果页结构化解析
+
+直接在HTML上按各站点的DOM结构提取结果，返回 SearchRecord 列表:
+- Google (含 site:scholar.google.com 搜索)、Google Scholar、Bing、百度、DuckDuckGo
+- arXiv 搜索列表、PubMed 搜索列表
+
+跳过广告位，把 Google /url?q=、Bing /ck/a、DuckDuckGo /l/?uddg= 等跳转链接还原为目标URL。
+parse_serp 按URL选择解析器，深度爬取直接使用解析出的结果链接，不再从Markdown中正则提取。
+
+学术记录包含标题、作者、年份、URL 和 DOI，可按 DOI / 规范化标题跨数据源去重，
+并用倒数排名融合 (RRF) 合并多个数据源的排序。
+"""
+
+import base64
+import binascii
+import json
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qs, urljoin, urlsplit
+
+import lxml.html
+
+DOI_PATTERN = re.compile(r"\b(10\.\d{4,9}/[^\s\"'<>]+)", re.IGNORECASE)
+YEAR_PATTERN = re.compile(r"\b(19[5-9]\d|20\d{2})\b")
+MARKDOWN_LINK_PATTERN = re.compile(r"\[([^\]]+)\]\(([^)\s]+)[^)]*\)")
+# 倒数排名融合常数
+RRF_K = 60
+
+# 搜索引擎自身的域名，深度爬取时不作为结果链接
+SEARCH_ENGINE_HOSTS = (
+    "google.com", "bing.com", "baidu.com", "duckduckgo.com",
+    "googleusercontent.com", "translate.goog", "microsofttranslator.com"
+)
+
+
+@dataclass
+class SearchRecord:
+    """一条搜索结果"""
+    title: str
+    url: str
+    source: str
+    rank: int
+    snippet: str = ""
+    authors: List[str] = field(default_factory=list)
+    year: Optional[int] = None
+    doi: Optional[str] = None
+    # 合并后出现过的数据源
+    sources: List[str] = field(default_factory=list)
+    score: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            "title": self.title,
+            "url": self.url,
+            "source": self.source,
+            "sources": self.sources or [self.source],
+            "rank": self.rank,
+            "authors": self.authors,
+            "year": self.year,
+            "doi": self.doi,
+            "snippet": self.snippet,
+            "score": round(self.score, 4)
+        }
+
+
+def _has_class(name: str) -> str:
+    """XPath 谓词: class 属性包含 name"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _text(element) -> str:
+    """元素的规范化文本"""
+    if element is None:
+        return ""
+    return " ".join(element.text_content().split())
+
+
+def _first(element, *xpaths: str):
+    """按顺序尝试多个 XPath，返回第一个匹配的元素"""
+    for xpath in xpaths:
+        found = element.xpath(xpath)
+        if found:
+            return found[0]
+    return None
+
+
+def _parse_html(html: str):
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml.html.fromstring(html)
+    except (ValueError, lxml.etree.ParserError):
+        return None
+
+
+def extract_doi(text: str) -> Optional[str]:
+    """从文本中提取 DOI (去掉结尾标点)"""
+    match = DOI_PATTERN.search(text or "")
+    if not match:
+        return None
+    return match.group(1).rstrip(".,;)]").lower()
+
+
+def extract_year(text: str) -> Optional[int]:
+    match = YEAR_PATTERN.search(text or "")
+    return int(match.group(1)) if match else None
+
+
+def normalize_title(title: str) -> str:
+    """用于去重的规范化标题: 小写、去除重音和标点、合并空白"""
+    normalized = unicodedata.normalize("NFKD", title or "")
+    normalized = "".join(ch for ch in normalized if not unicodedata.combining(ch))
+    normalized = re.sub(r"[^\w\s]", " ", normalized.lower())
+    return " ".join(normalized.split())
+
+
+def split_authors(text: str) -> List[str]:
+    """把 "A, B and C" 形式的作者串拆成列表"""
+    text = re.sub(r"^\s*authors?:\s*", "", text or "", flags=re.IGNORECASE).strip().rstrip(".")
+    if not text:
+        return []
+    parts = re.split(r",|\band\b|;", text)
+    return [part.strip() for part in parts if part.strip() and part.strip() != "…"]
+
+
+def parse_arxiv_listing(html: str, base_url: str = "https://arxiv.org/") -> List[SearchRecord]:
+    """解析 arXiv 搜索列表页 (li.arxiv-result)"""
+    root = _parse_html(html)
+    if root is None:
+        return []
+
+    records = []
+    for item in root.xpath(f"//li[{_has_class('arxiv-result')}]"):
+        title = _text(_first(item, f".//p[{_has_class('title')}]"))
+        link = _first(item, f".//p[{_has_class('list-title')}]//a[@href]")
+        if not title or link is None:
+            continue
+        authors = [_text(a) for a in item.xpath(f".//p[{_has_class('authors')}]/a")]
+        if not authors:
+            authors = split_authors(_text(_first(item, f".//p[{_has_class('authors')}]")))
+        snippet = _text(_first(
+            item,
+            f".//span[{_has_class('abstract-full')}]",
+            f".//p[{_has_class('abstract')}]"
+        ))
+        dates = _text(_first(item, f".//p[{_has_class('is-size-7')}]"))
+        records.append(SearchRecord(
+            title=title,
+            url=urljoin(base_url, link.get("href")),
+            source="arxiv",
+            rank=len(records) + 1,
+            snippet=snippet,
+            authors=authors,
+            year=extract_year(dates),
+            doi=extract_doi(" ".join(item.xpath(".//a/@href")) + " " + _text(item))
+        ))
+    return records
+
+
+def parse_pubmed_listing(html: str, base_url: str = "https://pubmed.ncbi.nlm.nih.gov/") -> List[SearchRecord]:
+    """解析 PubMed 搜索列表页 (article.full-docsum)"""
+    root = _parse_html(html)
+    if root is None:
+        return []
+
+    records = []
+    for item in root.xpath(f"//article[{_has_class('full-docsum')}]"):
+        link = _first(item, f".//a[{_has_class('docsum-title')}]")
+        if link is None or not link.get("href"):
+            continue
+        title = _text(link)
+        citation = _text(_first(
+            item,
+            f".//span[{_has_class('full-journal-citation')}]",
+            f".//span[{_has_class('docsum-journal-citation')}]"
+        ))
+        authors_element = _first(
+            item,
+            f".//span[{_has_class('full-authors')}]",
+            f".//span[{_has_class('docsum-authors')}]"
+        )
+        snippet = _text(_first(item, f".//div[{_has_class('full-view-snippet')}]"))
+        records.append(SearchRecord(
+            title=title,
+            url=urljoin(base_url, link.get("href")),
+            source="pubmed",
+            rank=len(records) + 1,
+            snippet=snippet,
+            authors=split_authors(_text(authors_element)),
+            year=extract_year(citation),
+            doi=extract_doi(citation)
+        ))
+    return records
+
+
+def parse_google_scholar(html: str, base_url: str = "https://scholar.google.com/") -> List[SearchRecord]:
+    """解析 Google Scholar 结果页 (div.gs_ri)"""
+    root = _parse_html(html)
+    if root is None:
+        return []
+
+    records = []
+    for item in root.xpath(f"//div[{_has_class('gs_ri')}]"):
+        link = _first(item, f".//h3[{_has_class('gs_rt')}]//a[@href]")
+        if link is None:
+            continue
+        # 作者行格式: "A Author, B Author - Journal, 2020 - publisher.com"
+        byline = _text(_first(item, f".//div[{_has_class('gs_a')}]"))
+        authors_part = byline.split(" - ")[0] if byline else ""
+        records.append(SearchRecord(
+            title=_text(link),
+            url=urljoin(base_url, link.get("href")),
+            source="google_scholar",
+            rank=len(records) + 1,
+            snippet=_text(_first(item, f".//div[{_has_class('gs_rs')}]")),
+            authors=split_authors(authors_part),
+            year=extract_year(byline),
+            doi=extract_doi(link.get("href"))
+        ))
+    return records
+
+
+def parse_google_results(html: str, base_url: str = "https://www.google.com/", source: str = "google") -> List[SearchRecord]:
+    """解析 Google 网页搜索结果页 (div.g 中带 h3 的主链接，跳过广告区)"""
+    root = _parse_html(html)
+    if root is None:
+        return []
+
+    records = []
+    seen = set()
+    ad_blocks = "ancestor::*[@id='tads' or @id='tadsb' or @id='bottomads' or @data-text-ad]"
+    for item in root.xpath(f"//div[{_has_class('g')}][not({ad_blocks})]"):
+        link = _first(item, ".//a[@href][.//h3]")
+        if link is None:
+            continue
+        url = unwrap_redirect(urljoin(base_url, link.get("href")))
+        if url in seen or not url.startswith(("http://", "https://")):
+            continue
+        seen.add(url)
+        snippet = _text(_first(item, f".//div[{_has_class('VwiC3b')}]", ".//div[@data-sncf]"))
+        records.append(SearchRecord(
+            title=_text(_first(link, ".//h3")),
+            url=url,
+            source=source,
+            rank=len(records) + 1,
+            snippet=snippet,
+            year=extract_year(snippet),
+            doi=extract_doi(url + " " + snippet)
+        ))
+    return records
+
+
+def parse_bing_results(html: str, base_url: str = "https://www.bing.com/") -> List[SearchRecord]:
+    """解析 Bing 搜索结果页 (li.b_algo，广告位 li.b_ad 不会匹配)"""
+    root = _parse_html(html)
+    if root is None:
+        return []
+
+    records = []
+    for item in root.xpath(f"//li[{_has_class('b_algo')}]"):
+        link = _first(item, ".//h2//a[@href]")
+        if link is None:
+            continue
+        url = unwrap_redirect(urljoin(base_url, link.get("href")))
+        if not url.startswith(("http://", "https://")):
+            continue
+        snippet = _text(_first(
+            item,
+            f".//div[{_has_class('b_caption')}]//p",
+            ".//p[contains(@class, 'b_lineclamp')]",
+            ".//p"
+        ))
+        records.append(SearchRecord(title=_text(link), url=url, source="bing", rank=len(records) + 1, snippet=snippet))
+    return records
+
+
+def _baidu_target_url(container, fallback: str) -> str:
+    """百度结果链接是 /link?url= 的不透明跳转，真实地址在容器的 mu 属性或 data-tools 中"""
+    target = container.get("mu")
+    if target and target.startswith(("http://", "https://")):
+        return target
+    tools = _first(container, ".//*[@data-tools]")
+    if tools is not None:
+        try:
+            target = json.loads(tools.get("data-tools")).get("url")
+        except (ValueError, AttributeError):
+            target = None
+        if target and target.startswith(("http://", "https://")):
+            return target
+    return fallback
+
+
+def parse_baidu_results(html: str, base_url: str = "https://www.baidu.com/") -> List[SearchRecord]:
+    """解析百度搜索结果页 (#content_left 下的结果容器，跳过推广)"""
+    root = _parse_html(html)
+    if root is None:
+        return []
+
+    records = []
+    containers = root.xpath(
+        f"//div[@id='content_left']/div[{_has_class('result')} or {_has_class('c-container')}]"
+    )
+    for container in containers:
+        if container.get("data-tuiguang") or container.xpath(".//span[normalize-space(text())='广告']"):
+            continue
+        link = _first(container, ".//h3//a[@href]")
+        if link is None:
+            continue
+        url = _baidu_target_url(container, urljoin(base_url, link.get("href")))
+        snippet = _text(_first(
+            container,
+            f".//div[{_has_class('c-abstract')}]",
+            ".//span[contains(@class, 'content-right')]",
+            ".//div[contains(@class, 'c-span-last')]"
+        ))
+        records.append(SearchRecord(title=_text(link), url=url, source="baidu", rank=len(records) + 1, snippet=snippet))
+    return records
+
+
+def parse_duckduckgo_results(html: str, base_url: str = "https://duckduckgo.com/") -> List[SearchRecord]:
+    """解析 DuckDuckGo 结果页 (HTML版 div.result__body 与 JS版 article[data-testid=result])"""
+    root = _parse_html(html)
+    if root is None:
+        return []
+
+    records = []
+    items = root.xpath(
+        f"//div[{_has_class('result__body')}][not(ancestor::div[{_has_class('result--ad')}])]"
+        " | //article[@data-testid='result']"
+    )
+    for item in items:
+        link = _first(item, f".//a[{_has_class('result__a')}]", ".//a[@data-testid='result-title-a']")
+        if link is None or not link.get("href"):
+            continue
+        url = unwrap_redirect(urljoin(base_url, link.get("href")))
+        if not url.startswith(("http://", "https://")):
+            continue
+        snippet = _text(_first(
+            item,
+            f".//*[{_has_class('result__snippet')}]",
+            ".//div[@data-result='snippet']"
+        ))
+        records.append(SearchRecord(title=_text(link), url=url, source="duckduckgo", rank=len(records) + 1, snippet=snippet))
+    return records
+
+
+def parse_scholar_site_search(html: str, base_url: str = "https://www.google.com/") -> List[SearchRecord]:
+    """解析 site:scholar.google.com 的 Google 搜索结果，摘要中的作者行按 Scholar 格式拆分"""
+    records = parse_google_results(html, base_url, source="google_scholar")
+    for record in records:
+        byline, _, _ = record.snippet.partition(" - ")
+        if byline and "," in byline and len(byline) < 200:
+            record.authors = split_authors(byline)
+    return records
+
+
+def _decode_bing_target(value: str) -> Optional[str]:
+    """Bing /ck/a 的 u 参数: "a1" + base64url(目标URL)"""
+    if not value.startswith("a1"):
+        return None
+    encoded = value[2:]
+    try:
+        return base64.urlsafe_b64decode(encoded + "=" * (-len(encoded) % 4)).decode("utf-8")
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
+
+
+def unwrap_redirect(url: str) -> str:
+    """把搜索引擎的跳转链接还原为目标URL，无法还原时原样返回"""
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    query = parse_qs(parts.query)
+    target = None
+
+    if "google." in host and parts.path == "/url":
+        target = (query.get("q") or query.get("url") or [None])[0]
+    elif host.endswith("bing.com") and parts.path.startswith("/ck/a"):
+        target = _decode_bing_target((query.get("u") or [""])[0])
+    elif host.endswith("duckduckgo.com") and parts.path.startswith("/l/"):
+        target = (query.get("uddg") or [None])[0]
+
+    if target and target.startswith(("http://", "https://")):
+        return target
+    return url
+
+
+def is_search_engine_url(url: str) -> bool:
+    """URL 是否指向搜索引擎自身 (按主机名后缀判断)"""
+    host = (urlsplit(url).hostname or "").lower()
+    return any(host == domain or host.endswith("." + domain) for domain in SEARCH_ENGINE_HOSTS)
+
+
+# 按 "主机+路径" 匹配的搜索结果页解析器，更具体的规则在前
+SERP_PARSERS: Tuple[Tuple[str, Callable[[str, str], List[SearchRecord]]], ...] = (
+    ("scholar.google.", parse_google_scholar),
+    ("google.com/search", parse_google_results),
+    ("bing.com/search", parse_bing_results),
+    ("baidu.com/s", parse_baidu_results),
+    ("duckduckgo.com", parse_duckduckgo_results),
+    ("arxiv.org/search", parse_arxiv_listing),
+    ("pubmed.ncbi.nlm.nih.gov", parse_pubmed_listing),
+)
+
+
+def get_serp_parser(url: str) -> Optional[Callable[[str, str], List[SearchRecord]]]:
+    """根据搜索页URL选择解析器 (只匹配主机和路径，不匹配查询参数)"""
+    parts = urlsplit(url)
+    location = f"{parts.netloc}{parts.path}".lower()
+    for pattern, parser in SERP_PARSERS:
+        if pattern in location:
+            return parser
+    return None
+
+
+def parse_serp(url: str, html: Optional[str]) -> Optional[List[SearchRecord]]:
+    """
+    解析搜索结果页
+
+    Returns:
+        结果记录列表；不支持的搜索引擎或没有HTML时返回 None
+    """
+    parser = get_serp_parser(url)
+    if parser is None or not html:
+        return None
+    return parser(html, url)
+
+
+def result_links(records: Iterable[SearchRecord], limit: int) -> List[str]:
+    """从结果记录中选出可深度爬取的链接: 去掉搜索引擎自身链接，按URL去重"""
+    links = []
+    seen = set()
+    for record in records:
+        if is_search_engine_url(record.url) or record.url in seen:
+            continue
+        seen.add(record.url)
+        links.append(record.url)
+        if len(links) >= limit:
+            break
+    return links
+
+
+def extract_markdown_links(markdown: str, limit: int) -> List[str]:
+    """
+    从Markdown中提取结果链接 (没有HTML或没有对应解析器时的回退)
+
+    还原跳转链接并按主机名排除搜索引擎自身的链接；带 #片段 的链接保留，
+    只跳过页内锚点。
+    """
+    links = []
+    seen = set()
+    for match in MARKDOWN_LINK_PATTERN.finditer(markdown or ""):
+        url = unwrap_redirect(match.group(2))
+        if not url.startswith(("http://", "https://")) or is_search_engine_url(url):
+            continue
+        page_url = url.split("#", 1)[0]
+        if page_url in seen:
+            continue
+        seen.add(page_url)
+        links.append(url)
+        if len(links) >= limit:
+            break
+    return links
+
+
+# 学术数据源对应的解析器
+ACADEMIC_PARSERS: Dict[str, Callable[[str, str], List[SearchRecord]]] = {
+    "arxiv": parse_arxiv_listing,
+    "pubmed": parse_pubmed_listing,
+    "google_scholar": parse_scholar_site_search,
+}
+
+
+def _record_keys(record: SearchRecord) -> List[str]:
+    keys = []
+    if record.doi:
+        keys.append("doi:" + record.doi)
+    title_key = normalize_title(record.title)
+    if title_key:
+        keys.append("title:" + title_key)
+    return keys
+
+
+def merge_records(records_by_source: Dict[str, Iterable[SearchRecord]], limit: Optional[int] = None) -> List[SearchRecord]:
+    """
+    跨数据源合并搜索记录
+
+    按 DOI 或规范化标题去重，合并作者/年份/DOI 等缺失字段，
+    按倒数排名融合打分: 在多个数据源中都靠前的记录排在前面。
+    """
+    merged: List[SearchRecord] = []
+    index: Dict[str, SearchRecord] = {}
+
+    for source, records in records_by_source.items():
+        for record in records:
+            keys = _record_keys(record)
+            existing = next((index[key] for key in keys if key in index), None)
+            contribution = 1.0 / (RRF_K + record.rank)
+
+            if existing is None:
+                existing = SearchRecord(
+                    title=record.title,
+                    url=record.url,
+                    source=record.source,
+                    rank=record.rank,
+                    snippet=record.snippet,
+                    authors=list(record.authors),
+                    year=record.year,
+                    doi=record.doi,
+                    sources=[source],
+                    score=contribution
+                )
+                merged.append(existing)
+            else:
+                if source not in existing.sources:
+                    existing.sources.append(source)
+                existing.score += contribution
+                existing.authors = existing.authors or list(record.authors)
+                existing.year = existing.year or record.year
+                existing.doi = existing.doi or record.doi
+                if len(record.snippet) > len(existing.snippet):
+                    existing.snippet = record.snippet
+
+            for key in _record_keys(existing):
+                index.setdefault(key, existing)
+
+    merged.sort(key=lambda item: (-item.score, item.rank))
+    return merged[:limit] if limit else merged
@@ -0,0 +1,180 @@
+# v9_core/startup.py - V9 启动计时与延迟导入
+"""
+启动阶段计时与延迟导入
+
+MCP 客户端在冷启动较慢时会握手超时。快速启动模式 (环境变量 V9_FAST_START=1)
+下服务器只导入注册工具所需的轻量模块，立即响应 initialize / list_tools；
+crawl4ai、反检测模块和意图分析器等重量级模块由后台预热任务加载，
+或在工具第一次使用时按需导入。每个启动阶段的耗时都会被记录下来。
+
+本模块只依赖标准库，必须能在虚拟环境激活之前导入。
+"""
+
+import asyncio
+import importlib
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+FAST_START_ENV = "V9_FAST_START"
+
+
+def is_fast_start_enabled() -> bool:
+    """根据环境变量判断是否启用快速启动模式"""
+    return os.environ.get(FAST_START_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+FAST_START = is_fast_start_enabled()
+
+
+def startup_log(message: str):
+    """输出启动诊断信息 (快速启动模式下静默，避免干扰 stdio 握手)"""
+    if not FAST_START:
+        print(message)
+
+
+class StartupProfiler:
+    """记录各启动阶段的耗时"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.ready_at: Optional[float] = None
+        self._phases: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str, background: bool = False):
+        """计时一个启动阶段"""
+        start = time.perf_counter()
+        error = None
+        try:
+            yield
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            self.record(name, time.perf_counter() - start, background=background, error=error)
+
+    def record(self, name: str, seconds: float, background: bool = False, error: Optional[str] = None):
+        with self._lock:
+            self._phases.append({
+                "name": name,
+                "seconds": round(seconds, 4),
+                "offset_seconds": round(time.perf_counter() - self.started_at - seconds, 4),
+                "background": background,
+                "error": error
+            })
+
+    def mark_ready(self):
+        """记录服务器可以响应 MCP 握手的时刻"""
+        if self.ready_at is None:
+            self.ready_at = time.perf_counter()
+
+    @property
+    def time_to_ready_seconds(self) -> Optional[float]:
+        if self.ready_at is None:
+            return None
+        return round(self.ready_at - self.started_at, 4)
+
+    def get_report(self) -> Dict[str, Any]:
+        """获取启动计时报告"""
+        with self._lock:
+            phases = list(self._phases)
+        return {
+            "fast_start": FAST_START,
+            "time_to_ready_seconds": self.time_to_ready_seconds,
+            "phases": phases
+        }
+
+    def format_report(self) -> str:
+        """格式化启动计时报告"""
+        report = self.get_report()
+        ready = report["time_to_ready_seconds"]
+        lines = [
+            f"Mode: {'fast start' if report['fast_start'] else 'standard'}",
+            f"Time to ready: {f'{ready:.3f}s' if ready is not None else 'not ready'}"
+        ]
+        for phase in report["phases"]:
+            suffix = " [background]" if phase["background"] else ""
+            if phase["error"]:
+                suffix += f" ({phase['error']})"
+            lines.append(f"- {phase['name']}: {phase['seconds'] * 1000:.1f}ms{suffix}")
+        return "\n".join(lines)
+
+
+startup_profiler = StartupProfiler()
+
+
+class LazyModule:
+    """
+    延迟导入的模块代理
+
+    第一次访问属性时才真正导入模块 (线程安全)，导入耗时记录到启动计时报告中。
+    """
+
+    def __init__(self, module_name: str):
+        self._module_name = module_name
+        self._module = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def load(self, background: bool = False):
+        """导入模块 (已导入时直接返回)"""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    with startup_profiler.phase(f"import {self._module_name}", background=background):
+                        self._module = importlib.import_module(self._module_name)
+        return self._module
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.load(), name)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyModule {self._module_name} ({state})>"
+
+
+class LazyObject:
+    """延迟创建的全局单例代理，第一次访问属性时调用工厂函数"""
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._instance = None
+        self._lock = threading.Lock()
+
+    def resolve(self) -> Any:
+        if self._instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+        return self._instance
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.resolve(), name)
+
+
+def preload_modules(modules: Iterable[LazyModule]):
+    """同步导入所有模块 (标准启动模式)"""
+    for module in modules:
+        try:
+            module.load()
+        except ImportError as e:
+            print(f"⚠️ 模块预加载失败 ({module._module_name}): {e}")
+
+
+async def warm_up_modules(modules: Iterable[LazyModule]):
+    """在后台线程中逐个导入模块，不阻塞事件循环"""
+    for module in modules:
+        if module.is_loaded:
+            continue
+        try:
+            await asyncio.to_thread(module.load, True)
+        except Exception as e:
+            print(f"⚠️ 后台预热导入失败 ({module._module_name}): {e}", file=sys.stderr)